@@ -9,7 +9,6 @@ import traceback
 from pathlib import Path
 
 import click
-import requests
 import rich
 from dotenv import load_dotenv
 from rich.console import Console
@@ -23,16 +22,9 @@ from cumulusci.utils import get_cci_upgrade_command
 from cumulusci.utils.http.requests_utils import init_requests_trust
 from cumulusci.utils.logging import tee_stdout_stderr
 
-from .error import error
-from .flow import flow
+from .lazy_group import LazyGroup
 from .logger import _set_windows_console_encoding, get_tempfile_logger, init_logger
-from .org import org
-from .plan import plan
-from .project import project
-from .robot import robot
 from .runtime import CliRuntime, pass_runtime
-from .service import service
-from .task import task
 from .utils import (
     check_latest_plugins,
     check_latest_version,
@@ -47,6 +39,29 @@ SUGGEST_ERROR_COMMAND = (
 
 USAGE_ERRORS = (CumulusCIUsageError, click.UsageError)
 
+# Top level command groups, imported only when invoked
+TOP_LEVEL_GROUPS = {
+    "error": "cumulusci.cli.error.error",
+    "project": "cumulusci.cli.project.project",
+    "org": "cumulusci.cli.org.org",
+    "service": "cumulusci.cli.service.service",
+    "task": "cumulusci.cli.task.task",
+    "flow": "cumulusci.cli.flow.flow",
+    "plan": "cumulusci.cli.plan.plan",
+    "robot": "cumulusci.cli.robot.robot",
+}
+# Their short help, for `cci --help` and shell completion
+TOP_LEVEL_GROUP_HELP = {
+    "error": "Get or share information about an error",
+    "project": "Commands for interacting with project repository configurations",
+    "org": "Commands for connecting and interacting with Salesforce orgs",
+    "service": "Commands for connecting services to the keychain",
+    "task": "Commands for finding and running tasks for a project",
+    "flow": "Commands for finding and running flows for a project",
+    "plan": "Commands for getting information about MetaDeploy plans",
+    "robot": "Commands for working with Robot Framework",
+}
+
 # Global variable to track the context stack for cleanup on signal
 _exit_stack = None
 _signal_handler_active = False  # Flag to prevent recursive signal handler calls
@@ -230,6 +245,8 @@ def handle_exception(
     """Displays error of appropriate message back to user, prompts user to investigate further
     with `cci error` commands, and writes the traceback to the latest logfile.
     """
+    import requests
+
     error_console = Console(stderr=True)
     if isinstance(error, requests.exceptions.ConnectionError):
         connection_error_message(error_console)
@@ -333,7 +350,13 @@ def version_info_wrapper(
     ctx.exit()
 
 
-@click.group("main", help="")
+@click.group(
+    "main",
+    help="",
+    cls=LazyGroup,
+    lazy_subcommands=TOP_LEVEL_GROUPS,
+    lazy_short_help=TOP_LEVEL_GROUP_HELP,
+)
 @click.option(  # based on https://click.palletsprojects.com/en/8.1.x/options/#callbacks-and-eager-options
     "--version",
     is_flag=True,
@@ -371,15 +394,3 @@ def shell(runtime, script=None, python=None):
         exec(python, variables)
     else:
         code.interact(local=variables)
-
-
-# Top Level Groups
-
-cli.add_command(error)
-cli.add_command(project)
-cli.add_command(org)
-cli.add_command(service)
-cli.add_command(task)
-cli.add_command(flow)
-cli.add_command(plan)
-cli.add_command(robot)
@@ -6,6 +6,9 @@ from pathlib import Path
 import click
 
 from cumulusci.core.exceptions import FlowNotFoundError
+from cumulusci.core.flow_checkpoint import FlowCheckpoint
+from cumulusci.core.flowrunner import MultiOrgFlowCoordinator
+from cumulusci.core.instrumentation import InstrumentationCallback
 from cumulusci.core.utils import format_duration
 from cumulusci.utils import document_flow, flow_ref_title_and_intro
 from cumulusci.utils.yaml.safer_loader import load_yaml_data
@@ -120,7 +123,7 @@ def flow_info(runtime, flow_name):
 @click.argument("flow_name")
 @click.option(
     "--org",
-    help="Specify the target org.  By default, runs against the current default org",
+    help="Specify the target org.  By default, runs against the current default org. Specify several orgs separated by commas to run the flow against them at the same time",
 )
 @click.option(
     "--delete-org",
@@ -146,8 +149,47 @@ def flow_info(runtime, flow_name):
     is_flag=True,
     help="Disables all prompts.  Set for non-interactive mode use such as calling from scripts or CI systems",
 )
+@click.option(
+    "--fuse-metadata-etl",
+    is_flag=True,
+    help="Run consecutive Metadata ETL steps with a single retrieve and deploy",
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    help="Skip the steps which completed when the flow last failed on this org, if their options and the files they use haven't changed",
+)
+@click.option(
+    "--instrument",
+    is_flag=True,
+    help="Show the time, API calls and memory used by each step when the flow finishes",
+)
+@click.option(
+    "--instrument-json",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Write the metrics collected by --instrument to this JSON file. Implies --instrument.",
+)
+@click.option(
+    "--instrument-folded",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Write the time spent by each step, by endpoint, as folded stacks for flame graph tools. Implies --instrument.",
+)
 @pass_runtime(require_keychain=True)
-def flow_run(runtime, flow_name, org, delete_org, no_org, debug, o, no_prompt):
+def flow_run(
+    runtime,
+    flow_name,
+    org,
+    delete_org,
+    no_org,
+    debug,
+    o,
+    no_prompt,
+    fuse_metadata_etl=False,
+    resume=False,
+    instrument=False,
+    instrument_json=None,
+    instrument_folded=None,
+):
 
     # Set click.no_prompt to disable all prompts in non-interactive mode
     if no_prompt:
@@ -155,29 +197,49 @@ def flow_run(runtime, flow_name, org, delete_org, no_org, debug, o, no_prompt):
 
     # Get necessary configs
     org_config = None
+    org_names = [name.strip() for name in org.split(",")] if org else []
+    if len(org_names) > 1 and not no_org:
+        if resume or instrument or instrument_json or instrument_folded:
+            raise click.UsageError(
+                "--resume and --instrument can't be used with more than one org"
+            )
+        return _run_flow_on_orgs(
+            runtime,
+            flow_name,
+            org_names,
+            _parse_flow_options(o),
+            delete_org,
+            fuse_metadata_etl,
+        )
     if no_org:
         if org:
             raise click.UsageError("--no-org and --org are mutually exclusive")
+        if resume:
+            raise click.UsageError("--resume can't be used with --no-org")
     else:
         org, org_config = runtime.get_org(org, fail_if_missing=True)
         if delete_org and not org_config.scratch:
             raise click.UsageError("--delete-org can only be used with a scratch org")
 
-    # Parse command line options
-    options = defaultdict(dict)
-    if o:
-        for key, value in o:
-            if "__" in key:
-                task_name, option_name = key.split("__")
-                options[task_name][option_name] = value
-            else:
-                raise click.UsageError(
-                    "-o option for flows should contain __ to split task name from option name."
-                )
+    options = _parse_flow_options(o)
 
     # Create the flow and handle initialization exceptions
+    instrumentation = None
     try:
         coordinator = runtime.get_flow(flow_name, options=options)
+        if fuse_metadata_etl:
+            coordinator.fuse_metadata_etl = True
+        if org_config:
+            coordinator.checkpoint = FlowCheckpoint(
+                org_config, flow_name, resume=resume
+            )
+        if instrument or instrument_json or instrument_folded:
+            instrumentation = InstrumentationCallback(
+                coordinator.callbacks,
+                json_path=instrument_json,
+                folded_path=instrument_folded,
+            )
+            coordinator.callbacks = instrumentation
         start_time = datetime.now()
         coordinator.run(org_config)
         duration = datetime.now() - start_time
@@ -186,6 +248,8 @@ def flow_run(runtime, flow_name, org, delete_org, no_org, debug, o, no_prompt):
         runtime.alert(f"Flow error: {flow_name}")
         raise
     finally:
+        if instrumentation and instrumentation.steps:
+            click.echo(instrumentation.format_summary())
         # Delete the scratch org if --delete-org was set
         if delete_org:
             try:
@@ -197,3 +261,64 @@ def flow_run(runtime, flow_name, org, delete_org, no_org, debug, o, no_prompt):
                 click.echo(str(e))
 
     runtime.alert(f"Flow Complete: {flow_name}")
+
+
+def _parse_flow_options(o) -> dict:
+    """Parse -o taskname__option value pairs"""
+    options = defaultdict(dict)
+    if o:
+        for key, value in o:
+            if "__" in key:
+                task_name, option_name = key.split("__")
+                options[task_name][option_name] = value
+            else:
+                raise click.UsageError(
+                    "-o option for flows should contain __ to split task name from option name."
+                )
+    return options
+
+
+def _run_flow_on_orgs(
+    runtime, flow_name, org_names, options, delete_org, fuse_metadata_etl
+):
+    """Run a flow against several orgs at the same time"""
+    org_configs = {}
+    for org_name in org_names:
+        _, org_config = runtime.get_org(org_name, fail_if_missing=True)
+        if delete_org and not org_config.scratch:
+            raise click.UsageError(
+                f"--delete-org can only be used with scratch orgs; {org_name} is not one"
+            )
+        org_configs[org_name] = org_config
+
+    flow_config = runtime.project_config.get_flow(flow_name)
+    coordinator = MultiOrgFlowCoordinator(
+        flow_config.project_config,
+        flow_config,
+        name=flow_config.name,
+        options=options,
+        callback_class=runtime.callback_class,
+        fuse_metadata_etl=True if fuse_metadata_etl else None,
+    )
+    try:
+        results = coordinator.run(org_configs)
+        click.echo(coordinator.format_summary())
+    finally:
+        if delete_org:
+            for org_name, org_config in org_configs.items():
+                try:
+                    org_config.delete_org()
+                except Exception as e:
+                    click.echo(
+                        f"Scratch org deletion failed for {org_name}.  Ignoring the error below to complete the flow:"
+                    )
+                    click.echo(str(e))
+
+    failed = [org_name for org_name, result in results.items() if result.exception]
+    if failed:
+        runtime.alert(f"Flow error: {flow_name}")
+        raise click.ClickException(
+            f"Flow {flow_name} failed on {len(failed)} of {len(results)} orgs: "
+            + ", ".join(failed)
+        )
+    runtime.alert(f"Flow Complete: {flow_name}")
@@ -0,0 +1,90 @@
+import importlib
+from typing import Dict, List, Optional, Tuple
+
+import click
+from click.utils import make_default_short_help
+
+
+class LazyGroup(click.Group):
+    """A click group whose subcommands are imported only when resolved.
+
+    ``lazy_subcommands`` maps a command name to the dotted path of the
+    click command object, e.g. ``{"org": "cumulusci.cli.org.org"}``. The
+    module behind a subcommand is imported the first time click asks for
+    that command, so running ``cci task run`` never imports ``cci org``.
+
+    ``lazy_short_help`` gives the short help of lazy subcommands, so that
+    listing them (in ``--help`` or shell completion) doesn't import them.
+    """
+
+    def __init__(
+        self,
+        *args,
+        lazy_subcommands: Optional[Dict[str, str]] = None,
+        lazy_short_help: Optional[Dict[str, str]] = None,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = lazy_subcommands or {}
+        self.lazy_short_help = lazy_short_help or {}
+
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        return sorted({*super().list_commands(ctx), *self.lazy_subcommands})
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        if cmd_name in self.lazy_subcommands and cmd_name not in self.commands:
+            self.add_command(self._load_command(cmd_name), cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def format_commands(
+        self, ctx: click.Context, formatter: click.HelpFormatter
+    ) -> None:
+        names = self.list_commands(ctx)
+        if not names:
+            return
+        # allow for 3 times the default spacing, like click
+        limit = formatter.width - 6 - max(len(name) for name in names)
+        rows = self._short_help_rows(ctx, names, limit)
+        if rows:
+            with formatter.section("Commands"):
+                formatter.write_dl(rows)
+
+    def shell_complete(self, ctx: click.Context, incomplete: str) -> List:
+        from click.shell_completion import CompletionItem
+
+        names = [
+            name for name in self.list_commands(ctx) if name.startswith(incomplete)
+        ]
+        results = [
+            CompletionItem(name, help=short_help)
+            for name, short_help in self._short_help_rows(ctx, names)
+        ]
+        # Complete options as click.Command does
+        results.extend(click.Command.shell_complete(self, ctx, incomplete))
+        return results
+
+    def _short_help_rows(
+        self, ctx: click.Context, names: List[str], limit: int = 45
+    ) -> List[Tuple[str, str]]:
+        """The short help of each visible subcommand, using the static help
+        of lazy subcommands which haven't been imported yet."""
+        rows = []
+        for name in names:
+            if name in self.lazy_short_help and name not in self.commands:
+                short_help = self.lazy_short_help[name]
+                rows.append((name, make_default_short_help(short_help, limit)))
+                continue
+            command = self.get_command(ctx, name)
+            if command is not None and not command.hidden:
+                rows.append((name, command.get_short_help_str(limit)))
+        return rows
+
+    def _load_command(self, cmd_name: str) -> click.Command:
+        import_path = self.lazy_subcommands[cmd_name]
+        module_name, attr_name = import_path.rsplit(".", 1)
+        command = getattr(importlib.import_module(module_name), attr_name)
+        if not isinstance(command, click.Command):
+            raise ValueError(
+                f"Lazy command {cmd_name} ({import_path}) is not a click command"
+            )
+        return command
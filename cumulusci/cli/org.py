@@ -2,7 +2,7 @@ import code
 import json
 import runpy
 import webbrowser
-from datetime import datetime
+from datetime import datetime, timedelta
 from urllib.parse import urlencode, urlparse
 
 import click
@@ -12,6 +12,7 @@ from cumulusci.cli.ui import CliTable, SimpleSalesforceUIHelpers
 from cumulusci.core.config import OrgConfig, ScratchOrgConfig
 from cumulusci.core.config.sfdx_org_config import SfdxOrgConfig
 from cumulusci.core.exceptions import OrgNotFound
+from cumulusci.core.scratch_org_pool import ScratchOrgPool, ScratchOrgPoolStore
 from cumulusci.oauth.client import (
     PROD_LOGIN_URL,
     SANDBOX_LOGIN_URL,
@@ -622,6 +623,164 @@ def org_scratch_delete(runtime, org_name):
     org_config.save()
 
 
+@org.group(
+    "pool",
+    help="Commands for keeping a pool of scratch orgs which are created ahead of time",
+)
+def org_pool():
+    pass
+
+
+def get_scratch_org_pool(runtime) -> ScratchOrgPool:
+    return ScratchOrgPool(
+        runtime.keychain, ScratchOrgPoolStore.for_project(runtime.project_config)
+    )
+
+
+@org_pool.command(
+    name="fill",
+    help="Creates scratch orgs from a scratch org config until the pool has SIZE orgs which aren't leased",
+)
+@click.argument("config_name")
+@click.option(
+    "--size", type=int, default=1, help="The number of orgs to keep in the pool"
+)
+@click.option(
+    "--days",
+    type=int,
+    help="If provided, overrides the scratch config default days value for how many days the scratch orgs should persist",
+)
+@click.option("--flow", "flow_name", help="A flow to run on each new org to set it up")
+@click.option(
+    "--max-parallel",
+    type=int,
+    help="The maximum number of orgs to create at the same time. By default, all of them",
+)
+@pass_runtime(require_project=True, require_keychain=True)
+def org_pool_fill(runtime, config_name, size, days, flow_name, max_parallel):
+    scratch_configs = runtime.project_config.lookup("orgs__scratch") or {}
+    if config_name not in scratch_configs:
+        raise click.UsageError(
+            f"No scratch org config named {config_name} found in the cumulusci.yml file"
+        )
+    setup = None
+    if flow_name:
+        # Fail before creating any orgs if the flow doesn't exist
+        coordinator = runtime.get_flow(flow_name)
+        if any(coordinator._is_from_other_project(step) for step in coordinator.steps):
+            # Its tasks change to the other project's directory,
+            # which concurrent orgs would share
+            click.echo(
+                "Creating one org at a time, because some of the flow's steps come from another project"
+            )
+            max_parallel = 1
+
+        def run_setup_flow(org_config):
+            runtime.get_flow(flow_name).run(org_config)
+
+        setup = run_setup_flow
+
+    created, errors = get_scratch_org_pool(runtime).fill(
+        config_name, size, days=days, setup=setup, max_parallel=max_parallel
+    )
+    if created:
+        click.echo(f"Added {len(created)} orgs to the pool: {', '.join(created)}")
+    else:
+        click.echo(f"The {config_name} pool is full.")
+    if errors:
+        raise click.ClickException(f"Unable to create {len(errors)} orgs for the pool.")
+
+
+@org_pool.command(
+    name="lease",
+    help="Leases an org from the pool of a scratch org config, and prints its name",
+)
+@click.argument("config_name")
+@click.option("--holder", help="A description of who is using the org")
+@click.option(
+    "--default", is_flag=True, help="If set, sets the leased org as the default org"
+)
+@pass_runtime(require_project=True, require_keychain=True)
+def org_pool_lease(runtime, config_name, holder, default):
+    org_name = get_scratch_org_pool(runtime).lease(config_name, holder=holder)
+    if org_name is None:
+        raise click.ClickException(
+            f"The {config_name} pool has no available orgs. Use `cci org pool fill {config_name}` to add some."
+        )
+    if default:
+        runtime.keychain.set_default_org(org_name)
+    click.echo(org_name)
+
+
+@org_pool.command(
+    name="return",
+    help="Returns a leased org to its pool, so that it can be leased again",
+)
+@click.argument("org_name")
+@click.option(
+    "--delete",
+    is_flag=True,
+    help="If set, deletes the org instead of making it available again",
+)
+@pass_runtime(require_project=True, require_keychain=True)
+def org_pool_return(runtime, org_name, delete):
+    get_scratch_org_pool(runtime).return_org(org_name, delete=delete)
+    if delete:
+        click.echo(f"Deleted {org_name}")
+    else:
+        click.echo(f"Returned {org_name} to the pool")
+
+
+@org_pool.command(name="list", help="Lists the pooled orgs and whether they are leased")
+@click.argument("config_name", required=False)
+@click.option("--plain", is_flag=True, help="Print the table using plain ascii.")
+@click.option(
+    "--json", "json_flag", is_flag=True, help="Output results in JSON format."
+)
+@pass_runtime(require_project=True, require_keychain=True)
+def org_pool_list(runtime, config_name, plain, json_flag):
+    orgs = get_scratch_org_pool(runtime).list_orgs(config_name)
+    if json_flag:
+        click.echo(json.dumps(orgs))
+        return
+
+    plain = plain or runtime.universal_config.cli__plain_output
+    data = [["Name", "Config", "State", "Expires", "Leased By"]]
+    data.extend(
+        [
+            org_name,
+            org["config_name"],
+            org["state"],
+            org["expires"] or "",
+            org.get("leased_by") or "",
+        ]
+        for org_name, org in sorted(orgs.items())
+    )
+    CliTable(data, title="Pooled Scratch Orgs").echo(plain)
+
+
+@org_pool.command(
+    name="prune",
+    help="Deletes pooled orgs which have expired, or which expire soon",
+)
+@click.argument("config_name", required=False)
+@click.option(
+    "--expiring-within",
+    type=int,
+    default=0,
+    help="Also deletes orgs which aren't leased and expire within this many hours",
+)
+@pass_runtime(require_project=True, require_keychain=True)
+def org_pool_prune(runtime, config_name, expiring_within):
+    pruned = get_scratch_org_pool(runtime).prune(
+        config_name, within=timedelta(hours=expiring_within)
+    )
+    if pruned:
+        click.echo(f"Removed {len(pruned)} orgs from the pool: {', '.join(pruned)}")
+    else:
+        click.echo("No pooled orgs to remove. ✨")
+
+
 org_shell_cci_help_message = """
 The cumulusci shell gives you access to the following objects and functions:
 
@@ -4,6 +4,8 @@ import click
 from rich.console import Console
 
 from cumulusci.cli.ui import CliTable
+from cumulusci.core.config import FlowConfig
+from cumulusci.core.flowrunner import FAILED_CHECK_STATUSES, PreflightFlowCoordinator
 from cumulusci.core.metadeploy.plans import get_frozen_steps
 from cumulusci.utils.yaml.cumulusci_yml import Plan
 
@@ -179,3 +181,56 @@ def plan_info(runtime, plan_name, messages_only):
     console.print(plan_preflight_checks_table)
     console.print(step_preflight_checks_table)
     console.print(steps_table)
+
+
+@plan.command(name="preflight")
+@click.argument("plan_name")
+@click.option(
+    "--org",
+    help="Specify the target org. By default, runs against the current default org",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Run every task the checks call, instead of reusing results from a recent preflight run against the org",
+)
+@pass_runtime(require_project=True, require_keychain=True)
+def plan_preflight(runtime, plan_name, org, no_cache):
+    """Evaluates a MetaDeploy plan's preflight checks against an org."""
+
+    plans = runtime.project_config.plans or {}
+
+    if plan_name not in plans:
+        raise click.UsageError(
+            f"Unknown plan '{plan_name}'. To view available plans run: `cci plan list`"
+        )
+
+    plan_config = plans[plan_name]
+    org, org_config = runtime.get_org(org, fail_if_missing=True)
+    coordinator = PreflightFlowCoordinator(
+        runtime.project_config,
+        FlowConfig(
+            {
+                "steps": plan_config.get("steps", {}),
+                "checks": plan_config.get("checks", []),
+            }
+        ),
+        name=plan_name,
+        use_task_result_cache=not no_cache,
+    )
+    coordinator.run(org_config)
+
+    results = [
+        [step_num or "Plan", result["status"], result.get("message") or ""]
+        for step_num, step_results in coordinator.preflight_results.items()
+        for result in step_results
+    ]
+    console = Console()
+    console.print(
+        CliTable(
+            title="Preflight Results",
+            data=[["Step", "Status", "Message"], *results],
+        )
+    )
+    if any(status in FAILED_CHECK_STATUSES for _, status, _ in results):
+        raise click.ClickException(f"Preflight checks for plan {plan_name} failed.")
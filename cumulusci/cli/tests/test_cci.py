@@ -2,6 +2,7 @@ import contextlib
 import io
 import os
 import signal
+import subprocess
 import sys
 from pathlib import Path
 from unittest import mock
@@ -463,14 +464,48 @@ def test_shell__no_project(interact):
 
 
 def test_cover_command_groups():
-    run_click_command(cci.project)
-    run_click_command(cci.org)
-    run_click_command(cci.task)
-    run_click_command(cci.flow)
-    run_click_command(cci.service)
+    ctx = click.Context(cci.cli)
+    for name in ("project", "org", "task", "flow", "service"):
+        run_click_command(cci.cli.get_command(ctx, name))
     # no assertion; this test is for coverage of empty methods
 
 
+def test_top_level_groups_registered():
+    ctx = click.Context(cci.cli)
+    assert set(cci.TOP_LEVEL_GROUPS) <= set(cci.cli.list_commands(ctx))
+    for name in cci.TOP_LEVEL_GROUPS:
+        assert cci.cli.get_command(ctx, name).name == name
+
+
+def test_top_level_group_help():
+    ctx = click.Context(cci.cli)
+    for name, short_help in cci.TOP_LEVEL_GROUP_HELP.items():
+        assert cci.cli.get_command(ctx, name).get_short_help_str(100) == short_help
+
+
+def test_help_does_not_load_command_groups():
+    """Guards CLI startup time: `cci --help` and completing the top level
+    commands must not import the modules behind the command groups, or the
+    sfdx-backed org configs."""
+    code = (
+        "import sys\n"
+        "from click.shell_completion import ShellComplete\n"
+        "from click.testing import CliRunner\n"
+        "import cumulusci.cli.cci as cci\n"
+        "result = CliRunner().invoke(cci.cli, ['--help'])\n"
+        "assert result.exit_code == 0, result.output\n"
+        "ShellComplete(cci.cli, {}, 'cci', '_CCI_COMPLETE').get_completions([], '')\n"
+        "modules = [path.rsplit('.', 1)[0] for path in cci.TOP_LEVEL_GROUPS.values()]\n"
+        "modules += ['cumulusci.core.config.scratch_org_config', "
+        "'cumulusci.core.config.sfdx_org_config']\n"
+        "print(','.join(m for m in modules if m in sys.modules))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == ""
+
+
 @mock.patch(
     "cumulusci.cli.runtime.CliRuntime.get_org",
     lambda *args, **kwargs: (MagicMock(), MagicMock()),
@@ -1,3 +1,4 @@
+import json
 from unittest import mock
 
 import click
@@ -205,6 +206,165 @@ def test_flow_run__delete_org_when_error_occurs_in_flow():
     org_config.delete_org.assert_called_once()
 
 
+@mock.patch("click.echo")
+def test_flow_run__instrument(echo, tmp_path):
+    runtime = CliRuntime(
+        config={
+            "flows": {"test": {"steps": {1: {"task": "test_task"}}}},
+            "tasks": {
+                "test_task": {
+                    "class_path": "cumulusci.cli.tests.test_flow.DummyTask",
+                    "description": "Test Task",
+                }
+            },
+        },
+        load_keychain=False,
+    )
+    json_path = tmp_path / "metrics.json"
+
+    run_click_command(
+        flow.flow_run,
+        runtime=runtime,
+        flow_name="test",
+        org=None,
+        no_org=True,
+        delete_org=False,
+        debug=False,
+        o=[("test_task__color", "blue")],
+        no_prompt=True,
+        instrument_json=str(json_path),
+    )
+
+    metrics = json.loads(json_path.read_text())
+    assert metrics["flow"] == "test"
+    assert [step["task_name"] for step in metrics["steps"]] == ["test_task"]
+    assert any(
+        call[0][0].startswith("Flow metrics for test") for call in echo.call_args_list
+    )
+
+
+def test_flow_run__resume():
+    org_config = mock.Mock(scratch=True, config={})
+    runtime = mock.Mock()
+    runtime.get_org.return_value = ("test", org_config)
+    coordinator = runtime.get_flow.return_value
+
+    run_click_command(
+        flow.flow_run,
+        runtime=runtime,
+        flow_name="test",
+        org="test",
+        no_org=False,
+        delete_org=False,
+        debug=False,
+        o=None,
+        no_prompt=True,
+        resume=True,
+    )
+
+    assert coordinator.checkpoint.org_config is org_config
+    assert coordinator.checkpoint.flow_name == "test"
+    assert coordinator.checkpoint.resume
+    coordinator.run.assert_called_once_with(org_config)
+
+
+def test_flow_run__resume_no_org():
+    runtime = mock.Mock()
+
+    with pytest.raises(click.UsageError, match="--resume"):
+        run_click_command(
+            flow.flow_run,
+            runtime=runtime,
+            flow_name="test",
+            org=None,
+            no_org=True,
+            delete_org=False,
+            debug=False,
+            o=None,
+            no_prompt=True,
+            resume=True,
+        )
+
+
+@mock.patch("cumulusci.cli.flow.MultiOrgFlowCoordinator")
+def test_flow_run__multiple_orgs(MultiOrgFlowCoordinator):
+    org_configs = {
+        "dev": mock.Mock(scratch=True),
+        "qa": mock.Mock(scratch=True),
+    }
+    runtime = mock.Mock()
+    runtime.get_org.side_effect = lambda name, fail_if_missing: (
+        name,
+        org_configs[name],
+    )
+    coordinator = MultiOrgFlowCoordinator.return_value
+    coordinator.run.return_value = {
+        "dev": mock.Mock(exception=None),
+        "qa": mock.Mock(exception=None),
+    }
+    coordinator.format_summary.return_value = "Flow 'test' succeeded on 2 of 2 orgs:"
+
+    run_click_command(
+        flow.flow_run,
+        runtime=runtime,
+        flow_name="test",
+        org="dev, qa",
+        no_org=False,
+        delete_org=True,
+        debug=False,
+        o=[("test_task__color", "blue")],
+        no_prompt=True,
+    )
+
+    assert MultiOrgFlowCoordinator.call_args.kwargs["options"] == {
+        "test_task": {"color": "blue"}
+    }
+    coordinator.run.assert_called_once_with(org_configs)
+    for org_config in org_configs.values():
+        org_config.delete_org.assert_called_once()
+    runtime.alert.assert_called_once_with("Flow Complete: test")
+
+
+@mock.patch("cumulusci.cli.flow.MultiOrgFlowCoordinator")
+def test_flow_run__multiple_orgs__failure(MultiOrgFlowCoordinator):
+    runtime = mock.Mock()
+    runtime.get_org.side_effect = lambda name, fail_if_missing: (name, mock.Mock())
+    MultiOrgFlowCoordinator.return_value.run.return_value = {
+        "dev": mock.Mock(exception=Exception("Failed")),
+        "qa": mock.Mock(exception=None),
+    }
+
+    with pytest.raises(click.ClickException, match="failed on 1 of 2 orgs: dev"):
+        run_click_command(
+            flow.flow_run,
+            runtime=runtime,
+            flow_name="test",
+            org="dev,qa",
+            no_org=False,
+            delete_org=False,
+            debug=False,
+            o=None,
+            no_prompt=True,
+        )
+    runtime.alert.assert_called_once_with("Flow error: test")
+
+
+def test_flow_run__multiple_orgs__resume():
+    with pytest.raises(click.UsageError, match="more than one org"):
+        run_click_command(
+            flow.flow_run,
+            runtime=mock.Mock(),
+            flow_name="test",
+            org="dev,qa",
+            no_org=False,
+            delete_org=False,
+            debug=False,
+            o=None,
+            no_prompt=True,
+            resume=True,
+        )
+
+
 def test_flow_run__option_error():
     org_config = mock.Mock(scratch=True, config={})
     runtime = CliRuntime(config={"noop": {}}, load_keychain=False)
@@ -0,0 +1,82 @@
+import click
+import pytest
+from click.testing import CliRunner
+
+from cumulusci.cli.lazy_group import LazyGroup
+
+
+@click.command("eager")
+def eager():
+    pass
+
+
+lazy_target = click.Command("lazy", callback=lambda: None)
+not_a_command = object()
+
+
+def make_group(lazy_short_help=None, **lazy_subcommands):
+    group = LazyGroup(
+        "main",
+        lazy_subcommands={
+            "lazy": "cumulusci.cli.tests.test_lazy_group.lazy_target",
+            **lazy_subcommands,
+        },
+        lazy_short_help=lazy_short_help,
+    )
+    group.add_command(eager)
+    return group
+
+
+def test_list_commands():
+    group = make_group()
+    assert group.list_commands(click.Context(group)) == ["eager", "lazy"]
+
+
+def test_get_command__resolves_lazily():
+    group = make_group()
+    assert "lazy" not in group.commands
+    assert group.get_command(click.Context(group), "lazy") is lazy_target
+    assert group.commands["lazy"] is lazy_target
+
+
+def test_get_command__unknown():
+    group = make_group()
+    assert group.get_command(click.Context(group), "missing") is None
+
+
+def test_get_command__not_a_command():
+    group = make_group(
+        bad="cumulusci.cli.tests.test_lazy_group.not_a_command",
+    )
+    with pytest.raises(ValueError, match="not a click command"):
+        group.get_command(click.Context(group), "bad")
+
+
+def test_invoke_lazy_command():
+    result = CliRunner().invoke(make_group(), ["lazy"])
+    assert result.exit_code == 0
+
+
+def test_help__uses_static_short_help():
+    group = make_group(lazy_short_help={"lazy": "Does lazy things"})
+    result = CliRunner().invoke(group, ["--help"])
+
+    assert "lazy   Does lazy things" in result.output
+    assert "lazy" not in group.commands
+
+
+def test_help__without_static_short_help():
+    group = make_group()
+    CliRunner().invoke(group, ["--help"])
+    assert group.commands["lazy"] is lazy_target
+
+
+def test_shell_complete():
+    group = make_group(lazy_short_help={"lazy": "Does lazy things"})
+    completions = group.shell_complete(click.Context(group), "")
+
+    assert [(c.value, c.help) for c in completions if c.type == "plain"] == [
+        ("eager", ""),
+        ("lazy", "Does lazy things"),
+    ]
+    assert "lazy" not in group.commands
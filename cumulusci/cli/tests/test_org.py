@@ -1379,6 +1379,224 @@ class TestOrgCommands:
         run_click_command(org.org_scratch_delete, runtime=runtime, org_name="test")
         assert "org remove" in str(echo.mock_calls)
 
+    @mock.patch("cumulusci.cli.org.get_scratch_org_pool")
+    def test_org_pool_fill(self, get_scratch_org_pool):
+        runtime = mock.Mock()
+        runtime.project_config.lookup = MockLookup(orgs__scratch={"dev": {}})
+        pool = get_scratch_org_pool.return_value
+        pool.fill.return_value = (["dev__pool_1", "dev__pool_2"], {})
+        runtime.get_flow.return_value.steps = []
+        org_config = mock.Mock()
+
+        run_click_command(
+            org.org_pool_fill,
+            runtime=runtime,
+            config_name="dev",
+            size=2,
+            days=3,
+            flow_name="dev_org",
+            max_parallel=None,
+        )
+
+        pool.fill.assert_called_once_with(
+            "dev", 2, days=3, setup=mock.ANY, max_parallel=None
+        )
+        setup = pool.fill.call_args.kwargs["setup"]
+        setup(org_config)
+        runtime.get_flow.assert_called_with("dev_org")
+        runtime.get_flow.return_value.run.assert_called_once_with(org_config)
+
+    @mock.patch("cumulusci.cli.org.get_scratch_org_pool")
+    def test_org_pool_fill__flow_from_other_project(self, get_scratch_org_pool):
+        runtime = mock.Mock()
+        runtime.project_config.lookup = MockLookup(orgs__scratch={"dev": {}})
+        pool = get_scratch_org_pool.return_value
+        pool.fill.return_value = (["dev__pool_1"], {})
+        coordinator = runtime.get_flow.return_value
+        coordinator.steps = [mock.Mock()]
+        coordinator._is_from_other_project.return_value = True
+
+        run_click_command(
+            org.org_pool_fill,
+            runtime=runtime,
+            config_name="dev",
+            size=2,
+            days=None,
+            flow_name="dev_org",
+            max_parallel=None,
+        )
+
+        pool.fill.assert_called_once_with(
+            "dev", 2, days=None, setup=mock.ANY, max_parallel=1
+        )
+
+    @mock.patch("cumulusci.cli.org.get_scratch_org_pool")
+    def test_org_pool_fill__errors(self, get_scratch_org_pool):
+        runtime = mock.Mock()
+        runtime.project_config.lookup = MockLookup(orgs__scratch={"dev": {}})
+        get_scratch_org_pool.return_value.fill.return_value = (
+            [],
+            {"dev__pool_1": Exception("Failed")},
+        )
+
+        with pytest.raises(click.ClickException, match="Unable to create 1 orgs"):
+            run_click_command(
+                org.org_pool_fill,
+                runtime=runtime,
+                config_name="dev",
+                size=1,
+                days=None,
+                flow_name=None,
+                max_parallel=None,
+            )
+
+    def test_org_pool_fill__unknown_config(self):
+        runtime = mock.Mock()
+        runtime.project_config.lookup = MockLookup(orgs__scratch={"dev": {}})
+
+        with pytest.raises(click.UsageError):
+            run_click_command(
+                org.org_pool_fill,
+                runtime=runtime,
+                config_name="qa",
+                size=1,
+                days=None,
+                flow_name=None,
+                max_parallel=None,
+            )
+
+    @mock.patch("click.echo")
+    @mock.patch("cumulusci.cli.org.get_scratch_org_pool")
+    def test_org_pool_lease(self, get_scratch_org_pool, echo):
+        runtime = mock.Mock()
+        get_scratch_org_pool.return_value.lease.return_value = "dev__pool_1"
+
+        run_click_command(
+            org.org_pool_lease,
+            runtime=runtime,
+            config_name="dev",
+            holder="build 1",
+            default=True,
+        )
+
+        get_scratch_org_pool.return_value.lease.assert_called_once_with(
+            "dev", holder="build 1"
+        )
+        runtime.keychain.set_default_org.assert_called_once_with("dev__pool_1")
+        echo.assert_called_once_with("dev__pool_1")
+
+    @mock.patch("cumulusci.cli.org.get_scratch_org_pool")
+    def test_org_pool_lease__empty(self, get_scratch_org_pool):
+        get_scratch_org_pool.return_value.lease.return_value = None
+
+        with pytest.raises(click.ClickException, match="no available orgs"):
+            run_click_command(
+                org.org_pool_lease,
+                runtime=mock.Mock(),
+                config_name="dev",
+                holder=None,
+                default=False,
+            )
+
+    @mock.patch("cumulusci.cli.org.get_scratch_org_pool")
+    def test_org_pool_return(self, get_scratch_org_pool):
+        run_click_command(
+            org.org_pool_return,
+            runtime=mock.Mock(),
+            org_name="dev__pool_1",
+            delete=True,
+        )
+
+        get_scratch_org_pool.return_value.return_org.assert_called_once_with(
+            "dev__pool_1", delete=True
+        )
+
+    @mock.patch("cumulusci.cli.org.CliTable")
+    @mock.patch("cumulusci.cli.org.get_scratch_org_pool")
+    def test_org_pool_list(self, get_scratch_org_pool, cli_tbl):
+        runtime = mock.Mock()
+        runtime.universal_config.cli__plain_output = None
+        get_scratch_org_pool.return_value.list_orgs.return_value = {
+            "dev__pool_2": {
+                "config_name": "dev",
+                "state": "available",
+                "expires": "2026-10-26T00:00:00+00:00",
+            },
+            "dev__pool_1": {
+                "config_name": "dev",
+                "state": "leased",
+                "expires": "2026-10-25T00:00:00+00:00",
+                "leased_by": "build 1",
+            },
+        }
+
+        run_click_command(
+            org.org_pool_list,
+            runtime=runtime,
+            config_name="dev",
+            plain=False,
+            json_flag=False,
+        )
+
+        get_scratch_org_pool.return_value.list_orgs.assert_called_once_with("dev")
+        cli_tbl.assert_called_once_with(
+            [
+                ["Name", "Config", "State", "Expires", "Leased By"],
+                [
+                    "dev__pool_1",
+                    "dev",
+                    "leased",
+                    "2026-10-25T00:00:00+00:00",
+                    "build 1",
+                ],
+                ["dev__pool_2", "dev", "available", "2026-10-26T00:00:00+00:00", ""],
+            ],
+            title="Pooled Scratch Orgs",
+        )
+        cli_tbl.return_value.echo.assert_called_once_with(None)
+
+    @mock.patch("click.echo")
+    @mock.patch("cumulusci.cli.org.get_scratch_org_pool")
+    def test_org_pool_list__json(self, get_scratch_org_pool, echo):
+        orgs = {"dev__pool_1": {"config_name": "dev", "state": "creating"}}
+        get_scratch_org_pool.return_value.list_orgs.return_value = orgs
+
+        run_click_command(
+            org.org_pool_list,
+            runtime=mock.Mock(),
+            config_name=None,
+            plain=False,
+            json_flag=True,
+        )
+
+        echo.assert_called_once_with(json.dumps(orgs))
+
+    @mock.patch("click.echo")
+    @mock.patch("cumulusci.cli.org.get_scratch_org_pool")
+    def test_org_pool_prune(self, get_scratch_org_pool, echo):
+        get_scratch_org_pool.return_value.prune.return_value = ["dev__pool_1"]
+
+        run_click_command(
+            org.org_pool_prune,
+            runtime=mock.Mock(),
+            config_name=None,
+            expiring_within=2,
+        )
+
+        get_scratch_org_pool.return_value.prune.assert_called_once_with(
+            None, within=timedelta(hours=2)
+        )
+        echo.assert_called_once_with("Removed 1 orgs from the pool: dev__pool_1")
+
+    def test_get_scratch_org_pool(self, tmp_path):
+        runtime = mock.Mock()
+        runtime.project_config.project_local_dir = str(tmp_path)
+
+        pool = org.get_scratch_org_pool(runtime)
+
+        assert pool.keychain is runtime.keychain
+        assert pool.store.path == tmp_path / "scratch_org_pool.json"
+
     @mock.patch("cumulusci.cli.org.get_simple_salesforce_connection")
     @mock.patch("code.interact")
     def test_org_shell(self, mock_code, mock_sf):
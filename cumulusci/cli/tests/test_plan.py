@@ -243,3 +243,56 @@ class TestPlanInfo:
             run_click_command(
                 plan.plan_info, "invalid_plan", runtime=runtime, messages_only=False
             )
+
+
+class TestPlanPreflight:
+    @mock.patch("cumulusci.cli.plan.CliTable")
+    @mock.patch("cumulusci.cli.plan.PreflightFlowCoordinator")
+    def test_plan_preflight(self, coordinator_class, cli_table, runtime):
+        org_config = mock.Mock()
+        runtime.get_org = mock.Mock(return_value=("test", org_config))
+        coordinator = coordinator_class.return_value
+        coordinator.preflight_results = {
+            None: [{"status": "warn", "message": "Careful"}],
+            "1": [{"status": "skip", "message": None}],
+        }
+
+        with pytest.raises(click.ClickException, match="plan 1 failed"):
+            run_click_command(
+                plan.plan_preflight, "plan 1", runtime=runtime, org=None, no_cache=True
+            )
+
+        flow_config = coordinator_class.call_args.args[1]
+        assert flow_config.checks == runtime.project_config.plans["plan 1"]["checks"]
+        assert coordinator_class.call_args.kwargs["use_task_result_cache"] is False
+        coordinator.run.assert_called_once_with(org_config)
+        cli_table.assert_called_once_with(
+            title="Preflight Results",
+            data=[
+                ["Step", "Status", "Message"],
+                ["Plan", "warn", "Careful"],
+                ["1", "skip", ""],
+            ],
+        )
+
+    @mock.patch("cumulusci.cli.plan.CliTable")
+    @mock.patch("cumulusci.cli.plan.PreflightFlowCoordinator")
+    def test_plan_preflight__passed(self, coordinator_class, cli_table, runtime):
+        runtime.get_org = mock.Mock(return_value=("test", mock.Mock()))
+        coordinator_class.return_value.preflight_results = {}
+
+        run_click_command(
+            plan.plan_preflight, "plan 1", runtime=runtime, org=None, no_cache=False
+        )
+
+        assert coordinator_class.call_args.kwargs["use_task_result_cache"] is True
+
+    def test_plan_preflight__bogus_plan(self, runtime):
+        with pytest.raises(click.UsageError, match=r"Unknown plan 'invalid_plan'."):
+            run_click_command(
+                plan.plan_preflight,
+                "invalid_plan",
+                runtime=runtime,
+                org=None,
+                no_cache=False,
+            )
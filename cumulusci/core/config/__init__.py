@@ -3,6 +3,8 @@
 # constants used by MetaCI
 FAILED_TO_CREATE_SCRATCH_ORG = "Failed to create scratch org"
 
+from typing import TYPE_CHECKING
+
 from cumulusci.core.config.base_config import BaseConfig
 from cumulusci.core.exceptions import TaskImportError
 from cumulusci.core.utils import import_global
@@ -101,15 +103,32 @@ from cumulusci.core.config.base_task_flow_config import BaseTaskFlowConfig
 # inherit from BaseTaskFlowConfig
 from cumulusci.core.config.project_config import BaseProjectConfig
 
-# inherit from SfdxOrgConfig
-from cumulusci.core.config.scratch_org_config import ScratchOrgConfig
-
-# inherit from OrgConfig
-from cumulusci.core.config.sfdx_org_config import SfdxOrgConfig
-
 # inherit from BaseProjectConfig
 from cumulusci.core.config.universal_config import UniversalConfig
 
+# The sfdx-backed org configs shell out to the sf CLI and are only needed
+# once an org is loaded, so they are imported on first access.
+_LAZY_IMPORTS = {
+    "ScratchOrgConfig": "cumulusci.core.config.scratch_org_config",
+    "SfdxOrgConfig": "cumulusci.core.config.sfdx_org_config",
+}
+
+
+if TYPE_CHECKING:
+    from cumulusci.core.config.scratch_org_config import ScratchOrgConfig
+    from cumulusci.core.config.sfdx_org_config import SfdxOrgConfig
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        import importlib
+
+        value = getattr(importlib.import_module(_LAZY_IMPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 __all__ = (
     "FAILED_TO_CREATE_SCRATCH_ORG",
     "BaseConfig",
@@ -0,0 +1,134 @@
+"""Persistent cache for loaded and validated cumulusci.yml configuration.
+
+Parsing and validating the universal, global, project and local YAML files
+dominates ``cci`` startup time for large projects. The result of loading
+them is pickled into ``~/.cumulusci/config_cache`` under a key derived from
+the path, mtime, size and content hash of every contributing file, so an
+unchanged project is reloaded without touching the YAML parser or pydantic.
+
+The cache holds at most ``max_entries`` compiled configs; the least recently
+used entries are pruned when a new one is written.
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+from cumulusci.__about__ import __version__
+
+# Bump when the structure of cached entries changes.
+CACHE_FORMAT_VERSION = 1
+CACHE_DIR_NAME = "config_cache"
+DEFAULT_MAX_ENTRIES = 32
+DISABLE_ENV_VAR = "CUMULUSCI_DISABLE_CONFIG_CACHE"
+
+logger = logging.getLogger(__name__)
+
+
+class CompiledConfigCache:
+    """A small LRU-bounded on-disk store of compiled configuration dicts."""
+
+    suffix = ".pickle"
+
+    def __init__(self, cache_dir: Path, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.cache_dir = Path(cache_dir)
+        self.max_entries = max_entries
+
+    @classmethod
+    def default(cls) -> Optional["CompiledConfigCache"]:
+        """Return the cache in ~/.cumulusci, or None if it has been disabled."""
+        if os.environ.get(DISABLE_ENV_VAR):
+            return None
+        return cls(Path.home() / ".cumulusci" / CACHE_DIR_NAME)
+
+    def key_for(
+        self, paths: Sequence[Optional[str]], extra: Sequence[Optional[str]] = ()
+    ) -> str:
+        """Build a cache key from the state of each file and any extra text.
+
+        Missing files (None or nonexistent) are part of the key too, so that
+        creating e.g. a local cumulusci.yml invalidates the entry."""
+        digest = hashlib.sha256()
+        digest.update(f"{CACHE_FORMAT_VERSION}:{__version__}".encode())
+        for path in paths:
+            digest.update(b"\0path:")
+            digest.update(fingerprint_file(path).encode())
+        for text in extra:
+            digest.update(b"\0extra:")
+            digest.update(hashlib.sha256((text or "").encode()).digest())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path_for(key)
+        try:
+            with path.open("rb") as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.debug(f"Discarding unreadable config cache entry {path}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+
+        # Touch the entry so pruning treats it as recently used.
+        try:
+            os.utime(path)
+        except OSError:  # pragma: no cover
+            pass
+        return value
+
+    def set(self, key: str, value: Dict[str, Any]):
+        tmp_name = None
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_name, self._path_for(key))
+        except Exception as e:
+            # The cache is an optimization; never fail a command over it.
+            logger.debug(f"Unable to write config cache entry: {e}")
+            if tmp_name:
+                Path(tmp_name).unlink(missing_ok=True)
+            return
+        self._prune()
+
+    def clear(self):
+        for entry in self._entries():
+            entry.unlink(missing_ok=True)
+
+    def _path_for(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{self.suffix}"
+
+    def _entries(self):
+        if not self.cache_dir.is_dir():
+            return []
+        return list(self.cache_dir.glob(f"*{self.suffix}"))
+
+    def _prune(self):
+        entries = []
+        for entry in self._entries():
+            try:
+                entries.append((entry.stat().st_mtime_ns, entry))
+            except FileNotFoundError:  # pragma: no cover
+                continue
+        entries.sort(reverse=True)
+        for _, entry in entries[self.max_entries :]:
+            entry.unlink(missing_ok=True)
+
+
+def fingerprint_file(path: Optional[str]) -> str:
+    "Describe a file by its path, mtime, size and content hash."
+    if not path:
+        return "<none>"
+    try:
+        stat = os.stat(path)
+        with open(path, "rb") as f:
+            content_hash = hashlib.sha256(f.read()).hexdigest()
+    except (OSError, TypeError, ValueError):
+        return f"{path!r}:<missing>"
+    return f"{os.path.abspath(path)}:{stat.st_mtime_ns}:{stat.st_size}:{content_hash}"
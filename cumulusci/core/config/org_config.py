@@ -1,5 +1,6 @@
 import os
 import re
+import threading
 from collections import defaultdict, namedtuple
 from contextlib import contextmanager
 from datetime import date, datetime
@@ -69,6 +70,9 @@ class OrgConfig(BaseConfig):
     # make sure it can be mocked for tests
     OAuth2Client = OAuth2Client
 
+    # Serializes token refreshes by tasks running in parallel
+    _refresh_lock = threading.RLock()
+
     def __init__(self, config: dict, name: str, keychain=None, global_org=False):
         self.keychain = keychain
         self.global_org = global_org
@@ -116,11 +120,12 @@ class OrgConfig(BaseConfig):
 
     @contextmanager
     def save_if_changed(self):
-        orig_config = self.config.copy()
-        yield
-        if self.config != orig_config:
-            self.logger.info("Org info updated, writing to keychain")
-            self.save()
+        with self._refresh_lock:
+            orig_config = self.config.copy()
+            yield
+            if self.config != orig_config:
+                self.logger.info("Org info updated, writing to keychain")
+                self.save()
 
     def _refresh_token(self, keychain, connected_app):
         if keychain:  # it might be none'd and caller adds connected_app
@@ -23,6 +23,7 @@ from pydantic.v1 import ValidationError
 
 from cumulusci.core.config import FlowConfig, TaskConfig
 from cumulusci.core.config.base_task_flow_config import BaseTaskFlowConfig
+from cumulusci.core.config.config_cache import CompiledConfigCache, fingerprint_file
 from cumulusci.core.exceptions import (
     ConfigError,
     CumulusCIException,
@@ -43,6 +44,7 @@ from cumulusci.utils.git import (
 from cumulusci.utils.yaml.cumulusci_yml import (
     LocalFolderSourceModel,
     VCSSourceModel,
+    _log_yaml_errors,
     cci_safe_load,
 )
 from cumulusci.vcs.models import AbstractRepo
@@ -58,6 +60,7 @@ tasks.__path__ = []
 if TYPE_CHECKING:
     from cumulusci.core.config.universal_config import UniversalConfig
     from cumulusci.core.keychain.base_project_keychain import BaseProjectKeychain
+    from cumulusci.core.shared_work import SharedWork
     from cumulusci.utils.yaml.cumulusci_yml import ReleaseBranchFormat
     from cumulusci.vcs.base import VCSService
 
@@ -96,6 +99,8 @@ class BaseProjectConfig(BaseTaskFlowConfig, ProjectConfigPropertiesMixin):
         Union[VCSSourceModel, LocalFolderSourceModel],
         "BaseProjectConfig",
     ]
+    # Set while flows run against several orgs at once (see MultiOrgFlowCoordinator)
+    shared_work: Optional["SharedWork"] = None
 
     def __init__(
         self,
@@ -163,31 +168,71 @@ class BaseProjectConfig(BaseTaskFlowConfig, ProjectConfigPropertiesMixin):
                 f"The file {self.config_filename} was not found in the repo root: {repo_root}. Are you in a CumulusCI Project directory?"
             )
 
-        # Load the project's yaml config file
-        project_config = cci_safe_load(self.config_project_path, logger=self.logger)
+        self.config = self._load_compiled_config()
+
+        self._validate_config()
+
+    def _load_compiled_config(self) -> dict:
+        """Loads, validates and merges the YAML configs, reusing the persistent
+        config cache when none of the contributing files have changed.
+
+        Populates the individual config dicts and returns the merged config."""
+        cache = CompiledConfigCache.default()
+        key = None
+        if cache is not None:
+            # The local config's location depends on the project name, so it is
+            # checked against the fingerprint stored with the entry instead.
+            key = cache.key_for(
+                [
+                    self.universal_config_obj.config_universal_path,
+                    self.universal_config_obj.config_global_path,
+                    self.config_project_path,
+                ],
+                extra=[self.additional_yaml],
+            )
+            compiled = cache.get(key)
+            if compiled is not None:
+                self.config_project.update(compiled["project_config"])
+                local_fingerprint = fingerprint_file(self.config_project_local_path)
+                if local_fingerprint == compiled["local_fingerprint"]:
+                    self.config_project_local.update(compiled["project_local_config"])
+                    self.config_additional_yaml.update(compiled["additional_yaml"])
+                    for errors in compiled["errors"]:
+                        _log_yaml_errors(self.logger, errors)
+                    return compiled["config"]
+                self.config_project.clear()
+
+        all_errors = []
+
+        def load(source, context=None) -> dict:
+            errors = []
+            data = cci_safe_load(source, context, on_error=errors.append)
+            if errors:
+                _log_yaml_errors(self.logger, errors)
+                all_errors.append(errors)
+            return data
 
+        # Load the project's yaml config file
+        project_config = load(self.config_project_path)
         if project_config:
             self.config_project.update(project_config)
 
         # Load the local project yaml config file if it exists
-        if self.config_project_local_path:
-            local_config = cci_safe_load(
-                self.config_project_local_path, logger=self.logger
-            )
+        config_project_local_path = self.config_project_local_path
+        if config_project_local_path:
+            local_config = load(config_project_local_path)
             if local_config:
                 self.config_project_local.update(local_config)
 
         # merge in any additional yaml that was passed along
         if self.additional_yaml:
-            additional_yaml_config = cci_safe_load(
-                StringIO(self.additional_yaml),
-                self.config_project_path,
-                logger=self.logger,
+            additional_yaml_config = load(
+                StringIO(self.additional_yaml), self.config_project_path
             )
             if additional_yaml_config:
                 self.config_additional_yaml.update(additional_yaml_config)
 
-        self.config = self.merge_base_config(
+        config = self.merge_base_config(
             {
                 "universal_config": self.config_universal,
                 "global_config": self.config_global,
@@ -197,7 +242,19 @@ class BaseProjectConfig(BaseTaskFlowConfig, ProjectConfigPropertiesMixin):
             }
         )
 
-        self._validate_config()
+        if cache is not None:
+            cache.set(
+                key,
+                {
+                    "project_config": self.config_project,
+                    "project_local_config": self.config_project_local,
+                    "additional_yaml": self.config_additional_yaml,
+                    "local_fingerprint": fingerprint_file(config_project_local_path),
+                    "errors": all_errors,
+                    "config": config,
+                },
+            )
+        return config
 
     def _validate_config(self):
         """Performs validation checks on the configuration"""
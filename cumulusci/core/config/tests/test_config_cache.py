@@ -0,0 +1,143 @@
+import os
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from cumulusci.core.config import BaseProjectConfig, UniversalConfig
+from cumulusci.core.config.config_cache import (
+    DISABLE_ENV_VAR,
+    CompiledConfigCache,
+    fingerprint_file,
+)
+from cumulusci.utils import cd
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return CompiledConfigCache(tmp_path / "cache", max_entries=2)
+
+
+@pytest.fixture
+def project_dir(tmp_path):
+    project = tmp_path / "project"
+    (project / ".git").mkdir(parents=True)
+    (project / "cumulusci.yml").write_text(
+        "project:\n    name: CacheTest\n    package:\n        api_version: '55.0'\n"
+    )
+    return project
+
+
+def load_project_config():
+    return BaseProjectConfig(UniversalConfig(), repo_info={"root": os.getcwd()})
+
+
+class TestCompiledConfigCache:
+    def test_roundtrip(self, cache):
+        cache.set("abc", {"config": {"a": 1}})
+        assert cache.get("abc") == {"config": {"a": 1}}
+
+    def test_get__missing(self, cache):
+        assert cache.get("missing") is None
+
+    def test_get__corrupt_entry_discarded(self, cache):
+        cache.cache_dir.mkdir(parents=True)
+        entry = cache.cache_dir / "bad.pickle"
+        entry.write_bytes(b"not a pickle")
+        assert cache.get("bad") is None
+        assert not entry.exists()
+
+    def test_set__prunes_least_recently_used(self, cache):
+        cache.set("one", {})
+        cache.set("two", {})
+        os.utime(cache.cache_dir / "one.pickle", ns=(1, 1))
+        cache.set("three", {})
+        assert cache.get("one") is None
+        assert cache.get("two") == {}
+        assert cache.get("three") == {}
+
+    def test_set__write_failure_ignored(self, cache):
+        cache.set("unpicklable", {"f": lambda: None})
+        assert cache.get("unpicklable") is None
+        assert list(cache.cache_dir.iterdir()) == []
+
+    def test_clear(self, cache):
+        cache.set("one", {})
+        cache.clear()
+        assert cache.get("one") is None
+
+    def test_key_for__changes_with_content(self, cache, tmp_path):
+        path = tmp_path / "cumulusci.yml"
+        path.write_text("project: {}")
+        key = cache.key_for([str(path), None])
+        assert key == cache.key_for([str(path), None])
+
+        path.write_text("project: {name: Changed}")
+        assert key != cache.key_for([str(path), None])
+        assert key != cache.key_for([str(path), None], extra=["tasks: {}"])
+
+    def test_fingerprint_file__missing(self, tmp_path):
+        assert fingerprint_file(None) == "<none>"
+        assert fingerprint_file(str(tmp_path / "nope")).endswith(":<missing>")
+
+    def test_default__disabled(self):
+        with mock.patch.dict(os.environ, {DISABLE_ENV_VAR: "1"}):
+            assert CompiledConfigCache.default() is None
+        assert CompiledConfigCache.default().cache_dir == (
+            Path.home() / ".cumulusci" / "config_cache"
+        )
+
+
+class TestProjectConfigCaching:
+    def test_second_load_uses_cache(self, project_dir):
+        with cd(project_dir):
+            first = load_project_config()
+            with mock.patch(
+                "cumulusci.core.config.project_config.cci_safe_load"
+            ) as cci_safe_load:
+                second = load_project_config()
+        cci_safe_load.assert_not_called()
+        assert second.config == first.config
+        assert second.config_project == first.config_project
+        assert second.project__name == "CacheTest"
+
+    def test_project_change_invalidates(self, project_dir):
+        with cd(project_dir):
+            load_project_config()
+            (project_dir / "cumulusci.yml").write_text(
+                "project:\n    name: CacheTest\n    package:\n        api_version: '56.0'\n"
+            )
+            config = load_project_config()
+        assert config.project__package__api_version == "56.0"
+
+    def test_local_config_change_invalidates(self, project_dir):
+        with cd(project_dir):
+            load_project_config()
+            local_dir = Path.home() / ".cumulusci" / "CacheTest"
+            (local_dir / "cumulusci.yml").write_text(
+                "project:\n    package:\n        api_version: '57.0'\n"
+            )
+            config = load_project_config()
+        assert config.config_project_local != {}
+        assert config.project__package__api_version == "57.0"
+
+    def test_validation_warnings_replayed(self, project_dir, caplog):
+        (project_dir / "cumulusci.yml").write_text(
+            "project:\n    name: CacheTest\n    package:\n        api_version: '55.0'\n"
+            "bogus_key: 1\n"
+        )
+        with cd(project_dir):
+            load_project_config()
+            caplog.clear()
+            with mock.patch(
+                "cumulusci.core.config.project_config.cci_safe_load"
+            ) as cci_safe_load:
+                load_project_config()
+        cci_safe_load.assert_not_called()
+        assert "bogus_key" in caplog.text
+
+    def test_disabled(self, project_dir):
+        with cd(project_dir), mock.patch.dict(os.environ, {DISABLE_ENV_VAR: "1"}):
+            load_project_config()
+            load_project_config()
+        assert not (Path.home() / ".cumulusci" / "config_cache").exists()
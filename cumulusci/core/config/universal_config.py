@@ -3,6 +3,7 @@ from pathlib import Path
 from typing import Optional
 
 from cumulusci.core.config import BaseTaskFlowConfig
+from cumulusci.core.config.config_cache import CompiledConfigCache
 from cumulusci.core.config.project_config import (
     BaseProjectConfig,
     ProjectConfigPropertiesMixin,
@@ -69,6 +70,17 @@ class UniversalConfig(BaseTaskFlowConfig, ProjectConfigPropertiesMixin):
         if UniversalConfig.config is not None:
             return
 
+        cache = CompiledConfigCache.default()
+        key = None
+        if cache is not None:
+            key = cache.key_for([self.config_universal_path, self.config_global_path])
+            compiled = cache.get(key)
+            if compiled is not None:
+                UniversalConfig.config_universal = compiled["config_universal"]
+                UniversalConfig.config_global = compiled["config_global"]
+                UniversalConfig.config = compiled["config"]
+                return
+
         # load the universal config
         UniversalConfig.config_universal = cci_safe_load(self.config_universal_path)
 
@@ -85,3 +97,13 @@ class UniversalConfig(BaseTaskFlowConfig, ProjectConfigPropertiesMixin):
                 "global_config": UniversalConfig.config_global,
             }
         )
+
+        if cache is not None:
+            cache.set(
+                key,
+                {
+                    "config_universal": UniversalConfig.config_universal,
+                    "config_global": UniversalConfig.config_global,
+                    "config": UniversalConfig.config,
+                },
+            )
@@ -21,6 +21,7 @@ from cumulusci.core.sfdx import (
     convert_sfdx_source,
     get_source_format_for_zipfile,
 )
+from cumulusci.core.shared_work import shared_work_for
 from cumulusci.core.utils import format_duration
 from cumulusci.salesforce_api.metadata import ApiDeploy
 from cumulusci.salesforce_api.package_zip import MetadataPackageZipBuilder
@@ -234,10 +235,12 @@ class UnmanagedDependency(UnmanagedStaticDependency, ABC):
         with contextlib.ExitStack() as stack:
             if source_format is SourceFormat.SFDX:
                 # Convert source first.
-                stack.enter_context(temporary_dir(chdir=True))
-                zip_src.extractall()
+                source_path = stack.enter_context(temporary_dir(chdir=False))
+                zip_src.extractall(source_path)
                 real_path = stack.enter_context(
-                    convert_sfdx_source(self.subfolder, None, project_config.logger)
+                    convert_sfdx_source(
+                        self.subfolder, None, project_config.logger, cwd=source_path
+                    )
                 )
                 zip_src = None  # Don't use the zipfile if we converted source.
 
@@ -265,7 +268,7 @@ class UnmanagedDependency(UnmanagedStaticDependency, ABC):
         task = TaskContext(
             org_config=org, project_config=context, logger=context.logger
         )
-        api = ApiDeploy(task, package_zip_builder.as_base64())
+        api = ApiDeploy(task, package_zip_builder.as_file())
 
         return api()
 
@@ -605,6 +608,16 @@ class UnmanagedVcsDependency(UnmanagedDependency, ABC):
         raise NotImplementedError("Subclasses must implement package_name.")
 
     def _get_zip_src(self, context):
+        # Flows running against several orgs at once download each ref once.
+        work = shared_work_for(context)
+        if work is not None:
+            return work.zip_file(
+                ("vcs_zip", self.url, self.ref),
+                lambda: self._download_zip_src(context),
+            )
+        return self._download_zip_src(context)
+
+    def _download_zip_src(self, context):
         repo = self.get_repo(context, self.url)
 
         # We don't pass `subfolder` to download_extract_vcs_from_repo()
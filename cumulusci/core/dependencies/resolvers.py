@@ -1,7 +1,9 @@
+import functools
 import itertools
 import re
 from abc import ABC, abstractmethod
 from collections.abc import Mapping
+from dataclasses import dataclass
 from enum import StrEnum
 from typing import Callable, Iterable, List, Optional, Tuple, Type
 
@@ -28,6 +30,7 @@ from cumulusci.core.exceptions import (
     DependencyResolutionError,
     VcsNotFoundError,
 )
+from cumulusci.core.shared_work import shared_work_for
 from cumulusci.core.versions import PackageType
 from cumulusci.utils.git import (
     construct_release_branch_name,
@@ -549,23 +552,33 @@ def get_resolver_stack(
     raise CumulusCIException(f"Resolver stack {name} was not found.")
 
 
-def dependency_filter_ignore_deps(ignore_deps: List[dict]) -> Callable:
-    ignore_github = [d["github"] for d in ignore_deps if "github" in d]
-    ignore_namespace = [d["namespace"] for d in ignore_deps if "namespace" in d]
+@dataclass(frozen=True)
+class _IgnoreDependencies:
+    """Includes the dependencies which are not to be ignored.
+
+    Filters ignoring the same dependencies are equal, so that resolutions
+    using them can be shared (see get_static_dependencies)."""
 
-    def should_include(some_dep: Dependency) -> bool:
+    github: Tuple[str, ...]
+    namespace: Tuple[str, ...]
 
+    def __call__(self, some_dep: Dependency) -> bool:
         if isinstance(some_dep, PackageNamespaceVersionDependency):
-            return some_dep.namespace not in ignore_namespace
+            return some_dep.namespace not in self.namespace
 
         from cumulusci.core.dependencies.github import BaseGitHubDependency
 
         if isinstance(some_dep, BaseGitHubDependency):
-            return some_dep.github not in ignore_github
+            return some_dep.github not in self.github
 
         return True
 
-    return should_include
+
+def dependency_filter_ignore_deps(ignore_deps: List[dict]) -> Callable:
+    return _IgnoreDependencies(
+        github=tuple(d["github"] for d in ignore_deps if "github" in d),
+        namespace=tuple(d["namespace"] for d in ignore_deps if "namespace" in d),
+    )
 
 
 def get_static_dependencies(
@@ -601,6 +614,44 @@ def get_static_dependencies(
     ), "Expected resolution_strategy or strategies but not both"
     if resolution_strategy:
         strategies = get_resolver_stack(context, resolution_strategy)
+
+    # When flows run against several orgs at once, they share resolutions.
+    work = shared_work_for(context)
+    if work is not None:
+        key = (
+            "static_dependencies",
+            tuple(dependencies),
+            tuple(strategies),
+            tuple(pins),
+            filter_function,
+            max_iterations,
+        )
+        try:
+            hash(key)
+        except (TypeError, ValueError):
+            work = None
+    resolve = functools.partial(
+        _resolve_static_dependencies,
+        context,
+        dependencies,
+        strategies,
+        pins,
+        filter_function,
+        max_iterations,
+    )
+    if work is not None:
+        return list(work.get_or_compute(key, resolve))
+    return resolve()
+
+
+def _resolve_static_dependencies(
+    context: BaseProjectConfig,
+    dependencies: List[Dependency],
+    strategies: List[DependencyResolutionStrategy],
+    pins: List[DependencyPin],
+    filter_function: Optional[Callable],
+    max_iterations: int,
+) -> List[StaticDependency]:
     if filter_function is None:
         filter_function = lambda x: True  # noqa: E731
 
@@ -681,7 +681,7 @@ class TestUnmanagedGitHubRefDependency:
             )
             api_deploy_mock.assert_called_once_with(
                 mock.ANY,  # The context object is checked below
-                zip_builder_mock.from_zipfile.return_value.as_base64.return_value,
+                zip_builder_mock.from_zipfile.return_value.as_file.return_value,
             )
             mock_task = api_deploy_mock.call_args_list[0][0][0]
             assert mock_task.org_config == org
@@ -770,7 +770,7 @@ class TestUnmanagedZipURLDependency:
             )
             api_deploy_mock.assert_called_once_with(
                 mock.ANY,  # The context object is checked below
-                zip_builder_mock.from_zipfile.return_value.as_base64.return_value,
+                zip_builder_mock.from_zipfile.return_value.as_file.return_value,
             )
             mock_task = api_deploy_mock.call_args_list[0][0][0]
             assert mock_task.org_config == org
@@ -909,10 +909,14 @@ class TestUnmanagedZipURLDependency:
         )
         sfdx_mock.assert_called_once_with(
             "project convert source",
-            args=["-d", mock.ANY, "-r", "force-app"],
+            args=["-d", mock.ANY, "-r", mock.ANY],
             capture_output=True,
             check_return=True,
+            cwd=mock.ANY,
         )
+        # The source is extracted and converted without changing directories
+        kwargs = sfdx_mock.call_args.kwargs
+        assert kwargs["args"][3] == os.path.join(kwargs["cwd"], "force-app")
         zf.close()
 
 
@@ -7,6 +7,7 @@ from pydantic.v1 import root_validator
 from cumulusci.core.config import UniversalConfig
 from cumulusci.core.config.project_config import BaseProjectConfig
 from cumulusci.core.config.tests.test_config import DummyRelease
+from cumulusci.core.dependencies import resolvers
 from cumulusci.core.dependencies.base import DynamicDependency, StaticDependency
 from cumulusci.core.dependencies.dependencies import (
     PackageNamespaceVersionDependency,
@@ -41,6 +42,7 @@ from cumulusci.core.exceptions import (
     DependencyMissingVersion,
     DependencyResolutionError,
 )
+from cumulusci.core.shared_work import SharedWork
 from cumulusci.utils.yaml.cumulusci_yml import ReleaseBranchFormat
 from cumulusci.vcs.bootstrap import locate_commit_status_package_id
 
@@ -1434,3 +1436,47 @@ version_id: 04t000000000000""",
                 package_dependency=root_repo,
             ),
         ]
+
+    def test_get_static_dependencies__shared_work(
+        self,
+        project_config,
+        tmp_path,
+        patch_github_resolvers_get_github_repo,
+        patch_github_dependencies_get_github_repo,
+    ):
+        setup_github_repo_mock(patch_github_resolvers_get_github_repo, project_config)
+        setup_github_repo_mock(
+            patch_github_dependencies_get_github_repo, project_config
+        )
+        project_config.shared_work = SharedWork(tmp_path)
+        gh = GitHubDynamicDependency(github="https://github.com/SFDO-Tooling/RootRepo")
+
+        def resolve():
+            return get_static_dependencies(
+                project_config,
+                dependencies=[gh],
+                strategies=[DependencyResolutionStrategy.RELEASE_TAG],
+                filter_function=dependency_filter_ignore_deps(
+                    [{"github": "https://github.com/SFDO-Tooling/DependencyRepo"}]
+                ),
+            )
+
+        with mock.patch(
+            "cumulusci.core.dependencies.resolvers._resolve_static_dependencies",
+            wraps=resolvers._resolve_static_dependencies,
+        ) as resolve_static:
+            assert resolve() == resolve()
+
+        resolve_static.assert_called_once()
+
+    def test_dependency_filter_ignore_deps__equality(self):
+        ignore = [{"github": "https://github.com/Test/Repo"}, {"namespace": "foo"}]
+        assert dependency_filter_ignore_deps(ignore) == dependency_filter_ignore_deps(
+            ignore
+        )
+        assert hash(dependency_filter_ignore_deps(ignore)) == hash(
+            dependency_filter_ignore_deps(ignore)
+        )
+        assert dependency_filter_ignore_deps(ignore) != dependency_filter_ignore_deps(
+            ignore[:1]
+        )
@@ -0,0 +1,253 @@
+"""Checkpoints of flow runs, so that a failed flow can be resumed.
+
+While a flow runs, FlowCheckpoint records each step which completes
+successfully in a JSON file in the org's info cache directory: the step's
+path, a fingerprint of its task class, its resolved options and the
+project files they name (or the project's package directories, for tasks
+left to their default `path`), and the step's return values.
+
+When the flow is run again with `resume` set, steps whose fingerprint
+still matches are not run again. Their return values are replayed into
+the flow's results, so that later steps' ^^ option references still
+resolve. The checkpoint is removed when the flow completes.
+
+>>> checkpoint = FlowCheckpoint(org_config, "dev_org", resume=True)
+>>> coordinator = FlowCoordinator(
+...     project_config, flow_config, name="dev_org", checkpoint=checkpoint
+... )
+>>> coordinator.run(org_config)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import typing as T
+from pathlib import Path
+
+from cumulusci.core.config.org_config import OrgConfig
+from cumulusci.core.flowrunner import FlowCoordinator, StepResult, StepSpec
+
+# Bump when the structure of checkpoints changes.
+CHECKPOINT_FORMAT_VERSION = 1
+CACHE_NAME = "flow_checkpoints"
+
+logger = logging.getLogger(__name__)
+
+
+class FlowCheckpoint:
+    """Records the steps of a flow run against an org which succeeded,
+    and restores them when the flow is resumed."""
+
+    def __init__(self, org_config: OrgConfig, flow_name: str, resume: bool = False):
+        self.org_config = org_config
+        self.flow_name = flow_name
+        self.resume = resume
+        self.path: T.Optional[Path] = None
+        # Steps recorded by a previous run, and by this one, by key
+        self.previous: T.Dict[str, dict] = {}
+        self.steps: T.Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Load the previous run's checkpoint when resuming, or else discard it."""
+        self.path = None
+        self.previous = self.steps = {}
+        try:
+            with self.org_config.get_orginfo_cache_dir(CACHE_NAME) as directory:
+                file_name = re.sub(r"[^\w.-]", "_", self.flow_name or "flow")
+                self.path = Path(directory.getsyspath()) / f"{file_name}.json"
+        except Exception as e:
+            # Checkpoints are a convenience; never fail a flow over them.
+            logger.warning(f"Unable to checkpoint flow {self.flow_name}: {e}")
+            return
+        self.previous = self._load() if self.resume else {}
+        self.steps = {}
+        if not self.resume:
+            self.path.unlink(missing_ok=True)
+
+    def finish(self):
+        """Remove the checkpoint of a flow which completed."""
+        if self.path:
+            self.path.unlink(missing_ok=True)
+
+    def can_restore(self, step: StepSpec) -> bool:
+        """Was this step completed by the run being resumed?"""
+        return self._key(step) in self.previous
+
+    def fingerprint(self, flow: FlowCoordinator, step: StepSpec) -> T.Optional[str]:
+        """A hash of the step's task class, its options with return value
+        references resolved, and the contents of the project files and
+        directories named by its options. Tasks with a `path` option that
+        isn't set resolve it to a default in code, so the project's package
+        directories are hashed for them too.
+
+        Returns None if it can't be computed, e.g. because the options
+        can't be resolved yet; the step is then neither restored nor
+        recorded."""
+        options = dict(step.task_config.get("options") or {})
+        try:
+            flow.resolve_return_value_options(options)
+            task_class = step.task_class
+            digest = hashlib.sha256()
+            digest.update(f"{CHECKPOINT_FORMAT_VERSION}".encode())
+            digest.update(
+                f"\0task:{task_class.__module__}.{task_class.__qualname__}".encode()
+            )
+            digest.update(
+                f"\0options:{json.dumps(options, sort_keys=True, default=repr)}".encode()
+            )
+            repo_root = step.project_config.repo_root if step.project_config else None
+            if repo_root:
+                paths = _option_paths(options, Path(repo_root))
+                if "path" in task_class.task_options and not options.get("path"):
+                    paths = sorted(
+                        set(paths) | set(_package_paths(step.project_config))
+                    )
+                for path in paths:
+                    _hash_path(digest, path, Path(repo_root))
+        except Exception as e:
+            logger.debug(f"Unable to fingerprint step {step.path}: {e}")
+            return None
+        return digest.hexdigest()
+
+    def restore(
+        self, step: StepSpec, fingerprint: T.Optional[str]
+    ) -> T.Optional[StepResult]:
+        """The result of a step completed by the run being resumed,
+        if its fingerprint still matches."""
+        previous = self.previous.get(self._key(step))
+        if (
+            fingerprint is None
+            or not previous
+            or previous["fingerprint"] != fingerprint
+        ):
+            return None
+        self._record(step, previous)
+        return StepResult(
+            step.step_num,
+            step.task_name,
+            step.path,
+            None,
+            previous["return_values"],
+            None,
+        )
+
+    def record(self, step: StepSpec, fingerprint: T.Optional[str], result: StepResult):
+        """Record a step which succeeded."""
+        if fingerprint is None or result.exception:
+            return
+        try:
+            # Make sure that the return values can be replayed
+            return_values = json.loads(json.dumps(result.return_values))
+        except (TypeError, ValueError) as e:
+            logger.debug(f"Unable to checkpoint return values of {step.path}: {e}")
+            return
+        self._record(
+            step,
+            {
+                "path": step.path,
+                "fingerprint": fingerprint,
+                "return_values": return_values,
+            },
+        )
+
+    def _record(self, step: StepSpec, entry: dict):
+        with self._lock:
+            self.steps[self._key(step)] = entry
+            try:
+                self._save()
+            except Exception as e:
+                logger.warning(f"Unable to checkpoint flow {self.flow_name}: {e}")
+                self.path = None
+
+    def _key(self, step: StepSpec) -> str:
+        return f"{step.step_num} {step.path}"
+
+    def _load(self) -> T.Dict[str, dict]:
+        try:
+            checkpoint = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable flow checkpoint {self.path}: {e}")
+            return {}
+        if checkpoint.get("version") != CHECKPOINT_FORMAT_VERSION:
+            return {}
+        return checkpoint["steps"]
+
+    def _save(self):
+        if not self.path:
+            return
+        checkpoint = {
+            "version": CHECKPOINT_FORMAT_VERSION,
+            "flow": self.flow_name,
+            "steps": self.steps,
+        }
+        fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(checkpoint, f, indent=2)
+            os.replace(tmp_name, self.path)
+        except Exception:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+
+def _option_paths(options: dict, repo_root: Path) -> T.List[Path]:
+    """The files and directories in the project named by option values,
+    other than the project's root directory"""
+    values = []
+    for value in options.values():
+        if isinstance(value, str):
+            values.extend(v.strip() for v in value.split(","))
+        elif isinstance(value, (list, tuple)):
+            values.extend(v for v in value if isinstance(v, str))
+    repo_root = repo_root.resolve()
+    paths = []
+    for value in values:
+        if not value or len(value) > 4096:
+            continue
+        try:
+            path = (repo_root / value).resolve()
+            if path != repo_root and path.is_relative_to(repo_root) and path.exists():
+                paths.append(path)
+        except (OSError, ValueError):
+            continue
+    return sorted(set(paths))
+
+
+def _package_paths(project_config) -> T.List[Path]:
+    """The project's package directories which exist"""
+    repo_root = Path(project_config.repo_root).resolve()
+    paths = [repo_root / "src"]
+    if (repo_root / "sfdx-project.json").exists():
+        paths.extend(
+            repo_root / package["path"]
+            for package in project_config.sfdx_project_config.get(
+                "packageDirectories", []
+            )
+        )
+    return [
+        path.resolve()
+        for path in paths
+        if path.resolve() != repo_root
+        and path.resolve().is_relative_to(repo_root)
+        and path.exists()
+    ]
+
+
+def _hash_path(digest, path: Path, repo_root: Path):
+    repo_root = repo_root.resolve()
+    files = [path] if path.is_file() else sorted(path.rglob("*"))
+    for file in files:
+        name = file.relative_to(repo_root)
+        if ".git" in name.parts or not file.is_file():
+            continue
+        digest.update(f"\0file:{name}\0".encode())
+        with file.open("rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
@@ -52,15 +52,24 @@ Option values/overrides can be passed in at a number of levels, in increasing or
 """
 
 import copy
+import functools
+import itertools
 import logging
 import os
+import tempfile
+import threading
 from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
 from operator import attrgetter
 from typing import (
     TYPE_CHECKING,
     Any,
+    Callable,
     DefaultDict,
     Dict,
+    Iterable,
+    Iterator,
     List,
     NamedTuple,
     Optional,
@@ -69,6 +78,7 @@ from typing import (
     Union,
 )
 
+from jinja2 import TemplateSyntaxError, nodes
 from jinja2.sandbox import ImmutableSandboxedEnvironment
 
 from cumulusci.core.config import FlowConfig, TaskConfig
@@ -79,13 +89,21 @@ from cumulusci.core.exceptions import (
     FlowInfiniteLoopError,
     TaskImportError,
 )
+from cumulusci.core.shared_work import SharedWork
+from cumulusci.core.task_result_cache import TaskResultCache
+from cumulusci.core.utils import format_duration
+from cumulusci.utils import pinned_cwd
 from cumulusci.utils.version_strings import LooseVersion
 
 if TYPE_CHECKING:
+    from cumulusci.core.flow_checkpoint import FlowCheckpoint
     from cumulusci.core.tasks import BaseTask
 
 
 RETURN_VALUE_OPTION_PREFIX = "^^"
+DEFAULT_MAX_PARALLEL = 4
+# Preflight check actions that report a problem with the org
+FAILED_CHECK_STATUSES = ("error", "warn")
 
 jinja2_env = ImmutableSandboxedEnvironment()
 
@@ -111,6 +129,8 @@ class StepSpec:
         "path",
         "skip",
         "when",
+        "parallel_group",
+        "parallel_lane",
     )
 
     step_num: StepVersion
@@ -124,6 +144,10 @@ class StepSpec:
     path: str
     skip: bool
     when: Optional[str]
+    # Consecutive steps in the same parallel group run concurrently,
+    # one thread per lane. Steps in the same lane run in order.
+    parallel_group: Optional[str]
+    parallel_lane: Optional[str]
 
     def __init__(
         self,
@@ -136,6 +160,8 @@ class StepSpec:
         from_flow: Optional[str] = None,
         skip: bool = False,
         when: Optional[str] = None,
+        parallel_group: Optional[str] = None,
+        parallel_lane: Optional[str] = None,
     ):
         self.step_num = step_num
         self.task_name = task_name
@@ -145,6 +171,8 @@ class StepSpec:
         self.allow_failure = allow_failure
         self.skip = skip
         self.when = when
+        self.parallel_group = parallel_group
+        self.parallel_lane = parallel_lane
 
         # Store the dotted path to this step.
         # This is not guaranteed to be unique, because multiple steps
@@ -268,7 +296,10 @@ class TaskRunner:
 
         :return: StepResult
         """
+        return self.run_task(self.create_task(**options))
 
+    def create_task(self, **options) -> "BaseTask":
+        """Instantiate the step's task with its resolved options."""
         # Resolve ^^task_name.return_value style option syntax
         task_config = self.step.task_config.copy()
         task_config["options"] = task_config.get("options", {}).copy()
@@ -287,6 +318,10 @@ class TaskRunner:
             stepnum=self.step.step_num,
             flow=self.flow,
         )
+        return task
+
+    def run_task(self, task: "BaseTask") -> StepResult:
+        """Run a task created by create_task() and collect its StepResult."""
         self._log_options(task)
         exc = None
         try:
@@ -345,11 +380,26 @@ class FlowCoordinator:
         options: Optional[dict] = None,
         skip: Optional[List[str]] = None,
         callbacks: Optional[FlowCallback] = None,
+        fuse_metadata_etl: Optional[bool] = None,
+        max_parallel: Optional[int] = None,
+        checkpoint: Optional["FlowCheckpoint"] = None,
     ):
         self.project_config = project_config
         self.flow_config = flow_config
         self.name = name
         self.org_config = None
+        if fuse_metadata_etl is None:
+            fuse_metadata_etl = bool(flow_config.config.get("fuse_metadata_etl"))
+        self.fuse_metadata_etl = fuse_metadata_etl
+        if max_parallel is None:
+            max_parallel = flow_config.config.get("max_parallel", DEFAULT_MAX_PARALLEL)
+        if not isinstance(max_parallel, int) or max_parallel < 1:
+            raise FlowConfigError(
+                f"max_parallel must be a positive integer, not {max_parallel!r}"
+            )
+        self.max_parallel = max_parallel
+        self.checkpoint = checkpoint
+        self._callbacks_lock = threading.Lock()
 
         if not callbacks:
             callbacks = FlowCallback()
@@ -505,6 +555,9 @@ class FlowCoordinator:
         self._rule(new_line=True)
 
         try:
+            if self.checkpoint:
+                self.checkpoint.start()
+
             # Pre-evaluate all flow conditions
             skipped_flows_set = set()
             for step in self.steps:
@@ -513,6 +566,7 @@ class FlowCoordinator:
                         skipped_flows_set.add(step.path)
 
             # Main execution loop with optimized path checking
+            runnable_steps = []
             for step in self.steps:
                 if isinstance(step, FlowStepSpec):
                     self.logger.info(
@@ -526,7 +580,17 @@ class FlowCoordinator:
                     )
                     continue
 
-                self._run_step(step)
+                runnable_steps.append(step)
+
+            for group, steps in itertools.groupby(
+                runnable_steps, key=attrgetter("parallel_group")
+            ):
+                if group is None:
+                    self._run_steps(list(steps))
+                else:
+                    self._run_parallel_steps(list(steps))
+            if self.checkpoint:
+                self.checkpoint.finish()
             flow_name = f"'{self.name}' " if self.name else ""
             org_name = f"on org {org_config.name} " if org_config else ""
             self.logger.info(f"Completed flow {flow_name}{org_name}successfully!")
@@ -574,7 +638,177 @@ class FlowCoordinator:
                 return True
         return False
 
-    def _run_step(self, step: StepSpec):
+    def _is_fusable(self, step: StepSpec) -> bool:
+        """Can this step's task be fused with neighboring steps?
+
+        Only tasks which define a `fusion_class` are fused, and only when
+        enabled by the flow's `fuse_metadata_etl` setting. Steps that are
+        skipped, are conditional or use return values from other steps
+        are always run on their own."""
+        return bool(
+            self.fuse_metadata_etl
+            and getattr(step.task_class, "fusion_class", None)
+            and not step.skip
+            and step.when is None
+            and RETURN_VALUE_OPTION_PREFIX
+            not in str(step.task_config.get("options", {}))
+            and not (self.checkpoint and self.checkpoint.can_restore(step))
+        )
+
+    def _run_steps(self, steps: List[StepSpec]):
+        """Run steps one at a time, fusing them where possible."""
+        for fusable, steps in itertools.groupby(steps, key=self._is_fusable):
+            steps = list(steps)
+            if fusable and len(steps) > 1:
+                self._run_fusable_steps(steps)
+            else:
+                for step in steps:
+                    self._run_step(step)
+
+    def _run_parallel_steps(self, steps: List[StepSpec]):
+        """Run the lanes of a parallel group concurrently.
+
+        Each lane runs its steps in order in a thread of its own, with at
+        most max_parallel lanes running at a time. If a step fails, lanes
+        which are running finish their current step and no more steps are
+        started; the failure of the earliest step is then raised."""
+        lanes: Dict[str, List[StepSpec]] = {}
+        for step in steps:
+            lanes.setdefault(step.parallel_lane, []).append(step)
+        if len(lanes) == 1:
+            self._run_steps(steps)
+            return
+        if any(self._is_from_other_project(step) for step in steps):
+            # Tasks run from their project's directory, which threads can't
+            # change to while sharing the working directory.
+            self.logger.info(
+                "Running parallel steps one at a time, "
+                "because some come from another project"
+            )
+            self._run_steps(steps)
+            return
+
+        names = [self._lane_name(lane_steps) for lane_steps in lanes.values()]
+        self.logger.info(
+            f"Running {len(lanes)} steps in parallel "
+            f"({min(self.max_parallel, len(lanes))} at a time): " + ", ".join(names)
+        )
+        failed = threading.Event()
+        results_start = len(self.results)
+        try:
+            futures = self._run_in_threads(
+                [
+                    (name, functools.partial(self._run_lane, lane_steps, failed))
+                    for name, lane_steps in zip(names, lanes.values())
+                ]
+            )
+        finally:
+            # Keep results in step order, whatever order they finished in
+            self.results[results_start:] = sorted(
+                self.results[results_start:], key=attrgetter("step_num")
+            )
+
+        for future in futures:
+            if future.exception():
+                raise future.exception()
+
+    def _is_from_other_project(self, step: StepSpec) -> bool:
+        repo_root = step.project_config.repo_root if step.project_config else None
+        return bool(repo_root) and os.path.realpath(repo_root) != os.path.realpath(
+            self.project_config.repo_root or ""
+        )
+
+    def _run_lane(self, steps: List[StepSpec], failed: threading.Event):
+        for step in steps:
+            if failed.is_set():
+                self.logger.info(
+                    f"Not running task {step.task_name} because a parallel step failed"
+                )
+                return
+            try:
+                self._run_step(step)
+            except Exception:
+                failed.set()
+                raise
+
+    def _run_in_threads(
+        self, jobs: List[Tuple[str, Callable[[], Any]]]
+    ) -> List[Future]:
+        """Run named jobs concurrently, at most max_parallel at a time,
+        and wait for them to finish (see _run_in_threads below)."""
+        return _run_in_threads(
+            jobs, self.logger, self.max_parallel, self.project_config.repo_root
+        )
+
+    def _lane_name(self, steps: List[StepSpec]) -> str:
+        """The name of the task or flow that a lane of a parallel group runs"""
+        step = steps[0]
+        depth = step.parallel_lane.count("/")
+        return step.path.split(".")[depth]
+
+    def _run_fusable_steps(self, steps: List[StepSpec]):
+        """Run consecutive fusable steps, fusing those with the same fusion key."""
+        tasks = []
+        for step in steps:
+            try:
+                tasks.append(TaskRunner.from_flow(self, step).create_task())
+            except Exception:
+                # Leave the error to be reported when the step runs on its own
+                break
+
+        def fusion_key(step_and_task):
+            step, task = step_and_task
+            fusion_class = step.task_class.fusion_class
+            return (fusion_class, fusion_class.fusion_key(task))
+
+        for (fusion_class, _), group in itertools.groupby(
+            zip(steps, tasks), key=fusion_key
+        ):
+            group = list(group)
+            if len(group) == 1:
+                self._run_step(*group[0])
+            else:
+                self._run_fused_steps(fusion_class, group)
+
+        for step in steps[len(tasks) :]:
+            self._run_step(step)
+
+    def _run_fused_steps(self, fusion_class, steps_and_tasks):
+        tasks = [task for _, task in steps_and_tasks]
+        fusion = fusion_class(tasks)
+        self.logger.info(
+            f"Fusing {len(tasks)} steps: "
+            + ", ".join(step.task_name for step, _ in steps_and_tasks)
+        )
+        for task in tasks:
+            task.fusion = fusion
+        # The last step deploys the work of all of them, so none of the
+        # steps is checkpointed unless they all succeed.
+        completed = []
+        try:
+            for step, task in steps_and_tasks:
+                self._run_step(step, task, completed)
+        except Exception:
+            # Finish the work of the steps which succeeded,
+            # as it would have been if they had run on their own.
+            try:
+                fusion.finish()
+            except Exception as e:
+                self.logger.error(f"Error finishing fused steps: {e}")
+            raise
+        if self.checkpoint and not any(result.exception for _, _, result in completed):
+            for step, fingerprint, result in completed:
+                self.checkpoint.record(step, fingerprint, result)
+
+    def _run_step(
+        self,
+        step: StepSpec,
+        task: Optional["BaseTask"] = None,
+        completed: Optional[List[Tuple[StepSpec, Optional[str], StepResult]]] = None,
+    ):
+        """Run a step, and checkpoint it if it succeeds. If `completed` is
+        given, the step and its fingerprint and result are added to it to be
+        checkpointed by the caller instead."""
         if step.skip:
             self._rule(fill="*")
             self.logger.info(f"Skipping task: {step.task_name}")
@@ -589,13 +823,31 @@ class FlowCoordinator:
                 )
                 return
 
+        fingerprint = None
+        if self.checkpoint:
+            fingerprint = self.checkpoint.fingerprint(self, step)
+            result = self.checkpoint.restore(step, fingerprint)
+            if result:
+                self.logger.info(
+                    f"Skipping task {step.task_name} (completed before the flow was resumed)"
+                )
+                self.results.append(result)
+                return
+
         self._rule(fill="-")
         self.logger.info(f"Running task: {step.task_name}")
         self._rule(fill="-", new_line=True)
 
-        self.callbacks.pre_task(step)
-        result = TaskRunner.from_flow(self, step).run_step()
-        self.callbacks.post_task(step, result)
+        with self._callbacks_lock:
+            self.callbacks.pre_task(step)
+        runner = TaskRunner.from_flow(self, step)
+        result = runner.run_task(task) if task else runner.run_step()
+        with self._callbacks_lock:
+            self.callbacks.post_task(step, result)
+        if completed is not None:
+            completed.append((step, fingerprint, result))
+        elif self.checkpoint:
+            self.checkpoint.record(step, fingerprint, result)
 
         self.results.append(
             result
@@ -628,7 +880,42 @@ class FlowCoordinator:
             specs = self._visit_step(number, step_config, self.project_config)
             steps.extend(specs)
 
-        return sorted(steps, key=attrgetter("step_num"))
+        steps.sort(key=attrgetter("step_num"))
+        self._check_parallel_groups(steps)
+        return steps
+
+    def _check_parallel_groups(self, steps: List[StepSpec]):
+        """Check that no step in a parallel group needs the return values
+        of a step in another lane of the group, which may not have run yet."""
+        earlier_paths = []
+        for group, group_steps in itertools.groupby(
+            steps, key=attrgetter("parallel_group")
+        ):
+            group_steps = list(group_steps)
+            if group is not None:
+                for step in group_steps:
+                    for path in self._return_value_paths(step):
+                        if any(p.endswith(path) for p in earlier_paths):
+                            continue
+                        for other in group_steps:
+                            if (
+                                other.parallel_lane != step.parallel_lane
+                                and other.path.endswith(path)
+                            ):
+                                raise FlowConfigError(
+                                    f"Step {step.step_num} ({step.task_name}) uses return values "
+                                    f"of step {other.step_num} ({other.task_name}), "
+                                    "so they can't be in the same parallel group."
+                                )
+            earlier_paths.extend(step.path for step in group_steps)
+
+    def _return_value_paths(self, step: StepSpec) -> List[str]:
+        options = step.task_config.get("options") or {}
+        return [
+            value[len(RETURN_VALUE_OPTION_PREFIX) :].rsplit(".", 1)[0]
+            for value in options.values()
+            if isinstance(value, str) and value.startswith(RETURN_VALUE_OPTION_PREFIX)
+        ]
 
     def _visit_step(
         self,
@@ -639,6 +926,7 @@ class FlowCoordinator:
         parent_options: Optional[dict] = None,
         parent_ui_options: Optional[dict] = None,
         from_flow: Optional[str] = None,
+        parallel: Optional[Tuple[str, str]] = None,
     ) -> List[StepSpec]:
         """
         for each step (as defined in the flow YAML), _visit_step is called with only
@@ -653,6 +941,8 @@ class FlowCoordinator:
         :param parent_options: used when called recursively for nested steps, options from parent flow
         :param parent_ui_options: used when called recursively for nested steps, UI options from parent flow
         :param from_flow: used when called recursively for nested steps, name of parent flow
+        :param parallel: used when called recursively for nested steps, (group, lane) of a
+            parallel group the parent flow step belongs to
         :return: List[StepSpec] a list of all resolved steps including/under the one passed in
         """
         step_number = StepVersion(str(number))
@@ -663,6 +953,12 @@ class FlowCoordinator:
             parent_options = {}
         if parent_ui_options is None:
             parent_ui_options = {}
+        if parallel is None and step_config.get("parallel"):
+            # Groups are scoped to the flow that declares them,
+            # and each step in the group is a lane of its own.
+            parent_number = str(number).rpartition("/")[0]
+            parallel = (f"{parent_number}:{step_config['parallel']}", str(step_number))
+        parallel_group, parallel_lane = parallel or (None, None)
 
         # This should never happen because of cleanup
         # in core/utils/cleanup_old_flow_step_replace_syntax()
@@ -685,6 +981,8 @@ class FlowCoordinator:
                     project_config=project_config,
                     from_flow=from_flow,
                     skip=True,  # someday we could use different vals for why skipped
+                    parallel_group=parallel_group,
+                    parallel_lane=parallel_lane,
                 )
             )
             return visited_steps
@@ -739,6 +1037,8 @@ class FlowCoordinator:
                     allow_failure=step_config.get("ignore_failure", False),
                     from_flow=from_flow,
                     when=step_config.get("when"),
+                    parallel_group=parallel_group,
+                    parallel_lane=parallel_lane,
                 )
             )
             return visited_steps
@@ -782,6 +1082,7 @@ class FlowCoordinator:
                     parent_options=step_options,
                     parent_ui_options=step_ui_options,
                     from_flow=path,
+                    parallel=parallel,
                 )
         return visited_steps
 
@@ -851,12 +1152,230 @@ class FlowCoordinator:
         raise NameError(f"Path not found: {path}")
 
 
+class _LaneLogPrefix(logging.Handler):
+    """Prefixes log messages from the lanes of a parallel group with the
+    name of the lane, so that interleaved messages can be told apart.
+
+    Added to the flow's logger, it sees messages from the loggers of
+    the flow's tasks before the handlers that output them."""
+
+    def __init__(self):
+        super().__init__()
+        self.local = threading.local()
+
+    def emit(self, record: logging.LogRecord):
+        prefix = getattr(self.local, "prefix", None)
+        if prefix and not getattr(record, "lane_prefixed", False):
+            if record.args:
+                prefix = prefix.replace("%", "%%")
+            record.msg = f"{prefix}{record.msg}"
+            record.lane_prefixed = True
+
+
+def _run_in_threads(
+    jobs: List[Tuple[str, Callable[[], Any]]],
+    logger: logging.Logger,
+    max_workers: int,
+    directory: Optional[str] = None,
+) -> List[Future]:
+    """Run named jobs concurrently, at most max_workers at a time, and
+    wait for them to finish.
+
+    Messages logged to `logger` by each job are prefixed with its name.
+    The jobs run from `directory` (the project's root directory), where
+    tasks resolve relative paths such as a deploy's `path: src`. The
+    working directory is shared by all threads, so it can't be changed
+    while they run (see pinned_cwd): a task which tries to fails instead
+    of moving the other jobs to another directory."""
+    log_prefix = _LaneLogPrefix()
+
+    def run(name: str, job: Callable[[], Any]):
+        log_prefix.local.prefix = f"[{name}] "
+        try:
+            return job()
+        finally:
+            log_prefix.local.prefix = None
+
+    logger.addHandler(log_prefix)
+    try:
+        with pinned_cwd(directory), ThreadPoolExecutor(
+            max_workers=min(max_workers, len(jobs)),
+            thread_name_prefix="flow-step",
+        ) as executor:
+            return [executor.submit(run, name, job) for name, job in jobs]
+    finally:
+        logger.removeHandler(log_prefix)
+
+
+class OrgFlowResult(NamedTuple):
+    org_name: str
+    coordinator: FlowCoordinator
+    duration: timedelta
+    exception: Optional[Exception]
+
+
+class MultiOrgFlowCoordinator:
+    """Runs a flow against several orgs at once.
+
+    A FlowCoordinator is created for each org, from the same project and
+    flow configs, and they run concurrently (at most max_parallel at a
+    time, if given). Messages they log are prefixed with the org's name. While they
+    run, work which doesn't depend on the org, such as resolving and
+    downloading dependencies and building package zips, is done once and
+    shared (see cumulusci.core.shared_work)."""
+
+    results: Dict[str, OrgFlowResult]
+
+    def __init__(
+        self,
+        project_config: BaseProjectConfig,
+        flow_config: FlowConfig,
+        name: Optional[str] = None,
+        options: Optional[dict] = None,
+        skip: Optional[List[str]] = None,
+        callback_class: Type[FlowCallback] = FlowCallback,
+        max_parallel: Optional[int] = None,
+        fuse_metadata_etl: Optional[bool] = None,
+    ):
+        self.project_config = project_config
+        self.flow_config = flow_config
+        self.name = name
+        self.options = options
+        self.skip = skip
+        self.callback_class = callback_class
+        self.fuse_metadata_etl = fuse_metadata_etl
+        if max_parallel is not None and (
+            not isinstance(max_parallel, int) or max_parallel < 1
+        ):
+            raise FlowConfigError(
+                f"max_parallel must be a positive integer, not {max_parallel!r}"
+            )
+        self.max_parallel = max_parallel
+        self.results = {}
+        self.logger = logging.getLogger("cumulusci.flows").getChild(
+            self.__class__.__name__
+        )
+
+    def get_flow(self) -> FlowCoordinator:
+        """Create the coordinator for one org"""
+        return FlowCoordinator(
+            self.project_config,
+            self.flow_config,
+            name=self.name,
+            options=self.options,
+            skip=self.skip,
+            callbacks=self.callback_class(),
+            fuse_metadata_etl=self.fuse_metadata_etl,
+        )
+
+    def run(self, org_configs: Dict[str, OrgConfig]) -> Dict[str, OrgFlowResult]:
+        """Run the flow against each org, and return the results by org name.
+
+        A failure on one org doesn't stop the flow on the others; check
+        the `exception` of each result."""
+        # Errors in the flow's configuration are raised before any org is touched
+        coordinators = {org_name: self.get_flow() for org_name in org_configs}
+        max_parallel = min(self.max_parallel or len(org_configs), len(org_configs))
+        coordinator = next(iter(coordinators.values()))
+        # Tasks from another project change to its directory, which
+        # the orgs' threads share (see _run_in_threads)
+        in_sequence = any(
+            coordinator._is_from_other_project(step) for step in coordinator.steps
+        )
+        if in_sequence:
+            self.logger.info(
+                "Running the flow on one org at a time, "
+                "because some of its steps come from another project"
+            )
+            max_parallel = 1
+        flow_name = f"'{self.name}' " if self.name else ""
+        self.logger.info(
+            f"Running flow {flow_name}on {len(org_configs)} orgs "
+            f"({max_parallel} at a time): " + ", ".join(org_configs)
+        )
+
+        def run(org_name: str) -> OrgFlowResult:
+            coordinator = coordinators[org_name]
+            started = datetime.now()
+            exception = None
+            try:
+                coordinator.run(org_configs[org_name])
+            except Exception as e:
+                coordinator.logger.error(f"Flow failed: {e}")
+                exception = e
+            return OrgFlowResult(
+                org_name, coordinator, datetime.now() - started, exception
+            )
+
+        if in_sequence:
+            self.results = {org_name: run(org_name) for org_name in org_configs}
+            return self.results
+
+        with tempfile.TemporaryDirectory(prefix="cci_shared_") as directory:
+            self.project_config.shared_work = SharedWork(directory)
+            try:
+                futures = _run_in_threads(
+                    [
+                        (org_name, functools.partial(run, org_name))
+                        for org_name in org_configs
+                    ],
+                    logging.getLogger("cumulusci.flows"),
+                    max_parallel,
+                    self.project_config.repo_root,
+                )
+            finally:
+                self.project_config.shared_work = None
+
+        self.results = {}
+        for future in futures:
+            result = future.result()
+            self.results[result.org_name] = result
+        return self.results
+
+    def format_summary(self) -> str:
+        """One line per org, with the outcome of its run"""
+        succeeded = sum(1 for result in self.results.values() if not result.exception)
+        flow_name = f"'{self.name}' " if self.name else ""
+        lines = [
+            f"Flow {flow_name}succeeded on {succeeded} of {len(self.results)} orgs:"
+        ]
+        width = max(len(org_name) for org_name in self.results)
+        for org_name, result in self.results.items():
+            status = "Failed" if result.exception else "Succeeded"
+            line = f"  {org_name:<{width}}  {status:<9}  {format_duration(result.duration)}"
+            if result.exception:
+                line += f"  {result.exception}"
+            lines.append(line)
+        return "\n".join(lines)
+
+
 class PreflightFlowCoordinator(FlowCoordinator):
-    """Coordinates running preflight checks instead of the actual flow steps."""
+    """Coordinates running preflight checks instead of the actual flow steps.
+
+    Tasks called by the checks with constant options are run concurrently
+    before the checks are evaluated, and their results are kept for a few
+    minutes in `task_result_cache` (by default, in ~/.cumulusci) so that
+    running the checks again against the same org doesn't repeat them.
+    Results used by a failed check are not kept, since the cause of the
+    failure is likely to be fixed before the checks are run again."""
 
     preflight_results: DefaultDict[Optional[str], List[dict]]
     _task_caches: Dict[BaseProjectConfig, "TaskCache"]
 
+    def __init__(
+        self,
+        *args,
+        task_result_cache: Optional[TaskResultCache] = None,
+        use_task_result_cache: bool = True,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.task_result_cache = (
+            task_result_cache or TaskResultCache.default()
+            if use_task_result_cache
+            else None
+        )
+
     def run(self, org_config: OrgConfig):
         self.org_config = org_config
         self.callbacks.pre_flow(self)
@@ -873,37 +1392,80 @@ class PreflightFlowCoordinator(FlowCoordinator):
 
         self.preflight_results = defaultdict(list)
         # Expose for test access
-        self._task_caches = {self.project_config: TaskCache(self, self.project_config)}
+        self._task_caches = {}
         try:
-            # flow-level checks
-            jinja2_context = {
-                "tasks": self._task_caches[self.project_config],
-                "project_config": self.project_config,
-                "org_config": self.org_config,
-            }
-            for check in self.flow_config.checks or []:
-                result = self.evaluate_check(check, jinja2_context)
-                if result:
-                    self.preflight_results[None].append(result)
-
-            # Step-level checks
+            # flow-level checks, then step-level checks
+            checks = [
+                (None, self.project_config, check)
+                for check in self.flow_config.checks or []
+            ]
             for step in self.steps:
-                jinja2_context["project_config"] = step.project_config
-                # Create a cache for this project config, if not present
-                # and not equal to the root project config.
-                # This accommodates cross-project preflight checks.
-                if step.project_config not in self._task_caches:
-                    self._task_caches[step.project_config] = TaskCache(
-                        self, step.project_config
+                checks.extend(
+                    (str(step.step_num), step.project_config, check)
+                    for check in step.task_config.get("checks", [])
+                )
+            # Create a cache for each project config.
+            # This accommodates cross-project preflight checks.
+            for project_config in [self.project_config] + [
+                step.project_config for step in self.steps
+            ]:
+                if project_config not in self._task_caches:
+                    self._task_caches[project_config] = TaskCache(
+                        self, project_config, store=self.task_result_cache
                     )
-                jinja2_context["tasks"] = self._task_caches[step.project_config]
-                for check in step.task_config.get("checks", []):
-                    result = self.evaluate_check(check, jinja2_context)
-                    if result:
-                        self.preflight_results[str(step.step_num)].append(result)
+
+            self._prefetch_task_results(
+                [(self._task_caches[config], check) for _, config, check in checks]
+            )
+
+            jinja2_context = {"org_config": self.org_config}
+            for step_num, project_config, check in checks:
+                task_cache = self._task_caches[project_config]
+                jinja2_context["project_config"] = project_config
+                jinja2_context["tasks"] = task_cache
+                first_call = len(task_cache.calls)
+                result = self.evaluate_check(check, jinja2_context)
+                if result:
+                    self.preflight_results[step_num].append(result)
+                    if result["status"] in FAILED_CHECK_STATUSES:
+                        task_cache.discard_stored(task_cache.calls[first_call:])
         finally:
             self.callbacks.post_flow(self)
 
+    def _prefetch_task_results(self, checks: List[Tuple["TaskCache", dict]]):
+        """Run the distinct tasks called by the checks concurrently,
+        so that their results are cached when the checks are evaluated.
+
+        Only calls with constant options can be found. Errors are left to
+        be raised when the check that makes the call is evaluated."""
+        calls = {}
+        for cache, check in checks:
+            for task_name, options in _task_calls(check["when"]):
+                if task_name not in cache.project_config.tasks:
+                    continue
+                try:
+                    key = (cache, task_name, tuple(sorted(options.items())))
+                    hash(key)
+                except TypeError:
+                    continue
+                calls.setdefault(key, (cache, task_name, options))
+        if len(calls) < 2:
+            return
+
+        def prefetch(cache: "TaskCache", task_name: str, options: dict):
+            try:
+                CachedTaskRunner(cache, task_name)(**options)
+            except Exception as e:
+                self.logger.debug(f"Unable to run {task_name} ahead of checks: {e}")
+
+        self.logger.info(f"Running {len(calls)} tasks for preflight checks...")
+        self._run_in_threads(
+            [
+                (task_name, functools.partial(prefetch, *call))
+                for (_, task_name, _), call in calls.items()
+            ]
+        )
+
     def evaluate_check(
         self, check: dict, jinja2_context: Dict[str, Any]
     ) -> Optional[dict]:
@@ -921,21 +1483,47 @@ class TaskCache:
     This is intended for use in a jinja2 expression context
     so that multiple expressions evaluated in the same context
     can avoid running a task more than once with the same options.
+
+    Results are also kept in `store`, if given, for use by later runs
+    against the same org.
     """
 
     project_config: BaseProjectConfig
     results: Dict[Tuple[str, Tuple[Any]], Any]
+    store_keys: Dict[Tuple[str, Tuple[Any]], str]
+    calls: List[Tuple[str, Tuple[Any]]]
 
-    def __init__(self, flow: FlowCoordinator, project_config: BaseProjectConfig):
+    def __init__(
+        self,
+        flow: FlowCoordinator,
+        project_config: BaseProjectConfig,
+        store: Optional[TaskResultCache] = None,
+    ):
         self.flow = flow
         # Cross-project flows may include preflight checks
         # that depend on their local context.
         self.project_config = project_config
+        self.store = store
         self.results = {}
+        self.store_keys = {}
+        self.calls = []
 
     def __getattr__(self, task_name: str):
         return CachedTaskRunner(self, task_name)
 
+    def store_key(self, task_class: Type["BaseTask"], options: dict) -> Optional[str]:
+        org_id = self.flow.org_config.org_id if self.flow.org_config else None
+        if self.store is None or not org_id:
+            return None
+        return self.store.key_for(org_id, task_class, options)
+
+    def discard_stored(self, cache_keys: Iterable[Tuple[str, Tuple[Any]]]):
+        """Remove the stored results of these calls, so later runs repeat them."""
+        for cache_key in cache_keys:
+            store_key = self.store_keys.pop(cache_key, None)
+            if store_key:
+                self.store.delete(store_key)
+
 
 class CachedTaskRunner:
     """Runs a task and caches the result in a TaskCache"""
@@ -949,6 +1537,7 @@ class CachedTaskRunner:
 
     def __call__(self, **options: dict) -> Any:
         cache_key = (self.task_name, tuple(sorted(options.items())))
+        self.cache.calls.append(cache_key)
         if cache_key in self.cache.results:
             return self.cache.results[cache_key].return_values
 
@@ -963,11 +1552,57 @@ class CachedTaskRunner:
             task_class=task_class,
             project_config=self.cache.project_config,
         )
-        self.cache.flow.callbacks.pre_task(step)
-        result = TaskRunner(step, self.cache.flow.org_config, self.cache.flow).run_step(
-            **options
+        store_key = self.cache.store_key(
+            task_class, {**task_config.get("options", {}), **options}
         )
-        self.cache.flow.callbacks.post_task(step, result)
-
+        stored = self.cache.store.get(store_key) if store_key else None
+        if stored is not None:
+            self.cache.flow.logger.info(
+                f"Using result of {self.task_name} from a recent preflight run"
+            )
+            result = StepResult(
+                step.step_num,
+                self.task_name,
+                self.task_name,
+                None,
+                stored["return_values"],
+                None,
+            )
+        else:
+            flow = self.cache.flow
+            with flow._callbacks_lock:
+                flow.callbacks.pre_task(step)
+            result = TaskRunner(step, flow.org_config, flow).run_step(**options)
+            with flow._callbacks_lock:
+                flow.callbacks.post_task(step, result)
+            if store_key and result.exception is None:
+                self.cache.store.set(store_key, result.return_values)
+
+        if store_key and result.exception is None:
+            self.cache.store_keys[cache_key] = store_key
         self.cache.results[cache_key] = result
         return result.return_values
+
+
+def _task_calls(expression: str) -> Iterator[Tuple[str, dict]]:
+    """Find calls like `tasks.name(option=value)` with constant options
+    in a jinja2 expression."""
+    try:
+        template = jinja2_env.parse("{{ (" + expression + ") }}")
+    except TemplateSyntaxError:
+        return
+    for call in template.find_all(nodes.Call):
+        func = call.node
+        if not (
+            isinstance(func, nodes.Getattr)
+            and isinstance(func.node, nodes.Name)
+            and func.node.name == "tasks"
+        ):
+            continue
+        if call.args or call.dyn_args or call.dyn_kwargs:
+            continue
+        try:
+            options = {kwarg.key: kwarg.value.as_const() for kwarg in call.kwargs}
+        except nodes.Impossible:
+            continue
+        yield func.attr, options
@@ -0,0 +1,328 @@
+"""Instrumentation of flow runs, to find out where the time goes.
+
+InstrumentationCallback is a FlowCallback that records, for each step of a
+flow: wall time, the HTTP requests it made (counted by endpoint, with
+retries, bytes sent and received and time spent waiting for responses),
+time spent in time.sleep() (mostly polling), and peak memory use.
+
+HTTP requests are observed by wrapping requests.Session.send for the
+duration of the flow, so requests made by any library built on
+`requests` (simple_salesforce, the Metadata API client, ...) are
+counted. When steps run in parallel, each is credited with the work done
+in its own thread; work done in threads started by a task is attributed
+to it only while no other step is running. Peak memory is the resident set size of the
+process, sampled every quarter second and at the start and end of each
+step, so very short spikes can be missed.
+
+The results can be written as JSON, summarized as a text flame chart, or
+exported as folded stacks for flame graph tools:
+
+>>> callbacks = InstrumentationCallback(json_path="metrics.json")
+>>> coordinator = FlowCoordinator(project_config, flow_config, callbacks=callbacks)
+>>> coordinator.run(org_config)
+>>> print(callbacks.format_summary())
+"""
+
+import functools
+import json
+import re
+import threading
+import time
+import typing as T
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import psutil
+import requests
+
+from cumulusci.core.flowrunner import FlowCallback, StepResult, StepSpec
+
+# Salesforce record ids and API versions vary between otherwise identical
+# requests; they are replaced so that requests group by endpoint.
+SALESFORCE_ID_RE = re.compile(r"^[a-zA-Z0-9]{5}0[a-zA-Z0-9]{9}([a-zA-Z0-9]{3})?$")
+API_VERSION_RE = re.compile(r"^v?\d+\.\d+$")
+
+MEMORY_SAMPLE_INTERVAL = 0.25
+SUMMARY_BAR_WIDTH = 30
+
+
+@dataclass
+class EndpointMetrics:
+    calls: int = 0
+    retries: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    elapsed: float = 0.0
+
+
+@dataclass
+class StepMetrics:
+    step_num: str
+    path: str
+    task_name: str
+    status: str = "running"
+    wall_time: float = 0.0
+    sleep_time: float = 0.0
+    peak_rss: T.Optional[int] = None
+    endpoints: T.Dict[str, EndpointMetrics] = field(default_factory=dict)
+
+    @property
+    def api_calls(self) -> int:
+        return sum(e.calls for e in self.endpoints.values())
+
+    @property
+    def retries(self) -> int:
+        return sum(e.retries for e in self.endpoints.values())
+
+    @property
+    def bytes_transferred(self) -> int:
+        return sum(e.bytes_sent + e.bytes_received for e in self.endpoints.values())
+
+    @property
+    def http_time(self) -> float:
+        return sum(e.elapsed for e in self.endpoints.values())
+
+    def as_dict(self) -> dict:
+        return {
+            **asdict(self),
+            "api_calls": self.api_calls,
+            "retries": self.retries,
+            "bytes_transferred": self.bytes_transferred,
+            "http_time": self.http_time,
+        }
+
+
+def endpoint_name(request: requests.PreparedRequest) -> str:
+    """A name for the endpoint of a request, e.g.
+    "GET /services/data/{version}/sobjects/Account/{id}".
+
+    SOAP requests include their action, e.g. (checkDeployStatus)."""
+    segments = []
+    for segment in urlsplit(request.url).path.split("/"):
+        if API_VERSION_RE.match(segment):
+            segment = "{version}"
+        elif SALESFORCE_ID_RE.match(segment) and re.search(r"\d", segment):
+            segment = "{id}"
+        segments.append(segment)
+    name = f"{request.method} {'/'.join(segments)}"
+    action = request.headers.get("SOAPAction")
+    if action:
+        name += f" ({action.strip(chr(34))})"
+    return name
+
+
+class InstrumentationCallback(FlowCallback):
+    """Records per-step metrics for a flow run.
+
+    Wraps another FlowCallback (if given), whose methods are still called."""
+
+    def __init__(
+        self,
+        wrapped: T.Optional[FlowCallback] = None,
+        json_path: T.Union[str, Path, None] = None,
+        folded_path: T.Union[str, Path, None] = None,
+    ):
+        self.wrapped = wrapped or FlowCallback()
+        self.json_path = json_path
+        self.folded_path = folded_path
+        self.flow_name = None
+        self.steps: T.List[StepMetrics] = []
+        self.wall_time = 0.0
+        self._lock = threading.Lock()
+        self._flow_started = None
+        # Steps which are running, and when they started, by thread
+        self._running: T.Dict[int, T.Tuple[StepMetrics, float]] = {}
+        self._original_send = None
+        self._original_sleep = None
+        self._process = psutil.Process()
+        self._stop_sampling = threading.Event()
+        self._sampler = None
+
+    def pre_flow(self, coordinator):
+        self.flow_name = coordinator.name or "flow"
+        self._flow_started = time.perf_counter()
+        self._install()
+        self.wrapped.pre_flow(coordinator)
+
+    def post_flow(self, coordinator):
+        try:
+            self.wrapped.post_flow(coordinator)
+        finally:
+            self._uninstall()
+            with self._lock:
+                # Steps whose tasks couldn't be created never finished
+                for metrics, started in self._running.values():
+                    metrics.wall_time = time.perf_counter() - started
+                    metrics.status = "error"
+                self._running.clear()
+            self.wall_time = time.perf_counter() - self._flow_started
+            self.write()
+
+    def pre_task(self, step: StepSpec):
+        metrics = StepMetrics(str(step.step_num), step.path, step.task_name)
+        with self._lock:
+            self.steps.append(metrics)
+            self._running[threading.get_ident()] = (metrics, time.perf_counter())
+        self._sample_rss()
+        self.wrapped.pre_task(step)
+
+    def post_task(self, step: StepSpec, result: StepResult):
+        self._sample_rss()
+        with self._lock:
+            running = self._running.pop(threading.get_ident(), None)
+            if running is not None:
+                metrics, started = running
+                metrics.wall_time = time.perf_counter() - started
+                metrics.status = "error" if result.exception else "success"
+        self.wrapped.post_task(step, result)
+
+    # Hooks
+
+    def record_request(
+        self, request: requests.PreparedRequest, response: requests.Response, stream
+    ):
+        sent = int(request.headers.get("Content-Length") or 0)
+        received = response.headers.get("Content-Length")
+        if received is None and not stream:
+            received = len(response.content)
+        retries = getattr(getattr(response.raw, "retries", None), "history", ())
+        name = endpoint_name(request)
+        with self._lock:
+            current = self._current()
+            if current is None:
+                return
+            endpoint = current.endpoints.setdefault(name, EndpointMetrics())
+            endpoint.calls += 1
+            endpoint.retries += len(retries or ())
+            endpoint.bytes_sent += sent
+            endpoint.bytes_received += int(received or 0)
+            endpoint.elapsed += response.elapsed.total_seconds()
+
+    def record_sleep(self, seconds: float):
+        with self._lock:
+            current = self._current()
+            if current is not None:
+                current.sleep_time += seconds
+
+    def record_memory(self, rss: int):
+        with self._lock:
+            for metrics, _ in self._running.values():
+                metrics.peak_rss = max(metrics.peak_rss or 0, rss)
+
+    def _current(self) -> T.Optional[StepMetrics]:
+        """The step running in this thread, or else the only running step"""
+        running = self._running.get(threading.get_ident())
+        if running is None and len(self._running) == 1:
+            (running,) = self._running.values()
+        return running[0] if running else None
+
+    def _install(self):
+        original_send = self._original_send = requests.Session.send
+        original_sleep = self._original_sleep = time.sleep
+
+        @functools.wraps(original_send)
+        def send(session, request, **kwargs):
+            response = original_send(session, request, **kwargs)
+            self.record_request(request, response, kwargs.get("stream", False))
+            return response
+
+        @functools.wraps(original_sleep)
+        def sleep(seconds):
+            self.record_sleep(seconds)
+            return original_sleep(seconds)
+
+        requests.Session.send = send
+        time.sleep = sleep
+
+        self._stop_sampling.clear()
+        self._sampler = threading.Thread(
+            target=self._sample_memory, name="flow-metrics", daemon=True
+        )
+        self._sampler.start()
+
+    def _uninstall(self):
+        if self._original_send:
+            requests.Session.send = self._original_send
+            time.sleep = self._original_sleep
+            self._original_send = self._original_sleep = None
+        self._stop_sampling.set()
+        if self._sampler:
+            self._sampler.join()
+            self._sampler = None
+
+    def _sample_rss(self):
+        self.record_memory(self._process.memory_info().rss)
+
+    def _sample_memory(self):
+        while True:
+            self._sample_rss()
+            # Rather than time.sleep, which is instrumented
+            if self._stop_sampling.wait(MEMORY_SAMPLE_INTERVAL):
+                return
+
+    # Reports
+
+    def as_dict(self) -> dict:
+        return {
+            "flow": self.flow_name,
+            "wall_time": self.wall_time,
+            "steps": [step.as_dict() for step in self.steps],
+        }
+
+    def folded_stacks(self) -> T.List[str]:
+        """Per-step time in the "folded stacks" format of flame graph tools,
+        in milliseconds: HTTP time by endpoint, sleep time and the rest."""
+        lines = []
+        for step in self.steps:
+            frame = f"{self.flow_name};{step.step_num} {step.task_name}"
+            for name, endpoint in sorted(step.endpoints.items()):
+                lines.append(f"{frame};{name} {round(endpoint.elapsed * 1000)}")
+            if step.sleep_time:
+                lines.append(f"{frame};sleep {round(step.sleep_time * 1000)}")
+            other = step.wall_time - step.http_time - step.sleep_time
+            lines.append(f"{frame};other {max(0, round(other * 1000))}")
+        return lines
+
+    def format_summary(self) -> str:
+        """A text flame chart: one bar per step, proportional to its wall time"""
+        total = sum(step.wall_time for step in self.steps) or 1
+        width = max([len(step.task_name) for step in self.steps] + [4])
+        lines = [f"Flow metrics for {self.flow_name} ({self.wall_time:.1f}s):"]
+        for step in self.steps:
+            share = step.wall_time / total
+            bar = "█" * round(share * SUMMARY_BAR_WIDTH)
+            details = [
+                f"{step.api_calls} API calls",
+                format_bytes(step.bytes_transferred),
+            ]
+            if step.retries:
+                details.append(f"{step.retries} retries")
+            if step.sleep_time:
+                details.append(f"{step.sleep_time:.1f}s sleeping")
+            if step.peak_rss:
+                details.append(f"peak RSS {format_bytes(step.peak_rss)}")
+            lines.append(
+                f"  {step.step_num:>5} {step.task_name:<{width}} "
+                f"{step.wall_time:8.1f}s {share:6.1%} "
+                f"{bar:<{SUMMARY_BAR_WIDTH}} {', '.join(details)}"
+            )
+        return "\n".join(lines)
+
+    def write(self):
+        if self.json_path:
+            Path(self.json_path).write_text(
+                json.dumps(self.as_dict(), indent=2), encoding="utf-8"
+            )
+        if self.folded_path:
+            Path(self.folded_path).write_text(
+                "\n".join(self.folded_stacks()) + "\n", encoding="utf-8"
+            )
+
+
+def format_bytes(size: int) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
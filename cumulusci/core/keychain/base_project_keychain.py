@@ -2,7 +2,6 @@ import sarge
 
 from cumulusci.core.config import ConnectedAppOAuthConfig, ServiceConfig
 from cumulusci.core.config.base_config import BaseConfig
-from cumulusci.core.config.scratch_org_config import ScratchOrgConfig
 from cumulusci.core.exceptions import (
     CumulusCIException,
     CumulusCIUsageError,
@@ -77,6 +76,8 @@ class BaseProjectKeychain(BaseConfig):
         scratch_config[
             "sfdx_alias"
         ] = f"{self.project_config.project__name}__{org_name}"
+        from cumulusci.core.config.scratch_org_config import ScratchOrgConfig
+
         org_config = ScratchOrgConfig(
             scratch_config, org_name, keychain=self, global_org=False
         )
@@ -84,6 +85,8 @@ class BaseProjectKeychain(BaseConfig):
         org_config.save()
 
     def set_org(self, org_config, global_org=False, save=True):
+        from cumulusci.core.config.scratch_org_config import ScratchOrgConfig
+
         if isinstance(org_config, ScratchOrgConfig):
             org_config.config["scratch"] = True
         self._set_org(org_config, global_org, save=save)
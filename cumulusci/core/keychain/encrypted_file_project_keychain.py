@@ -6,9 +6,8 @@ import typing as T
 from pathlib import Path
 from shutil import rmtree
 
-from cumulusci.core.config import OrgConfig, ScratchOrgConfig, ServiceConfig
+from cumulusci.core.config import OrgConfig, ServiceConfig
 from cumulusci.core.config.base_config import BaseConfig
-from cumulusci.core.config.sfdx_org_config import SfdxOrgConfig
 from cumulusci.core.exceptions import (
     ConfigError,
     CumulusCIException,
@@ -39,11 +38,24 @@ if sys.platform.startswith("win"):
     # O_BINARY only available on Windows
     OS_FILE_FLAGS |= os.O_BINARY
 
-scratch_org_class = os.environ.get("CUMULUSCI_SCRATCH_ORG_CLASS")
-if scratch_org_class:
-    scratch_org_factory = import_global(scratch_org_class)  # pragma: no cover
-else:
-    scratch_org_factory = ScratchOrgConfig
+if T.TYPE_CHECKING:
+    from cumulusci.core.config.scratch_org_config import ScratchOrgConfig
+
+
+def scratch_org_factory(*args, **kwargs):
+    """Create a scratch org config, of the class named by the
+    CUMULUSCI_SCRATCH_ORG_CLASS environment variable if it is set.
+
+    The sfdx-backed org configs are imported here rather than at module
+    import, to keep them out of CLI startup."""
+    scratch_org_class = os.environ.get("CUMULUSCI_SCRATCH_ORG_CLASS")
+    if scratch_org_class:
+        config_class = import_global(scratch_org_class)  # pragma: no cover
+    else:
+        from cumulusci.core.config.scratch_org_config import ScratchOrgConfig
+
+        config_class = ScratchOrgConfig
+    return config_class(*args, **kwargs)
 
 
 """
@@ -156,6 +168,8 @@ class EncryptedFileProjectKeychain(BaseProjectKeychain):
         if config.get("scratch"):
             config_class = scratch_org_factory
         elif config.get("sfdx"):
+            from cumulusci.core.config.sfdx_org_config import SfdxOrgConfig
+
             config_class = SfdxOrgConfig
 
         return config_class(*args)
@@ -325,7 +339,7 @@ class EncryptedFileProjectKeychain(BaseProjectKeychain):
         with open(fd, "wb") as f:
             f.write(org_bytes)
 
-    def _get_org(self, org_name: str) -> ScratchOrgConfig:
+    def _get_org(self, org_name: str) -> OrgConfig:
         try:
             config = self.orgs[org_name].data
             global_org = self.orgs[org_name].global_org
@@ -346,12 +360,14 @@ class EncryptedFileProjectKeychain(BaseProjectKeychain):
             )
         org.global_org = global_org
 
+        from cumulusci.core.config.scratch_org_config import ScratchOrgConfig
+
         if isinstance(org, ScratchOrgConfig):
             self._merge_config_from_yml(org)
 
         return org
 
-    def _merge_config_from_yml(self, scratch_config: ScratchOrgConfig):
+    def _merge_config_from_yml(self, scratch_config: "ScratchOrgConfig"):
         """Merges any values configurable via cumulusci.yml
         into the scratch org config that is loaded from file."""
 
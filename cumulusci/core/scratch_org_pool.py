@@ -0,0 +1,357 @@
+"""A pool of scratch orgs created ahead of time.
+
+Creating a scratch org takes minutes. A scheduled job can keep a pool of
+orgs for a scratch org config filled (and set up by a flow), so that the
+jobs which need an org lease one instead of waiting for it to be created:
+
+>>> pool = ScratchOrgPool(keychain, ScratchOrgPoolStore.for_project(project_config))
+>>> pool.fill("dev", 5, setup=lambda org_config: run_flow("dev_org", org_config))
+>>> org_name = pool.lease("dev", holder="build 1234")
+>>> pool.return_org(org_name, delete=True)
+
+Pooled orgs are ordinary scratch orgs in the keychain. Which of them are
+available or leased is recorded in a JSON file, which is locked while it
+is read and updated so that several processes can share the pool.
+"""
+
+import contextlib
+import datetime
+import json
+import logging
+import os
+import tempfile
+import time
+import typing as T
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from cumulusci.core.config.scratch_org_config import ScratchOrgConfig
+from cumulusci.core.exceptions import CumulusCIException, OrgNotFound
+from cumulusci.utils import pinned_cwd
+
+# Bump when the structure of the store changes.
+STORE_FORMAT_VERSION = 1
+STORE_FILENAME = "scratch_org_pool.json"
+
+CREATING = "creating"
+AVAILABLE = "available"
+LEASED = "leased"
+
+# Orgs still marked as being created after this long were abandoned,
+# e.g. because the process creating them was killed.
+CREATE_TIMEOUT = datetime.timedelta(hours=2)
+
+logger = logging.getLogger(__name__)
+
+
+class ScratchOrgPoolError(CumulusCIException):
+    pass
+
+
+class ScratchOrgPoolStore:
+    """The state of the pooled orgs, in a JSON file shared by processes.
+
+    Changes are made in `transaction()`, which holds a lock file next to
+    the store while the store is read and written."""
+
+    def __init__(self, path: T.Union[str, Path], lock_timeout: float = 60):
+        self.path = Path(path)
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        self.lock_timeout = lock_timeout
+
+    @classmethod
+    def for_project(cls, project_config) -> "ScratchOrgPoolStore":
+        """The store in the project's directory in ~/.cumulusci"""
+        if not project_config.project_local_dir:
+            raise ScratchOrgPoolError(
+                "Scratch org pools can only be used in a project with a name."
+            )
+        return cls(Path(project_config.project_local_dir) / STORE_FILENAME)
+
+    def load(self) -> T.Dict[str, dict]:
+        """The pooled orgs by name, without locking the store"""
+        try:
+            store = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except ValueError as e:
+            raise ScratchOrgPoolError(f"Unable to read {self.path}: {e}")
+        if store.get("version") != STORE_FORMAT_VERSION:
+            raise ScratchOrgPoolError(
+                f"{self.path} was written by another version of CumulusCI."
+            )
+        return store["orgs"]
+
+    @contextlib.contextmanager
+    def transaction(self) -> T.Iterator[T.Dict[str, dict]]:
+        """Lock the store and yield the pooled orgs by name. Changes to
+        them are saved unless the block raises an exception."""
+        with self._lock():
+            orgs = self.load()
+            yield orgs
+            self._save(orgs)
+
+    def _save(self, orgs: T.Dict[str, dict]):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        store = {"version": STORE_FORMAT_VERSION, "orgs": orgs}
+        fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(store, f, indent=2)
+            os.replace(tmp_name, self.path)
+        except Exception:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    @contextlib.contextmanager
+    def _lock(self):
+        # An exclusively created lock file works the same way on every platform.
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        deadline = time.monotonic() + self.lock_timeout
+        while True:
+            try:
+                fd = os.open(self.lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                if self._lock_is_stale():
+                    self.lock_path.unlink(missing_ok=True)
+                    continue
+                if time.monotonic() > deadline:
+                    raise ScratchOrgPoolError(
+                        f"Timed out waiting for the lock on {self.path}. "
+                        f"If no other cci process is using the pool, remove {self.lock_path}."
+                    )
+                time.sleep(0.1)
+        try:
+            os.write(fd, str(os.getpid()).encode())
+            os.close(fd)
+            yield
+        finally:
+            self.lock_path.unlink(missing_ok=True)
+
+    def _lock_is_stale(self) -> bool:
+        """Is the lock older than anyone could hold it for?"""
+        try:
+            age = time.time() - self.lock_path.stat().st_mtime
+        except FileNotFoundError:
+            return False
+        return age > max(self.lock_timeout * 2, 60)
+
+
+class ScratchOrgPool:
+    """Creates, leases and removes pooled scratch orgs.
+
+    `create_org` creates the scratch org for an org config; by default,
+    ScratchOrgConfig.create_org, which runs `sf org create scratch`."""
+
+    def __init__(
+        self,
+        keychain,
+        store: ScratchOrgPoolStore,
+        create_org: T.Optional[T.Callable[[ScratchOrgConfig], None]] = None,
+    ):
+        self.keychain = keychain
+        self.store = store
+        self.create_org = create_org or ScratchOrgConfig.create_org
+
+    def fill(
+        self,
+        config_name: str,
+        size: int,
+        days: T.Optional[int] = None,
+        setup: T.Optional[T.Callable[[ScratchOrgConfig], None]] = None,
+        max_parallel: T.Optional[int] = None,
+    ) -> T.Tuple[T.List[str], T.Dict[str, Exception]]:
+        """Create orgs until the pool has `size` unleased orgs for the config.
+
+        The orgs are created concurrently (at most max_parallel at a time),
+        and set up by calling setup(org_config). While they are, the working
+        directory is pinned to the project's root (see pinned_cwd). Returns the names of the
+        orgs added to the pool, and the errors of those which failed."""
+        if self.keychain.project_config.lookup(f"orgs__scratch__{config_name}") is None:
+            raise OrgNotFound(f"No such org configured: `{config_name}`")
+        now = _now()
+        with self.store.transaction() as orgs:
+            pooled = [
+                org
+                for org in orgs.values()
+                if org["config_name"] == config_name
+                and org["state"] in (CREATING, AVAILABLE)
+                and not _has_expired(org, now)
+            ]
+            names = [
+                f"{config_name}__pool_{uuid.uuid4().hex[:8]}"
+                for _ in range(max(size - len(pooled), 0))
+            ]
+            for org_name in names:
+                orgs[org_name] = {
+                    "config_name": config_name,
+                    "state": CREATING,
+                    "created": now.isoformat(),
+                    "expires": None,
+                }
+        if not names:
+            logger.info(f"The {config_name} pool already has {len(pooled)} orgs.")
+            return [], {}
+
+        logger.info(f"Creating {len(names)} {config_name} scratch orgs for the pool")
+
+        def create(name):
+            return self._create(name, config_name, days, setup)
+
+        if max_parallel == 1:
+            outcomes = [create(name) for name in names]
+        else:
+            # The threads share the working directory, where setup
+            # resolves the project's relative paths
+            with pinned_cwd(self.keychain.project_config.repo_root), ThreadPoolExecutor(
+                max_workers=max_parallel or len(names)
+            ) as executor:
+                outcomes = list(executor.map(create, names))
+
+        errors = {name: e for name, e in zip(names, outcomes) if e is not None}
+        with self.store.transaction() as orgs:
+            for org_name in names:
+                if org_name in errors:
+                    orgs.pop(org_name, None)
+                elif org_name in orgs:
+                    org_config = self.keychain.get_org(org_name)
+                    orgs[org_name]["state"] = AVAILABLE
+                    orgs[org_name]["expires"] = _isoformat(org_config.expires)
+        return [name for name in names if name not in errors], errors
+
+    def _create(
+        self,
+        org_name: str,
+        config_name: str,
+        days: T.Optional[int],
+        setup: T.Optional[T.Callable[[ScratchOrgConfig], None]],
+    ) -> T.Optional[Exception]:
+        org_config = None
+        try:
+            self.keychain.create_scratch_org(org_name, config_name, days)
+            org_config = self.keychain.get_org(org_name)
+            self.create_org(org_config)
+            org_config.save()
+            logger.info(f"Created {org_name}")
+            if setup:
+                setup(org_config)
+                org_config.save()
+        except Exception as e:
+            logger.error(f"Unable to create {org_name} for the pool: {e}")
+            self._remove(org_name, org_config)
+            return e
+
+    def lease(
+        self, config_name: str, holder: T.Optional[str] = None
+    ) -> T.Optional[str]:
+        """Lease an available org for the config, and return its name.
+
+        The org which expires soonest is leased first. Returns None if
+        the pool has no available orgs."""
+        now = _now()
+        with self.store.transaction() as orgs:
+            available = [
+                (org["expires"] or "", org_name)
+                for org_name, org in orgs.items()
+                if org["config_name"] == config_name
+                and org["state"] == AVAILABLE
+                and not _has_expired(org, now)
+            ]
+            if not available:
+                return None
+            _, org_name = min(available)
+            orgs[org_name].update(
+                {"state": LEASED, "leased_by": holder, "leased_at": now.isoformat()}
+            )
+        return org_name
+
+    def return_org(self, org_name: str, delete: bool = False):
+        """Return a leased org to the pool, or delete it."""
+        with self.store.transaction() as orgs:
+            if org_name not in orgs:
+                raise ScratchOrgPoolError(f"{org_name} is not a pooled org.")
+            if not delete:
+                orgs[org_name]["state"] = AVAILABLE
+                orgs[org_name].pop("leased_by", None)
+                orgs[org_name].pop("leased_at", None)
+                return
+            del orgs[org_name]
+        self._remove(org_name, delete_org=True)
+
+    def prune(
+        self,
+        config_name: T.Optional[str] = None,
+        within: datetime.timedelta = datetime.timedelta(0),
+    ) -> T.List[str]:
+        """Remove orgs which have expired, or will within `within`, and
+        orgs whose creation was abandoned. Leased orgs are only removed
+        once they have expired. Returns the names of the removed orgs."""
+        now = _now()
+        with self.store.transaction() as orgs:
+            pruned = []
+            for org_name, org in list(orgs.items()):
+                if config_name and org["config_name"] != config_name:
+                    continue
+                if org["state"] == CREATING:
+                    prune = now - _parse(org["created"]) > CREATE_TIMEOUT
+                elif org["state"] == LEASED:
+                    prune = _has_expired(org, now)
+                else:
+                    prune = _has_expired(org, now + within)
+                if prune:
+                    pruned.append((org_name, _has_expired(org, now)))
+                    del orgs[org_name]
+        for org_name, expired in pruned:
+            self._remove(org_name, delete_org=not expired)
+        return [org_name for org_name, _ in pruned]
+
+    def list_orgs(self, config_name: T.Optional[str] = None) -> T.Dict[str, dict]:
+        """The pooled orgs by name"""
+        return {
+            org_name: org
+            for org_name, org in self.store.load().items()
+            if not config_name or org["config_name"] == config_name
+        }
+
+    def _remove(
+        self,
+        org_name: str,
+        org_config: T.Optional[ScratchOrgConfig] = None,
+        delete_org: bool = True,
+    ):
+        """Delete the scratch org and remove it from the keychain"""
+        try:
+            org_config = org_config or self.keychain.get_org(org_name)
+            if delete_org and org_config.can_delete():
+                org_config.delete_org()
+        except Exception as e:
+            logger.warning(f"Unable to delete scratch org {org_name}: {e}")
+        try:
+            self.keychain.remove_org(org_name)
+        except OrgNotFound:
+            pass
+
+
+def _now() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+def _parse(value: str) -> datetime.datetime:
+    parsed = datetime.datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed
+
+
+def _isoformat(value: T.Optional[datetime.datetime]) -> T.Optional[str]:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.astimezone()
+    return value.astimezone(datetime.timezone.utc).isoformat()
+
+
+def _has_expired(org: dict, when: datetime.datetime) -> bool:
+    return bool(org.get("expires")) and _parse(org["expires"]) <= when
@@ -38,10 +38,12 @@ def sfdx(
     env=None,
     capture_output=True,
     check_return=False,
+    cwd: T.Optional[str] = None,
 ):
     """Call an sfdx command and capture its output.
 
     Be sure to quote user input that is part of the command using `shell_quote`.
+    The command runs in `cwd`, if given, rather than the current directory.
 
     Returns a `sarge` Command instance with returncode, stdout, stderr
     """
@@ -63,6 +65,7 @@ def sfdx(
         stderr=sarge.Capture(buffer_size=-1) if capture_output else None,
         shell=True,
         env={**env, "SFDX_TOOL": "CCI"},
+        cwd=cwd,
     )
     p.run()
     if capture_output:
@@ -137,14 +140,22 @@ def get_source_format_for_zipfile(
 
 @contextlib.contextmanager
 def convert_sfdx_source(
-    path: T.Optional[PathLike], name: T.Optional[str], logger: logging.Logger
+    path: T.Optional[PathLike],
+    name: T.Optional[str],
+    logger: logging.Logger,
+    cwd: T.Optional[PathLike] = None,
 ):
+    """Convert the SFDX source in `path` to MDAPI format, if needed, yielding
+    the path of the MDAPI source. A relative `path` is relative to `cwd` (by
+    default, the current directory)."""
     mdapi_path = None
+    if cwd:
+        path = os.path.join(cwd, path) if path else None
     with contextlib.ExitStack() as stack:
         # Convert SFDX -> MDAPI format if path exists but does not have package.xml
         if (
-            len(os.listdir(path))  # path is None -> CWD
-            and get_source_format_for_path(path) is SourceFormat.SFDX
+            len(os.listdir(path or cwd))  # path is None -> CWD
+            and get_source_format_for_path(path or cwd) is SourceFormat.SFDX
         ):
             logger.info("Converting from SFDX to MDAPI format.")
             mdapi_path = stack.enter_context(temporary_dir(chdir=False))
@@ -159,6 +170,7 @@ def convert_sfdx_source(
                 args=args,
                 capture_output=True,
                 check_return=True,
+                cwd=cwd,
             )
 
         yield mdapi_path or path
@@ -0,0 +1,119 @@
+"""Work shared by flows running against several orgs at once.
+
+MultiOrgFlowCoordinator runs a flow against several orgs concurrently,
+with one project config. While they run, a SharedWork is attached to the
+project config as `shared_work`. Work which doesn't depend on the org,
+such as resolving the project's dependencies, downloading them and
+building package zips, is done by the first flow that needs it and
+reused by the others:
+
+>>> work = shared_work_for(project_config)
+>>> if work:
+...     dependencies = work.get_or_compute(key, resolve_dependencies)
+"""
+
+import os
+import shutil
+import threading
+import typing as T
+import zipfile
+from collections import defaultdict
+from pathlib import Path
+
+ResultType = T.TypeVar("ResultType")
+
+
+class SharedWork:
+    """Results of work shared between threads, computed once per key.
+
+    Files built for sharing, such as package zips, are kept in `directory`."""
+
+    def __init__(self, directory: T.Union[str, Path]):
+        self.directory = Path(directory)
+        self._results: T.Dict[T.Hashable, T.Any] = {}
+        self._locks: T.DefaultDict[T.Hashable, threading.Lock] = defaultdict(
+            threading.Lock
+        )
+        self._lock = threading.Lock()
+        self._files = 0
+
+    def get_or_compute(
+        self, key: T.Hashable, compute: T.Callable[[], ResultType]
+    ) -> ResultType:
+        """Return the result of compute() for this key.
+
+        If another thread is computing it, wait for that result rather than
+        computing it again. Exceptions are not kept: the next caller tries
+        again."""
+        with self._lock:
+            key_lock = self._locks[key]
+        with key_lock:
+            if key not in self._results:
+                self._results[key] = compute()
+            return self._results[key]
+
+    def file(
+        self, key: T.Hashable, build: T.Callable[[Path], bool]
+    ) -> T.Optional[Path]:
+        """Return the path of a file written once by build(path), which
+        returns False if there is nothing to write."""
+
+        def compute():
+            with self._lock:
+                self._files += 1
+                path = self.directory / f"shared_{self._files}"
+            return path if build(path) else None
+
+        return self.get_or_compute(key, compute)
+
+    def open_file(
+        self, key: T.Hashable, build: T.Callable[[], T.Optional[T.IO[bytes]]]
+    ) -> T.Optional[T.IO[bytes]]:
+        """Return a new file object for the contents of the file returned
+        by build(), which is only called once."""
+
+        def copy(path: Path) -> bool:
+            fp = build()
+            if fp is None:
+                return False
+            with fp, path.open("wb") as f:
+                shutil.copyfileobj(fp, f)
+            return True
+
+        path = self.file(key, copy)
+        return path.open("rb") if path else None
+
+    def zip_file(
+        self, key: T.Hashable, build: T.Callable[[], zipfile.ZipFile]
+    ) -> zipfile.ZipFile:
+        """Return a new ZipFile for the contents of the ZipFile returned by
+        build(), which is only called once. ZipFiles can't be read by
+        several threads at once, so each caller gets its own."""
+
+        def copy(path: Path) -> bool:
+            source = build()
+            with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as target:
+                for info in source.infolist():
+                    target.writestr(info, source.read(info))
+            return True
+
+        return zipfile.ZipFile(self.file(key, copy))
+
+
+def shared_work_for(project_config) -> T.Optional[SharedWork]:
+    """The SharedWork attached to a project config, if any"""
+    work = getattr(project_config, "shared_work", None)
+    return work if isinstance(work, SharedWork) else None
+
+
+def tree_stamp(path: T.Union[str, Path]) -> T.Tuple[int, int, int]:
+    """A cheap stamp of the files in a directory, which changes when files
+    are added, removed or modified: (count, total size, latest mtime)."""
+    count = size = latest = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            stat = os.stat(os.path.join(root, name))
+            count += 1
+            size += stat.st_size
+            latest = max(latest, stat.st_mtime_ns)
+    return count, size, latest
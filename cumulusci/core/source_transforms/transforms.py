@@ -17,7 +17,6 @@ from cumulusci.core.enums import StrEnum
 from cumulusci.core.exceptions import CumulusCIException, TaskOptionsError
 from cumulusci.tasks.metadata.package import RemoveSourceComponents
 from cumulusci.utils import (
-    cd,
     inject_namespace,
     strip_namespace,
     temporary_dir,
@@ -243,36 +242,31 @@ class BundleStaticResourcesTransform(SourceTransform):
             raise Exception("No package.xml found; cannot zip Static Resources")
 
         # Build static resource bundles and add to package
-        with temporary_dir():
-            os.mkdir("staticresources")
-            bundles = []
-            for name in os.listdir(path):
-                bundle_relpath = os.path.join(self.options.static_resource_path, name)
-                bundle_path = os.path.join(path, name)
-                if not os.path.isdir(bundle_path):
-                    continue
-                context.logger.info(
-                    f"Zipping {bundle_relpath} to add to staticresources"
-                )
-
-                # Add resource-meta.xml file
-                meta_name = f"{name}.resource-meta.xml"
-                meta_path = os.path.join(path, meta_name)
-                with open(meta_path, "rb") as f:
-                    zip_dest.writestr(f"staticresources/{meta_name}", f.read())
-
-                # Add bundle
-                zip_path = os.path.join("staticresources", f"{name}.resource")
-                with open(zip_path, "wb") as bundle_fp:
-                    bundle_zip = zipfile.ZipFile(bundle_fp, "w", zipfile.ZIP_DEFLATED)
-                    with cd(bundle_path):
-                        for root, _, files in os.walk("."):
-                            for f in files:
-                                resource_file = os.path.join(root, f)
-                                bundle_zip.write(resource_file)
-                    bundle_zip.close()
-                zip_dest.write(zip_path)
-                bundles.append(name)
+        bundles = []
+        for name in os.listdir(path):
+            bundle_relpath = os.path.join(self.options.static_resource_path, name)
+            bundle_path = os.path.join(path, name)
+            if not os.path.isdir(bundle_path):
+                continue
+            context.logger.info(f"Zipping {bundle_relpath} to add to staticresources")
+
+            # Add resource-meta.xml file
+            meta_name = f"{name}.resource-meta.xml"
+            meta_path = os.path.join(path, meta_name)
+            with open(meta_path, "rb") as f:
+                zip_dest.writestr(f"staticresources/{meta_name}", f.read())
+
+            # Add bundle
+            bundle_fp = io.BytesIO()
+            with zipfile.ZipFile(bundle_fp, "w", zipfile.ZIP_DEFLATED) as bundle_zip:
+                for root, _, files in os.walk(bundle_path):
+                    for f in files:
+                        resource_file = os.path.join(root, f)
+                        bundle_zip.write(
+                            resource_file, os.path.relpath(resource_file, bundle_path)
+                        )
+            zip_dest.writestr(f"staticresources/{name}.resource", bundle_fp.getvalue())
+            bundles.append(name)
 
         # Update package.xml
         package = metadata_tree.parse(package_xml)
@@ -503,16 +497,16 @@ class StripUnwantedComponentTransform(SourceTransform):
         package_xml_path = os.path.abspath(os.path.expanduser(self.options.package_xml))
 
         zip_dest = zipfile.ZipFile(io.BytesIO(), "w", zipfile.ZIP_DEFLATED)
-        with temporary_dir():
-            zf.extractall()
+        with temporary_dir(chdir=False) as path:
+            zf.extractall(path)
             RemoveSourceComponents(
-                os.getcwd(), package_xml_path, api_version=None, logger=context.logger
+                path, package_xml_path, api_version=None, logger=context.logger
             )()
-            shutil.copy(package_xml_path, "package.xml")
-            for root, _, files in os.walk("."):
+            shutil.copy(package_xml_path, os.path.join(path, "package.xml"))
+            for root, _, files in os.walk(path):
                 for f in files:
                     file = os.path.join(root, f)
-                    zip_dest.write(file)
+                    zip_dest.write(file, os.path.relpath(file, path))
 
         return zip_dest
 
@@ -0,0 +1,116 @@
+"""Persistent cache for the results of tasks run by preflight checks.
+
+Preflight checks call tasks such as ``get_installed_packages`` or
+``get_available_licenses``, which query the org. Running the checks again
+soon after, for example after fixing the cause of one failed check, would
+repeat all of those queries. Their return values are pickled into
+``~/.cumulusci/preflight_cache`` under a key derived from the org id, the
+task class and its options, and reused for a short time (``ttl`` seconds).
+Results used by a check that fails are discarded, so that the check is
+evaluated against fresh results on the next run.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Optional, Type
+
+from cumulusci.__about__ import __version__
+
+# Bump when the structure of cached entries changes.
+CACHE_FORMAT_VERSION = 1
+CACHE_DIR_NAME = "preflight_cache"
+DEFAULT_TTL = 300
+DISABLE_ENV_VAR = "CUMULUSCI_DISABLE_PREFLIGHT_CACHE"
+
+logger = logging.getLogger(__name__)
+
+
+class TaskResultCache:
+    """An on-disk store of task return values which expire after `ttl` seconds."""
+
+    suffix = ".pickle"
+
+    def __init__(self, cache_dir: Path, ttl: float = DEFAULT_TTL):
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+
+    @classmethod
+    def default(cls) -> Optional["TaskResultCache"]:
+        """Return the cache in ~/.cumulusci, or None if it has been disabled."""
+        if os.environ.get(DISABLE_ENV_VAR):
+            return None
+        return cls(Path.home() / ".cumulusci" / CACHE_DIR_NAME)
+
+    def key_for(self, org_id: str, task_class: Type, options: dict) -> str:
+        digest = hashlib.sha256()
+        digest.update(f"{CACHE_FORMAT_VERSION}:{__version__}".encode())
+        digest.update(f"\0org:{org_id}".encode())
+        digest.update(
+            f"\0task:{task_class.__module__}.{task_class.__qualname__}".encode()
+        )
+        frozen = json.dumps(options, sort_keys=True, default=repr)
+        digest.update(f"\0options:{frozen}".encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return {"return_values": ...} for a fresh entry, or None."""
+        path = self._path_for(key)
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl:
+                path.unlink(missing_ok=True)
+                return None
+            with path.open("rb") as f:
+                return {"return_values": pickle.load(f)}
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.debug(f"Discarding unreadable preflight cache entry {path}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+
+    def set(self, key: str, return_values: Any):
+        tmp_name = None
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(return_values, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_name, self._path_for(key))
+        except Exception as e:
+            # The cache is an optimization; never fail a preflight over it.
+            logger.debug(f"Unable to write preflight cache entry: {e}")
+            if tmp_name:
+                Path(tmp_name).unlink(missing_ok=True)
+            return
+        self._prune()
+
+    def delete(self, key: str):
+        self._path_for(key).unlink(missing_ok=True)
+
+    def clear(self):
+        for entry in self._entries():
+            entry.unlink(missing_ok=True)
+
+    def _path_for(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{self.suffix}"
+
+    def _entries(self):
+        if not self.cache_dir.is_dir():
+            return []
+        return list(self.cache_dir.glob(f"*{self.suffix}"))
+
+    def _prune(self):
+        """Remove expired entries"""
+        expired = time.time() - self.ttl
+        for entry in self._entries():
+            try:
+                if entry.stat().st_mtime < expired:
+                    entry.unlink(missing_ok=True)
+            except FileNotFoundError:  # pragma: no cover
+                continue
@@ -0,0 +1,214 @@
+import json
+import os
+from unittest import mock
+
+import pytest
+
+from cumulusci.core.config import FlowConfig, OrgConfig
+from cumulusci.core.flow_checkpoint import FlowCheckpoint
+from cumulusci.core.flowrunner import FlowCoordinator
+from cumulusci.core.tasks import BaseTask
+from cumulusci.tests.util import create_project_config
+
+
+class _CountingTask(BaseTask):
+    task_options = {
+        "name": {"description": "A name to return"},
+        "path": {"description": "A path in the project"},
+        "fail": {"description": "Fails if set"},
+    }
+    runs = []
+    fail = False
+
+    def _run_task(self):
+        self.runs.append(self.stepnum)
+        if self.options.get("fail") and _CountingTask.fail:
+            raise ValueError("Failed")
+        self.return_values = {"name": self.options.get("name")}
+
+
+class _UnserializableTask(BaseTask):
+    def _run_task(self):
+        self.return_values = {"task": self}
+
+
+@pytest.fixture
+def project_config(tmp_path):
+    project_config = create_project_config()
+    repo_root = tmp_path / "project"
+    (repo_root / "src").mkdir(parents=True)
+    (repo_root / "src" / "Account.object").write_text("<CustomObject/>")
+    project_config.repo_info["root"] = str(repo_root)
+    for name, task_class in (
+        ("count", _CountingTask),
+        ("unserializable", _UnserializableTask),
+    ):
+        project_config.config["tasks"][name] = {
+            "class_path": f"{__name__}.{task_class.__name__}"
+        }
+    return project_config
+
+
+@pytest.fixture
+def org_config(tmp_path):
+    org_config = OrgConfig(
+        {
+            "instance_url": "https://orgname.my.salesforce.com",
+            "username": "test@example.com",
+            "org_id": "00D000000000001",
+        },
+        "test",
+        keychain=mock.Mock(cache_dir=tmp_path / "cache"),
+    )
+    org_config.refresh_oauth_token = mock.Mock()
+    return org_config
+
+
+@pytest.fixture(autouse=True)
+def reset_counting_task():
+    _CountingTask.runs = []
+    _CountingTask.fail = True
+
+
+FLOW_CONFIG = {
+    "steps": {
+        1: {"task": "count", "options": {"name": "first"}},
+        2: {
+            "task": "count",
+            "options": {"name": "^^count.name", "path": "src"},
+        },
+        3: {"task": "count", "options": {"fail": True}},
+    }
+}
+
+
+def run_flow(project_config, org_config, resume=False):
+    checkpoint = FlowCheckpoint(org_config, "test_flow", resume=resume)
+    flow = FlowCoordinator(
+        project_config,
+        FlowConfig(FLOW_CONFIG),
+        name="test_flow",
+        checkpoint=checkpoint,
+    )
+    flow.run(org_config)
+    return flow
+
+
+class TestFlowCheckpoint:
+    def test_resume(self, project_config, org_config):
+        with pytest.raises(ValueError):
+            run_flow(project_config, org_config)
+        assert [str(n) for n in _CountingTask.runs] == ["1", "2", "3"]
+        checkpoint_path = (
+            org_config.keychain.cache_dir
+            / "orginfo/orgname.my.salesforce.com__test__example.com"
+            / "flow_checkpoints/test_flow.json"
+        )
+        checkpoint = json.loads(checkpoint_path.read_text())
+        assert [step["path"] for step in checkpoint["steps"].values()] == [
+            "count",
+            "count",
+        ]
+
+        _CountingTask.runs = []
+        _CountingTask.fail = False
+        flow = run_flow(project_config, org_config, resume=True)
+
+        assert [str(n) for n in _CountingTask.runs] == ["3"]
+        assert [result.return_values for result in flow.results] == [
+            {"name": "first"},
+            {"name": "first"},
+            {"name": None},
+        ]
+        # The checkpoint is removed when the flow completes
+        assert not checkpoint_path.exists()
+
+    def test_resume__files_changed(self, project_config, org_config):
+        with pytest.raises(ValueError):
+            run_flow(project_config, org_config)
+
+        _CountingTask.runs = []
+        _CountingTask.fail = False
+        source = project_config.repo_root + "/src/Account.object"
+        with open(source, "w") as f:
+            f.write("<CustomObject><label>Changed</label></CustomObject>")
+        run_flow(project_config, org_config, resume=True)
+
+        # Step 1 leaves `path` to its default, so it depends on src too
+        assert [str(n) for n in _CountingTask.runs] == ["1", "2", "3"]
+
+    def test_resume__unrelated_files_changed(self, project_config, org_config):
+        with pytest.raises(ValueError):
+            run_flow(project_config, org_config)
+
+        _CountingTask.runs = []
+        _CountingTask.fail = False
+        with open(project_config.repo_root + "/README.md", "w") as f:
+            f.write("Changed")
+        run_flow(project_config, org_config, resume=True)
+
+        assert [str(n) for n in _CountingTask.runs] == ["3"]
+
+    def test_resume__sfdx_package_directory_changed(self, project_config, org_config):
+        repo_root = project_config.repo_root
+        with open(repo_root + "/sfdx-project.json", "w") as f:
+            json.dump({"packageDirectories": [{"path": "force-app"}]}, f)
+        with pytest.raises(ValueError):
+            run_flow(project_config, org_config)
+
+        _CountingTask.runs = []
+        _CountingTask.fail = False
+        os.makedirs(repo_root + "/force-app")
+        with open(repo_root + "/force-app/Account.object", "w") as f:
+            f.write("<CustomObject/>")
+        run_flow(project_config, org_config, resume=True)
+
+        # Only step 1 uses the default path; step 2 names src
+        assert [str(n) for n in _CountingTask.runs] == ["1", "3"]
+
+    def test_resume__options_changed(self, project_config, org_config):
+        with pytest.raises(ValueError):
+            run_flow(project_config, org_config)
+
+        _CountingTask.runs = []
+        _CountingTask.fail = False
+        with mock.patch.dict(FLOW_CONFIG["steps"][1]["options"], {"name": "other"}):
+            run_flow(project_config, org_config, resume=True)
+
+        # Step 2 uses the return values of step 1, which have changed
+        assert [str(n) for n in _CountingTask.runs] == ["1", "2", "3"]
+
+    def test_run_without_resume(self, project_config, org_config):
+        with pytest.raises(ValueError):
+            run_flow(project_config, org_config)
+
+        _CountingTask.runs = []
+        with pytest.raises(ValueError):
+            run_flow(project_config, org_config)
+
+        assert [str(n) for n in _CountingTask.runs] == ["1", "2", "3"]
+
+    def test_record__unserializable_return_values(self, project_config, org_config):
+        checkpoint = FlowCheckpoint(org_config, "test_flow")
+        flow = FlowCoordinator(
+            project_config,
+            FlowConfig({"steps": {1: {"task": "unserializable"}}}),
+            checkpoint=checkpoint,
+        )
+        with mock.patch.object(checkpoint, "finish"):
+            flow.run(org_config)
+
+        assert checkpoint.steps == {}
+
+    def test_start__no_cache_dir(self, project_config, org_config, caplog):
+        org_config.keychain = None
+        checkpoint = FlowCheckpoint(org_config, "test_flow", resume=True)
+        flow = FlowCoordinator(
+            project_config,
+            FlowConfig({"steps": {1: {"task": "count"}}}),
+            checkpoint=checkpoint,
+        )
+        flow.run(org_config)
+
+        assert len(_CountingTask.runs) == 1
+        assert "Unable to checkpoint flow test_flow" in caplog.text
@@ -1,4 +1,5 @@
 import logging
+import threading
 from pathlib import Path
 from unittest import mock
 
@@ -17,14 +18,18 @@ from cumulusci.core.exceptions import (
 )
 from cumulusci.core.flowrunner import (
     FlowCoordinator,
+    MultiOrgFlowCoordinator,
     PreflightFlowCoordinator,
     StepSpec,
     TaskRunner,
+    _task_calls,
 )
 from cumulusci.core.source.local_folder import LocalFolderSource
+from cumulusci.core.task_result_cache import TaskResultCache
 from cumulusci.core.tasks import BaseTask
 from cumulusci.core.tests.utils import MockLoggingHandler
 from cumulusci.tests.util import create_project_config
+from cumulusci.utils import temporary_dir
 from cumulusci.utils.yaml.cumulusci_yml import LocalFolderSourceModel
 
 ORG_ID = "00D000000000001"
@@ -59,6 +64,62 @@ class _SfdcTask(BaseTask):
         return -1
 
 
+class _RecordingFusion:
+    instances = []
+
+    def __init__(self, tasks):
+        self.tasks = tasks
+        self.ran = []
+        self.finished = 0
+        self.instances.append(self)
+
+    @staticmethod
+    def fusion_key(task):
+        return task.options.get("group")
+
+    def run(self, task):
+        self.ran.append(task.stepnum)
+        if task.options.get("fail"):
+            raise Exception("Fused task failed")
+
+    def finish(self):
+        self.finished += 1
+
+
+class _FusableTask(BaseTask):
+    task_options = {
+        "group": {"description": "Tasks with the same group can be fused"},
+        "fail": {"description": "Raise an exception"},
+    }
+    fusion_class = _RecordingFusion
+    fusion = None
+
+    def _run_task(self):
+        if self.fusion:
+            self.fusion.run(self)
+
+
+class _BarrierTask(BaseTask):
+    """Waits for the other tasks using the same barrier, which only
+    returns if they run at the same time."""
+
+    barrier = None
+    task_options = {"name": {"description": "A name to return"}}
+
+    def _run_task(self):
+        self.logger.info("Waiting at the barrier")
+        self.barrier.wait()
+        self.return_values = {"name": self.options.get("name")}
+
+
+class _ChdirTask(BaseTask):
+    """Changes to a temporary directory, as tasks mustn't in parallel."""
+
+    def _run_task(self):
+        with temporary_dir():
+            pass
+
+
 class AbstractFlowCoordinatorTest:
     @classmethod
     def setup_class(cls):
@@ -121,6 +182,19 @@ class TestSimpleTestFlowCoordinator(AbstractFlowCoordinatorTest):
                 "description": "An sfdc task",
                 "class_path": "cumulusci.core.tests.test_flowrunner._SfdcTask",
             },
+            "barrier": {
+                "description": "Waits for other tasks",
+                "class_path": "cumulusci.core.tests.test_flowrunner._BarrierTask",
+            },
+            "chdir": {
+                "description": "Changes directory",
+                "class_path": "cumulusci.core.tests.test_flowrunner._ChdirTask",
+            },
+            "fusable": {
+                "description": "A task that can be fused",
+                "class_path": "cumulusci.core.tests.test_flowrunner._FusableTask",
+                "options": {"group": "A"},
+            },
         }
         self.project_config.config["flows"] = {
             "nested_flow": {
@@ -669,6 +743,236 @@ class TestSimpleTestFlowCoordinator(AbstractFlowCoordinatorTest):
         assert 2 == len(flow.results)
         assert flow.results[0].exception is not None
 
+    def test_run__fused_steps(self):
+        _RecordingFusion.instances.clear()
+        flow_config = FlowConfig(
+            {
+                "description": "Run fusable tasks",
+                "fuse_metadata_etl": True,
+                "steps": {
+                    1: {"task": "fusable"},
+                    2: {"task": "fusable"},
+                    3: {"task": "pass_name"},
+                    4: {"task": "fusable"},
+                    5: {"task": "fusable", "when": "True"},
+                    6: {"task": "fusable"},
+                    7: {"task": "fusable"},
+                    8: {"task": "fusable", "options": {"group": "B"}},
+                },
+            }
+        )
+        flow = FlowCoordinator(self.project_config, flow_config)
+        flow.run(self.org_config)
+
+        assert len(flow.results) == 8
+        assert [[str(n) for n in f.ran] for f in _RecordingFusion.instances] == [
+            ["1", "2"],
+            ["6", "7"],
+        ]
+
+    def test_run__fused_steps__disabled(self):
+        _RecordingFusion.instances.clear()
+        flow_config = FlowConfig(
+            {
+                "description": "Run fusable tasks",
+                "steps": {1: {"task": "fusable"}, 2: {"task": "fusable"}},
+            }
+        )
+        flow = FlowCoordinator(self.project_config, flow_config)
+        flow.run(self.org_config)
+
+        assert len(flow.results) == 2
+        assert not _RecordingFusion.instances
+
+    def test_run__fused_steps__failure_finishes_fusion(self):
+        _RecordingFusion.instances.clear()
+        flow_config = FlowConfig(
+            {
+                "description": "Run fusable tasks",
+                "steps": {
+                    1: {"task": "fusable"},
+                    2: {"task": "fusable", "options": {"fail": True}},
+                    3: {"task": "fusable"},
+                },
+            }
+        )
+        flow = FlowCoordinator(self.project_config, flow_config, fuse_metadata_etl=True)
+        with pytest.raises(Exception, match="Fused task failed"):
+            flow.run(self.org_config)
+
+        (fusion,) = _RecordingFusion.instances
+        assert [str(n) for n in fusion.ran] == ["1", "2"]
+        assert fusion.finished == 1
+        assert len(flow.results) == 2
+
+    def test_run__fused_steps__checkpointed_together(self):
+        _RecordingFusion.instances.clear()
+        flow_config = FlowConfig(
+            {
+                "steps": {
+                    1: {"task": "fusable"},
+                    2: {"task": "fusable"},
+                    3: {"task": "fusable", "options": {"group": "B"}},
+                    4: {"task": "fusable", "options": {"group": "B", "fail": True}},
+                },
+            }
+        )
+        checkpoint = mock.Mock()
+        checkpoint.can_restore.return_value = False
+        checkpoint.restore.return_value = None
+        recorded = []
+        checkpoint.record.side_effect = lambda step, fingerprint, result: (
+            recorded.append((str(step.step_num), len(flow.results)))
+        )
+        flow = FlowCoordinator(
+            self.project_config,
+            flow_config,
+            fuse_metadata_etl=True,
+            checkpoint=checkpoint,
+        )
+        with pytest.raises(Exception, match="Fused task failed"):
+            flow.run(self.org_config)
+
+        # Steps 1 and 2 are recorded once both have run; steps 3 and 4 never
+        assert recorded == [("1", 2), ("2", 2)]
+
+    def test_run__parallel_steps(self):
+        _BarrierTask.barrier = threading.Barrier(2, timeout=5)
+        flow_config = FlowConfig(
+            {
+                "steps": {
+                    1: {"task": "pass_name"},
+                    2: {"task": "barrier", "parallel": "config"},
+                    3: {
+                        "task": "barrier",
+                        "parallel": "config",
+                        "options": {"name": "other"},
+                    },
+                    4: {
+                        "task": "name_response",
+                        "options": {"response": "^^barrier.name"},
+                    },
+                }
+            }
+        )
+        flow = FlowCoordinator(self.project_config, flow_config)
+        flow.run(self.org_config)
+
+        assert [str(result.step_num) for result in flow.results] == ["1", "2", "3", "4"]
+        assert flow.results[2].return_values == {"name": "other"}
+        assert "Running 2 steps in parallel (2 at a time): barrier, barrier" in (
+            self.flow_log["info"]
+        )
+        assert self.flow_log["info"].count("[barrier] Waiting at the barrier") == 2
+
+    def test_run__parallel_subflows(self):
+        _BarrierTask.barrier = threading.Barrier(2, timeout=5)
+        self.project_config.config["flows"]["barrier_flow"] = {
+            "steps": {1: {"task": "pass_name"}, 2: {"task": "barrier"}}
+        }
+        self.project_config.config["flows"]["test"] = {
+            "steps": {
+                1: {"flow": "barrier_flow", "parallel": "config"},
+                2: {"task": "barrier", "parallel": "config"},
+            }
+        }
+        flow_config = self.project_config.get_flow("test")
+        flow = FlowCoordinator(self.project_config, flow_config)
+        assert [(s.parallel_group, s.parallel_lane) for s in flow.steps] == [
+            (":config", "1"),
+            (":config", "1"),
+            (":config", "2"),
+        ]
+
+        flow.run(self.org_config)
+
+        assert [str(result.step_num) for result in flow.results] == ["1/1", "1/2", "2"]
+        assert "[barrier_flow] Waiting at the barrier" in self.flow_log["info"]
+
+    def test_run__parallel_steps__failure(self):
+        self.project_config.config["flows"]["test"] = {
+            "steps": {
+                1: {"task": "raise_exception", "parallel": "config"},
+                2: {"flow": "nested_flow", "parallel": "config"},
+                3: {"task": "pass_name"},
+            }
+        }
+        flow_config = self.project_config.get_flow("test")
+        flow = FlowCoordinator(self.project_config, flow_config, max_parallel=1)
+        with pytest.raises(Exception, match="Test raised exception as expected"):
+            flow.run(self.org_config)
+
+        assert len(flow.results) == 1
+        assert (
+            "[nested_flow] Not running task pass_name because a parallel step failed"
+            in self.flow_log["info"]
+        )
+
+    def test_run__parallel_steps__working_directory_pinned(self):
+        flow_config = FlowConfig(
+            {
+                "steps": {
+                    1: {"task": "chdir", "parallel": "config"},
+                    2: {"task": "pass_name", "parallel": "config"},
+                }
+            }
+        )
+        flow = FlowCoordinator(self.project_config, flow_config)
+        with pytest.raises(Exception, match="share the working directory"):
+            flow.run(self.org_config)
+
+        # Run in the flow's own thread, the task can change directory
+        flow_config.config["steps"][1].pop("parallel")
+        FlowCoordinator(self.project_config, flow_config).run(self.org_config)
+
+    def test_run__parallel_steps__from_other_project(self):
+        flow_config = FlowConfig(
+            {
+                "steps": {
+                    1: {"task": "chdir", "parallel": "config"},
+                    2: {"task": "pass_name", "parallel": "config"},
+                }
+            }
+        )
+        flow = FlowCoordinator(self.project_config, flow_config)
+        with mock.patch.object(
+            FlowCoordinator, "_is_from_other_project", return_value=True
+        ):
+            flow.run(self.org_config)
+
+        assert [str(result.step_num) for result in flow.results] == ["1", "2"]
+        assert (
+            "Running parallel steps one at a time, because some come from another project"
+            in self.flow_log["info"]
+        )
+
+    def test_init__parallel_steps_depend_on_each_other(self):
+        flow_config = FlowConfig(
+            {
+                "steps": {
+                    1: {"task": "pass_name", "parallel": "config"},
+                    2: {
+                        "task": "name_response",
+                        "parallel": "config",
+                        "options": {"response": "^^pass_name.name"},
+                    },
+                }
+            }
+        )
+        with pytest.raises(FlowConfigError, match="same parallel group"):
+            FlowCoordinator(self.project_config, flow_config)
+
+        # Fine if the return value comes from an earlier step
+        flow_config.config["steps"][0] = {"task": "pass_name"}
+        FlowCoordinator(self.project_config, flow_config)
+
+    def test_init__bad_max_parallel(self):
+        flow_config = FlowConfig(
+            {"max_parallel": 0, "steps": {1: {"task": "pass_name"}}}
+        )
+        with pytest.raises(FlowConfigError, match="max_parallel"):
+            FlowCoordinator(self.project_config, flow_config)
+
     def test_run__no_steps(self):
         """A flow with no tasks will have no results."""
         flow_config = FlowConfig({"description": "Run no tasks", "steps": {}})
@@ -709,6 +1013,97 @@ class TestSimpleTestFlowCoordinator(AbstractFlowCoordinatorTest):
 
         save.assert_called_once()
 
+    def _other_org_config(self):
+        org_config = OrgConfig(
+            {"username": "other@example", "org_id": "00D000000000002"},
+            "other",
+            mock.Mock(),
+        )
+        org_config.refresh_oauth_token = mock.Mock()
+        return org_config
+
+    def test_run__multiple_orgs(self):
+        _BarrierTask.barrier = threading.Barrier(2, timeout=5)
+        shared_work = []
+
+        class _Callbacks(mock.MagicMock):
+            def pre_flow(_, coordinator):
+                shared_work.append(coordinator.project_config.shared_work)
+
+        flow_config = FlowConfig({"steps": {1: {"task": "barrier"}}})
+        multi = MultiOrgFlowCoordinator(
+            self.project_config,
+            flow_config,
+            name="test_flow",
+            callback_class=_Callbacks,
+        )
+        results = multi.run(
+            {"test": self.org_config, "other": self._other_org_config()}
+        )
+
+        assert list(results) == ["test", "other"]
+        assert all(result.exception is None for result in results.values())
+        assert results["test"].coordinator.org_config is self.org_config
+        # Both flows shared the same work while they ran
+        assert len(shared_work) == 2 and shared_work[0] is shared_work[1]
+        assert self.project_config.shared_work is None
+        assert (
+            "Running flow 'test_flow' on 2 orgs (2 at a time): test, other"
+            in self.flow_log["info"]
+        )
+        assert "[test] Waiting at the barrier" in self.flow_log["info"]
+        assert "[other] Waiting at the barrier" in self.flow_log["info"]
+        assert multi.format_summary().startswith(
+            "Flow 'test_flow' succeeded on 2 of 2 orgs:"
+        )
+
+    def test_run__multiple_orgs__failure(self):
+        self.project_config.config["flows"]["test"] = {
+            "steps": {1: {"task": "raise_exception"}, 2: {"task": "pass_name"}}
+        }
+        multi = MultiOrgFlowCoordinator(
+            self.project_config,
+            self.project_config.get_flow("test"),
+            name="test",
+            max_parallel=1,
+        )
+        with mock.patch.object(
+            FlowCoordinator, "run", side_effect=[Exception("Failed"), None]
+        ):
+            results = multi.run(
+                {"test": self.org_config, "other": self._other_org_config()}
+            )
+
+        assert str(results["test"].exception) == "Failed"
+        assert results["other"].exception is None
+        assert "[test] Flow failed: Failed" in self.flow_log["error"]
+        summary = multi.format_summary().splitlines()
+        assert summary[0] == "Flow 'test' succeeded on 1 of 2 orgs:"
+        assert summary[1].startswith("  test   Failed")
+        assert summary[1].endswith("  Failed")
+        assert summary[2].startswith("  other  Succeeded")
+
+    def test_run__multiple_orgs__from_other_project(self):
+        flow_config = FlowConfig({"steps": {1: {"task": "chdir"}}})
+        multi = MultiOrgFlowCoordinator(self.project_config, flow_config)
+        with mock.patch.object(
+            FlowCoordinator, "_is_from_other_project", return_value=True
+        ):
+            results = multi.run(
+                {"test": self.org_config, "other": self._other_org_config()}
+            )
+
+        assert all(result.exception is None for result in results.values())
+        assert (
+            "Running the flow on one org at a time, "
+            "because some of its steps come from another project"
+        ) in self.flow_log["info"]
+
+    def test_init__multiple_orgs__bad_max_parallel(self):
+        flow_config = FlowConfig({"steps": {1: {"task": "pass_name"}}})
+        with pytest.raises(FlowConfigError, match="max_parallel"):
+            MultiOrgFlowCoordinator(self.project_config, flow_config, max_parallel=0)
+
 
 class TestStepSpec:
     def test_repr(self):
@@ -717,6 +1112,20 @@ class TestStepSpec:
 
 
 class TestPreflightFlowCoordinatorTest(AbstractFlowCoordinatorTest):
+    def _setup_project_config(self):
+        for name, task_class in (
+            ("barrier", _BarrierTask),
+            ("name_response", _TaskResponseName),
+            ("raise_exception", _TaskRaisesException),
+        ):
+            self.project_config.config["tasks"][name] = {
+                "class_path": f"cumulusci.core.tests.test_flowrunner.{task_class.__name__}"
+            }
+        self.project_config.config["tasks"]["raise_exception"]["options"] = {
+            "exception": ValueError,
+            "message": "Failed",
+        }
+
     def test_run(self):
         flow_config = FlowConfig(
             {
@@ -790,6 +1199,145 @@ class TestPreflightFlowCoordinatorTest(AbstractFlowCoordinatorTest):
             "1/1": [{"status": "error", "message": None}],
         } == flow.preflight_results
 
+    def test_run__runs_task_calls_concurrently(self):
+        _BarrierTask.barrier = threading.Barrier(2, timeout=5)
+        flow_config = FlowConfig(
+            {
+                "checks": [
+                    {
+                        "when": "tasks.barrier(name='a')['name'] == 'a'",
+                        "action": "error",
+                        "message": "a",
+                    },
+                    {
+                        "when": "tasks.barrier(name='b')['name'] == 'b' and tasks.barrier(name='a')",
+                        "action": "error",
+                        "message": "b",
+                    },
+                ],
+                "steps": {1: {"task": "log"}},
+            }
+        )
+        flow = PreflightFlowCoordinator(self.project_config, flow_config)
+        flow.run(self.org_config)
+
+        assert {
+            None: [
+                {"status": "error", "message": "a"},
+                {"status": "error", "message": "b"},
+            ]
+        } == flow.preflight_results
+        assert "Running 2 tasks for preflight checks..." in self.flow_log["info"]
+        assert len(flow._task_caches[flow.project_config].results) == 2
+
+    def test_run__reuses_results_of_recent_run(self, tmp_path):
+        store = TaskResultCache(tmp_path)
+        flow_config = FlowConfig(
+            {
+                "checks": [
+                    {
+                        "when": "tasks.name_response(response='yes') != {}",
+                        "action": "error",
+                    }
+                ],
+                "steps": {1: {"task": "log"}},
+            }
+        )
+        flow = PreflightFlowCoordinator(
+            self.project_config, flow_config, task_result_cache=store
+        )
+        flow.run(self.org_config)
+        assert len(list(tmp_path.iterdir())) == 1
+
+        self._flow_log_handler.reset()
+        with mock.patch.object(_TaskResponseName, "_run_task") as run_task:
+            flow = PreflightFlowCoordinator(
+                self.project_config, flow_config, task_result_cache=store
+            )
+            flow.run(self.org_config)
+        run_task.assert_not_called()
+        assert (
+            "Using result of name_response from a recent preflight run"
+            in self.flow_log["info"]
+        )
+        assert flow.preflight_results == {}
+
+    def test_run__discards_results_used_by_failed_checks(self, tmp_path):
+        store = TaskResultCache(tmp_path)
+        flow_config = FlowConfig(
+            {
+                "checks": [
+                    {
+                        "when": "tasks.name_response(response='yes') == {}",
+                        "action": "error",
+                    },
+                    {
+                        "when": "tasks.name_response(response='no') == {}",
+                        "action": "skip",
+                    },
+                ],
+                "steps": {1: {"task": "log"}},
+            }
+        )
+        flow = PreflightFlowCoordinator(
+            self.project_config, flow_config, task_result_cache=store
+        )
+        flow.run(self.org_config)
+
+        assert flow.preflight_results == {
+            None: [
+                {"status": "error", "message": None},
+                {"status": "skip", "message": None},
+            ]
+        }
+        # Only the result used by the skip check is kept
+        assert len(list(tmp_path.iterdir())) == 1
+
+    def test_run__without_task_result_cache(self, tmp_path):
+        with mock.patch.object(
+            TaskResultCache, "default", return_value=TaskResultCache(tmp_path)
+        ):
+            flow = PreflightFlowCoordinator(
+                self.project_config,
+                FlowConfig({"steps": {1: {"task": "log"}}}),
+                use_task_result_cache=False,
+            )
+        assert flow.task_result_cache is None
+
+    def test_run__does_not_store_failed_tasks(self, tmp_path):
+        flow_config = FlowConfig(
+            {
+                "checks": [{"when": "tasks.raise_exception()", "action": "error"}],
+                "steps": {1: {"task": "log"}},
+            }
+        )
+        flow = PreflightFlowCoordinator(
+            self.project_config,
+            flow_config,
+            task_result_cache=TaskResultCache(tmp_path),
+        )
+        flow.run(self.org_config)
+        assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.parametrize(
+    "expression,calls",
+    [
+        ("tasks.foo()", [("foo", {})]),
+        (
+            "'a' in tasks.foo(x=1, y=['b']) or not tasks.bar(z=none)",
+            [("foo", {"x": 1, "y": ["b"]}), ("bar", {"z": None})],
+        ),
+        # Options which aren't constant can't be known in advance
+        ("tasks.foo(x=org_config.org_id)", []),
+        ("tasks.foo(1)", []),
+        ("other.foo()", []),
+        ("tasks.foo(", []),
+    ],
+)
+def test_task_calls(expression, calls):
+    assert list(_task_calls(expression)) == calls
+
 
 @pytest.fixture
 def task_runner():
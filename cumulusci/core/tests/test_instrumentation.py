@@ -0,0 +1,233 @@
+import json
+import time
+from unittest import mock
+
+import pytest
+import requests
+import responses
+
+from cumulusci.core.config import FlowConfig
+from cumulusci.core.flowrunner import FlowCallback, FlowCoordinator
+from cumulusci.core.instrumentation import InstrumentationCallback, endpoint_name
+from cumulusci.core.tasks import BaseTask
+from cumulusci.tests.util import create_project_config
+
+INSTANCE_URL = "https://example.my.salesforce.com"
+
+
+class _RequestingTask(BaseTask):
+    def _run_task(self):
+        requests.get(
+            f"{INSTANCE_URL}/services/data/v62.0/sobjects/Account/001000000000001AAA"
+        )
+        requests.get(
+            f"{INSTANCE_URL}/services/data/v62.0/sobjects/Account/001000000000002AAA"
+        )
+        time.sleep(2)
+
+
+class _PostingTask(BaseTask):
+    def _run_task(self):
+        requests.post(
+            f"{INSTANCE_URL}/services/Soap/m/62.0",
+            data="<checkDeployStatus/>",
+            headers={"SOAPAction": '"checkDeployStatus"'},
+        )
+
+
+class _FailingTask(BaseTask):
+    def _run_task(self):
+        raise ValueError("Failed")
+
+
+@pytest.fixture
+def project_config():
+    project_config = create_project_config("TestOwner", "TestRepo")
+    for name, task_class in (
+        ("get_accounts", _RequestingTask),
+        ("check_status", _PostingTask),
+        ("fail", _FailingTask),
+    ):
+        project_config.config["tasks"][name] = {
+            "class_path": f"{__name__}.{task_class.__name__}"
+        }
+    return project_config
+
+
+def run_flow(project_config, steps, **kwargs):
+    flow_config = FlowConfig({"steps": steps})
+    callbacks = InstrumentationCallback(**kwargs)
+    flow = FlowCoordinator(
+        project_config, flow_config, name="test_flow", callbacks=callbacks
+    )
+    flow.run(None)
+    return callbacks
+
+
+@pytest.mark.parametrize(
+    "method,url,headers,name",
+    [
+        (
+            "GET",
+            f"{INSTANCE_URL}/services/data/v62.0/sobjects/Account/001000000000001AAA?fields=Name",
+            {},
+            "GET /services/data/{version}/sobjects/Account/{id}",
+        ),
+        (
+            "POST",
+            f"{INSTANCE_URL}/services/Soap/m/62.0",
+            {"SOAPAction": '"deploy"'},
+            "POST /services/Soap/m/{version} (deploy)",
+        ),
+        (
+            "GET",
+            f"{INSTANCE_URL}/services/data/v62.0/tooling/query/",
+            {},
+            "GET /services/data/{version}/tooling/query/",
+        ),
+    ],
+)
+def test_endpoint_name(method, url, headers, name):
+    request = requests.Request(method, url, headers=headers).prepare()
+    assert endpoint_name(request) == name
+
+
+class TestInstrumentationCallback:
+    @responses.activate
+    def test_records_step_metrics(self, project_config):
+        responses.add(
+            "GET",
+            f"{INSTANCE_URL}/services/data/v62.0/sobjects/Account/001000000000001AAA",
+            json={"Id": "001000000000001AAA"},
+        )
+        responses.add(
+            "GET",
+            f"{INSTANCE_URL}/services/data/v62.0/sobjects/Account/001000000000002AAA",
+            json={"Id": "001000000000002AAA"},
+        )
+        responses.add("POST", f"{INSTANCE_URL}/services/Soap/m/62.0", body="<ok/>")
+        send, sleep = requests.Session.send, time.sleep
+
+        callbacks = run_flow(
+            project_config,
+            {1: {"task": "get_accounts"}, 2: {"task": "check_status"}},
+        )
+
+        first, second = callbacks.steps
+        assert (first.step_num, first.task_name, first.status) == (
+            "1",
+            "get_accounts",
+            "success",
+        )
+        assert first.api_calls == 2
+        endpoint = first.endpoints["GET /services/data/{version}/sobjects/Account/{id}"]
+        assert endpoint.calls == 2
+        assert endpoint.bytes_received == 2 * len('{"Id": "001000000000001AAA"}')
+        assert first.sleep_time == 2
+        assert first.peak_rss > 0
+        assert list(second.endpoints) == [
+            "POST /services/Soap/m/{version} (checkDeployStatus)"
+        ]
+        assert second.endpoints[
+            "POST /services/Soap/m/{version} (checkDeployStatus)"
+        ].bytes_sent == len("<checkDeployStatus/>")
+        assert second.sleep_time == 0
+        # The hooks are removed when the flow finishes
+        assert (requests.Session.send, time.sleep) == (send, sleep)
+
+    @responses.activate
+    def test_parallel_steps(self, project_config):
+        responses.add(
+            "GET",
+            f"{INSTANCE_URL}/services/data/v62.0/sobjects/Account/001000000000001AAA",
+        )
+        responses.add(
+            "GET",
+            f"{INSTANCE_URL}/services/data/v62.0/sobjects/Account/001000000000002AAA",
+        )
+        responses.add("POST", f"{INSTANCE_URL}/services/Soap/m/62.0", body="<ok/>")
+
+        callbacks = run_flow(
+            project_config,
+            {
+                1: {"task": "get_accounts", "parallel": "group"},
+                2: {"task": "check_status", "parallel": "group"},
+            },
+        )
+
+        steps = {step.task_name: step for step in callbacks.steps}
+        assert steps["get_accounts"].api_calls == 2
+        assert steps["get_accounts"].sleep_time == 2
+        assert steps["check_status"].api_calls == 1
+        assert steps["check_status"].sleep_time == 0
+
+    @responses.activate
+    def test_requests_outside_steps_are_ignored(self, project_config):
+        responses.add("GET", f"{INSTANCE_URL}/", body="")
+        callbacks = InstrumentationCallback()
+        callbacks._install()
+        try:
+            requests.get(f"{INSTANCE_URL}/")
+        finally:
+            callbacks._uninstall()
+        assert callbacks.steps == []
+
+    def test_failed_step(self, project_config):
+        with pytest.raises(ValueError):
+            callbacks = InstrumentationCallback()
+            FlowCoordinator(
+                project_config,
+                FlowConfig({"steps": {1: {"task": "fail"}}}),
+                callbacks=callbacks,
+            ).run(None)
+        (step,) = callbacks.steps
+        assert step.status == "error"
+        assert step.wall_time > 0
+
+    @responses.activate
+    def test_calls_wrapped_callback(self, project_config):
+        responses.add("POST", f"{INSTANCE_URL}/services/Soap/m/62.0", body="<ok/>")
+        wrapped = mock.Mock(spec=FlowCallback)
+        run_flow(project_config, {1: {"task": "check_status"}}, wrapped=wrapped)
+        assert [call[0] for call in wrapped.method_calls] == [
+            "pre_flow",
+            "pre_task",
+            "post_task",
+            "post_flow",
+        ]
+
+    @responses.activate
+    def test_reports(self, project_config, tmp_path):
+        responses.add("POST", f"{INSTANCE_URL}/services/Soap/m/62.0", body="<ok/>")
+        json_path = tmp_path / "metrics.json"
+        folded_path = tmp_path / "metrics.folded"
+
+        callbacks = run_flow(
+            project_config,
+            {1: {"task": "check_status"}},
+            json_path=json_path,
+            folded_path=folded_path,
+        )
+
+        metrics = json.loads(json_path.read_text())
+        assert metrics["flow"] == "test_flow"
+        (step,) = metrics["steps"]
+        assert step["task_name"] == "check_status"
+        assert step["api_calls"] == 1
+        assert (
+            step["endpoints"]["POST /services/Soap/m/{version} (checkDeployStatus)"][
+                "calls"
+            ]
+            == 1
+        )
+
+        folded = folded_path.read_text().splitlines()
+        assert [line.rsplit(" ", 1)[0] for line in folded] == [
+            "test_flow;1 check_status;POST /services/Soap/m/{version} (checkDeployStatus)",
+            "test_flow;1 check_status;other",
+        ]
+
+        summary = callbacks.format_summary()
+        assert summary.startswith("Flow metrics for test_flow")
+        assert "check_status" in summary
+        assert "1 API calls" in summary
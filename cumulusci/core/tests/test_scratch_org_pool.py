@@ -0,0 +1,257 @@
+import datetime
+import json
+import os
+import threading
+from unittest import mock
+
+import pytest
+
+from cumulusci.core.config import BaseProjectConfig, UniversalConfig
+from cumulusci.core.config.scratch_org_config import ScratchOrgConfig
+from cumulusci.core.exceptions import OrgNotFound
+from cumulusci.core.keychain import BaseProjectKeychain
+from cumulusci.core.scratch_org_pool import (
+    ScratchOrgPool,
+    ScratchOrgPoolError,
+    ScratchOrgPoolStore,
+)
+from cumulusci.utils import cd
+
+
+def fake_create_org(org_config):
+    org_config.config["org_id"] = "00D000000000001"
+    org_config.config["username"] = f"{org_config.name}@example.com"
+    org_config.config["date_created"] = datetime.datetime.now(datetime.timezone.utc)
+    org_config.config["created"] = True
+
+
+@pytest.fixture
+def keychain():
+    project_config = BaseProjectConfig(
+        UniversalConfig(), {"orgs": {"scratch": {"dev": {"days": 7}, "qa": {}}}}
+    )
+    return BaseProjectKeychain(project_config, None)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ScratchOrgPoolStore(tmp_path / "scratch_org_pool.json", lock_timeout=1)
+
+
+@pytest.fixture
+def pool(keychain, store):
+    return ScratchOrgPool(keychain, store, create_org=fake_create_org)
+
+
+@pytest.fixture(autouse=True)
+def delete_org():
+    with mock.patch.object(ScratchOrgConfig, "delete_org") as delete_org:
+        yield delete_org
+
+
+def set_expires(store, org_name, expires):
+    with store.transaction() as orgs:
+        orgs[org_name]["expires"] = expires.isoformat()
+
+
+class TestScratchOrgPool:
+    def test_fill(self, pool, keychain):
+        created, errors = pool.fill("dev", 2)
+
+        assert len(created) == 2 and errors == {}
+        for org_name in created:
+            assert org_name.startswith("dev__pool_")
+            org_config = keychain.get_org(org_name)
+            assert org_config.created
+            assert org_config.config_name == "dev"
+            assert pool.list_orgs()[org_name]["state"] == "available"
+            assert pool.list_orgs()[org_name]["expires"] is not None
+
+        # Only missing orgs are created
+        assert pool.fill("dev", 3)[0] != []
+        assert len(pool.list_orgs("dev")) == 3
+        assert pool.fill("dev", 3) == ([], {})
+
+    def test_fill__concurrent(self, keychain, store):
+        barrier = threading.Barrier(3, timeout=5)
+
+        def create_org(org_config):
+            barrier.wait()
+            fake_create_org(org_config)
+
+        pool = ScratchOrgPool(keychain, store, create_org=create_org)
+        created, errors = pool.fill("dev", 3)
+        assert len(created) == 3 and errors == {}
+
+    def test_fill__setup(self, pool):
+        setup = mock.Mock()
+        created, _ = pool.fill("dev", 1, setup=setup)
+        setup.assert_called_once()
+        assert setup.call_args[0][0].name == created[0]
+
+    def test_fill__failure(self, keychain, store):
+        def create_org(org_config):
+            if len(created_orgs) == 1:
+                raise Exception("No more scratch orgs today")
+            created_orgs.append(org_config.name)
+            fake_create_org(org_config)
+
+        created_orgs = []
+        pool = ScratchOrgPool(keychain, store, create_org=create_org)
+        created, errors = pool.fill("dev", 2, max_parallel=1)
+
+        assert created == created_orgs
+        assert [str(e) for e in errors.values()] == ["No more scratch orgs today"]
+        assert list(pool.list_orgs()) == created
+        # The failed org was removed from the keychain
+        (failed,) = errors
+        with pytest.raises(OrgNotFound):
+            keychain.get_org(failed)
+
+    def test_fill__working_directory_pinned(self, pool, tmp_path):
+        def setup(org_config):
+            with cd(tmp_path):
+                pass
+
+        _, errors = pool.fill("dev", 2, setup=setup)
+        assert len(errors) == 2
+        assert all("share the working directory" in str(e) for e in errors.values())
+
+        # One at a time, the flow may change directory
+        created, errors = pool.fill("qa", 1, setup=setup, max_parallel=1)
+        assert len(created) == 1 and errors == {}
+
+    def test_fill__unknown_config(self, pool):
+        with pytest.raises(OrgNotFound):
+            pool.fill("bogus", 1)
+
+    def test_lease(self, pool, store):
+        created, _ = pool.fill("dev", 2)
+        now = datetime.datetime.now(datetime.timezone.utc)
+        set_expires(store, created[1], now + datetime.timedelta(days=1))
+
+        # The org which expires first is leased first
+        assert pool.lease("dev", holder="build 1") == created[1]
+        assert pool.lease("dev") == created[0]
+        assert pool.lease("dev") is None
+        assert pool.lease("qa") is None
+
+        leased = pool.list_orgs()[created[1]]
+        assert leased["state"] == "leased"
+        assert leased["leased_by"] == "build 1"
+
+    def test_lease__skips_expired(self, pool, store):
+        created, _ = pool.fill("dev", 1)
+        now = datetime.datetime.now(datetime.timezone.utc)
+        set_expires(store, created[0], now - datetime.timedelta(minutes=1))
+        assert pool.lease("dev") is None
+
+    def test_lease__concurrent(self, pool, store):
+        pool.fill("dev", 5)
+        leased = []
+        threads = [
+            threading.Thread(target=lambda: leased.append(pool.lease("dev")))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        assert leased.count(None) == 3
+        assert len(set(leased) - {None}) == 5
+
+    def test_return_org(self, pool):
+        created, _ = pool.fill("dev", 1)
+        org_name = pool.lease("dev", holder="build 1")
+        pool.return_org(org_name)
+
+        assert pool.list_orgs()[org_name] == {
+            "config_name": "dev",
+            "state": "available",
+            "created": mock.ANY,
+            "expires": mock.ANY,
+        }
+        assert pool.lease("dev") == org_name
+
+    def test_return_org__delete(self, pool, keychain, delete_org):
+        pool.fill("dev", 1)
+        org_name = pool.lease("dev")
+        pool.return_org(org_name, delete=True)
+
+        delete_org.assert_called_once()
+        assert pool.list_orgs() == {}
+        with pytest.raises(OrgNotFound):
+            keychain.get_org(org_name)
+
+    def test_return_org__not_pooled(self, pool):
+        with pytest.raises(ScratchOrgPoolError):
+            pool.return_org("dev")
+
+    def test_prune(self, pool, store, delete_org):
+        now = datetime.datetime.now(datetime.timezone.utc)
+        expired, soon, later, leased = pool.fill("dev", 4)[0]
+        set_expires(store, expired, now - datetime.timedelta(hours=1))
+        set_expires(store, soon, now + datetime.timedelta(hours=1))
+        set_expires(store, later, now + datetime.timedelta(days=3))
+        set_expires(store, leased, now + datetime.timedelta(hours=1))
+        with store.transaction() as orgs:
+            orgs[leased]["state"] = "leased"
+            orgs["dev__pool_abandoned"] = {
+                "config_name": "dev",
+                "state": "creating",
+                "created": (now - datetime.timedelta(hours=3)).isoformat(),
+                "expires": None,
+            }
+
+        assert pool.prune("qa") == []
+        assert sorted(pool.prune(within=datetime.timedelta(hours=2))) == sorted(
+            [expired, soon, "dev__pool_abandoned"]
+        )
+        assert sorted(pool.list_orgs()) == sorted([later, leased])
+        # Expired orgs are already gone from the Dev Hub
+        assert delete_org.call_count == 1
+
+
+class TestScratchOrgPoolStore:
+    def test_transaction__not_saved_on_error(self, store):
+        with store.transaction() as orgs:
+            orgs["one"] = {"config_name": "dev"}
+        with pytest.raises(ValueError):
+            with store.transaction() as orgs:
+                orgs["two"] = {"config_name": "dev"}
+                raise ValueError()
+
+        assert list(store.load()) == ["one"]
+        assert not store.lock_path.exists()
+
+    def test_lock__timeout(self, store):
+        store.lock_path.write_text("1")
+        with pytest.raises(ScratchOrgPoolError, match="Timed out"):
+            with store.transaction():
+                pass
+
+    def test_lock__stale(self, store):
+        store.lock_path.write_text("1")
+        os.utime(store.lock_path, (1, 1))
+        with store.transaction() as orgs:
+            assert orgs == {}
+
+    def test_load__other_version(self, store):
+        store.path.write_text(json.dumps({"version": 0, "orgs": {}}))
+        with pytest.raises(ScratchOrgPoolError, match="another version"):
+            store.load()
+
+    def test_load__unreadable(self, store):
+        store.path.write_text("{")
+        with pytest.raises(ScratchOrgPoolError, match="Unable to read"):
+            store.load()
+
+    def test_for_project(self, tmp_path):
+        project_config = mock.Mock(project_local_dir=str(tmp_path))
+        store = ScratchOrgPoolStore.for_project(project_config)
+        assert store.path == tmp_path / "scratch_org_pool.json"
+
+        project_config.project_local_dir = None
+        with pytest.raises(ScratchOrgPoolError):
+            ScratchOrgPoolStore.for_project(project_config)
@@ -1,4 +1,5 @@
 import io
+import os
 from unittest import mock
 from zipfile import ZipFile
 
@@ -98,6 +99,7 @@ def test_convert_sfdx():
         args=["-d", mock.ANY, "-r", path, "-n", "Test Package"],
         capture_output=True,
         check_return=True,
+        cwd=None,
     )
 
 
@@ -114,6 +116,25 @@ def test_convert_sfdx__cwd():
         args=["-d", mock.ANY, "-n", "Test Package"],
         capture_output=True,
         check_return=True,
+        cwd=None,
+    )
+
+
+def test_convert_sfdx__in_directory():
+    logger = mock.Mock()
+    with temporary_dir(chdir=False) as path:
+        os.mkdir(os.path.join(path, "force-app"))
+        touch(os.path.join(path, "force-app", "README.md"))
+        with mock.patch("cumulusci.core.sfdx.sfdx") as sfdx:
+            with convert_sfdx_source("force-app", None, logger, cwd=path) as p:
+                assert p is not None
+
+    sfdx.assert_called_once_with(
+        "project convert source",
+        args=["-d", mock.ANY, "-r", os.path.join(path, "force-app")],
+        capture_output=True,
+        check_return=True,
+        cwd=path,
     )
 
 
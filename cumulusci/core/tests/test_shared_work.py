@@ -0,0 +1,101 @@
+import io
+import threading
+import zipfile
+from unittest import mock
+
+import pytest
+
+from cumulusci.core.shared_work import SharedWork, shared_work_for, tree_stamp
+
+
+@pytest.fixture
+def work(tmp_path):
+    return SharedWork(tmp_path)
+
+
+class TestSharedWork:
+    def test_get_or_compute(self, work):
+        compute = mock.Mock(return_value="result")
+        assert work.get_or_compute("key", compute) == "result"
+        assert work.get_or_compute("key", compute) == "result"
+        assert work.get_or_compute("other", compute) == "result"
+        assert compute.call_count == 2
+
+    def test_get_or_compute__concurrent(self, work):
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return "result"
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(work.get_or_compute("key", compute))
+            )
+            for _ in range(3)
+        ]
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert results == ["result"] * 3
+        assert len(calls) == 1
+
+    def test_get_or_compute__exception_not_kept(self, work):
+        compute = mock.Mock(side_effect=[ValueError("Failed"), "result"])
+        with pytest.raises(ValueError):
+            work.get_or_compute("key", compute)
+        assert work.get_or_compute("key", compute) == "result"
+
+    def test_file__nothing_to_write(self, work):
+        assert work.file("key", lambda path: False) is None
+
+    def test_open_file(self, work):
+        build = mock.Mock(side_effect=lambda: io.BytesIO(b"contents"))
+        with work.open_file("key", build) as f:
+            assert f.read() == b"contents"
+        with work.open_file("key", build) as f:
+            assert f.read() == b"contents"
+        build.assert_called_once()
+
+    def test_open_file__none(self, work):
+        assert work.open_file("key", lambda: None) is None
+
+    def test_zip_file(self, work):
+        def build():
+            zf = zipfile.ZipFile(io.BytesIO(), "w")
+            zf.writestr("src/package.xml", "<Package/>")
+            return zf
+
+        first = work.zip_file("key", build)
+        second = work.zip_file("key", build)
+        assert first is not second
+        assert first.filename == second.filename
+        assert second.read("src/package.xml") == b"<Package/>"
+
+
+def test_shared_work_for(tmp_path):
+    work = SharedWork(tmp_path)
+    assert shared_work_for(mock.Mock(shared_work=work)) is work
+    assert shared_work_for(mock.Mock()) is None
+    assert shared_work_for(None) is None
+
+
+def test_tree_stamp(tmp_path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "a.txt").write_text("a")
+    stamp = tree_stamp(tmp_path)
+    assert stamp[:2] == (1, 1)
+
+    (tmp_path / "b.txt").write_text("bb")
+    assert tree_stamp(tmp_path)[:2] == (2, 3)
+    assert tree_stamp(tmp_path) != stamp
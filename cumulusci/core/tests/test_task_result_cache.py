@@ -0,0 +1,92 @@
+import os
+from unittest import mock
+
+import pytest
+
+from cumulusci.core.task_result_cache import (
+    DEFAULT_TTL,
+    DISABLE_ENV_VAR,
+    TaskResultCache,
+)
+from cumulusci.core.tasks import BaseTask
+
+
+class _OtherTask(BaseTask):
+    pass
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return TaskResultCache(tmp_path / "cache", ttl=60)
+
+
+class TestTaskResultCache:
+    def test_roundtrip(self, cache):
+        key = cache.key_for("00D000000000001", BaseTask, {})
+        cache.set(key, ["package"])
+        assert cache.get(key) == {"return_values": ["package"]}
+
+    def test_roundtrip__none(self, cache):
+        cache.set("key", None)
+        assert cache.get("key") == {"return_values": None}
+
+    def test_get__missing(self, cache):
+        assert cache.get("missing") is None
+
+    def test_get__expired(self, cache):
+        cache.set("key", True)
+        entry = cache.cache_dir / "key.pickle"
+        os.utime(entry, (1, 1))
+        assert cache.get("key") is None
+        assert not entry.exists()
+
+    def test_get__corrupt_entry_discarded(self, cache):
+        cache.cache_dir.mkdir(parents=True)
+        entry = cache.cache_dir / "bad.pickle"
+        entry.write_bytes(b"not a pickle")
+        assert cache.get("bad") is None
+        assert not entry.exists()
+
+    def test_set__prunes_expired_entries(self, cache):
+        cache.set("old", 1)
+        os.utime(cache.cache_dir / "old.pickle", (1, 1))
+        cache.set("new", 2)
+        assert sorted(p.name for p in cache.cache_dir.iterdir()) == ["new.pickle"]
+
+    def test_set__write_failure_ignored(self, cache):
+        cache.set("unpicklable", lambda: None)
+        assert cache.get("unpicklable") is None
+        assert list(cache.cache_dir.iterdir()) == []
+
+    def test_delete(self, cache):
+        cache.set("one", 1)
+        cache.set("two", 2)
+        cache.delete("one")
+        cache.delete("missing")
+        assert cache.get("one") is None
+        assert cache.get("two") == {"return_values": 2}
+
+    def test_clear(self, cache):
+        cache.set("one", 1)
+        cache.set("two", 2)
+        cache.clear()
+        assert cache.get("one") is None
+        assert cache.get("two") is None
+
+    def test_key_for(self, cache):
+        key = cache.key_for("00D000000000001", BaseTask, {"a": 1, "b": 2})
+        assert key == cache.key_for("00D000000000001", BaseTask, {"b": 2, "a": 1})
+        assert key != cache.key_for("00D000000000002", BaseTask, {"a": 1, "b": 2})
+        assert key != cache.key_for("00D000000000001", _OtherTask, {"a": 1, "b": 2})
+        assert key != cache.key_for("00D000000000001", BaseTask, {"a": 1})
+
+    def test_default(self, tmp_path):
+        with mock.patch.dict(os.environ, {}, clear=False):
+            os.environ.pop(DISABLE_ENV_VAR, None)
+            cache = TaskResultCache.default()
+        assert cache.cache_dir.name == "preflight_cache"
+        assert cache.ttl == DEFAULT_TTL
+
+    def test_default__disabled(self):
+        with mock.patch.dict(os.environ, {DISABLE_ENV_VAR: "1"}):
+            assert TaskResultCache.default() is None
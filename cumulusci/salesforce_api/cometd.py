@@ -0,0 +1,163 @@
+"""A minimal CometD (Bayeux) client for the Salesforce Streaming API.
+
+Only the long-polling transport is supported, which is all Salesforce
+offers. Events are delivered to listeners from a background thread:
+
+>>> client = CometDClient(org_config, "62.0")
+>>> client.add_listener(print)
+>>> client.subscribe("/event/Deploy_Status__e")
+>>> client.start()
+...
+>>> client.stop()
+"""
+
+import itertools
+import logging
+import threading
+import typing as T
+
+import requests
+
+from cumulusci.salesforce_api.exceptions import StreamingApiError
+
+logger = logging.getLogger(__name__)
+
+Listener = T.Callable[[dict], None]
+
+
+class CometDClient:
+    """Subscribes to Streaming API channels and dispatches their events"""
+
+    # Salesforce holds a long poll open for up to 110 seconds.
+    timeout = 120
+
+    def __init__(self, org_config, api_version: str):
+        self.org_config = org_config
+        self.endpoint = f"{org_config.instance_url}/cometd/{api_version}"
+        self.client_id = None
+        self.subscriptions: T.Set[str] = set()
+        self.listeners: T.List[Listener] = []
+        self.session = requests.Session()
+        self._message_ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def add_listener(self, listener: Listener):
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener: Listener):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def subscribe(self, channel: str):
+        with self._lock:
+            self.subscriptions.add(channel)
+            if self.client_id:
+                self._subscribe(channel)
+
+    def handshake(self):
+        with self._lock:
+            self.client_id = None
+            reply = self._meta_reply(
+                self._send(
+                    {
+                        "channel": "/meta/handshake",
+                        "version": "1.0",
+                        "minimumVersion": "1.0",
+                        "supportedConnectionTypes": ["long-polling"],
+                    }
+                ),
+                "/meta/handshake",
+            )
+            self.client_id = reply["clientId"]
+            for channel in sorted(self.subscriptions):
+                self._subscribe(channel)
+
+    def connect(self) -> T.List[dict]:
+        """Long-poll once and return the events that arrived"""
+        replies = self._send(
+            {"channel": "/meta/connect", "connectionType": "long-polling"}
+        )
+        events = []
+        for reply in replies:
+            if reply.get("channel") != "/meta/connect":
+                events.append(reply)
+            elif not reply.get("successful"):
+                advice = reply.get("advice") or {}
+                if advice.get("reconnect") == "handshake":
+                    self.handshake()
+                else:
+                    raise StreamingApiError(
+                        f"CometD connect failed: {reply.get('error')}"
+                    )
+        return events
+
+    def disconnect(self):
+        if self.client_id:
+            self._send({"channel": "/meta/disconnect"})
+            self.client_id = None
+
+    def start(self):
+        """Start delivering events to the listeners from a daemon thread"""
+        if self._thread:
+            return
+        self.handshake()
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="cometd", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        try:
+            self.disconnect()
+        except Exception as e:
+            logger.debug(f"CometD disconnect failed: {e}")
+        self._thread = None
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                events = self.connect()
+            except Exception as e:
+                if self._stopped.is_set():
+                    return
+                logger.debug(f"CometD connect failed, handshaking again: {e}")
+                try:
+                    self.handshake()
+                except Exception as e:
+                    logger.warning(f"Lost connection to the Streaming API: {e}")
+                    return
+                continue
+            for event in events:
+                for listener in list(self.listeners):
+                    listener(event)
+
+    def _subscribe(self, channel: str):
+        self._meta_reply(
+            self._send({"channel": "/meta/subscribe", "subscription": channel}),
+            "/meta/subscribe",
+        )
+
+    def _send(self, message: dict) -> T.List[dict]:
+        message = {"id": str(next(self._message_ids)), **message}
+        if self.client_id:
+            message["clientId"] = self.client_id
+        response = self.session.post(
+            self.endpoint,
+            json=[message],
+            headers={"Authorization": f"Bearer {self.org_config.access_token}"},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def _meta_reply(self, replies: T.List[dict], channel: str) -> dict:
+        for reply in replies:
+            if reply.get("channel") == channel:
+                if not reply.get("successful"):
+                    raise StreamingApiError(
+                        f"CometD {channel} failed: {reply.get('error')}"
+                    )
+                return reply
+        raise StreamingApiError(f"No reply to CometD {channel}")
@@ -21,3 +21,7 @@ class MissingOAuthError(CumulusCIException):
 
 class MissingOrgCredentialsError(CumulusCIException):
     pass
+
+
+class StreamingApiError(CumulusCIException):
+    pass
@@ -9,15 +9,17 @@ based on mrbelvedere/mpinstaller/mdapi.py
 
 import base64
 import http.client
-import io
 import re
-import time
+import tempfile
 from collections import defaultdict
+from typing import Dict, List, Optional
+from xml.sax.handler import ContentHandler
 from xml.sax.saxutils import escape
 from zipfile import ZipFile
 
 import requests
 from defusedxml.minidom import parseString
+from defusedxml.sax import make_parser
 from requests.adapters import HTTPAdapter
 from requests.packages.urllib3.util.retry import Retry
 
@@ -28,7 +30,10 @@ from cumulusci.salesforce_api.exceptions import (
     MetadataComponentFailure,
     MetadataParseError,
 )
-from cumulusci.utils import parse_api_datetime, zip_subfolder
+from cumulusci.salesforce_api.status_waiters import PollingWaiter
+from cumulusci.utils import parse_api_datetime
+from cumulusci.utils.http.streaming_body import FilePart, StreamingBody
+from cumulusci.utils.ziputils import zip_subfolder_in_place
 
 # If pyOpenSSL is installed, make sure it's not used for requests
 # (it's not needed in the verisons of Python we support)
@@ -40,10 +45,101 @@ else:
     pyopenssl.extract_from_urllib3()
 
 INVALID_CROSS_REF_ERROR = "INVALID_CROSS_REFERENCE_KEY: No package named"
+# Stands in for a package zip that is streamed into the deploy envelope
+PACKAGE_ZIP_PLACEHOLDER = "###PACKAGE_ZIP###"
 
 retry_policy = Retry(backoff_factor=0.3)
 
 
+class RetrieveResultReader(ContentHandler):
+    """Reads the zipFile out of a retrieve result without loading the
+    whole SOAP response into memory.
+
+    The response body is parsed incrementally as it streams in, and the
+    base64 text of the zipFile element is decoded chunk by chunk into a
+    temporary file, which spills to disk once it gets large. Text in other
+    elements (status, messages, etc.) is kept in `text`, and the start of
+    the raw body in `head`, for error reporting. Each of the result's
+    messages is kept in `messages`, e.g. {"fileName": ..., "problem": ...}.
+
+    With read_zip_file=False, the zipFile is skipped, for callers which
+    only need the messages."""
+
+    chunk_size = 1024 * 1024
+    head_size = 64 * 1024
+    max_memory_size = 32 * 1024 * 1024
+
+    def __init__(self, read_zip_file: bool = True):
+        super().__init__()
+        self.read_zip_file = read_zip_file
+        self.zip_file = None
+        self.messages: List[Dict[str, str]] = []
+        self._in_zip_file = False
+        self._undecoded = ""
+        self._text = []
+        self._message = None
+        self._message_field = None
+        self.head = b""
+
+    @property
+    def text(self) -> str:
+        return "".join(self._text)
+
+    def read(self, response: requests.Response) -> Optional[ZipFile]:
+        """Return the retrieved zip file, or None if there is none"""
+        parser = make_parser()
+        parser.setContentHandler(self)
+        for chunk in response.iter_content(self.chunk_size):
+            if len(self.head) < self.head_size:
+                self.head += chunk[: self.head_size - len(self.head)]
+            parser.feed(chunk)
+        parser.close()
+
+        if self.zip_file is None:
+            return None
+        self.zip_file.seek(0)
+        return ZipFile(self.zip_file, "r")
+
+    def startElement(self, name, attrs):
+        local_name = name.rsplit(":", 1)[-1]
+        if local_name == "zipFile":
+            self._in_zip_file = True
+            if self.read_zip_file:
+                self.zip_file = tempfile.SpooledTemporaryFile(
+                    max_size=self.max_memory_size
+                )
+        elif local_name == "messages":
+            self._message = {}
+        elif self._message is not None:
+            self._message_field = local_name
+            self._message[local_name] = ""
+
+    def endElement(self, name):
+        if self._in_zip_file:
+            self._in_zip_file = False
+            if self._undecoded and self.zip_file:
+                # Not a multiple of 4 characters; let base64 complain about it
+                self.zip_file.write(base64.b64decode(self._undecoded))
+        elif name.rsplit(":", 1)[-1] == "messages" and self._message is not None:
+            self.messages.append(self._message)
+            self._message = None
+        self._message_field = None
+
+    def characters(self, content):
+        if not self._in_zip_file:
+            self._text.append(content)
+            if self._message_field:
+                self._message[self._message_field] += content
+            return
+        if not self.zip_file:
+            return
+        # Decode whole 4-character groups and carry the rest over.
+        data = self._undecoded + "".join(content.split())
+        split = len(data) - len(data) % 4
+        self.zip_file.write(base64.b64decode(data[:split]))
+        self._undecoded = data[split:]
+
+
 class BaseMetadataApiCall(object):
     check_interval = 1
     soap_envelope_start = None
@@ -52,12 +148,19 @@ class BaseMetadataApiCall(object):
     soap_action_start = None
     soap_action_status = None
     soap_action_result = None
+    # Leave the body of the result response unread for _process_response
+    # to stream.
+    stream_result = False
+    # Decides when the status is checked (see status_waiters). Defaults to
+    # polling on a capped exponential schedule starting at check_interval.
+    waiter = None
 
     def __init__(self, task, api_version=None):
         # the cumulusci context object contains logger, oauth, ID, secret, etc
         self.task = task
         self.status = None
         self.check_num = 1
+        self.process_id = None
         self.api_version = (
             api_version
             if api_version
@@ -103,7 +206,7 @@ class BaseMetadataApiCall(object):
             "SOAPAction": action,
         }
 
-    def _call_mdapi(self, headers, envelope, refresh=None):
+    def _call_mdapi(self, headers, envelope, refresh=None, stream=False):
         # Insert the session id
         session_id = self.task.org_config.access_token
         auth_envelope = envelope.replace("###SESSION_ID###", session_id)
@@ -113,23 +216,44 @@ class BaseMetadataApiCall(object):
         response = session.post(
             self._build_endpoint_url(),
             headers=headers,
-            data=auth_envelope.encode("utf-8"),
+            data=self._build_request_body(auth_envelope),
+            stream=stream,
         )
+        if stream and response.status_code == http.client.OK:
+            # SOAP faults come with an error status, so there is nothing
+            # to check before the caller consumes the body.
+            return response
         faultcode = parseString(response.content).getElementsByTagName("faultcode")
         # refresh = False can be passed to prevent a loop if refresh fails
         if refresh is None:
             refresh = True
         if faultcode:
-            return self._handle_soap_error(headers, envelope, refresh, response)
+            return self._handle_soap_error(
+                headers, envelope, refresh, response, stream=stream
+            )
         return response
 
+    def _build_request_body(self, envelope: str):
+        return envelope.encode("utf-8")
+
     def _get_element_value(self, dom, tag):
         result = dom.getElementsByTagName(tag)
         if result and result[0].firstChild:
             return result[0].firstChild.nodeValue
 
+    def _get_waiter(self):
+        return self.waiter or PollingWaiter(initial_interval=self.check_interval)
+
     def _get_check_interval(self):
-        return self.check_interval * ((self.check_num // 3) + 1)
+        return self._get_waiter().interval(self.check_num)
+
+    def check_status(self) -> bool:
+        """Check the status of the operation once; True if it has finished"""
+        envelope = self._build_envelope_status()
+        headers = self._build_headers(self.soap_action_status, envelope)
+        response = self._call_mdapi(headers, envelope)
+        self._status_response = self._process_response_status(response)
+        return self.status in ["Done", "Failed"]
 
     def _get_response(self):
         if not self.soap_envelope_start:
@@ -144,30 +268,17 @@ class BaseMetadataApiCall(object):
         # Process the response to set self.process_id with the process id
         # started
         response = self._process_response_start(response)
-        # Check the status if configured
-        if self.soap_envelope_status:
-            while self.status not in ["Done", "Failed"]:
-                # Check status in a loop until done
-                envelope = self._build_envelope_status()
-                headers = self._build_headers(self.soap_action_status, envelope)
-                response = self._call_mdapi(headers, envelope)
-                response = self._process_response_status(response)
-
-                # start increasing the check interval progressively to handle long pending jobs
-                check_interval = self._get_check_interval()
-                self.check_num += 1
-
-                time.sleep(check_interval)
-            # Fetch the final result and return
-            if self.soap_envelope_result:
-                envelope = self._build_envelope_result()
-                headers = self._build_headers(self.soap_action_result, envelope)
-                response = self._call_mdapi(headers, envelope)
-            else:
-                return response
+        # Check the status until done
+        self._get_waiter().wait(self)
+        response = self._status_response
+        # Fetch the final result and return
+        if self.soap_envelope_result:
+            envelope = self._build_envelope_result()
+            headers = self._build_headers(self.soap_action_result, envelope)
+            response = self._call_mdapi(headers, envelope, stream=self.stream_result)
         return response
 
-    def _handle_soap_error(self, headers, envelope, refresh, response):
+    def _handle_soap_error(self, headers, envelope, refresh, response, stream=False):
         resp_xml = parseString(response.content)
         faultcode = resp_xml.getElementsByTagName("faultcode")
         if faultcode:
@@ -187,7 +298,7 @@ class BaseMetadataApiCall(object):
                 self.task.org_config.refresh_oauth_token(
                     self.task.project_config.keychain
                 )
-                return self._call_mdapi(headers, envelope, refresh=False)
+                return self._call_mdapi(headers, envelope, refresh=False, stream=stream)
         # Log the error
         message = f"{faultcode}: {faultstring}"
         self._set_status("Failed", message)
@@ -268,6 +379,7 @@ class ApiRetrieveUnpackaged(BaseMetadataApiCall):
     soap_action_start = "retrieve"
     soap_action_status = "checkStatus"
     soap_action_result = "checkRetrieveStatus"
+    stream_result = True
 
     def __init__(self, task, package_xml, api_version):
         super(ApiRetrieveUnpackaged, self).__init__(task, api_version)
@@ -288,13 +400,10 @@ class ApiRetrieveUnpackaged(BaseMetadataApiCall):
 
     def _process_response(self, response):
         # Parse the metadata zip file from the response
-        zipstr = parseString(response.content).getElementsByTagName("zipFile")
-        if zipstr:
-            zipstr = zipstr[0].firstChild.nodeValue
-        zipstringio = io.BytesIO(base64.b64decode(zipstr))
-        zipfile = ZipFile(zipstringio, "r")
-        zipfile = zip_subfolder(zipfile, "unpackaged")
-        return zipfile
+        zipfile = RetrieveResultReader().read(response)
+        if zipfile is None:
+            raise MetadataParseError("No zipFile in retrieve result", response)
+        return zip_subfolder_in_place(zipfile, "unpackaged")
 
 
 class ApiRetrieveInstalledPackages(BaseMetadataApiCall):
@@ -305,6 +414,7 @@ class ApiRetrieveInstalledPackages(BaseMetadataApiCall):
     soap_action_start = "retrieve"
     soap_action_status = "checkStatus"
     soap_action_result = "checkRetrieveStatus"
+    stream_result = True
 
     def __init__(self, task, api_version=None):
         super(ApiRetrieveInstalledPackages, self).__init__(task, api_version)
@@ -312,13 +422,9 @@ class ApiRetrieveInstalledPackages(BaseMetadataApiCall):
 
     def _process_response(self, response):
         # Parse the metadata zip file from the response
-        zipstr = parseString(response.content).getElementsByTagName("zipFile")
-        if zipstr:
-            zipstr = zipstr[0].firstChild.nodeValue
-        else:
+        zipfile = RetrieveResultReader().read(response)
+        if zipfile is None:
             return self.packages
-        zipstringio = io.BytesIO(base64.b64decode(zipstr))
-        zipfile = ZipFile(zipstringio, "r")
         # Loop through all files in the zip skipping anything other than
         # InstalledPackages
         for path in zipfile.namelist():
@@ -342,6 +448,7 @@ class ApiRetrievePackaged(BaseMetadataApiCall):
     soap_action_start = "retrieve"
     soap_action_status = "checkStatus"
     soap_action_result = "checkRetrieveStatus"
+    stream_result = True
 
     def __init__(self, task, package_name, api_version):
         super(ApiRetrievePackaged, self).__init__(task, api_version)
@@ -353,19 +460,26 @@ class ApiRetrievePackaged(BaseMetadataApiCall):
         )
 
     def _process_response(self, response):
-        if INVALID_CROSS_REF_ERROR in response.content.decode("utf-8"):
-            raise CumulusCIException(
-                f"No package found in org with name: {self.package_name}"
-            )
-
-        # Parse the metadata zip file from the response
-        zipstr = parseString(response.content).getElementsByTagName("zipFile")
-        if zipstr:
-            zipstr = zipstr[0].firstChild.nodeValue
-        zipstringio = io.BytesIO(base64.b64decode(zipstr))
-        zipfile = ZipFile(zipstringio, "r")
+        reader = RetrieveResultReader()
+        try:
+            # Parse the metadata zip file from the response
+            zipfile = reader.read(response)
+        except Exception:
+            # The error may not come wrapped in a well-formed result
+            if INVALID_CROSS_REF_ERROR in reader.head.decode("utf-8", "replace"):
+                self._raise_package_not_found()
+            raise
+        if INVALID_CROSS_REF_ERROR in reader.text:
+            self._raise_package_not_found()
+        if zipfile is None:
+            raise MetadataParseError("No zipFile in retrieve result", response)
         return zipfile
 
+    def _raise_package_not_found(self):
+        raise CumulusCIException(
+            f"No package found in org with name: {self.package_name}"
+        )
+
 
 class ApiDeploy(BaseMetadataApiCall):
     soap_envelope_start = soap_envelopes.DEPLOY
@@ -415,7 +529,9 @@ class ApiDeploy(BaseMetadataApiCall):
             else ""
         )
         return self.soap_envelope_start.format(
-            package_zip=self.package_zip,
+            package_zip=self.package_zip
+            if isinstance(self.package_zip, str)
+            else PACKAGE_ZIP_PLACEHOLDER,
             check_only=self.check_only,
             purge_on_delete=self.purge_on_delete,
             test_level=test_level,
@@ -423,6 +539,17 @@ class ApiDeploy(BaseMetadataApiCall):
             api_version=self.api_version,
         )
 
+    def _build_request_body(self, envelope: str):
+        if PACKAGE_ZIP_PLACEHOLDER not in envelope:
+            return super()._build_request_body(envelope)
+        # Base64 encode the zip file while sending it, rather than in memory
+        before, after = envelope.split(PACKAGE_ZIP_PLACEHOLDER, 1)
+        return StreamingBody(
+            before.encode("utf-8"),
+            FilePart(self.package_zip, base64=True),
+            after.encode("utf-8"),
+        )
+
     def _process_response(self, response):
         resp_xml = parseString(response.content)
         status = resp_xml.getElementsByTagName("status")
@@ -1,5 +1,6 @@
 import gzip
 import re
+import time
 import typing as T
 from collections import defaultdict
 from contextlib import ExitStack, contextmanager
@@ -25,7 +26,10 @@ from cumulusci.utils.http.multi_request import (
     RECOVERABLE_ERRORS,
     CompositeParallelSalesforce,
 )
-from cumulusci.utils.salesforce.count_sobjects import count_sobjects
+from cumulusci.utils.salesforce.count_sobjects import (
+    count_sobjects,
+    count_sobjects_from_record_count,
+)
 
 y2k = "Sat, 1 Jan 2000 00:00:01 GMT"
 
@@ -104,6 +108,22 @@ class Filters(Enum):
     populated = SObject.count > 0  # does it have data in the org?
 
 
+class CountMethod(Enum):
+    """Ways of counting the records of each SObject"""
+
+    soql = "soql"  # exact: `select count() from X` per object
+    record_count = "record_count"  # approximate: REST limits/recordCount
+    exists = "exists"  # 1 or 0: `select Id from X limit 1` per object
+
+
+# Cached counts taken with any of these methods can stand in for each method
+USABLE_CACHED_COUNTS = {
+    CountMethod.soql: {CountMethod.soql},
+    CountMethod.record_count: {CountMethod.soql, CountMethod.record_count},
+    CountMethod.exists: set(CountMethod),
+}
+
+
 # TODO: Profiling and optimizing of the
 #      SQL parts. After the object is frozen,
 #      all query-sets can be cached as
@@ -165,12 +185,33 @@ class Schema:
     def __repr__(self):
         return f"<Schema {self.path} : {self.engine}>"
 
-    def add_counts(self, counts: T.Dict[str, int]):
+    def add_counts(
+        self, counts: T.Dict[str, int], method: CountMethod = CountMethod.soql
+    ):
+        now = time.time()
         for objname, count in counts.items():
             obj = self.get(objname)
             if obj:
                 obj.count = count
-        self.includes_counts = True
+                obj.count_timestamp = now
+                obj.count_method = method.value
+        # Existence checks only store 1 or 0, which are not real counts
+        if method != CountMethod.exists:
+            self.includes_counts = True
+
+    def cached_counts(
+        self, objnames: T.Sequence[str], max_age: float, method: CountMethod
+    ) -> T.Dict[str, int]:
+        """Counts stored in the schema that are younger than `max_age` seconds
+        and were taken with a method at least as precise as `method`"""
+        oldest = time.time() - max_age
+        usable_methods = [m.value for m in USABLE_CACHED_COUNTS[method]]
+        rows = self.session.query(SObject.name, SObject.count).filter(
+            SObject.name.in_(objnames),
+            SObject.count_timestamp >= oldest,
+            SObject.count_method.in_(usable_methods),
+        )
+        return {name: count for name, count in rows}
 
     def populate_cache(
         self,
@@ -181,6 +222,8 @@ class Schema:
         logger=None,
         *,
         include_counts: bool = False,
+        count_method: CountMethod = CountMethod.soql,
+        counts_max_age: T.Optional[float] = None,
     ) -> T.Union[T.Dict[str, int], T.Dict[str, None]]:
         """Populate a schema cache from the API, using last_modified_date
         to pull down only new schema"""
@@ -219,7 +262,14 @@ class Schema:
 
         self._populate_cache_from_describe(changes)
         if include_counts:
-            results = populate_counts(sf, self, sobj_names, logger)
+            results = populate_counts(
+                sf,
+                self,
+                sobj_names,
+                logger,
+                method=count_method,
+                max_age=counts_max_age,
+            )
         else:
             results = {name: None for name in sobj_names}
         return results
@@ -231,12 +281,24 @@ class Schema:
         metadata.bind = engine
         metadata.reflect()
 
+        # Replacing an SObject's row shouldn't lose its cached record count
+        counts = {
+            row.name: row._asdict()
+            for row in self.session.query(
+                SObject.name,
+                SObject.count,
+                SObject.count_timestamp,
+                SObject.count_method,
+            ).filter(SObject.count_timestamp.isnot(None))
+        }
+
         with BufferedSession(engine, metadata) as sess:
 
             for (sobj_data, last_modified) in describe_objs:
                 sobj_data = sobj_data.copy()
                 fields = sobj_data.pop("fields")
                 sobj_data["last_modified_date"] = last_modified
+                sobj_data.update(counts.get(sobj_data["name"], {}))
                 create_row(sess, SObject, sobj_data)
                 for field in fields:
                     field["sobject"] = sobj_data["name"]
@@ -247,7 +309,7 @@ class Schema:
         engine.execute("vacuum")
 
     FormatVersion = "FormatVersion"
-    CurrentFormatVersion = 2
+    CurrentFormatVersion = 3
 
     @property
     def version(self) -> int:
@@ -338,6 +400,8 @@ def get_org_schema(
     org_config,
     *,
     include_counts: bool = False,
+    count_method: CountMethod = CountMethod.soql,
+    counts_max_age: T.Optional[float] = None,
     filters: T.Sequence[Filters] = (),
     patterns_to_ignore: T.Tuple[str, ...] = (),
     included_objects: T.List[str] = (),
@@ -351,13 +415,22 @@ def get_org_schema(
 
     include_counts: query each queryable/retrievable object count.
                     This takes time and may even timeout in huge orgs!
+    count_method: a CountMethod. `soql` (default) counts exactly, one
+                    query per object. `record_count` asks the REST
+                    limits/recordCount resource for approximate counts of
+                    many objects at once. `exists` only checks whether each
+                    object has any records, so counts are 1 or 0 and the
+                    schema's `includes_counts` stays False.
+    counts_max_age: reuse counts stored in the schema cache if they are
+                    younger than this many seconds. None (default) always
+                    recounts.
     filters: A sequence of Filters which are the same as Salesforce SObject properties
             like .createable, .deletable etc. Objects that do not match are ignored.
             Two special filters exist:
                 * Filters.extractable, which uses heuristics to limit to objects
                     that extract properly
                 * Filters.populated, which limits to objects that have data in them.
-                    This depends upon `include_counts`
+                    Without `include_counts` this uses `exists` checks.
     included_objects: Ignore objects not in this list. Stacks with other filters
     patterns_to_ignore: Strings in SQL %LIKE% syntax that match SObjects to be
                         ignored.
@@ -381,8 +454,9 @@ def get_org_schema(
         if Filters.populated in filters:
             filters.add(Filters.queryable)
             filters.add(Filters.retrieveable)
-            # experiment with removing this limitation by using limit 1 query instead
-            assert include_counts, "Filters.populated depends on include_counts"
+            if not include_counts:
+                include_counts = True
+                count_method = CountMethod.exists
             patterns_to_ignore += NOT_COUNTABLE
 
         if Filters.extractable in filters:
@@ -434,10 +508,11 @@ def get_org_schema(
                 patterns_to_ignore,
                 logger,
                 include_counts=include_counts,
+                count_method=count_method,
+                counts_max_age=counts_max_age,
             )
 
             if Filters.populated in filters:
-                # another way to compute this might be by querying the first ID
                 objs_to_include = [
                     objname for objname, count in populated_objs.items() if count > 0
                 ]
@@ -478,9 +553,34 @@ class ZippableTempDb:
         return create_engine(f"sqlite:///{str(self.tempfile)}")
 
 
-def populate_counts(sf, schema, objs_cached, logger) -> T.Dict[str, int]:
-    objects_to_count = [objname for objname in objs_cached]
-    counts, transports_errors, salesforce_errors = count_sobjects(sf, objects_to_count)
+def populate_counts(
+    sf,
+    schema,
+    objs_cached,
+    logger,
+    *,
+    method: CountMethod = CountMethod.soql,
+    max_age: T.Optional[float] = None,
+) -> T.Dict[str, int]:
+    cached_counts = {}
+    if max_age is not None:
+        cached_counts = schema.cached_counts(objs_cached, max_age, method)
+    objects_to_count = [
+        objname for objname in objs_cached if objname not in cached_counts
+    ]
+    if cached_counts:
+        logger.info(f"Reusing cached record counts for {len(cached_counts)} objects")
+
+    if not objects_to_count:
+        result = ({}, [], [])
+    elif method == CountMethod.record_count:
+        result = count_sobjects_from_record_count(sf, objects_to_count)
+    elif method == CountMethod.exists:
+        result = count_sobjects(sf, objects_to_count, exists_only=True)
+    else:
+        result = count_sobjects(sf, objects_to_count)
+    counts, transports_errors, salesforce_errors = result
+
     errors = transports_errors + salesforce_errors
     for error in errors[0:10]:
         logger.warning(f"Error counting SObjects: {error}")
@@ -488,9 +588,10 @@ def populate_counts(sf, schema, objs_cached, logger) -> T.Dict[str, int]:
     if len(errors) > 10:
         logger.warning(f"{len(errors)} more counting errors suppressed")
 
-    schema.add_counts(counts)
-    schema.session.flush()
-    return counts
+    schema.add_counts(counts, method)
+    # commit so that the counts are saved in the cache file
+    schema.session.commit()
+    return {**cached_counts, **counts}
 
 
 class DescribeResponse(NamedTuple):
@@ -4,6 +4,7 @@ import sqlalchemy.types as types
 from sqlalchemy import (
     Boolean,
     Column,
+    Float,
     ForeignKey,
     Integer,
     PrimaryKeyConstraint,
@@ -126,6 +127,8 @@ class SObject(OrgSchemaModelMixin, Base):
     supportedScopes = Column(SequenceType)
     actionOverrides = Column(SequenceType)
     count = Column(Integer)
+    count_timestamp = Column(Float)  # time.time() when `count` was fetched
+    count_method = Column(String)  # a CountMethod value
     last_modified_date = Column(String)
 
     @property
@@ -1,11 +1,11 @@
 import html
-import io
 import logging
 import os
 import pathlib
+import tempfile
 import typing as T
 import zipfile
-from base64 import b64encode
+from base64 import b64decode, b64encode
 from xml.sax.saxutils import escape
 
 from cumulusci.core.dependencies.utils import TaskContext
@@ -50,6 +50,23 @@ INSTALLED_PACKAGE = """<?xml version="1.0" encoding="UTF-8"?>
 
 DEFAULT_LOGGER = logging.getLogger(__name__)
 
+# Package zips bigger than this are spooled to disk while they are built.
+MAX_IN_MEMORY_ZIP_SIZE = 32 * 1024 * 1024
+
+# Deploy APIs accept a package zip either as base64 text or as a binary file.
+PackageZip = T.Union[str, T.IO[bytes]]
+
+
+def package_zip_file(package_zip: PackageZip) -> T.IO[bytes]:
+    """Return the zip bytes of `package_zip` as a file positioned at the start"""
+    if isinstance(package_zip, str):
+        fp = tempfile.SpooledTemporaryFile(max_size=MAX_IN_MEMORY_ZIP_SIZE)
+        fp.write(b64decode(package_zip))
+    else:
+        fp = package_zip
+    fp.seek(0)
+    return fp
+
 
 class BasePackageZipBuilder(object):
     def __init__(self):
@@ -57,7 +74,7 @@ class BasePackageZipBuilder(object):
 
     def _open_zip(self):
         """Start a new, empty zipfile"""
-        self.buffer = io.BytesIO()
+        self.buffer = tempfile.SpooledTemporaryFile(max_size=MAX_IN_MEMORY_ZIP_SIZE)
         self.zf = zipfile.ZipFile(self.buffer, "w", zipfile.ZIP_DEFLATED)
 
     def _write_package_xml(self, package_xml):
@@ -67,12 +84,20 @@ class BasePackageZipBuilder(object):
         self.zf.writestr(path, content)
 
     def as_bytes(self) -> bytes:
-        fp = self.zf.fp
-        self.zf.close()
-        value = fp.getvalue()
+        fp = self.as_file()
+        value = fp.read()
         fp.close()
         return value
 
+    def as_file(self) -> T.IO[bytes]:
+        """Finish the zip and return its file, positioned at the start.
+
+        Unlike as_bytes() and as_base64(), this doesn't copy the zip."""
+        fp = self.zf.fp
+        self.zf.close()
+        fp.seek(0)
+        return fp
+
     def as_base64(self) -> str:
         return b64encode(self.as_bytes()).decode("utf-8")
 
@@ -0,0 +1,208 @@
+"""Idempotent creation of permission assignment records.
+
+Assigning Permission Sets, Permission Set Groups and Permission Set
+Licenses to users, and Permission Sets to Permission Set Groups, all
+create junction records which link a parent record to a child record.
+PermissionAssignments reads the junction records which already exist
+with one query per relationship, and creates only the missing ones:
+
+>>> assignments = PermissionAssignments(sf, logger)
+>>> result = assignments.assign(
+...     PERMISSION_SET_ASSIGNMENT, [(user_id, permission_set_id), ...]
+... )
+>>> result.failed
+{}
+
+New records are created in chunks of 200 with the sObject Collections
+API, several chunks at a time. Running the same assignments again reads
+the current state and writes nothing.
+"""
+
+import json
+import logging
+import typing as T
+from concurrent.futures import ThreadPoolExecutor
+
+# The records of a collections request, and the ids in a SOQL IN clause
+CHUNK_SIZE = 200
+QUERY_CHUNK_SIZE = 500
+DEFAULT_MAX_PARALLEL = 4
+
+# (parent id, child id)
+Pair = T.Tuple[str, str]
+
+
+class Relationship(T.NamedTuple):
+    """A junction object linking a parent record to a child record"""
+
+    sobject: str
+    parent_field: str
+    child_field: str
+
+
+PERMISSION_SET_ASSIGNMENT = Relationship(
+    "PermissionSetAssignment", "AssigneeId", "PermissionSetId"
+)
+PERMISSION_SET_GROUP_ASSIGNMENT = Relationship(
+    "PermissionSetAssignment", "AssigneeId", "PermissionSetGroupId"
+)
+PERMISSION_SET_LICENSE_ASSIGNMENT = Relationship(
+    "PermissionSetLicenseAssign", "AssigneeId", "PermissionSetLicenseId"
+)
+PERMISSION_SET_GROUP_COMPONENT = Relationship(
+    "PermissionSetGroupComponent", "PermissionSetGroupId", "PermissionSetId"
+)
+
+
+class AssignmentResult(T.NamedTuple):
+    """The outcome of assigning a set of pairs"""
+
+    # Pairs which were already assigned
+    existing: T.List[Pair]
+    # The sObject Collections result for each pair which was inserted
+    results: T.List[T.Tuple[Pair, dict]]
+
+    @property
+    def inserted(self) -> T.List[Pair]:
+        return [pair for pair, result in self.results if result.get("success")]
+
+    @property
+    def failed(self) -> T.Dict[Pair, str]:
+        """Error messages by pair, for the pairs which couldn't be inserted"""
+        return {
+            pair: _error_message(result)
+            for pair, result in self.results
+            if not result.get("success")
+        }
+
+    @property
+    def is_noop(self) -> bool:
+        return not self.results
+
+
+class PermissionAssignments:
+    """Reads and creates permission junction records in an org"""
+
+    def __init__(
+        self,
+        sf,
+        logger: T.Optional[logging.Logger] = None,
+        max_parallel: int = DEFAULT_MAX_PARALLEL,
+    ):
+        self.sf = sf
+        self.logger = logger or logging.getLogger(__name__)
+        self.max_parallel = max_parallel
+
+    def existing(
+        self,
+        relationship: Relationship,
+        parent_ids: T.Iterable[str],
+        child_ids: T.Iterable[str],
+    ) -> T.Set[Pair]:
+        """The pairs of these parents and children which are already linked"""
+        parent_ids = sorted(set(parent_ids))
+        child_ids = sorted(set(child_ids))
+        if not parent_ids or not child_ids:
+            return set()
+
+        # The query is only split if there are more ids than fit in a SOQL query.
+        pairs = set()
+        for parents in _chunks(parent_ids, QUERY_CHUNK_SIZE):
+            for children in _chunks(child_ids, QUERY_CHUNK_SIZE):
+                query = (
+                    f"SELECT {relationship.parent_field}, {relationship.child_field} "
+                    f"FROM {relationship.sobject} "
+                    f"WHERE {relationship.parent_field} IN ({_in_list(parents)}) "
+                    f"AND {relationship.child_field} IN ({_in_list(children)})"
+                )
+                for record in self.sf.query_all(query)["records"]:
+                    pairs.add(
+                        (
+                            record[relationship.parent_field],
+                            record[relationship.child_field],
+                        )
+                    )
+        return pairs
+
+    def assign(
+        self, relationship: Relationship, pairs: T.Iterable[Pair]
+    ) -> AssignmentResult:
+        """Link each (parent id, child id) pair which isn't linked yet."""
+        pairs = list(dict.fromkeys(pairs))
+        existing = self.existing(
+            relationship,
+            (parent for parent, _ in pairs),
+            (child for _, child in pairs),
+        )
+        missing = [pair for pair in pairs if pair not in existing]
+        already_assigned = [pair for pair in pairs if pair in existing]
+        if not missing:
+            self.logger.info(
+                f"All {len(pairs)} {relationship.sobject} records already exist. Nothing to do."
+            )
+            return AssignmentResult(already_assigned, [])
+
+        self.logger.info(
+            f"Creating {len(missing)} {relationship.sobject} records "
+            f"({len(already_assigned)} already exist)"
+        )
+        results = []
+        for pair, result in zip(missing, self.insert(relationship, missing)):
+            # Created by someone else since we looked
+            if _is_duplicate(result):
+                already_assigned.append(pair)
+            else:
+                results.append((pair, result))
+        return AssignmentResult(already_assigned, results)
+
+    def insert(self, relationship: Relationship, pairs: T.List[Pair]) -> T.List[dict]:
+        """Insert a junction record for each pair, and return the
+        sObject Collections result for each, in order."""
+        records = [
+            {
+                "attributes": {"type": relationship.sobject},
+                relationship.parent_field: parent,
+                relationship.child_field: child,
+            }
+            for parent, child in pairs
+        ]
+        chunks = list(_chunks(records, CHUNK_SIZE))
+        if len(chunks) == 1 or self.max_parallel == 1:
+            chunk_results = [self._insert_chunk(chunk) for chunk in chunks]
+        else:
+            with ThreadPoolExecutor(
+                max_workers=min(self.max_parallel, len(chunks))
+            ) as executor:
+                chunk_results = list(executor.map(self._insert_chunk, chunks))
+        return [result for results in chunk_results for result in results]
+
+    def _insert_chunk(self, records: T.List[dict]) -> T.List[dict]:
+        return self.sf.restful(
+            "composite/sobjects",
+            method="POST",
+            data=json.dumps({"allOrNone": False, "records": records}),
+        )
+
+
+def _chunks(items: T.List, size: int) -> T.Iterator[T.List]:
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+def _in_list(ids: T.List[str]) -> str:
+    return ", ".join("'" + id.replace("'", "\\'") + "'" for id in ids)
+
+
+def _is_duplicate(result: dict) -> bool:
+    return not result.get("success") and any(
+        error.get("statusCode") == "DUPLICATE_VALUE"
+        for error in result.get("errors") or []
+    )
+
+
+def _error_message(result: dict) -> str:
+    errors = result.get("errors") or []
+    return ", ".join(
+        f"{error.get('message', 'Unknown error')} ({error.get('statusCode', 'Unknown status code')})"
+        for error in errors
+    )
@@ -1,22 +1,31 @@
-import base64
-import io
 import json
 import os
-import time
+import tempfile
 import uuid
 import zipfile
-from typing import List, Union
+from typing import IO, List, Union
 
 import requests
 
+from cumulusci.salesforce_api.package_zip import (
+    MAX_IN_MEMORY_ZIP_SIZE,
+    PackageZip,
+    package_zip_file,
+)
+from cumulusci.salesforce_api.status_waiters import PollingWaiter
+from cumulusci.utils.http.streaming_body import FilePart, StreamingBody
+
 PARENT_DIR_NAME = "metadata"
 
 
 class RestDeploy:
+    # Decides when the deploy status is checked (see status_waiters)
+    waiter = None
+
     def __init__(
         self,
         task,
-        package_zip: str,
+        package_zip: PackageZip,
         purge_on_delete: Union[bool, str, None],
         check_only: bool,
         test_level: Union[str, None],
@@ -33,6 +42,8 @@ class RestDeploy:
         self.test_level = test_level
         self.package_zip = package_zip
         self.run_tests = run_tests or []
+        self.process_id = None
+        self.check_num = 1
         self.task.logger.info(f"Using REST Deploy API version: {self.api_version}")
 
     def __call__(self):
@@ -60,18 +71,21 @@ class RestDeploy:
         }
         json_payload = json.dumps(deploy_options)
 
-        # Construct the multipart/form-data request body
-        body = (
-            f"--{self._boundary}\r\n"
-            f'Content-Disposition: form-data; name="json"\r\n'
-            f"Content-Type: application/json\r\n\r\n"
-            f"{json_payload}\r\n"
-            f"--{self._boundary}\r\n"
-            f'Content-Disposition: form-data; name="file"; filename="metadata.zip"\r\n'
-            f"Content-Type: application/zip\r\n\r\n"
-        ).encode("utf-8")
-        body += self._reformat_zip(self.package_zip)
-        body += f"\r\n--{self._boundary}--\r\n".encode("utf-8")
+        # Construct the multipart/form-data request body, which streams the
+        # zip file while it is sent
+        body = StreamingBody(
+            (
+                f"--{self._boundary}\r\n"
+                f'Content-Disposition: form-data; name="json"\r\n'
+                f"Content-Type: application/json\r\n\r\n"
+                f"{json_payload}\r\n"
+                f"--{self._boundary}\r\n"
+                f'Content-Disposition: form-data; name="file"; filename="metadata.zip"\r\n'
+                f"Content-Type: application/zip\r\n\r\n"
+            ).encode("utf-8"),
+            FilePart(self._reformat_zip_file(self.package_zip)),
+            f"\r\n--{self._boundary}--\r\n".encode("utf-8"),
+        )
 
         response = requests.post(url, headers=headers, data=body)
         response_json = response.json()
@@ -100,42 +114,47 @@ class RestDeploy:
 
     # Monitor the deployment status and log progress
     def _monitor_deploy_status(self, deploy_request_id):
-        url = f"{self.task.org_config.instance_url}/services/data/v{self.api_version}/metadata/deployRequest/{deploy_request_id}?includeDetails=true"
-        headers = {"Authorization": f"Bearer {self.task.org_config.access_token}"}
+        self.process_id = deploy_request_id
+        self.check_num = 1
+        (self.waiter or PollingWaiter()).wait(self)
 
-        while True:
-            response = requests.get(url, headers=headers)
-            response_json = response.json()
-            self.task.logger.info(
-                f"Deployment {response_json['deployResult']['status']}"
-            )
+    def check_status(self) -> bool:
+        url = f"{self.task.org_config.instance_url}/services/data/v{self.api_version}/metadata/deployRequest/{self.process_id}?includeDetails=true"
+        headers = {"Authorization": f"Bearer {self.task.org_config.access_token}"}
 
-            if response_json["deployResult"]["status"] not in ["InProgress", "Pending"]:
-                # Handle the case when status has Failed
-                if response_json["deployResult"]["status"] == "Failed":
-                    for failure in response_json["deployResult"]["details"][
-                        "componentFailures"
-                    ]:
-                        self.task.logger.error(self._construct_error_message(failure))
-                return
-            time.sleep(5)
+        response = requests.get(url, headers=headers)
+        response_json = response.json()
+        self.task.logger.info(f"Deployment {response_json['deployResult']['status']}")
+
+        if response_json["deployResult"]["status"] in ["InProgress", "Pending"]:
+            return False
+        # Handle the case when status has Failed
+        if response_json["deployResult"]["status"] == "Failed":
+            for failure in response_json["deployResult"]["details"][
+                "componentFailures"
+            ]:
+                self.task.logger.error(self._construct_error_message(failure))
+        return True
 
     # Reformat the package zip file to include parent directory
-    def _reformat_zip(self, package_zip):
-        zip_bytes = base64.b64decode(package_zip)
-        zip_stream = io.BytesIO(zip_bytes)
-        new_zip_stream = io.BytesIO()
+    def _reformat_zip(self, package_zip: PackageZip) -> bytes:
+        return self._reformat_zip_file(package_zip).read()
+
+    # Copy the package zip into a temporary file one entry at a time, under
+    # the parent directory
+    def _reformat_zip_file(self, package_zip: PackageZip) -> IO[bytes]:
+        new_zip_file = tempfile.SpooledTemporaryFile(max_size=MAX_IN_MEMORY_ZIP_SIZE)
 
-        with zipfile.ZipFile(zip_stream, "r") as zip_ref:
-            with zipfile.ZipFile(new_zip_stream, "w") as new_zip_ref:
+        with zipfile.ZipFile(package_zip_file(package_zip), "r") as zip_ref:
+            with zipfile.ZipFile(new_zip_file, "w") as new_zip_ref:
                 for item in zip_ref.infolist():
                     # Choice of name for parent directory is irrelevant to functioning
                     new_item_name = os.path.join(PARENT_DIR_NAME, item.filename)
                     file_content = zip_ref.read(item.filename)
                     new_zip_ref.writestr(new_item_name, file_content)
 
-        new_zip_bytes = new_zip_stream.getvalue()
-        return new_zip_bytes
+        new_zip_file.seek(0)
+        return new_zip_file
 
     # Construct an error message from deployment failure details
     def _construct_error_message(self, failure):
@@ -0,0 +1,224 @@
+"""Strategies for waiting on long-running Metadata API operations.
+
+A deploy or retrieve is started with one request and then has to be
+checked until it finishes. A waiter decides when those checks happen:
+
+* PollingWaiter checks on a capped exponential schedule.
+* StreamingWaiter also checks as soon as a Streaming API event that
+  mentions the operation arrives, so a finished operation is noticed
+  right away rather than at the next scheduled check.
+* SharedStatusLoop checks any number of concurrent operations from a
+  single background thread, so that waiting on many deployments doesn't
+  mean as many threads each polling on their own schedule.
+
+Operations are objects with a `check_status()` method, which checks the
+status once and returns True when the operation has finished, and a
+`check_num` attribute that counts the checks made since the operation
+last reported progress (operations may reset it to 1 to check sooner).
+"""
+
+import json
+import logging
+import threading
+import time
+import typing as T
+from collections import deque
+
+from cumulusci.salesforce_api.cometd import CometDClient
+
+logger = logging.getLogger(__name__)
+
+
+class WaitableOperation(T.Protocol):
+    check_num: int
+    process_id: T.Optional[str]
+
+    def check_status(self) -> bool:
+        ...
+
+
+class PollingWaiter:
+    """Checks an operation on a capped exponential schedule"""
+
+    def __init__(
+        self,
+        initial_interval: float = 1,
+        factor: float = 2,
+        max_interval: float = 10,
+    ):
+        self.initial_interval = initial_interval
+        self.factor = factor
+        self.max_interval = max_interval
+
+    def interval(self, check_num: int) -> float:
+        """Seconds until the check after check number `check_num` (from 1)"""
+        return min(
+            self.max_interval, self.initial_interval * self.factor ** (check_num - 1)
+        )
+
+    def wait(self, operation: WaitableOperation):
+        """Block until the operation has finished"""
+        while not operation.check_status():
+            self._pause(operation, self.interval(operation.check_num))
+            operation.check_num += 1
+
+    def _pause(self, operation: WaitableOperation, seconds: float):
+        time.sleep(seconds)
+
+
+class StreamingWaiter(PollingWaiter):
+    """Checks an operation whenever a Streaming API event mentions it.
+
+    Salesforce doesn't publish Metadata API status changes by itself, so
+    `channel` must carry events (for example a platform event published by
+    the org) whose payload includes the id of the deploy or retrieve. Any
+    event on the channel wakes up operations that don't have an id yet.
+    The polling schedule still applies, with a longer cap, in case an
+    event is missed. If the Streaming API can't be used, the waiter falls
+    back to the usual polling schedule (and tries streaming again on the
+    next wait)."""
+
+    def __init__(
+        self,
+        client: CometDClient,
+        channel: str,
+        initial_interval: float = 1,
+        factor: float = 2,
+        max_interval: float = 30,
+    ):
+        super().__init__(initial_interval, factor, max_interval)
+        self.client = client
+        self.channel = channel
+        self._condition = threading.Condition()
+        # (sequence number, payload) of recent events; only events that
+        # arrive while an operation is waiting matter to it.
+        self._events: T.Deque[T.Tuple[int, str]] = deque(maxlen=100)
+        self._event_count = 0
+        self._started = False
+        self._start_lock = threading.Lock()
+        self.polling = PollingWaiter(initial_interval, factor)
+
+    def wait(self, operation: WaitableOperation):
+        # The operation has already been submitted, so a problem with the
+        # Streaming API mustn't stop it being checked.
+        if self._ensure_started():
+            super().wait(operation)
+        else:
+            self.polling.wait(operation)
+
+    def _ensure_started(self) -> bool:
+        """Start listening for events if need be. Returns whether listening."""
+        with self._start_lock:
+            if self._started:
+                return True
+            self.client.add_listener(self._on_event)
+            try:
+                self.client.subscribe(self.channel)
+                self.client.start()
+            except Exception as e:
+                logger.warning(
+                    f"Unable to listen for status events on {self.channel}, "
+                    f"checking on a schedule instead: {e}"
+                )
+                self.client.remove_listener(self._on_event)
+                self.client.stop()
+                return False
+            self._started = True
+            return True
+
+    def stop(self):
+        self.client.remove_listener(self._on_event)
+        self.client.stop()
+        self._started = False
+
+    def _on_event(self, message: dict):
+        if message.get("channel") != self.channel:
+            return
+        with self._condition:
+            self._event_count += 1
+            self._events.append((self._event_count, json.dumps(message.get("data"))))
+            self._condition.notify_all()
+
+    def _pause(self, operation: WaitableOperation, seconds: float):
+        process_id = getattr(operation, "process_id", None)
+
+        def mentioned():
+            return any(
+                number > seen and (not process_id or process_id in payload)
+                for number, payload in self._events
+            )
+
+        with self._condition:
+            seen = self._event_count
+            self._condition.wait_for(mentioned, timeout=seconds)
+
+
+class SharedStatusLoop(PollingWaiter):
+    """Checks all the operations waiting on it from one background thread.
+
+    Each operation keeps its own capped exponential schedule. The thread
+    runs only while there is something to wait for; errors raised while
+    checking an operation are re-raised in the thread waiting on it."""
+
+    def __init__(
+        self,
+        initial_interval: float = 1,
+        factor: float = 2,
+        max_interval: float = 10,
+    ):
+        super().__init__(initial_interval, factor, max_interval)
+        self._condition = threading.Condition()
+        self._waiting: T.List["_Waiting"] = []
+        self._thread = None
+
+    def wait(self, operation: WaitableOperation):
+        waiting = _Waiting(operation)
+        with self._condition:
+            self._waiting.append(waiting)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="metadata-status", daemon=True
+                )
+                self._thread.start()
+            self._condition.notify_all()
+        waiting.finished.wait()
+        if waiting.error is not None:
+            raise waiting.error
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if not self._waiting:
+                    self._thread = None
+                    return
+                waiting = min(self._waiting, key=lambda w: w.due)
+                delay = waiting.due - time.monotonic()
+                if delay > 0:
+                    self._condition.wait(delay)
+                    continue
+
+            try:
+                finished = waiting.operation.check_status()
+            except Exception as e:
+                waiting.error = e
+                finished = True
+
+            if finished:
+                with self._condition:
+                    self._waiting.remove(waiting)
+                waiting.finished.set()
+            else:
+                waiting.due = time.monotonic() + self.interval(
+                    waiting.operation.check_num
+                )
+                waiting.operation.check_num += 1
+
+
+class _Waiting:
+    __slots__ = ["operation", "due", "finished", "error"]
+
+    def __init__(self, operation: WaitableOperation):
+        self.operation = operation
+        self.due = time.monotonic()
+        self.finished = threading.Event()
+        self.error = None
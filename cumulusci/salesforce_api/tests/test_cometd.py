@@ -0,0 +1,144 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from cumulusci.salesforce_api.cometd import CometDClient
+from cumulusci.salesforce_api.exceptions import StreamingApiError
+from cumulusci.tests.util import DummyOrgConfig
+
+
+class StubStreamingServer:
+    """Just enough of the Salesforce CometD endpoint to exercise the client"""
+
+    def __init__(self):
+        self.requests = []
+        self.events = []
+        self.handshakes = 0
+        self.expire_next_connect = False
+        self.fail_subscribe = False
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers["Content-Length"])
+                (message,) = json.loads(self.rfile.read(length))
+                stub.requests.append(
+                    (self.path, self.headers["Authorization"], message)
+                )
+                body = json.dumps(stub.reply(message)).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def reply(self, message):
+        channel = message["channel"]
+        reply = {"channel": channel, "id": message["id"], "successful": True}
+        if channel == "/meta/handshake":
+            self.handshakes += 1
+            reply["clientId"] = f"client{self.handshakes}"
+        elif channel == "/meta/subscribe":
+            reply["subscription"] = message["subscription"]
+            if self.fail_subscribe:
+                reply.update(successful=False, error="403::Unknown channel")
+        elif channel == "/meta/connect":
+            if self.expire_next_connect:
+                self.expire_next_connect = False
+                reply.update(
+                    successful=False,
+                    error="403::Unknown client",
+                    advice={"reconnect": "handshake"},
+                )
+            events, self.events = self.events, []
+            return [*events, reply]
+        return [reply]
+
+
+@pytest.fixture
+def stub():
+    with StubStreamingServer() as stub:
+        yield stub
+
+
+def make_client(stub):
+    org_config = DummyOrgConfig(
+        {"instance_url": stub.url, "access_token": "TOKEN"}, "test"
+    )
+    return CometDClient(org_config, "62.0")
+
+
+class TestCometDClient:
+    def test_handshake_subscribe_connect(self, stub):
+        client = make_client(stub)
+        client.subscribe("/event/Status__e")
+        client.handshake()
+        stub.events.append({"channel": "/event/Status__e", "data": {"Id": "1"}})
+
+        assert client.connect() == [
+            {"channel": "/event/Status__e", "data": {"Id": "1"}}
+        ]
+        paths = {path for path, _, _ in stub.requests}
+        assert paths == {"/cometd/62.0"}
+        assert all(auth == "Bearer TOKEN" for _, auth, _ in stub.requests)
+        channels = [message["channel"] for _, _, message in stub.requests]
+        assert channels == ["/meta/handshake", "/meta/subscribe", "/meta/connect"]
+        assert stub.requests[2][2]["clientId"] == "client1"
+
+    def test_connect__handshakes_again_when_advised(self, stub):
+        client = make_client(stub)
+        client.subscribe("/event/Status__e")
+        client.handshake()
+        stub.expire_next_connect = True
+
+        assert client.connect() == []
+        assert client.client_id == "client2"
+        channels = [message["channel"] for _, _, message in stub.requests]
+        assert channels[-2:] == ["/meta/handshake", "/meta/subscribe"]
+
+    def test_subscribe__failure(self, stub):
+        client = make_client(stub)
+        client.handshake()
+        stub.fail_subscribe = True
+        with pytest.raises(StreamingApiError, match="Unknown channel"):
+            client.subscribe("/event/Missing__e")
+
+    def test_start__delivers_events_to_listeners(self, stub):
+        client = make_client(stub)
+        received = threading.Event()
+        events = []
+
+        def listener(event):
+            events.append(event)
+            received.set()
+
+        client.add_listener(listener)
+        client.subscribe("/event/Status__e")
+        stub.events.append({"channel": "/event/Status__e", "data": {"Id": "1"}})
+        client.start()
+        try:
+            assert received.wait(5)
+        finally:
+            client.stop()
+
+        assert events[0]["data"] == {"Id": "1"}
+        channels = [message["channel"] for _, _, message in stub.requests]
+        assert "/meta/disconnect" in channels
+        assert client.client_id is None
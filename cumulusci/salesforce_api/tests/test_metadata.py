@@ -1,6 +1,9 @@
+import base64
+import binascii
 import datetime
 import http.client
 import io
+import zipfile
 from collections import defaultdict
 from xml.dom.minidom import parseString
 
@@ -24,6 +27,7 @@ from cumulusci.salesforce_api.metadata import (
     ApiRetrievePackaged,
     ApiRetrieveUnpackaged,
     BaseMetadataApiCall,
+    RetrieveResultReader,
 )
 from cumulusci.salesforce_api.package_zip import (
     BasePackageZipBuilder,
@@ -275,8 +279,10 @@ class TestBaseTestMetadataApi:
         api = self._create_instance(task)
         api.check_num = 1
         assert api._get_check_interval() == 1
-        api.check_num = 10
+        api.check_num = 3
         assert api._get_check_interval() == 4
+        api.check_num = 10
+        assert api._get_check_interval() == 10
 
     @responses.activate
     def test_get_response_faultcode(self):
@@ -462,7 +468,8 @@ class TestBaseTestMetadataApi:
 
         assert api.status == "Done"
 
-        assert api.check_num == 4
+        # No wait after the final check
+        assert api.check_num == 3
 
     def test_process_response_status_no_done_element(self):
         task = self._create_task()
@@ -1013,3 +1020,147 @@ class TestApiRetrievePackaged(TestApiRetrieveUnpackaged):
         )
         with pytest.raises(CumulusCIException):
             api._process_response(response)
+
+
+def make_zip(files):
+    zip_bytes = io.BytesIO()
+    with zipfile.ZipFile(zip_bytes, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, content in files.items():
+            zf.writestr(name, content)
+    return zip_bytes.getvalue()
+
+
+def streamed_response(body: bytes):
+    response = Response()
+    response.status_code = 200
+    response.raw = io.BytesIO(body)
+    return response
+
+
+class TestRetrieveResultReader:
+    def test_read__chunked(self):
+        files = {"unpackaged/package.xml": "<Package/>", "other/x.txt": "x" * 5000}
+        encoded = base64.b64encode(make_zip(files)).decode()
+        # wrap the base64 text like Salesforce can, to test whitespace handling
+        wrapped = "\n".join(encoded[i : i + 76] for i in range(0, len(encoded), 76))
+        body = retrieve_result.format(zip=wrapped, extra="<status>Done</status>")
+
+        reader = RetrieveResultReader()
+        reader.chunk_size = 7
+        reader.max_memory_size = 100
+        zf = reader.read(streamed_response(body.encode()))
+
+        assert sorted(zf.namelist()) == sorted(files)
+        assert zf.read("other/x.txt") == b"x" * 5000
+        assert reader.zip_file._rolled
+        assert "Done" in reader.text
+
+    def test_read__no_zip_file(self):
+        reader = RetrieveResultReader()
+        body = deploy_result.format(status="Done", extra="")
+        assert reader.read(streamed_response(body.encode())) is None
+
+    def test_read__bad_base64(self):
+        body = retrieve_result.format(zip="abcde", extra="")
+        with pytest.raises(binascii.Error):
+            RetrieveResultReader().read(streamed_response(body.encode()))
+
+    def test_read__messages_without_zip_file(self):
+        messages = (
+            "<messages><fileName>unpackaged/package.xml</fileName>"
+            "<problem>Entity of type 'ApexClass' named 'Missing' cannot be found</problem>"
+            "</messages>"
+        )
+        body = retrieve_result.format(zip="abcde", extra=messages)
+        reader = RetrieveResultReader(read_zip_file=False)
+        reader.chunk_size = 7
+
+        assert reader.read(streamed_response(body.encode())) is None
+        assert reader.messages == [
+            {
+                "fileName": "unpackaged/package.xml",
+                "problem": "Entity of type 'ApexClass' named 'Missing' cannot be found",
+            }
+        ]
+
+
+class TestStreamedRetrieve:
+    def test_unpackaged__keeps_entries_without_recompressing(self):
+        files = {"unpackaged/package.xml": "<Package/>", "other/x.txt": "x"}
+        body = retrieve_result.format(
+            zip=base64.b64encode(make_zip(files)).decode(), extra=""
+        )
+        task = BaseTask(
+            project_config=create_project_config(),
+            task_config=TaskConfig({}),
+            org_config=DummyOrgConfig({}),
+        )
+        api = ApiRetrieveUnpackaged(task, "<Package/>", "55.0")
+
+        zf = api._process_response(streamed_response(body.encode()))
+
+        assert zf.namelist() == ["package.xml"]
+        assert zf.read("package.xml") == b"<Package/>"
+        assert zf.getinfo("package.xml").compress_type == zipfile.ZIP_DEFLATED
+
+    def test_unpackaged__no_zip_file(self):
+        task = BaseTask(
+            project_config=create_project_config(),
+            task_config=TaskConfig({}),
+            org_config=DummyOrgConfig({}),
+        )
+        api = ApiRetrieveUnpackaged(task, "<Package/>", "55.0")
+        body = deploy_result.format(status="Done", extra="")
+        with pytest.raises(MetadataParseError):
+            api._process_response(streamed_response(body.encode()))
+
+    @responses.activate
+    def test_call_mdapi__stream_leaves_body_unread(self):
+        task = BaseTask(
+            project_config=create_project_config(),
+            task_config=TaskConfig({}),
+            org_config=DummyOrgConfig(
+                {
+                    "instance_url": "https://na12.salesforce.com",
+                    "id": "https://login.salesforce.com/id/00D000000000000ABC/005000000000000ABC",
+                    "access_token": "0123456789",
+                }
+            ),
+        )
+        api = ApiRetrieveUnpackaged(task, "<Package/>", "55.0")
+        responses.add(
+            responses.POST, api._build_endpoint_url(), body=b"<result/>", status=200
+        )
+        response = api._call_mdapi({}, "envelope", stream=True)
+        assert not response._content_consumed
+
+        responses.replace(
+            responses.POST,
+            api._build_endpoint_url(),
+            body='<?xml version="1.0" encoding="UTF-8"?><faultcode>foo</faultcode>',
+            status=500,
+        )
+        with pytest.raises(MetadataApiError):
+            api._call_mdapi({}, "envelope", stream=True)
+
+
+class TestStreamedDeploy:
+    def test_build_request_body__streams_package_zip(self):
+        task = BaseTask(
+            project_config=create_project_config(),
+            task_config=TaskConfig({}),
+            org_config=DummyOrgConfig({}),
+        )
+        builder = DummyPackageZipBuilder()
+        builder.zf.writestr("package.xml", "<Package/>")
+        package_zip = builder.as_file()
+        expected_zip = base64.b64encode(package_zip.read()).decode()
+
+        api = ApiDeploy(task, package_zip, api_version="55.0")
+        envelope = api._build_envelope_start()
+        assert expected_zip not in envelope
+
+        body = api._build_request_body(envelope)
+        assert body.read().decode() == (
+            ApiDeploy(task, expected_zip, api_version="55.0")._build_envelope_start()
+        )
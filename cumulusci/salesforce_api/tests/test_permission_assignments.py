@@ -0,0 +1,160 @@
+import json
+import threading
+from unittest import mock
+
+from cumulusci.salesforce_api.permission_assignments import (
+    PERMISSION_SET_ASSIGNMENT,
+    PERMISSION_SET_GROUP_COMPONENT,
+    PermissionAssignments,
+)
+
+
+def make_sf(existing=(), insert_result=None):
+    """A mock connection whose org has the `existing` PermissionSetAssignments"""
+    sf = mock.Mock()
+    sf.query_all.return_value = {
+        "records": [
+            {"AssigneeId": user_id, "PermissionSetId": perm_id}
+            for user_id, perm_id in existing
+        ]
+    }
+
+    def restful(path, method, data):
+        records = json.loads(data)["records"]
+        return [
+            insert_result(record) if insert_result else {"success": True}
+            for record in records
+        ]
+
+    sf.restful.side_effect = restful
+    return sf
+
+
+class TestPermissionAssignments:
+    def test_existing(self):
+        sf = make_sf()
+        sf.query_all.return_value = {
+            "records": [{"PermissionSetGroupId": "0PG1", "PermissionSetId": "0PS1"}]
+        }
+        existing = PermissionAssignments(sf).existing(
+            PERMISSION_SET_GROUP_COMPONENT,
+            ["0PG2", "0PG1", "0PG1"],
+            ["0PS1", "0PS'2"],
+        )
+
+        sf.query_all.assert_called_once_with(
+            "SELECT PermissionSetGroupId, PermissionSetId "
+            "FROM PermissionSetGroupComponent "
+            "WHERE PermissionSetGroupId IN ('0PG1', '0PG2') "
+            "AND PermissionSetId IN ('0PS\\'2', '0PS1')"
+        )
+        assert existing == {("0PG1", "0PS1")}
+
+    def test_existing__chunked(self):
+        sf = make_sf()
+        PermissionAssignments(sf).existing(
+            PERMISSION_SET_ASSIGNMENT,
+            [f"005{i:012d}" for i in range(501)],
+            ["0PS000000000001"],
+        )
+        assert sf.query_all.call_count == 2
+
+    def test_existing__nothing_to_query(self):
+        sf = make_sf()
+        assert (
+            PermissionAssignments(sf).existing(
+                PERMISSION_SET_ASSIGNMENT, [], ["0PS000000000001"]
+            )
+            == set()
+        )
+        sf.query_all.assert_not_called()
+
+    def test_assign(self):
+        sf = make_sf([("005000000000001", "0PS000000000001")])
+        pairs = [
+            ("005000000000001", "0PS000000000001"),
+            ("005000000000001", "0PS000000000002"),
+            ("005000000000001", "0PS000000000002"),
+        ]
+        result = PermissionAssignments(sf).assign(PERMISSION_SET_ASSIGNMENT, pairs)
+
+        assert result.existing == [("005000000000001", "0PS000000000001")]
+        assert result.inserted == [("005000000000001", "0PS000000000002")]
+        assert result.failed == {}
+        assert not result.is_noop
+        sf.restful.assert_called_once()
+        assert json.loads(sf.restful.call_args[1]["data"]) == {
+            "allOrNone": False,
+            "records": [
+                {
+                    "attributes": {"type": "PermissionSetAssignment"},
+                    "AssigneeId": "005000000000001",
+                    "PermissionSetId": "0PS000000000002",
+                }
+            ],
+        }
+
+    def test_assign__noop(self):
+        pairs = [("005000000000001", "0PS000000000001")]
+        sf = make_sf(pairs)
+        result = PermissionAssignments(sf).assign(PERMISSION_SET_ASSIGNMENT, pairs)
+
+        assert result.is_noop
+        assert result.existing == pairs
+        sf.restful.assert_not_called()
+
+    def test_assign__errors(self):
+        def insert_result(record):
+            if record["PermissionSetId"] == "0PS000000000001":
+                return {
+                    "success": False,
+                    "errors": [{"message": "Dupe", "statusCode": "DUPLICATE_VALUE"}],
+                }
+            return {
+                "success": False,
+                "errors": [{"message": "Nope", "statusCode": "INSUFFICIENT_ACCESS"}],
+            }
+
+        sf = make_sf(insert_result=insert_result)
+        result = PermissionAssignments(sf).assign(
+            PERMISSION_SET_ASSIGNMENT,
+            [
+                ("005000000000001", "0PS000000000001"),
+                ("005000000000001", "0PS000000000002"),
+            ],
+        )
+
+        # Created by someone else since the query
+        assert result.existing == [("005000000000001", "0PS000000000001")]
+        assert result.inserted == []
+        assert result.failed == {
+            ("005000000000001", "0PS000000000002"): "Nope (INSUFFICIENT_ACCESS)"
+        }
+
+    def test_insert__chunks(self):
+        barrier = threading.Barrier(3, timeout=5)
+
+        def insert_result(record):
+            return {"success": True, "id": record["AssigneeId"]}
+
+        sf = make_sf(insert_result=insert_result)
+        restful = sf.restful.side_effect
+
+        def concurrent_restful(*args, **kwargs):
+            # All three chunks are in flight at once
+            barrier.wait()
+            return restful(*args, **kwargs)
+
+        sf.restful.side_effect = concurrent_restful
+        pairs = [(f"005{i:012d}", "0PS000000000001") for i in range(450)]
+        results = PermissionAssignments(sf, max_parallel=3).insert(
+            PERMISSION_SET_ASSIGNMENT, pairs
+        )
+
+        assert sf.restful.call_count == 3
+        assert sorted(
+            len(json.loads(call[1]["data"])["records"])
+            for call in sf.restful.call_args_list
+        ) == [50, 200, 200]
+        # Results are in the order of the pairs
+        assert [result["id"] for result in results] == [user for user, _ in pairs]
@@ -238,6 +238,25 @@ class TestRestDeploy(unittest.TestCase):
             base64.b64encode(actual_output_zip).decode("utf-8"), expected_zip
         )
 
+    @patch("requests.post")
+    def test_deployment__streams_zip_file(self, mock_post):
+        mock_post.return_value = Mock(status_code=500)
+        zip_file = io.BytesIO(base64.b64decode(generate_sample_zip_data()))
+
+        deployer = RestDeploy(self.mock_task, zip_file, False, False, "NoTestRun", [])
+        deployer()
+
+        body = mock_post.call_args.kwargs["data"]
+        content = body.read()
+        assert len(body) == len(content)
+        zip_start = content.index(b"PK")
+        zip_end = content.rindex(f"\r\n--{deployer._boundary}--".encode())
+        with zipfile.ZipFile(io.BytesIO(content[zip_start:zip_end])) as zf:
+            assert zf.namelist() == [
+                "metadata/objects/mockfile1.obj",
+                "metadata/objects/mockfile2.obj",
+            ]
+
     def test_purge_on_delete(self):
         test_data = [
             ("not_sandbox_developer", "Not Developer Edition", False, False, "false"),
@@ -0,0 +1,162 @@
+import threading
+from unittest import mock
+
+import pytest
+
+from cumulusci.salesforce_api.exceptions import StreamingApiError
+from cumulusci.salesforce_api.status_waiters import (
+    PollingWaiter,
+    SharedStatusLoop,
+    StreamingWaiter,
+)
+
+
+class FakeOperation:
+    def __init__(self, checks_until_done, process_id=None, error=None):
+        self.checks_until_done = checks_until_done
+        self.process_id = process_id
+        self.error = error
+        self.check_num = 1
+        self.checks = 0
+
+    def check_status(self):
+        self.checks += 1
+        if self.error and self.checks == self.checks_until_done:
+            raise self.error
+        return self.checks >= self.checks_until_done
+
+
+class TestPollingWaiter:
+    def test_interval__capped_exponential(self):
+        waiter = PollingWaiter(initial_interval=1, factor=2, max_interval=10)
+        assert [waiter.interval(n) for n in range(1, 7)] == [1, 2, 4, 8, 10, 10]
+
+    def test_wait(self):
+        operation = FakeOperation(3)
+        with mock.patch("time.sleep") as sleep:
+            PollingWaiter().wait(operation)
+        assert operation.checks == 3
+        assert sleep.call_args_list == [mock.call(1), mock.call(2)]
+
+    def test_wait__already_done(self):
+        operation = FakeOperation(1)
+        with mock.patch("time.sleep") as sleep:
+            PollingWaiter().wait(operation)
+        sleep.assert_not_called()
+
+
+class FakeClient:
+    def __init__(self):
+        self.listeners = []
+        self.channels = []
+        self.started = False
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        self.listeners.remove(listener)
+
+    def subscribe(self, channel):
+        self.channels.append(channel)
+
+    def start(self):
+        self.started = True
+
+    def stop(self):
+        self.started = False
+
+    def publish(self, channel, data):
+        for listener in self.listeners:
+            listener({"channel": channel, "data": data})
+
+
+class TestStreamingWaiter:
+    def test_wait__wakes_on_matching_event(self):
+        client = FakeClient()
+        # Long enough that the test would time out without the event
+        waiter = StreamingWaiter(client, "/event/Status__e", initial_interval=600)
+        operation = FakeOperation(2, process_id="0Af000000000001")
+
+        thread = threading.Thread(target=waiter.wait, args=(operation,))
+        thread.start()
+        while operation.checks == 0:
+            thread.join(0.01)
+        client.publish("/event/Other__e", {"Id__c": "0Af000000000001"})
+        client.publish("/event/Status__e", {"Id__c": "0Af000000000002"})
+        thread.join(0.1)
+        assert thread.is_alive()
+        client.publish("/event/Status__e", {"Id__c": "0Af000000000001"})
+        thread.join(5)
+
+        assert not thread.is_alive()
+        assert operation.checks == 2
+        assert client.started
+        assert client.channels == ["/event/Status__e"]
+
+        waiter.stop()
+        assert not client.started
+        assert client.listeners == []
+
+    def test_pause__times_out(self):
+        client = FakeClient()
+        waiter = StreamingWaiter(client, "/event/Status__e", initial_interval=0)
+        operation = FakeOperation(3)
+        waiter.wait(operation)
+        assert operation.checks == 3
+
+    def test_wait__streaming_unavailable(self, caplog):
+        client = FakeClient()
+        client.start = mock.Mock(side_effect=[StreamingApiError("Bad channel"), None])
+        waiter = StreamingWaiter(client, "/event/Typo__e")
+        operation = FakeOperation(3)
+        with mock.patch("time.sleep") as sleep:
+            waiter.wait(operation)
+
+        # Checked on the polling schedule instead
+        assert operation.checks == 3
+        assert sleep.call_args_list == [mock.call(1), mock.call(2)]
+        assert "Unable to listen for status events on /event/Typo__e" in caplog.text
+        assert client.listeners == []
+
+        # Streaming is tried again by the next wait
+        waiter.wait(FakeOperation(1))
+        assert client.start.call_count == 2
+        assert client.listeners == [waiter._on_event]
+
+
+class TestSharedStatusLoop:
+    def test_wait__concurrent_operations(self):
+        loop = SharedStatusLoop(initial_interval=0)
+        operations = [FakeOperation(n) for n in (1, 3, 5)]
+        check_threads = set()
+        for operation in operations:
+            check_status = operation.check_status
+
+            def record(check_status=check_status):
+                check_threads.add(threading.current_thread().name)
+                return check_status()
+
+            operation.check_status = record
+
+        threads = [
+            threading.Thread(target=loop.wait, args=(operation,))
+            for operation in operations
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        assert [operation.checks for operation in operations] == [1, 3, 5]
+        assert check_threads == {"metadata-status"}
+        assert loop._thread is None
+
+    def test_wait__raises_errors_in_waiting_thread(self):
+        loop = SharedStatusLoop(initial_interval=0)
+        with pytest.raises(ValueError, match="Status check failed"):
+            loop.wait(FakeOperation(2, error=ValueError("Status check failed")))
+        # The loop keeps working for later operations
+        operation = FakeOperation(2)
+        loop.wait(operation)
+        assert operation.checks == 2
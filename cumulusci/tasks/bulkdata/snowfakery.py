@@ -55,8 +55,9 @@ ERROR_THRESHOLD = (
     0  # TODO v2.1: Allow this to be a percentage of recent records instead
 )
 
-# time between "ticks" where the task re-evaluates its progress
-# relatively arbitrary trade-off between busy-waiting and adding latency.
+# longest time between "ticks" where the task re-evaluates its progress.
+# The task wakes up earlier whenever a worker finishes, so this mostly
+# bounds how often progress is reported while workers are busy.
 WAIT_TIME = 3
 
 
@@ -372,7 +373,7 @@ class Snowfakery(BaseSalesforceApiTask):
             self.update_running_totals()
             self.print_running_totals()
 
-            time.sleep(WAIT_TIME)
+            self.wait_for_progress()
 
             upload_status = self._report_status(
                 portions.batch_size,
@@ -431,12 +432,28 @@ class Snowfakery(BaseSalesforceApiTask):
                 results = self.queue_manager.get_results_report()
             except Empty:
                 break
-            if "results" in results and "step_results" in results["results"]:
-                self.update_running_totals_from_load_step_results(results["results"])
-            elif "error" in results:
-                self.logger.warning(f"Error in load: {results}")
-            else:  # pragma: no cover
-                self.logger.warning(f"Unexpected message from subtask: {results}")
+            self.handle_results_report(results)
+
+    def handle_results_report(self, results: dict) -> None:
+        if results.get("status") == "exited":
+            pass  # only used to wake up the controller
+        elif "results" in results and "step_results" in results["results"]:
+            self.update_running_totals_from_load_step_results(results["results"])
+        elif "error" in results:
+            self.logger.warning(f"Error in load: {results}")
+        else:  # pragma: no cover
+            self.logger.warning(f"Unexpected message from subtask: {results}")
+
+    def wait_for_progress(self, timeout: float = WAIT_TIME) -> None:
+        """Block until a worker reports back or `timeout` seconds pass.
+
+        Replaces a fixed sleep between ticks so that the next portion
+        is handed out as soon as a generator or loader frees up."""
+        try:
+            results = self.queue_manager.get_results_report(block=True, timeout=timeout)
+        except Empty:
+            return
+        self.handle_results_report(results)
 
     def update_running_totals_from_load_step_results(self, results: dict) -> None:
         """'Parse' the results from a load step, to keep track of row errors."""
@@ -468,7 +485,7 @@ class Snowfakery(BaseSalesforceApiTask):
                 cooldown = 5
             else:
                 cooldown -= 1
-            time.sleep(WAIT_TIME)
+            self.wait_for_progress()
 
         self.log_failures()
 
@@ -173,7 +173,7 @@ class SnowfakeryChannelManager:
             channel.tick()
         return all([channel.check_finished() for channel in self.channels])
 
-    def get_results_report(self, block=False):
+    def get_results_report(self, block=False, timeout=None):
         """
         This is a realtime reporting channel which could, in theory, be updated
         before sub-tasks finish. Currently no sub-tasks are coded to do that.
@@ -181,9 +181,10 @@ class SnowfakeryChannelManager:
         The logical next step is to allow LoadData to monitor steps one by
         one or even batches one by one.
 
-        Note that until we implement that, we are paying the complexity
-        cost of a real-time channel but not getting the benefits of it."""
-        return self.results_reporter.get(block=block)
+        Workers in both queues also report here (with status "exited")
+        when they finish, which is what lets the controller block on this
+        queue instead of sleeping between ticks."""
+        return self.results_reporter.get(block=block, timeout=timeout)
 
 
 class Channel:
@@ -249,7 +250,15 @@ class Channel:
         # b) finding a queue type which is not prone to race conditions
         #    or perf slowdowns with "Process" task types (sub-processes)
         # is a challenge.
-        self.data_gen_q = WorkerQueue(data_gen_q_config, self.filesystem_lock)
+        #
+        # Worker exits are reported from a watcher thread in this
+        # process instead, which is safe with a queue.Queue and lets
+        # the controller wake up as soon as a portion is generated.
+        self.data_gen_q = WorkerQueue(
+            data_gen_q_config,
+            self.filesystem_lock,
+            exit_reporter=self.results_reporter,
+        )
 
         load_data_q_config = WorkerQueueConfig(
             project_config=self.project_config,
@@ -266,7 +275,10 @@ class Channel:
             rename_directory=self.data_loader_new_directory_name,
         )
         self.load_data_q = WorkerQueue(
-            load_data_q_config, self.filesystem_lock, self.results_reporter
+            load_data_q_config,
+            self.filesystem_lock,
+            self.results_reporter,
+            exit_reporter=self.results_reporter,
         )
 
         self.data_gen_q.feeds_data_to(self.load_data_q)
@@ -323,35 +335,34 @@ class Channel:
         return data_dir
 
     def get_upload_status_for_channel(self):
-        with self.filesystem_lock:
-
-            def set_count_from_names(names):
-                return sum(int(name.split("_")[1]) for name in names)
-
-            return {
-                "sets_queued_to_be_generated": set_count_from_names(
-                    self.data_gen_q.queued_jobs
-                ),
-                "sets_being_generated": set_count_from_names(
-                    self.data_gen_q.inprogress_jobs
-                ),
-                "sets_queued_for_loading": set_count_from_names(
-                    self.load_data_q.queued_jobs
-                ),
-                # note that these may count as already imported in the org
-                "sets_being_loaded": set_count_from_names(
-                    self.load_data_q.inprogress_jobs
-                ),
-                "max_num_loader_workers": self.num_loader_workers,
-                "max_num_generator_workers": self.num_generator_workers,
-                # todo: use row-level result from org load for better accuracy
-                "sets_finished": set_count_from_names(self.load_data_q.outbox_jobs),
-                "sets_failed": len(self.load_data_q.failed_jobs),
-                # TODO: are these two redundant?
-                "inprogress_generator_jobs": len(self.data_gen_q.inprogress_jobs),
-                "inprogress_loader_jobs": len(self.load_data_q.inprogress_jobs),
-                "data_gen_free_workers": self.data_gen_q.num_free_workers,
-            }
+        # The queues track their jobs in memory in this (the controller)
+        # process, so no filesystem access or locking is needed here.
+        def set_count_from_names(names):
+            return sum(int(name.split("_")[1]) for name in names)
+
+        return {
+            "sets_queued_to_be_generated": set_count_from_names(
+                self.data_gen_q.queued_jobs
+            ),
+            "sets_being_generated": set_count_from_names(
+                self.data_gen_q.inprogress_jobs
+            ),
+            "sets_queued_for_loading": set_count_from_names(
+                self.load_data_q.queued_jobs
+            ),
+            # note that these may count as already imported in the org
+            "sets_being_loaded": set_count_from_names(self.load_data_q.inprogress_jobs),
+            "max_num_loader_workers": self.num_loader_workers,
+            "max_num_generator_workers": self.num_generator_workers,
+            # todo: use row-level result from org load for better accuracy
+            "sets_finished": set_count_from_names(self.load_data_q.outbox_jobs),
+            "sets_failed": len(self.load_data_q.failed_jobs)
+            + len(self.data_gen_q.failed_jobs),
+            # TODO: are these two redundant?
+            "inprogress_generator_jobs": len(self.data_gen_q.inprogress_jobs),
+            "inprogress_loader_jobs": len(self.load_data_q.inprogress_jobs),
+            "data_gen_free_workers": self.data_gen_q.num_free_workers,
+        }
 
     def failure_descriptions(self) -> T.List[str]:
         """Log failures from sub-processes to main process"""
@@ -370,18 +381,17 @@ class Channel:
 
     def check_finished(self) -> bool:
         self.data_gen_q.tick()
-        with self.filesystem_lock:
-            still_running = (
-                len(
-                    self.data_gen_q.workers
-                    + self.data_gen_q.queued_job_dirs
-                    + self.data_gen_q.inprogress_jobs
-                    + self.load_data_q.workers
-                    + self.load_data_q.inprogress_jobs
-                    + self.load_data_q.queued_job_dirs
-                )
-                > 0
+        still_running = (
+            len(
+                self.data_gen_q.workers
+                + self.data_gen_q.queued_job_dirs
+                + self.data_gen_q.inprogress_jobs
+                + self.load_data_q.workers
+                + self.load_data_q.inprogress_jobs
+                + self.load_data_q.queued_job_dirs
             )
+            > 0
+        )
         return not still_running
 
 
@@ -1,9 +1,10 @@
 import re
 import typing as T
-from collections import Counter
+from collections import Counter, defaultdict
 from contextlib import contextmanager
 from itertools import cycle
 from pathlib import Path
+from queue import Empty
 from tempfile import TemporaryDirectory
 from threading import Lock, Thread
 from unittest import mock
@@ -580,6 +581,38 @@ class TestSnowfakery:
                 task()
         assert "XYZZY" in str(logger.mock_calls)
 
+    def test_wait_for_progress__wakes_on_report(self, snowfakery):
+        task = snowfakery(recipe=sample_yaml)
+        task.sobject_counts = defaultdict(RunningTotals)
+        task.queue_manager = mock.Mock()
+        task.queue_manager.get_results_report.return_value = {
+            "status": "success",
+            "results": {
+                "step_results": {
+                    "Insert Account": {
+                        "sobject": "Account",
+                        "total_row_errors": 1,
+                        "records_processed": 5,
+                    }
+                }
+            },
+        }
+        task.wait_for_progress(timeout=7)
+        task.queue_manager.get_results_report.assert_called_once_with(
+            block=True, timeout=7
+        )
+        assert task.sobject_counts["Account"].successes == 4
+        assert task.sobject_counts["Account"].errors == 1
+
+    def test_wait_for_progress__timeout(self, snowfakery):
+        task = snowfakery(recipe=sample_yaml)
+        task.queue_manager = mock.Mock()
+        task.queue_manager.get_results_report.side_effect = Empty
+        with mock.patch.object(task, "logger") as logger:
+            task.wait_for_progress(timeout=0)
+            task.handle_results_report({"status": "exited", "queue": "data_gen"})
+        assert not logger.mock_calls
+
     def test_running_totals_repr(self):
         r = RunningTotals()
         r.errors = 12
@@ -118,7 +118,7 @@ class CreateConnectedApp(SFDXBaseTask):
         self.client_secret = random_alphanumeric_underscore(self.client_secret_length)
 
     def _build_package(self):
-        connected_app_path = "connectedApps"
+        connected_app_path = os.path.join(self.tempdir, "connectedApps")
         os.mkdir(connected_app_path)
         self._generate_id_and_secret()
         with open(
@@ -133,7 +133,7 @@ class CreateConnectedApp(SFDXBaseTask):
                     client_secret=self.client_secret,
                 )
             )
-        with open("package.xml", "w") as f:
+        with open(os.path.join(self.tempdir, "package.xml"), "w") as f:
             f.write(PACKAGE_XML)
 
     def _validate_connect_service(self):
@@ -177,7 +177,7 @@ class CreateConnectedApp(SFDXBaseTask):
         if self.options["connect"]:
             self._validate_connect_service()
 
-        with temporary_dir() as tempdir:
+        with temporary_dir(chdir=False) as tempdir:
             self.tempdir = tempdir
             self._build_package()
             super()._run_task()
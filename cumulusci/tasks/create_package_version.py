@@ -1,9 +1,12 @@
 import base64
+import functools
 import io
 import json
+import os
 import pathlib
 import zipfile
-from typing import Dict, List, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Union
 
 from pydantic.v1 import BaseModel, validator
 from simple_salesforce.exceptions import SalesforceMalformedRequest
@@ -206,6 +209,12 @@ class CreatePackageVersion(BaseSalesforceApiTask):
         "package_metadata_access": {
             "description": "The list of permission set names to assign to the package version for Package Metadata Access. Defaults to the list specified in the project configuration."
         },
+        "max_parallel": {
+            "description": "The maximum number of unlocked dependency packages to build at the same time. "
+            "Defaults to 1, which builds them one after another, each depending on the ones before it. "
+            "Otherwise, sibling subfolders (such as the subfolders of unpackaged/pre in the same repository) "
+            "are built together, depending only on the packages built before them."
+        },
     }
 
     def _init_options(self, kwargs):
@@ -277,6 +286,12 @@ class CreatePackageVersion(BaseSalesforceApiTask):
             if self.options.get("dependencies")
             else None
         )
+        try:
+            self.max_parallel = int(self.options.get("max_parallel", 1))
+        except (TypeError, ValueError):
+            raise TaskOptionsError("max_parallel must be an integer")
+        if self.max_parallel < 1:
+            raise TaskOptionsError("max_parallel must be at least 1")
 
     def _init_task(self):
         self.tooling = get_simple_salesforce_connection(
@@ -287,6 +302,10 @@ class CreatePackageVersion(BaseSalesforceApiTask):
         )
         self.context = TaskContext(self.org_config, self.project_config, self.logger)
         self._all_dependencies = None
+        # Package2VersionCreateRequests being polled, and the
+        # Package2VersionIds of those which have completed
+        self._pending_requests = []
+        self._package_version_ids = {}
 
     def _run_task(self):
         """Creates a new 2GP package version.
@@ -328,7 +347,9 @@ class CreatePackageVersion(BaseSalesforceApiTask):
         self.return_values["request_id"] = self.request_id
 
         # wait for request to complete
-        self._poll()
+        self.package_version_id = self._wait_for_version_requests([self.request_id])[
+            self.request_id
+        ]
         self.return_values["package2_version_id"] = self.package_version_id
 
         # get the new version number from Package2Version
@@ -770,7 +791,37 @@ class CreatePackageVersion(BaseSalesforceApiTask):
         For dependencies expressed as a VCS repo subfolder, build an unlocked package from that.
         """
         new_dependencies = []
+        # Unmanaged dependencies which can be built at the same time
+        group = []
+
+        def build_group():
+            version_ids = self._build_unlocked_packages(
+                [
+                    functools.partial(
+                        self._create_unlocked_package_from_unmanaged_dep,
+                        dependency,
+                        list(new_dependencies),
+                    )
+                    for dependency in group
+                ]
+            )
+            for dependency, version_id in zip(group, version_ids):
+                self.logger.info(f"Adding dependency {dependency} with id {version_id}")
+                new_dependencies.append({"subscriberPackageVersionId": version_id})
+            group.clear()
+
         for dependency in dependencies:
+            if (
+                isinstance(dependency, UnmanagedDependency)
+                and self.options["create_unlocked_dependency_packages"]
+            ):
+                if group and not self._can_build_together(group[0], dependency):
+                    build_group()
+                group.append(dependency)
+                continue
+            if group:
+                build_group()
+
             new_dependency = {}
             if isinstance(dependency, PackageVersionIdDependency) or (
                 isinstance(dependency, PackageNamespaceVersionDependency)
@@ -781,19 +832,10 @@ class CreatePackageVersion(BaseSalesforceApiTask):
                 )
                 new_dependency["subscriberPackageVersionId"] = dependency.version_id
             elif isinstance(dependency, UnmanagedDependency):
-                if self.options["create_unlocked_dependency_packages"]:
-                    version_id = self._create_unlocked_package_from_unmanaged_dep(
-                        dependency, new_dependencies
-                    )
-                    self.logger.info(
-                        f"Adding dependency {dependency} with id {version_id}"
-                    )
-                    new_dependency["subscriberPackageVersionId"] = version_id
-                else:
-                    self.logger.info(
-                        f"Skipping dependency {dependency} because create_unlocked_dependency_packages is False."
-                    )
-                    continue
+                self.logger.info(
+                    f"Skipping dependency {dependency} because create_unlocked_dependency_packages is False."
+                )
+                continue
             elif isinstance(dependency, UnmanagedVcsDependencyFlow):
                 self.logger.info(
                     f"Skipping Pre/Post flow static dependency {dependency}."
@@ -806,8 +848,30 @@ class CreatePackageVersion(BaseSalesforceApiTask):
 
             new_dependencies.append(new_dependency)
 
+        if group:
+            build_group()
         return new_dependencies
 
+    def _can_build_together(
+        self, dependency: UnmanagedDependency, other: UnmanagedDependency
+    ) -> bool:
+        """Can unlocked packages for these dependencies be built at the same
+        time? Only sibling subfolders of the same repository and ref are,
+        since they are at the same depth of the dependency graph."""
+        if self.max_parallel == 1:
+            return False
+        if not (
+            isinstance(dependency, UnmanagedVcsDependency)
+            and isinstance(other, UnmanagedVcsDependency)
+        ):
+            return False
+        if not (dependency.subfolder and other.subfolder):
+            return False
+        return (dependency.url, dependency.ref) == (other.url, other.ref) and (
+            os.path.dirname(dependency.subfolder.strip("/"))
+            == os.path.dirname(other.subfolder.strip("/"))
+        )
+
     def _get_unpackaged_pre_dependencies(self, dependencies):
         """Create package for unpackaged/pre metadata, if necessary"""
         path = pathlib.Path("unpackaged", "pre")
@@ -820,11 +884,28 @@ class CreatePackageVersion(BaseSalesforceApiTask):
             )
             return dependencies
 
-        for item_path in sorted(path.iterdir(), key=str):
-            if item_path.is_dir():
-                version_id = self._create_unlocked_package_from_local(
-                    item_path, dependencies
-                )
+        item_paths = [
+            item_path
+            for item_path in sorted(path.iterdir(), key=str)
+            if item_path.is_dir()
+        ]
+        # The subfolders don't depend on each other unless they are built one by one.
+        if self.max_parallel == 1:
+            groups = [[item_path] for item_path in item_paths]
+        else:
+            groups = [item_paths] if item_paths else []
+        for group in groups:
+            version_ids = self._build_unlocked_packages(
+                [
+                    functools.partial(
+                        self._create_unlocked_package_from_local,
+                        item_path,
+                        list(dependencies),
+                    )
+                    for item_path in group
+                ]
+            )
+            for item_path, version_id in zip(group, version_ids):
                 self.logger.info(
                     "Adding dependency {}/{} {} with id {}".format(
                         self.project_config.repo_owner,
@@ -837,10 +918,39 @@ class CreatePackageVersion(BaseSalesforceApiTask):
 
         return dependencies
 
+    def _build_unlocked_packages(
+        self, create_version_requests: List[Callable[[], str]]
+    ) -> List[str]:
+        """Build unlocked packages, and return their SubscriberPackageVersionIds.
+
+        Each callable creates the Package2VersionCreateRequest for a package
+        and returns its id. They are called up to max_parallel at a time,
+        and then all the requests are polled together."""
+        if len(create_version_requests) == 1:
+            request_ids = [create_version_requests[0]()]
+        else:
+            with ThreadPoolExecutor(
+                max_workers=min(self.max_parallel, len(create_version_requests))
+            ) as executor:
+                request_ids = list(
+                    executor.map(lambda create: create(), create_version_requests)
+                )
+
+        package_version_ids = self._wait_for_version_requests(request_ids)
+        version_ids = []
+        for request_id in request_ids:
+            res = self.tooling.query(
+                "SELECT SubscriberPackageVersionId FROM Package2Version "
+                f"WHERE Id='{package_version_ids[request_id]}'"
+            )
+            version_ids.append(res["records"][0]["SubscriberPackageVersionId"])
+        return version_ids
+
     def _create_unlocked_package_from_unmanaged_dep(
         self, dependency: UnmanagedVcsDependency, dependencies
     ) -> str:
-
+        """Request an unlocked package version for an unmanaged dependency,
+        and return the id of the Package2VersionCreateRequest."""
         package_name = dependency.description
         if isinstance(dependency, UnmanagedVcsDependency):
             package_name = dependency.package_name
@@ -858,24 +968,16 @@ class CreatePackageVersion(BaseSalesforceApiTask):
             namespace=self.package_config.namespace,
         )
         package_id = self._get_or_create_package(package_config)
-        self.request_id = self._create_version_request(
+        return self._create_version_request(
             package_id,
             package_config,
             package_zip_builder,
             dependencies=dependencies,
         )
 
-        self._poll()
-        self._reset_poll()
-        res = self.tooling.query(
-            "SELECT SubscriberPackageVersionId FROM Package2Version "
-            f"WHERE Id='{self.package_version_id}'"
-        )
-        package2_version = res["records"][0]
-        return package2_version["SubscriberPackageVersionId"]
-
-    def _create_unlocked_package_from_local(self, path, dependencies):
-        """Create an unlocked package version from a local directory."""
+    def _create_unlocked_package_from_local(self, path, dependencies) -> str:
+        """Request an unlocked package version for a local directory,
+        and return the id of the Package2VersionCreateRequest."""
         self.logger.info(f"Creating package for dependencies in {path}")
         package_name = (
             f"{self.project_config.repo_owner}/{self.project_config.repo_name} {path}"
@@ -893,45 +995,53 @@ class CreatePackageVersion(BaseSalesforceApiTask):
                 namespace=self.package_config.namespace,
             )
             package_id = self._get_or_create_package(package_config)
-            self.request_id = self._create_version_request(
+            return self._create_version_request(
                 package_id,
                 package_config,
                 package_zip_builder,
                 dependencies=dependencies,
             )
-        self._poll()
+
+    def _wait_for_version_requests(self, request_ids: List[str]) -> Dict[str, str]:
+        """Poll Package2VersionCreateRequests until they have all completed,
+        and return their Package2VersionIds by request id."""
+        self._pending_requests = list(dict.fromkeys(request_ids))
+        self._package_version_ids = {}
         self._reset_poll()
-        res = self.tooling.query(
-            "SELECT SubscriberPackageVersionId FROM Package2Version "
-            f"WHERE Id='{self.package_version_id}'"
-        )
-        package2_version = res["records"][0]
-        return package2_version["SubscriberPackageVersionId"]
+        self._poll()
+        return self._package_version_ids
 
     def _poll_action(self):
-        """Check if Package2VersionCreateRequest has completed."""
+        """Check if the pending Package2VersionCreateRequests have completed,
+        with one query for all of them."""
+        ids = ", ".join(f"'{request_id}'" for request_id in self._pending_requests)
         res = self.tooling.query(
-            f"SELECT Id, Status, Package2VersionId FROM Package2VersionCreateRequest WHERE Id = '{self.request_id}'"
-        )
-        request = res["records"][0]
-        if request["Status"] == "Success":
-            self.logger.info("[Success]: Package creation successful")
-            self.poll_complete = True
-            self.package_version_id = request["Package2VersionId"]
-        elif request["Status"] == "Error":
-            self.logger.error("[Error]: Package creation failed with error:")
-            res = self.tooling.query(
-                "SELECT Message FROM Package2VersionCreateRequestError "
-                f"WHERE ParentRequestId = '{request['Id']}'"
-            )
-            errors = []
-            if res["size"] > 0:
-                for error in res["records"]:
-                    errors.append(error["Message"])
-                    self.logger.error(error["Message"])
-            raise PackageUploadFailure("\n".join(errors))
-        else:
-            self.logger.info(f"[{request['Status']}]")
+            f"SELECT Id, Status, Package2VersionId FROM Package2VersionCreateRequest WHERE Id IN ({ids})"
+        )
+        several = len(self._pending_requests) > 1
+        for request in res["records"]:
+            label = f" {request['Id']}" if several else ""
+            if request["Status"] == "Success":
+                self.logger.info(f"[Success]{label}: Package creation successful")
+                self._package_version_ids[request["Id"]] = request["Package2VersionId"]
+                self._pending_requests.remove(request["Id"])
+            elif request["Status"] == "Error":
+                self.logger.error(
+                    f"[Error]{label}: Package creation failed with error:"
+                )
+                res = self.tooling.query(
+                    "SELECT Message FROM Package2VersionCreateRequestError "
+                    f"WHERE ParentRequestId = '{request['Id']}'"
+                )
+                errors = []
+                if res["size"] > 0:
+                    for error in res["records"]:
+                        errors.append(error["Message"])
+                        self.logger.error(error["Message"])
+                raise PackageUploadFailure("\n".join(errors))
+            else:
+                self.logger.info(f"[{request['Status']}]{label}")
+        self.poll_complete = not self._pending_requests
 
     def _prepare_cci_dependencies(self, deps) -> List[dict]:
         # Convert the dependencies returned by the Tooling API
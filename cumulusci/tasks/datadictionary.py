@@ -20,6 +20,17 @@ from cumulusci.utils.xml import metadata_tree
 from cumulusci.vcs.bootstrap import get_remote_project_config, get_repo_from_url
 from cumulusci.vcs.models import AbstractRepo
 
+# The parts of a CustomObject that the data dictionary reads. Objects can be
+# very large (list views, layouts, validation rules...), so only these are
+# kept when parsing them.
+OBJECT_ELEMENT_TAGS = (
+    "customSettingsVisibility",
+    "description",
+    "fields",
+    "label",
+    "visibility",
+)
+
 
 class Package(BaseModel):
     repo: Optional[Union[AbstractRepo, Mock]]
@@ -326,9 +337,12 @@ class GenerateDataDictionary(BaseSourceControlTask):
                     sobject_name = f"{version.package.namespace}{sobject_name}"
 
                 self._process_object_element(
-                    sobject_name, metadata_tree.fromstring(zip_file.read(f)), version
+                    sobject_name, self._parse_object(zip_file.read(f)), version
                 )
 
+    def _parse_object(self, source: bytes) -> metadata_tree.MetadataElement:
+        return metadata_tree.parse_subset(source, OBJECT_ELEMENT_TAGS)
+
     def _should_process_object(
         self,
         namespace: str,
@@ -406,7 +420,7 @@ class GenerateDataDictionary(BaseSourceControlTask):
                     if sobject_name.count("__") == 1:
                         sobject_name = f"{version.package.namespace}{sobject_name}"
 
-                    element = metadata_tree.fromstring(zip_file.read(f))
+                    element = self._parse_object(zip_file.read(f))
 
                     if self._should_process_object(
                         version.package.namespace, sobject_name, element
@@ -437,9 +451,7 @@ class GenerateDataDictionary(BaseSourceControlTask):
                     # If the object-meta file is locatable, load it so we can check
                     # if this is a Custom Setting.
                     if sobject_file in zip_file.namelist():
-                        object_entity = metadata_tree.fromstring(
-                            zip_file.read(sobject_file)
-                        )
+                        object_entity = self._parse_object(zip_file.read(sobject_file))
                     else:
                         object_entity = None
 
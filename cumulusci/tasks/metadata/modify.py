@@ -1,8 +1,8 @@
 import glob
+import os
 
 from cumulusci.core.exceptions import TaskOptionsError
 from cumulusci.core.tasks import BaseTask
-from cumulusci.utils import cd
 from cumulusci.utils.xml import lxml_parse_file
 from cumulusci.utils.xml.salesforce_encoding import serialize_xml_for_salesforce
 
@@ -65,17 +65,19 @@ class RemoveElementsXPath(BaseTask):
             self.elements = [{"xpath": xpath, "path": path}]
 
     def _run_task(self):
+        # Paths are resolved relative to chdir rather than by changing to it,
+        # since the working directory is shared with any other threads
         if self.chdir:
-            self.logger.info("Changing directory to {}".format(self.chdir))
-        with cd(self.chdir):
-            for element in self.elements:
-                self._process_element(element)
+            self.logger.info("Finding paths relative to {}".format(self.chdir))
+        for element in self.elements:
+            self._process_element(element)
 
     def _process_element(self, step):
         self.logger.info(
             "Removing elements matching {xpath} from {path}".format(**step)
         )
-        for f in glob.glob(step["path"], recursive=True):
+        for match in glob.glob(step["path"], root_dir=self.chdir, recursive=True):
+            f = os.path.join(self.chdir or "", match)
             self.logger.info(f"Checking {f}")
             with open(f, "rb") as fp:
                 orig = fp.read()
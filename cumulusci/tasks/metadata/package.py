@@ -2,6 +2,8 @@ import os
 import re
 import shutil
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from logging import Logger, getLogger
 from pathlib import Path
 from typing import Dict, List
@@ -9,11 +11,36 @@ from typing import Dict, List
 import yaml
 
 from cumulusci.core.tasks import BaseTask
+from cumulusci.tasks.metadata.parse_cache import (
+    CACHE_FILENAME,
+    MemberParseCache,
+    process_cache,
+)
 from cumulusci.utils import elementtree_parse_file
 from cumulusci.utils.xml import metadata_tree
 
 __location__ = os.path.dirname(os.path.realpath(__file__))
 
+# Type directories are parsed concurrently; parsing is mostly file I/O.
+MAX_PARSE_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+# item_xpaths naming direct children of the root can be read by streaming.
+CHILD_XPATH_RE = re.compile(r"^\./sf:(\w+)$")
+
+
+@lru_cache(maxsize=None)
+def load_metadata_map() -> dict:
+    """Load metadata_map.yml once per process. Treat the result as read-only."""
+    with open(__location__ + "/metadata_map.yml", "r", encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+
+@lru_cache(maxsize=None)
+def load_delete_excludes() -> tuple:
+    filename = os.path.join(__location__, "..", "..", "files", "delete_excludes.txt")
+    with open(filename, "r", encoding="utf-8") as f:
+        return tuple(line.strip() for line in f)
+
 
 def metadata_sort_key(name):
     sections = []
@@ -45,17 +72,29 @@ def process_common_components(response_messages: List, components: Dict):
     """Compare compoents in the api responce object with list of components and return common common components"""
     if not response_messages or not components:
         return components
-    for message in response_messages:
+    problems = [
+        message.firstChild.nextSibling.firstChild.nodeValue
+        for message in response_messages
+    ]
+    return remove_missing_components(problems, components)
 
-        message_list = message.firstChild.nextSibling.firstChild.nodeValue.split("'")
+
+def remove_missing_components(problems: List[str], components: Dict):
+    """Remove the components which the problems reported by a retrieve of
+    them show to be missing from the org, and return the rest"""
+    if not problems or not components:
+        return components
+    for problem in problems:
+
+        message_list = problem.split("'")
         if len(message_list) > 1:
             component_type = message_list[1]
             message_txt = message_list[2]
             if "is not available in this organization" in message_txt:
                 del components[component_type]
             elif "is unknown" in message_txt:
-                component_type = message_list[0].split(" ")
-                components[component_type[0]].remove(message_list[1])
+                component_type = message_list[0].split(" ")[0]
+                components[component_type].remove(message_list[1])
                 if len(components[component_type]) == 0:
                     del components[component_type]
             else:
@@ -83,11 +122,9 @@ class PackageXmlGenerator(object):
         uninstall_class=None,
         types=None,
         logger=None,
+        parse_cache=None,
     ):
-        with open(
-            __location__ + "/metadata_map.yml", "r", encoding="utf-8"
-        ) as f_metadata_map:
-            self.metadata_map = yaml.safe_load(f_metadata_map)
+        self.metadata_map = load_metadata_map()
         self.directory = directory
         self.api_version = api_version
         self.package_name = package_name
@@ -97,10 +134,12 @@ class PackageXmlGenerator(object):
         self.uninstall_class = uninstall_class
         self.types = types or []
         self.logger = logger
+        self.parse_cache = parse_cache or process_cache
 
     def __call__(self):
         if not self.types:
             self.parse_types()
+            self.parse_members()
         return self.render_xml()
 
     def parse_types(self):
@@ -127,8 +166,27 @@ class PackageXmlGenerator(object):
                     self.logger,  # Logger
                     **options,  # Extra kwargs
                 )
+                parser.parse_cache = self.parse_cache
                 self.types.append(parser)
 
+    def parse_members(self):
+        """Parse the members of each type directory in a worker pool.
+
+        The parsers are independent, and render_xml() sorts both types and
+        members, so the output doesn't depend on completion order."""
+        parsers = [
+            parser for parser in self.types if isinstance(parser, BaseMetadataParser)
+        ]
+        if len(parsers) < 2:
+            for parser in parsers:
+                parser.parse_items()
+            return
+        with ThreadPoolExecutor(
+            max_workers=min(MAX_PARSE_WORKERS, len(parsers))
+        ) as executor:
+            # list() re-raises the first parser error, if any
+            list(executor.map(lambda parser: parser.parse_items(), parsers))
+
     def render_xml(self):
         lines = []
 
@@ -166,32 +224,30 @@ class PackageXmlGenerator(object):
 
 
 class BaseMetadataParser(object):
+    parse_cache: MemberParseCache = process_cache
+
     def __init__(self, metadata_type, directory, extension, delete, logger=None):
         self.metadata_type = metadata_type
         self.directory = directory
         self.extension = extension
         self.delete = delete
         self.members = []
+        self.parsed = False
         self.logger: Logger = logger or getLogger(__file__)
 
         if self.delete:
             self.delete_excludes = self.get_delete_excludes()
 
     def __call__(self):
-        self.parse_items()
+        if not self.parsed:
+            self.parse_items()
         return self.render_xml()
 
     def get_delete_excludes(self):
-        filename = os.path.join(
-            __location__, "..", "..", "files", "delete_excludes.txt"
-        )
-        excludes = []
-        with open(filename, "r", encoding="utf-8") as f:
-            for line in f:
-                excludes.append(line.strip())
-        return excludes
+        return list(load_delete_excludes())
 
     def parse_items(self):
+        self.parsed = True
         # Loop through items
         for item in sorted(os.listdir(self.directory)):
             # on Macs this file is generated by the OS. Shouldn't be in the package.xml
@@ -375,17 +431,34 @@ class MetadataXmlElementParser(BaseMetadataParser):
         if not name_xpath:
             name_xpath = "./sf:fullName"
         self.name_xpath = name_xpath
+        match = CHILD_XPATH_RE.match(item_xpath)
+        self.item_tag = match.group(1) if match else None
 
     def _parse_item(self, item):
-        root = elementtree_parse_file(self.directory + "/" + item)
-        members = []
+        return self.parse_cache.get_members(
+            self.directory + "/" + item,
+            self.cache_key,
+            lambda: self._parse_file(item),
+        )
 
-        parent = self.strip_extension(item)
+    @property
+    def cache_key(self) -> str:
+        "Identifies the parser configuration in the member parse cache"
+        return "|".join(
+            (type(self).__name__, self.metadata_type, self.item_xpath, self.name_xpath)
+        )
 
-        for item in self.get_item_elements(root):
-            members.append(self.get_item_name(item, parent))
+    def _parse_file(self, item):
+        path = self.directory + "/" + item
+        parent = self.strip_extension(item)
+        if self.item_tag:
+            # Only the matching children are needed, so stream them rather
+            # than building a tree of the whole (possibly huge) file.
+            elements = metadata_tree.iter_child_elements(path, [self.item_tag])
+        else:
+            elements = self.get_item_elements(elementtree_parse_file(path))
 
-        return members
+        return [self.get_item_name(element, parent) for element in elements]
 
     def check_delete_excludes(self, item):
         return False
@@ -619,8 +692,15 @@ class UpdatePackageXml(BaseTask):
             uninstall_class=self.options.get(
                 "uninstall_class", self.project_config.project__package__uninstall_class
             ),
+            parse_cache=self._get_parse_cache(),
         )
 
+    def _get_parse_cache(self):
+        "Persist parsed members in the project's .cci directory, if there is one"
+        if not self.project_config.repo_root:
+            return None
+        return MemberParseCache(self.project_config.cache_dir / CACHE_FILENAME)
+
     def _run_task(self):
         output = self.options.get(
             "output", "{}/package.xml".format(self.options.get("path"))
@@ -631,6 +711,7 @@ class UpdatePackageXml(BaseTask):
         package_xml = self.package_xml()
         with open(self.options.get("output", output), mode="w", encoding="utf-8") as f:
             f.write(package_xml)
+        self.package_xml.parse_cache.save()
 
 
 class RemoveSourceComponents:
@@ -655,9 +736,8 @@ class RemoveSourceComponents:
             )
 
     def generate_package_xml_map(self) -> dict:
-        package = metadata_tree.parse(self.package_xml)
         xml_map = {}
-        for type in package.types:
+        for type in metadata_tree.iterparse(self.package_xml, ["types"]):
             members = []
             try:
                 for member in type.members:
@@ -0,0 +1,110 @@
+"""Cache of the members extracted from metadata files by package.xml parsers.
+
+Generating a package.xml means parsing every XML file for types such as
+CustomLabels or workflow rules, which dominates ``update_package_xml`` for
+large projects. Each file's members are cached under its path and the
+parser that read it, and reused as long as the file's mtime and size are
+unchanged. The cache can optionally be persisted to a JSON file so that
+later runs only re-parse files that changed. Each cache holds at most
+``max_entries`` files, evicting the least recently used.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+
+# Bump when the structure of cached entries changes.
+CACHE_FORMAT_VERSION = 1
+CACHE_FILENAME = "package_xml_cache.json"
+DEFAULT_MAX_ENTRIES = 20000
+
+logger = logging.getLogger(__name__)
+
+
+class MemberParseCache:
+    """Members of metadata files keyed by path, mtime and size.
+
+    Safe to share between the threads that parse type directories."""
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self.path = Path(path) if path else None
+        self.max_entries = max_entries
+        self.entries: Dict[str, list] = OrderedDict()
+        self.dirty = False
+        self._lock = threading.Lock()
+        if self.path:
+            self.load()
+
+    def load(self):
+        try:
+            with self.path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable package.xml cache {self.path}: {e}")
+            return
+        if data.get("version") == CACHE_FORMAT_VERSION:
+            self.entries = OrderedDict(data.get("entries", {}))
+            self._evict()
+
+    def save(self):
+        """Write the cache to disk if it changed, dropping deleted files."""
+        if not self.path or not self.dirty:
+            return
+        with self._lock:
+            entries = {
+                key: entry
+                for key, entry in self.entries.items()
+                if os.path.exists(key.split("\0", 1)[0])
+            }
+            self.dirty = False
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"version": CACHE_FORMAT_VERSION, "entries": entries}, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.debug(f"Could not write package.xml cache {self.path}: {e}")
+
+    def get_members(
+        self, path: str, parser_key: str, parse: Callable[[], List[str]]
+    ) -> List[str]:
+        """Return the cached members of `path`, calling `parse` on a miss.
+
+        `parser_key` identifies the parser configuration, since the same
+        file can be read by more than one parser (e.g. objects/*.object)."""
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        key = f"{path}\0{parser_key}"
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+                self.entries.move_to_end(key)
+                return list(entry[2])
+
+        members = parse()
+        with self._lock:
+            self.entries[key] = [stat.st_mtime_ns, stat.st_size, list(members)]
+            self.entries.move_to_end(key)
+            self._evict()
+            self.dirty = True
+        return members
+
+    def _evict(self):
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+
+# Shared by generators in this process that aren't given a persistent cache.
+process_cache = MemberParseCache()
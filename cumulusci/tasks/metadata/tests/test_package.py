@@ -27,9 +27,12 @@ from cumulusci.tasks.metadata.package import (
     ParserConfigurationError,
     RecordTypeParser,
     UpdatePackageXml,
+    load_metadata_map,
     metadata_sort_key,
     process_common_components,
+    remove_missing_components,
 )
+from cumulusci.tasks.metadata.parse_cache import MemberParseCache
 from cumulusci.utils import temporary_dir, touch
 
 __location__ = os.path.dirname(os.path.realpath(__file__))
@@ -92,6 +95,50 @@ class TestPackageXmlGenerator:
             with pytest.raises(MetadataParserMissingError):
                 generator.parse_types()
 
+    def test_metadata_map_loaded_once(self):
+        metadata_map = load_metadata_map()
+        with mock.patch("yaml.safe_load") as safe_load:
+            PackageXmlGenerator(".", "43.0")
+            PackageXmlGenerator(".", "43.0")
+        safe_load.assert_not_called()
+        assert PackageXmlGenerator(".", "43.0").metadata_map is metadata_map
+
+    def test_parse_members__uses_cache(self, tmp_path):
+        labels = tmp_path / "labels"
+        labels.mkdir()
+        (labels / "CustomLabels.labels").write_text(
+            """<?xml version='1.0' encoding='utf-8'?>
+<CustomLabels xmlns="http://soap.sforce.com/2006/04/metadata">
+    <labels>
+        <fullName>TestLabel</fullName>
+    </labels>
+</CustomLabels>"""
+        )
+        (tmp_path / "classes").mkdir()
+        (tmp_path / "classes" / "Foo.cls").write_text("")
+        cache = MemberParseCache()
+
+        first = PackageXmlGenerator(str(tmp_path), "43.0", parse_cache=cache)()
+        with mock.patch.object(MetadataXmlElementParser, "_parse_file") as parse_file:
+            second = PackageXmlGenerator(str(tmp_path), "43.0", parse_cache=cache)()
+        parse_file.assert_not_called()
+        assert first == second
+        assert "<members>TestLabel</members>" in second
+        assert "<members>Foo</members>" in second
+
+    def test_parse_members__raises_parser_errors(self, tmp_path):
+        for name in ("classes", "labels"):
+            (tmp_path / name).mkdir()
+        (tmp_path / "labels" / "CustomLabels.labels").write_text(
+            """<?xml version='1.0' encoding='utf-8'?>
+<CustomLabels xmlns="http://soap.sforce.com/2006/04/metadata">
+    <labels />
+</CustomLabels>"""
+        )
+        generator = PackageXmlGenerator(str(tmp_path), "43.0")
+        with pytest.raises(MissingNameElementError):
+            generator()
+
     def test_render_xml__managed(self):
         with temporary_dir() as path:
             generator = PackageXmlGenerator(
@@ -266,6 +313,26 @@ class TestMetadataXmlElementParser:
                 result
             )
 
+    def test_parser__streamed_and_parsed_agree(self, tmp_path):
+        (tmp_path / "Test.test").write_text(
+            """<?xml version='1.0' encoding='utf-8'?>
+<root xmlns="http://soap.sforce.com/2006/04/metadata">
+    <test><fullName>One</fullName></test>
+    <other><test><fullName>Nested</fullName></test></other>
+    <test><fullName>Two</fullName></test>
+</root>"""
+        )
+        streamed = MetadataXmlElementParser(
+            "TestMDT", str(tmp_path), "test", False, item_xpath="./sf:test"
+        )
+        parsed = MetadataXmlElementParser(
+            "TestMDT", str(tmp_path), "test", False, item_xpath="sf:test"
+        )
+        assert streamed.item_tag == "test"
+        assert parsed.item_tag is None
+        assert streamed._parse_file("Test.test") == ["Test.One", "Test.Two"]
+        assert parsed._parse_file("Test.test") == ["Test.One", "Test.Two"]
+
     def test_parser__missing_item_xpath(self):
         with pytest.raises(ParserConfigurationError):
             parser = MetadataXmlElementParser("TestMDT", None, "test", False)
@@ -368,6 +435,26 @@ class TestUpdatePackageXml:
                 result = f.read()
             assert expected == result
 
+    def test_run_task__saves_parse_cache(self, tmp_path):
+        src_path = os.path.join(
+            __location__, "package_metadata", "namespaced_report_folder"
+        )
+        project_config = BaseProjectConfig(
+            UniversalConfig(),
+            {"project": {"package": {"name": "Test Package", "api_version": "36.0"}}},
+            repo_info={"root": str(tmp_path)},
+        )
+        task_config = TaskConfig(
+            {"options": {"path": src_path, "output": str(tmp_path / "package.xml")}}
+        )
+        task = UpdatePackageXml(project_config, task_config, OrgConfig({}, "test"))
+        with mock.patch.object(MemberParseCache, "save") as save:
+            task()
+        assert task.package_xml.parse_cache.path == (
+            tmp_path / ".cci" / "package_xml_cache.json"
+        )
+        save.assert_called_once()
+
 
 class TestUpdatePackageXmlInstallUninstallClass:
     def test_run_task(self):
@@ -474,3 +561,19 @@ class TestProcessComponents:
         response_messages = parseString(self.response).getElementsByTagName("messages")
         result = process_common_components(response_messages, {})
         assert result == {}
+
+    def test_remove_missing_components(self):
+        components = {
+            "ApexClass": ["TestClass", "AnotherClass"],
+            "CustomObject": ["TestObject"],
+            "Layout": ["Account-Account Layout"],
+        }
+        problems = [
+            "Entity of type 'ApexClass' named 'TestClass' cannot be found",
+            "Entity of type 'CustomObject' named 'TestObject' cannot be found",
+            "Layout 'Account-Account Layout' is unknown",
+        ]
+
+        result = remove_missing_components(problems, components)
+
+        assert result == {"ApexClass": ["AnotherClass"]}
@@ -0,0 +1,101 @@
+import json
+import os
+
+from cumulusci.tasks.metadata.parse_cache import CACHE_FORMAT_VERSION, MemberParseCache
+
+
+def parse_once(members):
+    calls = []
+
+    def parse():
+        calls.append(1)
+        return members
+
+    return parse, calls
+
+
+class TestMemberParseCache:
+    def test_get_members__reuses_unchanged_file(self, tmp_path):
+        path = tmp_path / "custom.labels"
+        path.write_text("<root/>")
+        cache = MemberParseCache()
+        parse, calls = parse_once(["Label"])
+
+        assert cache.get_members(str(path), "key", parse) == ["Label"]
+        assert cache.get_members(str(path), "key", parse) == ["Label"]
+        assert len(calls) == 1
+
+    def test_get_members__reparses_changed_file(self, tmp_path):
+        path = tmp_path / "custom.labels"
+        path.write_text("<root/>")
+        cache = MemberParseCache()
+        parse, calls = parse_once(["Label"])
+        cache.get_members(str(path), "key", parse)
+
+        path.write_text("<root></root>")
+        cache.get_members(str(path), "key", parse)
+        assert len(calls) == 2
+
+    def test_get_members__keyed_by_parser(self, tmp_path):
+        path = tmp_path / "Account.object"
+        path.write_text("<root/>")
+        cache = MemberParseCache()
+
+        assert cache.get_members(str(path), "fields", lambda: ["Account.A"]) == [
+            "Account.A"
+        ]
+        assert cache.get_members(str(path), "recordTypes", lambda: []) == []
+
+    def test_get_members__evicts_least_recently_used(self, tmp_path):
+        paths = []
+        for name in "abc":
+            path = tmp_path / f"{name}.labels"
+            path.write_text("<root/>")
+            paths.append(str(path))
+        cache = MemberParseCache(max_entries=2)
+        cache.get_members(paths[0], "key", lambda: ["A"])
+        cache.get_members(paths[1], "key", lambda: ["B"])
+        cache.get_members(paths[0], "key", lambda: ["A"])
+        cache.get_members(paths[2], "key", lambda: ["C"])
+
+        assert [key.split("\0")[0] for key in cache.entries] == [paths[0], paths[2]]
+
+    def test_save_and_load(self, tmp_path):
+        path = tmp_path / "custom.labels"
+        path.write_text("<root/>")
+        cache_file = tmp_path / "cache" / "package_xml_cache.json"
+        cache = MemberParseCache(cache_file)
+        cache.get_members(str(path), "key", lambda: ["Label"])
+        cache.save()
+
+        parse, calls = parse_once(["Other"])
+        reloaded = MemberParseCache(cache_file)
+        assert reloaded.get_members(str(path), "key", parse) == ["Label"]
+        assert not calls
+
+    def test_save__drops_deleted_files(self, tmp_path):
+        path = tmp_path / "custom.labels"
+        path.write_text("<root/>")
+        cache_file = tmp_path / "package_xml_cache.json"
+        cache = MemberParseCache(cache_file)
+        cache.get_members(str(path), "key", lambda: ["Label"])
+        os.remove(path)
+        cache.save()
+
+        assert json.loads(cache_file.read_text()) == {
+            "version": CACHE_FORMAT_VERSION,
+            "entries": {},
+        }
+
+    def test_save__unchanged_not_written(self, tmp_path):
+        cache_file = tmp_path / "package_xml_cache.json"
+        MemberParseCache(cache_file).save()
+        assert not cache_file.exists()
+
+    def test_load__ignores_bad_file(self, tmp_path):
+        cache_file = tmp_path / "package_xml_cache.json"
+        cache_file.write_text("not json")
+        assert MemberParseCache(cache_file).entries == {}
+
+        cache_file.write_text(json.dumps({"version": -1, "entries": {"a": []}}))
+        assert MemberParseCache(cache_file).entries == {}
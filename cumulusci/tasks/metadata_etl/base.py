@@ -1,7 +1,15 @@
+import copy
+import hashlib
+import multiprocessing
+import os
+import sys
 import tempfile
+import threading
 from abc import ABCMeta, abstractmethod
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
 from urllib.parse import quote, unquote
 
 from lxml import etree
@@ -16,11 +24,44 @@ from cumulusci.core.utils import (
     process_list_arg,
 )
 from cumulusci.salesforce_api.metadata import ApiRetrieveUnpackaged
-from cumulusci.tasks.metadata.package import PackageXmlGenerator
+from cumulusci.tasks.metadata.package import PackageXmlGenerator, load_metadata_map
 from cumulusci.utils import inject_namespace
 from cumulusci.utils.xml import metadata_tree
 from cumulusci.utils.xml.metadata_tree import MetadataElement
 
+# The task whose entities a worker process transforms. Only ever set in
+# worker processes, by _init_transform_worker.
+_worker_task = None
+
+
+def _init_transform_worker(task):
+    """Receive the task in a forked worker process, without pickling it."""
+    global _worker_task
+    _worker_task = task
+
+
+def _transform_entity_file(api_name: str, path: Path) -> Optional[str]:
+    """Transform one entity file in a worker process. Returns the XML to deploy."""
+    return _worker_task._transform_entity_file(api_name, path)
+
+
+def can_fork_workers() -> bool:
+    """Process pools are only used where workers can be forked cheaply and
+    safely. Forking while other threads run (e.g. parallel flow steps) can
+    deadlock the child on a lock held by one of those threads. Daemon
+    threads are background helpers, such as --instrument's memory sampler,
+    which the workers don't depend on, so they don't prevent forking."""
+    return (
+        "fork" in multiprocessing.get_all_start_methods()
+        and sys.platform != "darwin"
+        and (os.cpu_count() or 1) > 1
+        and threading.current_thread() is threading.main_thread()
+        and not any(
+            thread is not threading.main_thread() and not thread.daemon
+            for thread in threading.enumerate()
+        )
+    )
+
 
 class MetadataOperation(StrEnum):
     DEPLOY = "deploy"
@@ -140,7 +181,10 @@ class BaseMetadataETLTask(BaseSalesforceTask, metaclass=ABCMeta):
         target_profile_xml.write_text(
             self._generate_package_xml(MetadataOperation.DEPLOY), encoding="utf-8"
         )
+        return self._deploy_directory(self.deploy_dir)
 
+    def _deploy_directory(self, path):
+        """Deploy a directory of metadata, including its package.xml"""
         # import is here to avoid an import cycle
         from cumulusci.tasks.salesforce import Deploy
 
@@ -149,7 +193,7 @@ class BaseMetadataETLTask(BaseSalesforceTask, metaclass=ABCMeta):
             TaskConfig(
                 {
                     "options": {
-                        "path": self.deploy_dir,
+                        "path": path,
                         "namespace_inject": self.options.get("namespace_inject"),
                         "unmanaged": not self.options["managed"],
                         "namespaced_org": self.options["namespaced_org"],
@@ -215,32 +259,179 @@ class BaseMetadataTransformTask(BaseMetadataETLTask, metaclass=ABCMeta):
 
     def _get_types_package_xml(self):
         """Generate package.xml content based on the return value of _get_entities()."""
-        base = """    <types>
+        return get_types_package_xml(self._get_entities())
+
+    def _get_package_xml_content(self, operation):
+        return get_package_xml_content(self._get_entities(), self.api_version)
+
+    @abstractmethod
+    def _transform(self):
+        pass
+
+
+def get_types_package_xml(entities: Dict[str, Iterable[str]]) -> str:
+    """Generate the <types> of a package.xml for a dict of entities and API names."""
+    base = """    <types>
 {members}
         <name>{name}</name>
     </types>
 """
-        types = ""
-        for entity, api_names in self._get_entities().items():
-            members = "\n".join(
-                f"        <members>{api_name}</members>"
-                for api_name in sorted(api_names)
-            )
-            types += base.format(members=members, name=entity)
+    types = ""
+    for entity, api_names in entities.items():
+        members = "\n".join(
+            f"        <members>{api_name}</members>" for api_name in sorted(api_names)
+        )
+        types += base.format(members=members, name=entity)
 
-        return types
+    return types
 
-    def _get_package_xml_content(self, operation):
-        return f"""<?xml version="1.0" encoding="UTF-8"?>
+
+def get_package_xml_content(
+    entities: Dict[str, Iterable[str]], api_version: str
+) -> str:
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
 <Package xmlns="http://soap.sforce.com/2006/04/metadata">
-{self._get_types_package_xml()}
-    <version>{self.api_version}</version>
+{get_types_package_xml(entities)}
+    <version>{api_version}</version>
 </Package>
 """
 
-    @abstractmethod
-    def _transform(self):
-        pass
+
+class MetadataETLFusion:
+    """Runs consecutive MetadataSingleEntityTransformTasks in a flow
+    with one retrieve and one deploy.
+
+    The flow sets each task's `fusion` and runs the tasks in order as usual.
+    The first task to run retrieves every entity any of the tasks need.
+    Each task then applies _transform_entity() to a copy of the shared
+    in-memory trees, and its changes are kept only if it succeeds, so an
+    error is still reported against the step that caused it. After the
+    last task (or when the flow stops early), everything that was
+    transformed is deployed together."""
+
+    def __init__(self, tasks: Iterable["MetadataSingleEntityTransformTask"]):
+        self.tasks = list(tasks)
+        self.retrieve_dir = None
+        # Transformed trees and their (entity, api_name), by path relative
+        # to the root of the retrieved metadata
+        self.trees: Dict[Path, MetadataElement] = {}
+        self.members: Dict[Path, Tuple[str, str]] = {}
+        self.transformed_tasks: List["MetadataSingleEntityTransformTask"] = []
+        self.finished = False
+        self._tempdir = None
+
+    @staticmethod
+    def fusion_key(task: "MetadataSingleEntityTransformTask") -> tuple:
+        """Tasks can share a retrieve and deploy if these are equal."""
+        return (
+            task.api_version,
+            task.options.get("namespace_inject"),
+            bool(task.options.get("managed")),
+            bool(task.options.get("namespaced_org")),
+        )
+
+    def run(self, task: "MetadataSingleEntityTransformTask"):
+        """Run `task`'s part of the fused retrieve, transform and deploy."""
+        try:
+            if self.retrieve_dir is None:
+                self._retrieve(task)
+            self._transform(task)
+        finally:
+            if task is self.tasks[-1]:
+                self.finish()
+
+    def _retrieve(self, task):
+        # Each task's own package.xml is merged, since some tasks retrieve
+        # more than the entities they transform (e.g. the objects and classes
+        # a profile grants access to). A wildcard is kept alongside named
+        # members, which it doesn't cover for standard objects.
+        entities = defaultdict(set)
+        for fused_task in self.tasks:
+            package_xml = metadata_tree.fromstring(
+                fused_task._generate_package_xml(MetadataOperation.RETRIEVE).encode(
+                    "utf-8"
+                )
+            )
+            for types in package_xml.findall("types"):
+                entities[types.find("name").text].update(
+                    members.text for members in types.findall("members")
+                )
+
+        task.logger.info(
+            f"Extracting existing metadata for {len(self.tasks)} Metadata ETL steps..."
+        )
+        package_xml = get_package_xml_content(entities, task.api_version)
+        self._tempdir = tempfile.TemporaryDirectory()
+        retrieve_dir = Path(self._tempdir.name, "retrieve")
+        retrieve_dir.mkdir()
+        api_retrieve = ApiRetrieveUnpackaged(task, package_xml, task.api_version)
+        api_retrieve().extractall(retrieve_dir)
+        self.retrieve_dir = retrieve_dir
+
+    def _transform(self, task):
+        directory, extension = task._get_entity_location()
+        task._expand_api_names(self.retrieve_dir / directory, extension)
+
+        transformed = {}
+        removed_api_names = set()
+        for api_name in task.api_names:
+            path = Path(directory, f"{api_name}.{extension}")
+            tree = self._checkout(task, path)
+            transformed_xml = task._transform_entity(tree, unquote(api_name))
+            if transformed_xml:
+                transformed[path] = (transformed_xml, api_name)
+            else:
+                removed_api_names.add(api_name)
+        task.api_names = task.api_names - removed_api_names
+
+        # Only now that the task has succeeded do its changes become visible.
+        for path, (tree, api_name) in transformed.items():
+            self.trees[path] = tree
+            self.members[path] = (task.entity, api_name)
+        if transformed:
+            self.transformed_tasks.append(task)
+
+    def _checkout(self, task, path: Path) -> MetadataElement:
+        """Return a private copy of the current version of an entity."""
+        if path in self.trees:
+            return MetadataElement(copy.deepcopy(self.trees[path]._element))
+        return task._parse_entity(self.retrieve_dir / path)
+
+    def finish(self):
+        """Deploy everything transformed so far. Only deploys once."""
+        if self.finished:
+            return
+        self.finished = True
+        try:
+            if not self.transformed_tasks:
+                return
+            self._deploy(self.transformed_tasks[-1])
+        finally:
+            if self._tempdir:
+                self._tempdir.cleanup()
+
+    def _deploy(self, task):
+        deploy_dir = Path(self._tempdir.name, "deploy")
+        deploy_dir.mkdir()
+        entities = defaultdict(set)
+        for path, tree in self.trees.items():
+            (deploy_dir / path.parent).mkdir(exist_ok=True)
+            with (deploy_dir / path).open(mode="w", encoding="utf-8") as f:
+                f.write(tree.tostring(xml_declaration=True))
+            entity, api_name = self.members[path]
+            entities[entity].add(api_name)
+
+        task.logger.info(
+            f"Loading transformed metadata for {len(self.transformed_tasks)} Metadata ETL steps..."
+        )
+        (deploy_dir / "package.xml").write_text(
+            task._inject_namespace(get_package_xml_content(entities, task.api_version)),
+            encoding="utf-8",
+        )
+        result = task._deploy_directory(deploy_dir)
+        for transformed_task in self.transformed_tasks:
+            transformed_task._post_deploy(result)
+        return result
 
 
 class MetadataSingleEntityTransformTask(BaseMetadataTransformTask, metaclass=ABCMeta):
@@ -250,6 +441,15 @@ class MetadataSingleEntityTransformTask(BaseMetadataTransformTask, metaclass=ABC
 
     entity = None
 
+    # Transform at least this many entities in a pool of worker processes.
+    # None disables the pool, e.g. for transforms that keep state between
+    # entities.
+    parallel_transform_threshold: Optional[int] = 50
+
+    # Consecutive steps of a flow can be run together; see MetadataETLFusion.
+    fusion_class = MetadataETLFusion
+    fusion: Optional[MetadataETLFusion] = None
+
     task_options = {
         "api_names": {"description": "List of API names of entities to affect"},
         **BaseMetadataETLTask.task_options,
@@ -276,22 +476,20 @@ class MetadataSingleEntityTransformTask(BaseMetadataTransformTask, metaclass=ABC
         should be deployed, or None to suppress deployment of this entity."""
         pass
 
-    def _transform(self):
-        # call _transform_entity once per retrieved entity
-        # if the entity is an XML file, provide a parsed version
-        # and write the returned metadata into the deploy directory
+    def _run_task(self):
+        if self.fusion:
+            self.fusion.run(self)
+        else:
+            super()._run_task()
 
-        parser = PackageXmlGenerator(
-            None, self.api_version
-        )  # We'll use it for its metadata_map
+    def _get_entity_location(self) -> Tuple[str, str]:
+        """Return the directory and file extension of self.entity's metadata files."""
+        metadata_map = load_metadata_map()
         entity_configurations = [
             entry
-            for entry in parser.metadata_map
+            for entry in metadata_map
             if any(
-                [
-                    subentry["type"] == self.entity
-                    for subentry in parser.metadata_map[entry]
-                ]
+                [subentry["type"] == self.entity for subentry in metadata_map[entry]]
             )
         ]
         if not entity_configurations:
@@ -299,7 +497,7 @@ class MetadataSingleEntityTransformTask(BaseMetadataTransformTask, metaclass=ABC
                 f"Unable to locate configuration for entity {self.entity}"
             )
 
-        configuration = parser.metadata_map[entity_configurations[0]][0]
+        configuration = metadata_map[entity_configurations[0]][0]
         if configuration["class"] not in [
             "MetadataFilenameParser",
             "CustomObjectParser",
@@ -308,10 +506,9 @@ class MetadataSingleEntityTransformTask(BaseMetadataTransformTask, metaclass=ABC
                 f"MetadataSingleEntityTransformTask only supports manipulating complete, file-based XML entities (not {self.entity})"
             )
 
-        extension = configuration["extension"]
-        directory = entity_configurations[0]
-        source_metadata_dir = self.retrieve_dir / directory
+        return entity_configurations[0], configuration["extension"]
 
+    def _expand_api_names(self, source_metadata_dir: Path, extension: str):
         if "*" in self.api_names:
             # Walk the retrieved directory to get the actual suite
             # of API names retrieved and rebuild our api_names list.
@@ -322,25 +519,33 @@ class MetadataSingleEntityTransformTask(BaseMetadataTransformTask, metaclass=ABC
                 if metadata_file.suffix == f".{extension}"
             )
 
-        removed_api_names = set()
+    def _parse_entity(self, path: Path) -> MetadataElement:
+        if not path.exists():
+            raise CumulusCIException(f"Cannot find metadata file {path}")
+
+        try:
+            return metadata_tree.parse(str(path))
+        except SyntaxError as err:
+            err.filename = path
+            raise err
 
-        for api_name in self.api_names:
-            # Page Layout names can contain spaces, but parentheses and other
-            # characters like ' and < are quoted.
-            # We quote user-specified API names so we can locate the corresponding
-            # metadata files, but present them un-quoted in messages to the user.
-            unquoted_api_name = unquote(api_name)
-
-            path = source_metadata_dir / f"{api_name}.{extension}"
-            if not path.exists():
-                raise CumulusCIException(f"Cannot find metadata file {path}")
-
-            try:
-                tree = metadata_tree.parse(str(path))
-            except SyntaxError as err:
-                err.filename = path
-                raise err
-            transformed_xml = self._transform_entity(tree, unquoted_api_name)
+    def _transform(self):
+        # call _transform_entity once per retrieved entity
+        # if the entity is an XML file, provide a parsed version
+        # and write the returned metadata into the deploy directory
+
+        directory, extension = self._get_entity_location()
+        source_metadata_dir = self.retrieve_dir / directory
+        self._expand_api_names(source_metadata_dir, extension)
+
+        removed_api_names = set()
+        entity_files = [
+            (api_name, source_metadata_dir / f"{api_name}.{extension}")
+            for api_name in sorted(self.api_names)
+        ]
+        for (api_name, _), transformed_xml in zip(
+            entity_files, self._transform_entity_files(entity_files)
+        ):
             if transformed_xml:
                 parent_dir = self.deploy_dir / directory
                 if not parent_dir.exists():
@@ -348,66 +553,88 @@ class MetadataSingleEntityTransformTask(BaseMetadataTransformTask, metaclass=ABC
                 destination_path = parent_dir / f"{api_name}.{extension}"
 
                 with destination_path.open(mode="w", encoding="utf-8") as f:
-                    f.write(transformed_xml.tostring(xml_declaration=True))
+                    f.write(transformed_xml)
             else:
                 # Make sure to remove from our package.xml
                 removed_api_names.add(api_name)
 
         self.api_names = self.api_names - removed_api_names
 
-    def _normalize_element(self, element: etree._Element) -> str:
-        """Normalize an XML element for comparison by serializing it.
+    def _transform_entity_files(
+        self, entity_files: List[Tuple[str, Path]]
+    ) -> Iterable[Optional[str]]:
+        """Transform entity files, in a process pool if there are many of them.
+
+        Parsing, transforming and serializing XML is CPU-bound, so large
+        sets of entities (e.g. all Profiles) are spread across forked
+        worker processes. Transforms that need to share state between
+        entities must set parallel_transform_threshold to None."""
+        threshold = self.parallel_transform_threshold
+        if threshold is None or len(entity_files) < threshold or not can_fork_workers():
+            return [
+                self._transform_entity_file(api_name, path)
+                for api_name, path in entity_files
+            ]
+
+        max_workers = os.cpu_count()
+        chunksize = max(1, len(entity_files) // (4 * max_workers))
+        with ProcessPoolExecutor(
+            max_workers,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=_init_transform_worker,
+            initargs=(self,),
+        ) as executor:
+            return list(
+                executor.map(
+                    _transform_entity_file, *zip(*entity_files), chunksize=chunksize
+                )
+            )
+
+    def _transform_entity_file(self, api_name: str, path: Path) -> Optional[str]:
+        # Page Layout names can contain spaces, but parentheses and other
+        # characters like ' and < are quoted.
+        # We quote user-specified API names so we can locate the corresponding
+        # metadata files, but present them un-quoted in messages to the user.
+        unquoted_api_name = unquote(api_name)
 
-        This creates a canonical representation that ignores whitespace
-        differences. Elements are serialized with sorted attributes.
-        """
-        # Create a deep copy to avoid modifying the original
-        element_copy = etree.fromstring(etree.tostring(element))
+        tree = self._parse_entity(path)
+        transformed_xml = self._transform_entity(tree, unquoted_api_name)
+        if transformed_xml:
+            return transformed_xml.tostring(xml_declaration=True)
 
-        # Sort attributes for consistent comparison
-        if element_copy.attrib:
-            sorted_attrs = dict(sorted(element_copy.attrib.items()))
-            element_copy.attrib.clear()
-            element_copy.attrib.update(sorted_attrs)
+    def _element_digest(self, element: etree._Element) -> bytes:
+        """Digest an XML element's content for comparison.
 
-        # Serialize to string for comparison
-        # Strip whitespace from text/tail for normalization
-        return etree.tostring(element_copy, encoding="unicode", method="xml")
+        The element is serialized in canonical (C14N) form, which orders
+        attributes and namespace declarations consistently, and hashed in
+        a single pass without copying the element.
+        """
+        return hashlib.sha256(
+            etree.tostring(element, method="c14n", with_tail=False)
+        ).digest()
 
     def _remove_duplicate_elements(self, metadata: MetadataElement) -> None:
         """Remove duplicate XML elements from metadata.
 
-        For elements with the same tag name, compares their normalized content
-        and removes duplicates, keeping only unique elements based on their
-        actual content (not just tag name).
+        Compares the content of the direct children of metadata and removes
+        duplicates, keeping only the first of each unique element based on
+        its actual content (not just tag name).
         """
-        # Get all direct child elements grouped by tag name
-        tag_to_elements = defaultdict(list)
-
-        # Iterate through all direct children of the metadata element
+        seen_digests = set()
+        duplicates_to_remove = []
         for child in metadata._element:
-            tag_name = child.tag.split("}")[1] if "}" in child.tag else child.tag
-            tag_to_elements[tag_name].append(child)
-
-        # Remove duplicates based on content comparison
-        for tag_name, elements in tag_to_elements.items():
-            if len(elements) > 1:
-                # Track seen content to identify duplicates
-                seen_content = set()
-                duplicates_to_remove = []
-
-                for element in elements:
-                    normalized = self._normalize_element(element)
-                    if normalized in seen_content:
-                        # This is a duplicate, mark for removal
-                        duplicates_to_remove.append(element)
-                    else:
-                        # First time seeing this content, keep it
-                        seen_content.add(normalized)
-
-                # Remove duplicates (in reverse order to maintain indices)
-                for duplicate in reversed(duplicates_to_remove):
-                    metadata._element.remove(duplicate)
+            if not isinstance(child.tag, str):  # comments and processing instructions
+                continue
+            digest = self._element_digest(child)
+            if digest in seen_digests:
+                duplicates_to_remove.append(child)
+            else:
+                seen_digests.add(digest)
+
+        for duplicate in duplicates_to_remove:
+            metadata._element.remove(duplicate)
+        if duplicates_to_remove:
+            metadata.invalidate()
 
 
 class UpdateMetadataFirstChildTextTask(MetadataSingleEntityTransformTask):
@@ -40,6 +40,8 @@ class UpdateEcaOauthPolicy(MetadataSingleEntityTransformTask):
     """
 
     entity = "ExtlClntAppOauthConfigurablePolicies"
+    # Transforms query the org for users, so they stay in this process.
+    parallel_transform_threshold = None
 
     task_options = {
         "comma_separated_permission_set": {
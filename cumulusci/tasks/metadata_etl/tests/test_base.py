@@ -1,4 +1,5 @@
 import tempfile
+import threading
 from pathlib import Path
 from unittest import mock
 
@@ -6,13 +7,16 @@ import pytest
 from lxml import etree
 
 from cumulusci.core.exceptions import CumulusCIException, TaskOptionsError
+from cumulusci.core.instrumentation import InstrumentationCallback
 from cumulusci.tasks.metadata_etl import (
     BaseMetadataETLTask,
     BaseMetadataSynthesisTask,
     BaseMetadataTransformTask,
     MetadataSingleEntityTransformTask,
     UpdateMetadataFirstChildTextTask,
+    base,
 )
+from cumulusci.tasks.metadata_etl.base import MetadataETLFusion
 from cumulusci.tasks.salesforce.tests.util import create_task
 from cumulusci.utils.xml.metadata_tree import fromstring
 
@@ -387,6 +391,265 @@ class TestMetadataSingleEntityTransformTask:
                 task._transform()
 
 
+class TestParallelTransform:
+    app_xml = """<?xml version="1.0" encoding="UTF-8"?>
+<CustomApplication xmlns="http://soap.sforce.com/2006/04/metadata">
+</CustomApplication>"""
+
+    def run_transform(self, threshold, api_names=("One", "Two", "Three")):
+        task = create_task(
+            AppendDescription,
+            {"managed": False, "api_version": "47.0", "text": "changed"},
+        )
+        task.parallel_transform_threshold = threshold
+        with tempfile.TemporaryDirectory() as tmpdir:
+            task._create_directories(tmpdir)
+            app_path = task.retrieve_dir / "applications"
+            app_path.mkdir()
+            for api_name in api_names:
+                (app_path / f"{api_name}.app").write_text(self.app_xml)
+
+            task._transform()
+
+            return task, {
+                path.name: path.read_text()
+                for path in (task.deploy_dir / "applications").iterdir()
+            }
+
+    @mock.patch("cumulusci.tasks.metadata_etl.base.can_fork_workers", lambda: True)
+    @mock.patch("cumulusci.tasks.metadata_etl.base.ProcessPoolExecutor")
+    def test_transform__process_pool(self, executor_mock):
+        def map_in_worker(fn, *args, **kw):
+            pool_kwargs = executor_mock.call_args.kwargs
+            pool_kwargs["initializer"](*pool_kwargs["initargs"])
+            return map(fn, *args)
+
+        executor = executor_mock.return_value.__enter__.return_value
+        executor.map.side_effect = map_in_worker
+
+        task, deployed = self.run_transform(threshold=2)
+
+        executor.map.assert_called_once()
+        assert task.api_names == {"One", "Two", "Three"}
+        assert sorted(deployed) == ["One.app", "Three.app", "Two.app"]
+        assert all("changed" in xml for xml in deployed.values())
+
+    @pytest.mark.skipif(
+        not base.can_fork_workers(), reason="worker processes can't be forked here"
+    )
+    def test_transform__forked_workers(self):
+        task, deployed = self.run_transform(threshold=2)
+
+        assert sorted(deployed) == ["One.app", "Three.app", "Two.app"]
+        assert all("changed" in xml for xml in deployed.values())
+        assert base._worker_task is None
+
+    @mock.patch("cumulusci.tasks.metadata_etl.base.ProcessPoolExecutor")
+    def test_transform__not_forked_while_threads_run(self, executor_mock):
+        stop = threading.Event()
+        thread = threading.Thread(target=stop.wait)
+        thread.start()
+        try:
+            task, deployed = self.run_transform(threshold=2)
+        finally:
+            stop.set()
+            thread.join()
+
+        executor_mock.assert_not_called()
+        assert len(deployed) == 3
+
+    @mock.patch("os.cpu_count", lambda: 2)
+    @mock.patch("cumulusci.tasks.metadata_etl.base.ProcessPoolExecutor")
+    def test_transform__forked_while_instrumented(self, executor_mock):
+        if not base.can_fork_workers():
+            pytest.skip("worker processes can't be forked here")
+
+        def map_in_worker(fn, *args, **kw):
+            pool_kwargs = executor_mock.call_args.kwargs
+            pool_kwargs["initializer"](*pool_kwargs["initargs"])
+            return map(fn, *args)
+
+        executor = executor_mock.return_value.__enter__.return_value
+        executor.map.side_effect = map_in_worker
+
+        # The memory sampler's thread doesn't change how the transform runs
+        callbacks = InstrumentationCallback()
+        callbacks._install()
+        try:
+            task, deployed = self.run_transform(threshold=2)
+        finally:
+            callbacks._uninstall()
+
+        executor.map.assert_called_once()
+        assert len(deployed) == 3
+
+    @mock.patch("cumulusci.tasks.metadata_etl.base.ProcessPoolExecutor")
+    def test_transform__below_threshold(self, executor_mock):
+        task, deployed = self.run_transform(threshold=5)
+        executor_mock.assert_not_called()
+        assert len(deployed) == 3
+
+    @mock.patch("cumulusci.tasks.metadata_etl.base.ProcessPoolExecutor")
+    def test_transform__disabled(self, executor_mock):
+        task, deployed = self.run_transform(threshold=None)
+        executor_mock.assert_not_called()
+        assert len(deployed) == 3
+
+
+class TestRemoveDuplicateElements:
+    def test_remove_duplicate_elements(self):
+        metadata = fromstring(
+            b"""<?xml version="1.0" encoding="UTF-8"?>
+<CustomObject xmlns="http://soap.sforce.com/2006/04/metadata">
+    <fields><fullName>A</fullName><label a="1" b="2">A</label></fields>
+    <fields><fullName>B</fullName></fields>
+    <!-- a comment -->
+    <fields><fullName>A</fullName><label b="2" a="1">A</label></fields>
+    <fields><fullName>A</fullName><label>A</label></fields>
+    <label>A</label>
+</CustomObject>"""
+        )
+        task = create_task(
+            ConcreteMetadataSingleEntityTransformTask,
+            {"managed": False, "api_version": "47.0"},
+        )
+
+        task._remove_duplicate_elements(metadata)
+
+        fields = metadata.findall("fields")
+        assert [field.fullName.text for field in fields] == ["A", "B", "A"]
+        assert metadata.find("label").text == "A"
+
+
+class AppendDescription(MetadataSingleEntityTransformTask):
+    entity = "CustomApplication"
+
+    def _transform_entity(self, metadata, api_name):
+        metadata.append("description", self.options["text"])
+        if self.options.get("fail"):
+            raise CumulusCIException("Transform failed")
+        return metadata
+
+
+class TestMetadataETLFusion:
+    app_xml = """<?xml version="1.0" encoding="UTF-8"?>
+<CustomApplication xmlns="http://soap.sforce.com/2006/04/metadata">
+</CustomApplication>"""
+
+    def run_fused(self, api_mock, *task_options):
+        def extractall(path):
+            app_path = Path(path, "applications")
+            app_path.mkdir()
+            (app_path / "Test.app").write_text(self.app_xml)
+            (app_path / "Other.app").write_text(self.app_xml)
+
+        api_mock.return_value.return_value.extractall.side_effect = extractall
+
+        deployed = {}
+
+        def deploy_directory(path):
+            deployed.update(
+                (f.relative_to(path).as_posix(), f.read_text())
+                for f in Path(path).rglob("*")
+                if f.is_file()
+            )
+            return "Success"
+
+        tasks = [
+            create_task(
+                AppendDescription,
+                {"managed": False, "api_version": "47.0", **options},
+            )
+            for options in task_options
+        ]
+        fusion = MetadataETLFusion(tasks)
+        for task in tasks:
+            task.fusion = fusion
+            task._deploy_directory = mock.Mock(side_effect=deploy_directory)
+            task._post_deploy = mock.Mock()
+        errors = []
+        for task in tasks:
+            try:
+                task()
+            except CumulusCIException as e:
+                errors.append(e)
+        return tasks, deployed, errors
+
+    @mock.patch("cumulusci.tasks.metadata_etl.base.ApiRetrieveUnpackaged")
+    def test_run(self, api_mock):
+        tasks, deployed, errors = self.run_fused(
+            api_mock,
+            {"api_names": "Test", "text": "one"},
+            {"api_names": "Test,Other", "text": "two"},
+        )
+
+        assert not errors
+        api_mock.assert_called_once()
+        package_xml = api_mock.call_args[0][1]
+        assert "<members>Other</members>" in package_xml
+        assert package_xml.count("<members>Test</members>") == 1
+        tasks[0]._deploy_directory.assert_not_called()
+        tasks[1]._deploy_directory.assert_called_once()
+
+        assert "<description>one</description>" in deployed["applications/Test.app"]
+        assert "<description>two</description>" in deployed["applications/Test.app"]
+        assert "one" not in deployed["applications/Other.app"]
+        assert "<members>Other</members>" in deployed["package.xml"]
+        for task in tasks:
+            task._post_deploy.assert_called_once_with("Success")
+
+    @mock.patch("cumulusci.tasks.metadata_etl.base.ApiRetrieveUnpackaged")
+    def test_run__wildcard(self, api_mock):
+        tasks, deployed, errors = self.run_fused(
+            api_mock,
+            {"api_names": "Test", "text": "one"},
+            {"api_names": "*", "text": "two"},
+        )
+
+        package_xml = api_mock.call_args[0][1]
+        assert "<members>*</members>" in package_xml
+        # A wildcard doesn't cover every named member (e.g. standard objects)
+        assert "<members>Test</members>" in package_xml
+        assert tasks[1].api_names == {"Test", "Other"}
+        assert set(deployed) == {
+            "package.xml",
+            "applications/Test.app",
+            "applications/Other.app",
+        }
+
+    @mock.patch("cumulusci.tasks.metadata_etl.base.ApiRetrieveUnpackaged")
+    def test_run__failed_step_discarded(self, api_mock):
+        tasks, deployed, errors = self.run_fused(
+            api_mock,
+            {"api_names": "Test", "text": "one"},
+            {"api_names": "Test", "text": "bad", "fail": True},
+            {"api_names": "Test", "text": "three"},
+        )
+
+        assert len(errors) == 1
+        assert "bad" not in deployed["applications/Test.app"]
+        assert "three" in deployed["applications/Test.app"]
+        tasks[1]._post_deploy.assert_not_called()
+
+    @mock.patch("cumulusci.tasks.metadata_etl.base.ApiRetrieveUnpackaged")
+    def test_finish__nothing_transformed(self, api_mock):
+        task = create_task(AppendDescription, {"managed": False, "api_version": "47.0"})
+        task._deploy_directory = mock.Mock()
+        fusion = MetadataETLFusion([task])
+        fusion.finish()
+        fusion.finish()
+        task._deploy_directory.assert_not_called()
+
+    def test_fusion_key(self):
+        options = {"managed": False, "api_version": "47.0"}
+        first = create_task(AppendDescription, options)
+        second = create_task(AppendDescription, options)
+        other = create_task(AppendDescription, {**options, "api_version": "48.0"})
+        key = MetadataETLFusion.fusion_key
+        assert key(first) == key(second)
+        assert key(first) != key(other)
+
+
 class TestUpdateMetadataFirstChildTextTask:
     def test_init_options__namespace_injected_in_value(self):
         options = {
@@ -1,5 +1,7 @@
+import json
+import os
 import pathlib
-from typing import List, Optional, Union
+from typing import IO, List, Optional, Union
 
 from defusedxml.minidom import parseString
 from pydantic.v1 import ValidationError
@@ -9,6 +11,7 @@ from cumulusci.core.config import TaskConfig
 from cumulusci.core.dependencies.utils import TaskContext
 from cumulusci.core.exceptions import TaskOptionsError
 from cumulusci.core.sfdx import convert_sfdx_source
+from cumulusci.core.shared_work import shared_work_for, tree_stamp
 from cumulusci.core.source_transforms.transforms import (
     SourceTransform,
     SourceTransformList,
@@ -18,9 +21,11 @@ from cumulusci.core.utils import (
     process_bool_arg,
     process_list_arg,
 )
+from cumulusci.salesforce_api.cometd import CometDClient
 from cumulusci.salesforce_api.metadata import ApiDeploy, ApiRetrieveUnpackaged
-from cumulusci.salesforce_api.package_zip import MetadataPackageZipBuilder
+from cumulusci.salesforce_api.package_zip import MetadataPackageZipBuilder, PackageZip
 from cumulusci.salesforce_api.rest_deploy import RestDeploy
+from cumulusci.salesforce_api.status_waiters import StreamingWaiter
 from cumulusci.tasks.metadata.package import process_common_components
 from cumulusci.tasks.salesforce.BaseSalesforceMetadataApiTask import (
     BaseSalesforceMetadataApiTask,
@@ -74,12 +79,19 @@ class Deploy(BaseSalesforceMetadataApiTask):
             "description": "Apply source transforms before deploying. See the CumulusCI documentation for details on how to specify transforms."
         },
         "rest_deploy": {"description": "If True, deploy metadata using REST API"},
+        "status_channel": {
+            "description": "A Streaming API channel (such as /event/Deploy_Status__e) with events that include the id of the deployment. "
+            "If set, the deployment status is checked as soon as such an event arrives, rather than only on the polling schedule."
+        },
     }
 
     namespaces = {"sf": "http://soap.sforce.com/2006/04/metadata"}
 
     transforms: List[SourceTransform] = []
 
+    # Decides when the status of deployments is checked, if not by polling
+    status_waiter = None
+
     def _init_options(self, kwargs):
         super(Deploy, self)._init_options(kwargs)
 
@@ -144,7 +156,9 @@ class Deploy(BaseSalesforceMetadataApiTask):
             table.echo()
             return None
         elif package_zip is not None:
-            self.logger.info("Payload size: {} bytes".format(len(package_zip)))
+            self.logger.info(
+                "Payload size: {} bytes".format(self._get_payload_size(package_zip))
+            )
         else:
             self.logger.warning("Deployment package is empty; skipping deployment.")
             return
@@ -153,7 +167,7 @@ class Deploy(BaseSalesforceMetadataApiTask):
         if self.rest_deploy:
             self.api_class = RestDeploy
 
-        return self.api_class(
+        api = self.api_class(
             self,
             package_zip,
             purge_on_delete=False,
@@ -161,6 +175,34 @@ class Deploy(BaseSalesforceMetadataApiTask):
             test_level=self.test_level,
             run_tests=self.specified_tests,
         )
+        api.waiter = self._get_status_waiter()
+        return api
+
+    def _get_status_waiter(self):
+        if self.status_waiter is None and self.options.get("status_channel"):
+            client = CometDClient(
+                self.org_config, self.project_config.project__package__api_version
+            )
+            self.status_waiter = StreamingWaiter(client, self.options["status_channel"])
+        return self.status_waiter
+
+    def _stop_status_waiter(self):
+        if isinstance(self.status_waiter, StreamingWaiter):
+            self.status_waiter.stop()
+        self.status_waiter = None
+
+    def _run_task(self):
+        try:
+            return super()._run_task()
+        finally:
+            self._stop_status_waiter()
+
+    def _get_payload_size(self, package_zip: PackageZip) -> int:
+        if isinstance(package_zip, str):
+            return len(package_zip)
+        size = package_zip.seek(0, os.SEEK_END)
+        package_zip.seek(0)
+        return size
 
     def _has_namespaced_package(self, ns: Optional[str]) -> bool:
         return determine_managed_mode(
@@ -202,7 +244,7 @@ class Deploy(BaseSalesforceMetadataApiTask):
 
         return is_collision, xml_map
 
-    def _get_package_zip(self, path) -> Union[str, dict, None]:
+    def _get_package_zip(self, path) -> Union[IO[bytes], dict, None]:
         assert path, f"Path should be specified for {self.__class__.name}"
         if not pathlib.Path(path).exists():
             self.logger.warning(f"{path} not found.")
@@ -217,6 +259,24 @@ class Deploy(BaseSalesforceMetadataApiTask):
             "unmanaged": not self._has_namespaced_package(namespace),
             "namespaced_org": self._is_namespaced_org(namespace),
         }
+        work = shared_work_for(self.project_config)
+        # Transforms may use details of the org, such as its URL.
+        if work is None or options.get("collision_check") or self.transforms:
+            return self._build_package_zip(path, options)
+
+        # Flows running against several orgs at once build each zip once.
+        # Their threads share the working directory, which is pinned to the
+        # project's root while they run, so relative paths resolve there.
+        resolved = pathlib.Path(path).resolve()
+        key = (
+            "package_zip",
+            str(resolved),
+            tree_stamp(resolved),
+            json.dumps(options, sort_keys=True, default=repr),
+        )
+        return work.open_file(key, lambda: self._build_package_zip(path, options))
+
+    def _build_package_zip(self, path, options: dict) -> Union[IO[bytes], dict, None]:
         package_zip = None
 
         with convert_sfdx_source(path, None, self.logger) as src_path:
@@ -237,7 +297,7 @@ class Deploy(BaseSalesforceMetadataApiTask):
                 # If the package is empty, do nothing.
                 if not package_zip.zf.namelist():
                     return
-                return package_zip.as_base64()
+                return package_zip.as_file()
             else:
                 return xml_map
 
@@ -1,17 +1,56 @@
 import copy
 import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
 
+from cumulusci.core.exceptions import TaskOptionsError
+from cumulusci.core.utils import process_list_arg
+from cumulusci.salesforce_api.status_waiters import SharedStatusLoop
 from cumulusci.tasks.salesforce import Deploy
 
 deploy_options = copy.deepcopy(Deploy.task_options)
 deploy_options["path"][
     "description"
 ] = "The path to the parent directory containing the metadata bundles directories"
+deploy_options["max_parallel"] = {
+    "description": "The maximum number of bundles to deploy at the same time. "
+    "Defaults to 1, which deploys the bundles one after another. Bundles are "
+    "only deployed together if they are listed in the same parallel_groups entry."
+}
+deploy_options["parallel_groups"] = {
+    "description": "A list of groups of bundle (subdirectory) names that don't "
+    "depend on each other and can be deployed concurrently. Each group is "
+    "deployed when its first bundle is reached in alphabetical order; bundles "
+    "that aren't in a group are deployed on their own, in order."
+}
 
 
 class DeployBundles(Deploy):
     task_options = deploy_options
 
+    def _init_options(self, kwargs):
+        super()._init_options(kwargs)
+        try:
+            self.max_parallel = int(self.options.get("max_parallel", 1))
+        except (TypeError, ValueError):
+            raise TaskOptionsError("max_parallel must be an integer")
+        if self.max_parallel < 1:
+            raise TaskOptionsError("max_parallel must be at least 1")
+
+        self.parallel_groups = [
+            process_list_arg(group)
+            for group in process_list_arg(self.options.get("parallel_groups") or [])
+        ]
+        seen = set()
+        for group in self.parallel_groups:
+            for name in group:
+                if name in seen:
+                    raise TaskOptionsError(
+                        f"Bundle {name} is listed in more than one parallel group"
+                    )
+                seen.add(name)
+
     def _run_task(self):
         path = self.options["path"]
         pwd = os.getcwd()
@@ -24,21 +63,104 @@ class DeployBundles(Deploy):
             self.logger.warning("Path {} not found, skipping".format(path))
             return
 
-        for item in sorted(os.listdir(path)):
-            item_path = os.path.join(path, item)
-            if not os.path.isdir(item_path):
-                continue
+        bundles = [
+            item
+            for item in sorted(os.listdir(path))
+            if os.path.isdir(os.path.join(path, item))
+        ]
+        try:
+            if self.max_parallel == 1:
+                for item in bundles:
+                    self._log_bundle(item)
+                    self._deploy_bundle(os.path.join(path, item))
+                return
 
-            self.logger.info(
-                "Deploying bundle: {}/{}".format(self.options["path"], item)
-            )
+            stages = [
+                [os.path.join(path, item) for item in stage]
+                for stage in self._get_stages(bundles)
+            ]
+            # Check on all the concurrent deployments from one thread
+            # unless their status is streamed.
+            if not self.options.get("status_channel"):
+                self.status_waiter = SharedStatusLoop()
+            self._deploy_stages(stages)
+        finally:
+            self._stop_status_waiter()
 
-            self._deploy_bundle(item_path)
+    def _log_bundle(self, item):
+        self.logger.info("Deploying bundle: {}/{}".format(self.options["path"], item))
 
     def _deploy_bundle(self, path):
         api = self._get_api(path)
         return api()
 
+    def _get_stages(self, bundles: List[str]) -> List[List[str]]:
+        """Split the bundles into stages which are deployed one after another.
+
+        The bundles within a stage are independent of each other."""
+        unknown = {name for group in self.parallel_groups for name in group}
+        unknown.difference_update(bundles)
+        if unknown:
+            raise TaskOptionsError(
+                f"parallel_groups lists bundles not found in {self.options['path']}: "
+                + ", ".join(sorted(unknown))
+            )
+
+        group_of = {name: group for group in self.parallel_groups for name in group}
+        stages = []
+        for item in bundles:
+            group = group_of.get(item)
+            if group is None:
+                stages.append([item])
+            elif item == min(group):
+                stages.append(sorted(group))
+        return stages
+
+    def _deploy_stages(self, stages: List[List[str]]):
+        """Deploy stages of bundles, overlapping packaging with deployment.
+
+        Bundles are packaged one at a time and in order, in a background
+        thread, because building a package can change the working directory.
+        Packaging keeps up to max_parallel bundles ahead of the deployments,
+        so the next bundle is ready as soon as the org is free to take it.
+        Deployments (submitting and polling ApiDeploy) run concurrently
+        within a stage, and a stage only starts once the previous one has
+        finished successfully."""
+        paths = [path for stage in stages for path in stage]
+        upcoming = iter(paths)
+        packager = ThreadPoolExecutor(max_workers=1)
+        deployer = ThreadPoolExecutor(max_workers=self.max_parallel)
+        packaged = deque()
+
+        def package_next():
+            path = next(upcoming, None)
+            if path is not None:
+                packaged.append(packager.submit(self._package_bundle, path))
+
+        try:
+            for _ in range(self.max_parallel):
+                package_next()
+            for stage in stages:
+                deploys = []
+                for _ in stage:
+                    api = packaged.popleft().result()
+                    package_next()
+                    if api is not None:
+                        deploys.append(deployer.submit(api))
+                # Let every deployment in the stage finish before reporting
+                # the first failure, so that none is left running unreported.
+                errors = [future.exception() for future in deploys]
+                errors = [error for error in errors if error is not None]
+                if errors:
+                    raise errors[0]
+        finally:
+            packager.shutdown(wait=True, cancel_futures=True)
+            deployer.shutdown(wait=True, cancel_futures=True)
+
+    def _package_bundle(self, path):
+        self._log_bundle(os.path.basename(path))
+        return self._get_api(path)
+
     def freeze(self, step):
         ui_options = self.task_config.config.get("ui_options", {})
         path = self.options["path"]
@@ -58,6 +180,8 @@ class DeployBundles(Deploy):
             # to freeze a different task is not ideal.
             dependency = self.options.copy()
             dependency.pop("path")
+            dependency.pop("max_parallel", None)
+            dependency.pop("parallel_groups", None)
             dependency.update(
                 {
                     "github": self.project_config.repo_url,
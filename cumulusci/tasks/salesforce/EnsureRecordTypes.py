@@ -131,8 +131,8 @@ class EnsureRecordTypes(BaseSalesforceApiTask):
             ]
             self.options["stage_name"] = active_picklist_values[0]["value"]
 
-    def _build_package(self):
-        objects_app_path = "objects"
+    def _build_package(self, path):
+        objects_app_path = os.path.join(path, "objects")
         os.mkdir(objects_app_path)
         with open(
             os.path.join(objects_app_path, self.options["sobject"] + ".object"), "w"
@@ -180,7 +180,7 @@ class EnsureRecordTypes(BaseSalesforceApiTask):
                     business_process_link=business_process_link,
                 )
             )
-        with open("package.xml", "w") as f:
+        with open(os.path.join(path, "package.xml"), "w") as f:
             f.write(PACKAGE_XML)
 
     def _run_task(self):
@@ -194,8 +194,8 @@ class EnsureRecordTypes(BaseSalesforceApiTask):
             )
             return
 
-        with temporary_dir() as tempdir:
-            self._build_package()
+        with temporary_dir(chdir=False) as tempdir:
+            self._build_package(tempdir)
             d = self._deploy(
                 self.project_config, self.task_config, self.org_config, path=tempdir
             )
@@ -42,7 +42,7 @@ class UninstallPackaged(UninstallLocal):
         )
         packaged = self._retrieve_packaged()
 
-        with temporary_dir() as tempdir:
+        with temporary_dir(chdir=False) as tempdir:
             packaged.extractall(tempdir)
             destructive_changes = super(
                 UninstallPackaged, self
@@ -6,6 +6,10 @@ from pydantic.v1 import create_model
 
 from cumulusci.core.exceptions import SalesforceException, TaskOptionsError
 from cumulusci.core.utils import determine_managed_mode
+from cumulusci.salesforce_api.permission_assignments import (
+    PERMISSION_SET_GROUP_COMPONENT,
+    PermissionAssignments,
+)
 from cumulusci.tasks.salesforce import BaseSalesforceApiTask
 from cumulusci.utils import inject_namespace
 from cumulusci.utils.options import CCIOptions, CCIOptionType, Field
@@ -87,6 +91,7 @@ class AssignPermissionSetToPermissionSetGroup(BaseSalesforceApiTask):
 
     This task creates PermissionSetGroupComponent records to associate
     Permission Sets with Permission Set Groups using the Composite API.
+    Permission Sets which are already in a group are skipped.
 
     Task options:
     - assignments: A dictionary where:
@@ -200,8 +205,8 @@ class AssignPermissionSetToPermissionSetGroup(BaseSalesforceApiTask):
                 raise SalesforceException(msg)
             self.logger.warning(msg)
 
-        # Step 3: Build composite request to create PermissionSetGroupComponent records
-        records = []
+        # Step 3: Pair the Permission Set Groups with their Permission Sets
+        pairs = []
         for psg_name, ps_names in assignments.items():
             psg_id = self.psg_ids.get(self.psg_names_sanitized[psg_name])
             if not psg_id:
@@ -218,28 +223,44 @@ class AssignPermissionSetToPermissionSetGroup(BaseSalesforceApiTask):
                     )
                     continue
 
-                records.append(
-                    {
-                        "attributes": {"type": "PermissionSetGroupComponent"},
-                        "PermissionSetGroupId": psg_id,
-                        "PermissionSetId": ps_id,
-                    }
-                )
+                pairs.append((psg_id, ps_id))
 
-        if not records:
+        if not pairs:
             self.logger.warning("No valid records to create. Nothing to do.")
             return
 
-        # Step 4: Use Composite API to create records in batches of 200
-        for i in range(0, len(records), 200):
-            batch = records[i : i + 200]
-            self.logger.info(f"Processing batch {i // 200 + 1} ({len(batch)} records)")
-            try:
-                self._create_permission_set_group_components(batch)
-            except Exception as e:
-                self.logger.error(f"Error processing batch {i // 200 + 1}: {str(e)}")
-                if self.parsed_options.fail_on_error:
-                    raise e
+        # Step 4: Create the PermissionSetGroupComponent records which don't exist yet
+        try:
+            result = PermissionAssignments(self.sf, self.logger).assign(
+                PERMISSION_SET_GROUP_COMPONENT, pairs
+            )
+        except Exception as e:
+            msg = f"Error creating PermissionSetGroupComponent records: {str(e)}"
+            if self.parsed_options.fail_on_error:
+                raise SalesforceException(msg) from e
+            self.logger.error(msg)
+            return
+
+        psg_names = {psg_id: name for name, psg_id in self.psg_ids.items()}
+        ps_names = {ps_id: name for name, ps_id in self.ps_ids.items()}
+        for psg_id, ps_id in result.existing:
+            self.logger.info(
+                f"Permission Set '{ps_names[ps_id]}' is already assigned to Permission Set Group '{psg_names[psg_id]}'. Skipping assignment creation."
+            )
+        for (psg_id, ps_id), message in result.failed.items():
+            self.logger.error(
+                f"Failed to create PermissionSetGroupComponent for Permission Set Group '{psg_names[psg_id]}' and Permission Set '{ps_names[ps_id]}': {message}"
+            )
+        if result.is_noop:
+            return
+
+        self.logger.info(
+            f"Permission Set Group Assignments results: {len(result.inserted)} succeeded, {len(result.failed)} failed"
+        )
+        if result.failed and self.parsed_options.fail_on_error:
+            raise SalesforceException(
+                f"Failed to create {len(result.failed)} PermissionSetGroupComponent record(s)"
+            )
 
     def _get_permission_set_group_ids(self, psg_names: List[str]):
         """Query Permission Set Groups by DeveloperName and return mapping of name to ID."""
@@ -332,89 +353,6 @@ class AssignPermissionSetToPermissionSetGroup(BaseSalesforceApiTask):
                 original_name = name_mapping[(record_name, None)]
                 self.ps_ids[original_name] = record["Id"]
 
-    def _create_permission_set_group_components(self, records: List[Dict]):
-        """Create PermissionSetGroupComponent records using Composite API."""
-        request_body = {
-            "allOrNone": False,
-            "records": records,
-        }
-
-        try:
-            result = self.sf.restful(
-                "composite/sobjects", method="POST", data=json.dumps(request_body)
-            )
-
-            # Process response
-            composite_response = isinstance(result, list) and result or []
-            success_count = 0
-            error_count = 0
-
-            for i, response in enumerate(composite_response):
-                success = response.get("success", False)
-                if success is True:
-                    success_count += 1
-                    record_id = response.get("id", "Unknown")
-                    self.logger.debug(
-                        f"Created PermissionSetGroupComponent record: {record_id}"
-                    )
-                else:
-
-                    errors = response.get("errors", [])
-                    is_duplicate_error = any(
-                        err.get("statusCode")
-                        for err in errors
-                        if isinstance(err, dict)
-                        and err.get("statusCode", "Unknown status code")
-                        == "DUPLICATE_VALUE"
-                    )
-
-                    error_messages = [
-                        f"{err.get('message', 'Unknown error')} ({err.get('statusCode', 'Unknown status code')})"
-                        for err in errors
-                        if isinstance(err, dict)
-                    ]
-                    psg_name = next(
-                        (
-                            key
-                            for key, value in self.psg_ids.items()
-                            if value
-                            == records[i].get("PermissionSetGroupId", "Unknown")
-                        ),
-                        None,
-                    )
-                    ps_name = next(
-                        (
-                            key
-                            for key, value in self.ps_ids.items()
-                            if value == records[i].get("PermissionSetId", "Unknown")
-                        ),
-                        None,
-                    )
-
-                    if is_duplicate_error:
-                        self.logger.info(
-                            f"Permission Set '{ps_name}' is already assigned to Permission Set Group '{self.psg_names_sanitized.get(psg_name, psg_name)}'. Skipping assignment creation."
-                        )
-                    else:
-                        error_count += 1
-                        self.logger.error(
-                            f"Failed to create PermissionSetGroupComponent for Permission Set Group '{self.psg_names_sanitized.get(psg_name, psg_name)}' and Permission Set '{self.ps_names_sanitized.get(ps_name, ps_name)}': {', '.join(error_messages)}"
-                        )
-
-            self.logger.info(
-                f"Permission Set Group Assignments results: {success_count} succeeded, {error_count} failed"
-            )
-
-            if error_count > 0:
-                raise SalesforceException(
-                    f"Failed to create {error_count} PermissionSetGroupComponent record(s)"
-                )
-
-        except Exception as e:
-            raise SalesforceException(
-                f"Error creating PermissionSetGroupComponent records: {str(e)}"
-            ) from e
-
 
 def build_name_conditions(names: List[str], field_name: str = "Name"):
     name_conditions = []
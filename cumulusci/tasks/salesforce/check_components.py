@@ -1,24 +1,33 @@
+import hashlib
+import io
 import json
 import os
-import shutil
-import tempfile
-from collections import defaultdict
-from itertools import chain
-from xml.etree.ElementTree import ParseError
-
-from defusedxml.minidom import parseString
+from typing import Dict, List, Optional
+from xml.sax.saxutils import escape
 
 from cumulusci.core.config import FlowConfig, TaskConfig
 from cumulusci.core.exceptions import TaskOptionsError
 from cumulusci.core.flowrunner import FlowCoordinator
 from cumulusci.core.sfdx import convert_sfdx_source
 from cumulusci.core.utils import process_list_arg
-from cumulusci.salesforce_api.metadata import ApiRetrieveUnpackaged
-from cumulusci.tasks.metadata.package import process_common_components
+from cumulusci.salesforce_api.metadata import (
+    ApiRetrieveUnpackaged,
+    RetrieveResultReader,
+)
+from cumulusci.tasks.metadata.package import (
+    PackageXmlGenerator,
+    remove_missing_components,
+)
 from cumulusci.tasks.salesforce import BaseSalesforceTask
 from cumulusci.utils import cd
 from cumulusci.utils.xml import metadata_tree
 
+# The components of deploy paths without a package.xml are cached in the
+# project's .cci directory, by a hash of the path's contents.
+INVENTORY_CACHE_NAME = "check_components"
+# Bump when the structure of the cached inventories changes.
+INVENTORY_CACHE_VERSION = 1
+
 
 class CheckComponents(BaseSalesforceTask):
     api_retrieve_unpackaged = ApiRetrieveUnpackaged
@@ -48,10 +57,9 @@ class CheckComponents(BaseSalesforceTask):
         paths = self.options.get("paths")
         plan_or_flow_name = self.options.get("name")
 
-        (
-            components,
-            api_retrieve_unpackaged_response,
-        ) = self.get_repo_existing_components(plan_or_flow_name, paths)
+        components, problems = self.get_repo_existing_components(
+            plan_or_flow_name, paths
+        ) or (None, None)
 
         if not components:
             self.logger.info("No components found in deploy path")
@@ -62,9 +70,7 @@ class CheckComponents(BaseSalesforceTask):
             self.logger.debug(f"{component_type}: {', '.join(component_names)}")
         # check common components
         components.pop("Settings", None)
-        existing_components = process_common_components(
-            api_retrieve_unpackaged_response, components
-        )
+        existing_components = remove_missing_components(problems, components)
 
         if existing_components:
             self.logger.info("Components exists in the target org:")
@@ -101,93 +107,93 @@ class CheckComponents(BaseSalesforceTask):
             self.logger.debug(
                 f"deploy paths found in the plan or flow.{self.deploy_paths}"
             )
-        # Temp dir to copy all deploy paths from task options
-        temp_dir = tempfile.mkdtemp()
-        self.logger.info(f"Temporary deploy directory created: {temp_dir}")
-        mdapi_components = {}
-        mdapi_response_messages = []
-        for path in self.deploy_paths:
+        inventories = []
+        for path in dict.fromkeys(self.deploy_paths):
             full_path = os.path.join(self.project_config.repo_root, path)
             if not os.path.exists(full_path):
                 self.logger.info(f"Skipping path: '{path}' - path doesn't exist")
                 continue
-            elif "package.xml" in os.listdir(full_path):
-                package_xml_path = os.path.join(full_path, "package.xml")
-                source_xml_tree = metadata_tree.parse(package_xml_path)
-                components = metadata_tree.parse_package_xml_types(
-                    "name", source_xml_tree
-                )
-                response_messages = self._get_api_object_responce(
-                    package_xml_path, source_xml_tree.version.text
-                )
-                merged = {}
-                for key in set(components).union(mdapi_components):
-                    merged[key] = list(
-                        set(
-                            chain(
-                                components.get(key, []), mdapi_components.get(key, [])
-                            )
-                        )
-                    )
-                mdapi_components = merged
-                mdapi_response_messages.extend(response_messages)
-                continue
-            self._copy_to_tempdir(path, temp_dir)
-
-        (
-            components,
-            api_retrieve_unpackaged_response,
-        ) = self._collect_components_from_paths(temp_dir)
+            inventory = self._get_path_inventory(path, full_path)
+            if inventory:
+                inventories.append(inventory)
 
-        # remove temp dir
-        shutil.rmtree(temp_dir)
         merged = {}
-        if components:
-            for key in set(components).union(mdapi_components):
-                merged[key] = list(
-                    set(chain(components.get(key, []), mdapi_components.get(key, [])))
+        for inventory in inventories:
+            for component_type, names in inventory["types"].items():
+                merged.setdefault(component_type, set()).update(names)
+        components = {
+            component_type: sorted(names) for component_type, names in merged.items()
+        }
+        if not components:
+            return [components, []]
+
+        # Retrieve the components of all the paths at once
+        api_version = max(
+            (inventory["version"] for inventory in inventories if inventory["version"]),
+            key=float,
+            default=self.project_config.project__package__api_version,
+        )
+        problems = self._get_retrieve_problems(
+            _build_package_xml(components, api_version), api_version
+        )
+        return [components, problems]
+
+    def _get_path_inventory(self, path, full_path) -> Optional[dict]:
+        """The components in a deploy path and the API version of its
+        package.xml, as {"types": {type: [names]}, "version": version}.
+
+        Finding the components of a path without a package.xml means
+        converting it, which is slow, so they are cached by a hash of
+        the path's contents."""
+        package_xml_path = os.path.join(full_path, "package.xml")
+        if os.path.exists(package_xml_path):
+            return _read_package_xml(package_xml_path)
+
+        key = _hash_directory(full_path)
+        with self.project_config.open_cache(INVENTORY_CACHE_NAME) as cache_dir:
+            cache_file = cache_dir / f"{key}.json"
+            if cache_file.exists():
+                self.logger.debug(f"Using cached components of path: {path}")
+                with cache_file.open("r", encoding="utf-8") as f:
+                    return json.load(f)
+
+            self.logger.info(f"Collecting components from path: {path}")
+            try:
+                inventory = self._collect_path_inventory(full_path)
+            except Exception as e:
+                self.logger.warning(
+                    f"Skipping path: '{path}' - unable to collect its components: {e}"
                 )
-            components = merged
-        else:
-            components = mdapi_components
+                return None
+            with cache_file.open("w", encoding="utf-8") as f:
+                json.dump(inventory, f)
+            return inventory
 
-        if api_retrieve_unpackaged_response:
-            api_retrieve_unpackaged_response.extend(mdapi_response_messages)
-        else:
-            api_retrieve_unpackaged_response = mdapi_response_messages
-
-        return [components, api_retrieve_unpackaged_response]
-
-    def _copy_to_tempdir(self, src_dir, temp_dir):
-        for item in os.listdir(src_dir):
-            src_item = os.path.join(src_dir, item)
-            dst_item = os.path.join(temp_dir, item)
-
-            if os.path.isdir(src_item):
-                if not os.path.exists(dst_item):
-                    shutil.copytree(src_item, dst_item)
-                else:
-                    self._merge_directories(src_item, dst_item)
-            else:
-                if not os.path.exists(dst_item):
-                    shutil.copy2(src_item, dst_item)
-                else:
-                    self.logger.debug(f"File {dst_item} already exists, skipping...")
-
-    def _merge_directories(self, src_dir, dst_dir):
-        for item in os.listdir(src_dir):
-            src_item = os.path.join(src_dir, item)
-            dst_item = os.path.join(dst_dir, item)
-
-            if os.path.isdir(src_item):
-                if not os.path.exists(dst_item):
-                    shutil.copytree(src_item, dst_item)
-                    self._merge_directories(src_item, dst_item)
-            else:
-                if not os.path.exists(dst_item):
-                    shutil.copy2(src_item, dst_item)  # Copy file if it doesn't exist
-                else:
-                    self.logger.debug(f"File {dst_item} already exists, skipping...")
+    def _collect_path_inventory(self, full_path) -> dict:
+        with convert_sfdx_source(full_path, None, self.logger) as src_path:
+            package_xml_path = os.path.join(src_path, "package.xml")
+            if os.path.exists(package_xml_path):
+                return _read_package_xml(package_xml_path)
+            # Metadata API format source without a package.xml
+            package_xml = PackageXmlGenerator(
+                str(src_path), self.project_config.project__package__api_version
+            )()
+            return _read_package_xml(io.BytesIO(package_xml.encode("utf-8")))
+
+    def _get_retrieve_problems(self, package_xml, api_version) -> List[str]:
+        """Retrieve the components in package_xml from the org, and return
+        the problems reported for those which don't exist there.
+
+        The response is parsed as it is read, without decoding the zip file."""
+        api_retrieve_unpackaged_object = self.api_retrieve_unpackaged(
+            self, package_xml, api_version
+        )
+        response = api_retrieve_unpackaged_object._get_response()
+        reader = RetrieveResultReader(read_zip_file=False)
+        reader.read(response)
+        return [
+            message["problem"] for message in reader.messages if message.get("problem")
+        ]
 
     def _is_plan(self, name):
 
@@ -267,58 +273,47 @@ class CheckComponents(BaseSalesforceTask):
 
         return found_values
 
-    def _collect_components_from_paths(self, full_path):
-
-        if not os.path.exists(full_path):
-            return None, None
 
-        components = defaultdict(set)
-        self.logger.info(f"Collecting components from path: {full_path}")
-        # remove if any exiting package.xml files coppied from deploy_pre/post paths
-
-        if os.path.exists(os.path.join(full_path, "package.xml")):
-            os.remove(os.path.join(full_path, "package.xml"))
-
-        with convert_sfdx_source(full_path, None, self.logger) as src_path:
-            package_xml_path = os.path.join(src_path, "package.xml")
-            if os.path.exists(package_xml_path):
-                try:
-                    source_xml_tree = metadata_tree.parse(package_xml_path)
-                    self.logger.info("parsing package.xml")
-
-                    components = metadata_tree.parse_package_xml_types(
-                        "name", source_xml_tree
-                    )
-
-                    response_messages = self._get_api_object_responce(
-                        package_xml_path, source_xml_tree.version.text
-                    )
-
-                    return [components, response_messages]
-
-                except ParseError as e:
-                    self.logger.error(f"Error parsing package.xml: {e}")
-                    return None, None
-            else:
-                self.logger.warning(
-                    f"No package.xml found in {full_path}, scanning directories"
-                )
-
-        return None, None
-
-    def _get_api_object_responce(self, pakcage_xml_path, version):
-
-        if not os.path.exists(pakcage_xml_path):
-            return None
+def _read_package_xml(source) -> dict:
+    source_xml_tree = metadata_tree.parse(source)
+    types = metadata_tree.parse_package_xml_types("name", source_xml_tree)
+    version = source_xml_tree.find("version")
+    return {
+        "types": {
+            component_type: sorted(names) for component_type, names in types.items()
+        },
+        "version": version.text if version is not None else None,
+    }
 
-        package_xml = open(pakcage_xml_path, "r")
 
-        api_retrieve_unpackaged_object = self.api_retrieve_unpackaged(
-            self, package_xml.read(), version
+def _build_package_xml(components: Dict[str, List[str]], api_version) -> str:
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<Package xmlns="http://soap.sforce.com/2006/04/metadata">',
+    ]
+    for component_type in sorted(components):
+        lines.append("    <types>")
+        lines.extend(
+            f"        <members>{escape(name)}</members>"
+            for name in components[component_type]
         )
-
-        response_messages = parseString(
-            api_retrieve_unpackaged_object._get_response().content
-        ).getElementsByTagName("messages")
-
-        return response_messages
+        lines.append(f"        <name>{escape(component_type)}</name>")
+        lines.append("    </types>")
+    lines.append(f"    <version>{api_version}</version>")
+    lines.append("</Package>")
+    return "\n".join(lines)
+
+
+def _hash_directory(path) -> str:
+    """A hash of the names and contents of the files in a directory"""
+    digest = hashlib.sha256(f"{INVENTORY_CACHE_VERSION}".encode())
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            file_path = os.path.join(root, name)
+            relative_path = os.path.relpath(file_path, path).replace(os.sep, "/")
+            digest.update(f"\0{relative_path}\0".encode())
+            with open(file_path, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    digest.update(chunk)
+    return digest.hexdigest()
@@ -2,10 +2,12 @@ import json
 import random
 import re
 import string
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
+from typing import Dict, List
 
 from cumulusci.cli.ui import CliTable
-from cumulusci.core.exceptions import SalesforceException
+from cumulusci.core.exceptions import SalesforceException, TaskOptionsError
 from cumulusci.core.utils import determine_managed_mode, process_list_arg
 from cumulusci.tasks.salesforce import BaseSalesforceApiTask
 from cumulusci.utils import inject_namespace
@@ -13,6 +15,17 @@ from cumulusci.utils import inject_namespace
 API_ROLLBACK_MESSAGE = "The transaction was rolled back since another operation in the same transaction failed."
 API_INVALID_REF_MESSAGE = "Invalid reference specified."
 
+# The most subrequests a composite request can have, and the most of
+# them which can be queries or sObject Collections requests
+COMPOSITE_SUBREQUEST_LIMIT = 25
+COMPOSITE_QUERY_LIMIT = 5
+
+TOKEN_RE = re.compile(r"%%%[A-Z_]+%%%")
+# @{referenceId.field.records[0].Id}
+REFERENCE_RE = re.compile(r"@\{(\w+)((?:\.\w+|\[\d+\])*)\}")
+REFERENCE_PATH_RE = re.compile(r"\.(\w+)|\[(\d+)\]")
+QUERY_URL_RE = re.compile(r"/(query|queryAll|composite/sobjects)\b")
+
 
 class CompositeApi(BaseSalesforceApiTask):
     task_docs = """
@@ -20,6 +33,18 @@ This task is a wrapper for Composite REST API calls. Given a list of JSON files
 (one request body per file), POST each and process the returned composite
 result. Files are processed in the order given by the ``data_files`` option.
 
+A file can use the results of subrequests in an earlier file with the usual
+``@{referenceId.field}`` syntax; the references are filled in from that
+file's results before the request is sent. Set ``max_parallel`` to send
+files which don't reference each other at the same time.
+
+A request with more subrequests than a composite request allows (25, of
+which at most 5 queries or sObject Collections requests) is sent as a chain
+of composite requests, with references to earlier parts of the chain filled
+in from their results. Each part is a separate transaction, so when
+``allOrNone`` is true a failure rolls back only its own part, and the rest
+of the chain isn't sent.
+
 In addition, this task will process the request body and replace namespace
 (``%%%NAMESPACE%%%``) and user ID (``%%%USERID%%%``) tokens. To avoid username
 collisions, use the ``randomize_username`` option to replace the top-level
@@ -60,40 +85,130 @@ Example Task Definition
             "description": "If True, randomize the TLD for any 'Username' fields.",
             "default": False,
         },
+        "max_parallel": {
+            "description": "The maximum number of data files to send at the same time. "
+            "Defaults to 1, which sends them one after another. Files which reference "
+            "the results of another file are sent after it. Only use a higher value if "
+            "files don't otherwise depend on the records created by earlier files.",
+        },
     }
 
     def _init_options(self, kwargs):
         super()._init_options(kwargs)
         self.data_files = process_list_arg(self.options.get("data_files") or [])
+        try:
+            self.max_parallel = int(self.options.get("max_parallel", 1))
+        except (TypeError, ValueError):
+            raise TaskOptionsError("max_parallel must be an integer")
+        if self.max_parallel < 1:
+            raise TaskOptionsError("max_parallel must be at least 1")
+        self._token_values = {}
 
     def _run_task(self):
-        for data_file_path in self.data_files:
-            self.logger.info(f"Processing {data_file_path}")
-            self._composite_request(data_file_path)
+        requests = [
+            json.loads(self._process_json(Path(data_file_path).read_text()))
+            for data_file_path in self.data_files
+        ]
+        dependencies = self._get_dependencies(requests)
 
-    def _composite_request(self, data_file_path):
-        request_body = self._process_json(Path(data_file_path).read_text())
-        self.is_all_or_none = json.loads(request_body).get("allOrNone", False)
-        result = self.sf.restful("composite", method="POST", data=request_body)
-        self._process_response(result)
+        # The results of each file's subrequests by referenceId, by file index
+        self.file_results = {}
+        pending = list(range(len(requests)))
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.max_parallel) as executor:
+            while pending or running:
+                ready = [
+                    i
+                    for i in pending
+                    if all(dep in self.file_results for dep in dependencies[i])
+                ]
+                if not ready and not running:
+                    raise TaskOptionsError(
+                        "These data files reference each other's results: "
+                        + ", ".join(self.data_files[i] for i in pending)
+                    )
+                for i in ready[: self.max_parallel - len(running)]:
+                    pending.remove(i)
+                    known = {}
+                    for dep in dependencies[i]:
+                        known.update(self.file_results[dep])
+                    future = executor.submit(
+                        self._composite_request, self.data_files[i], requests[i], known
+                    )
+                    running[future] = i
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self.file_results[running.pop(future)] = future.result()
 
-    def _process_json(self, body):
-        """Replace namespace tokens and randomize username domains."""
-        user_id = self.org_config.user_id
-        body = body.replace("%%%USERID%%%", user_id)
+    def _get_dependencies(self, requests: List[dict]) -> Dict[int, List[int]]:
+        """The indexes of the files whose results each file references.
 
-        namespace = self.project_config.project__package__namespace
-        managed = determine_managed_mode(
-            self.options, self.project_config, self.org_config
-        )
+        A referenceId which the file doesn't define itself is looked up in
+        the closest earlier file which does, or else the first later one."""
+        defined = [
+            {subrequest["referenceId"] for subrequest in request["compositeRequest"]}
+            for request in requests
+        ]
+        dependencies = {}
+        for i, request in enumerate(requests):
+            referenced = {
+                match.group(1)
+                for match in REFERENCE_RE.finditer(
+                    json.dumps(request["compositeRequest"])
+                )
+            }
+            candidates = list(range(i - 1, -1, -1)) + list(range(i + 1, len(requests)))
+            files = set()
+            for reference_id in referenced - defined[i]:
+                j = next((j for j in candidates if reference_id in defined[j]), None)
+                if j is not None:
+                    files.add(j)
+            dependencies[i] = sorted(files)
+        return dependencies
 
-        _, body = inject_namespace(
-            "composite",
-            body,
-            namespace=namespace,
-            managed=managed,
-            namespaced_org=self.options.get("namespaced", self.org_config.namespaced),
-        )
+    def _composite_request(
+        self, data_file_path: str, request: dict, known: Dict[str, dict]
+    ) -> Dict[str, dict]:
+        """Send a file's request, split into a chain of composite requests if
+        it's too big for one. Returns the subrequest results by referenceId."""
+        self.logger.info(f"Processing {data_file_path}")
+        is_all_or_none = request.get("allOrNone", False)
+        chunks = _split_subrequests(request["compositeRequest"])
+        if len(chunks) > 1:
+            self.logger.info(
+                f"Sending {len(request['compositeRequest'])} subrequests in {len(chunks)} chained composite requests"
+            )
+
+        results = dict(known)
+        subresponses = []
+        for chunk in chunks:
+            own = {subrequest["referenceId"] for subrequest in chunk}
+            body = dict(
+                request,
+                compositeRequest=_resolve_references(
+                    chunk,
+                    {key: value for key, value in results.items() if key not in own},
+                ),
+            )
+            result = self.sf.restful("composite", method="POST", data=json.dumps(body))
+            subresponses.extend(result["compositeResponse"])
+            for subresponse in result["compositeResponse"]:
+                results[subresponse["referenceId"]] = subresponse["body"]
+            if is_all_or_none and not all(
+                self._http_ok(subresponse["httpStatusCode"])
+                for subresponse in result["compositeResponse"]
+            ):
+                break
+
+        self._process_response({"compositeResponse": subresponses}, is_all_or_none)
+        return {
+            subresponse["referenceId"]: subresponse["body"]
+            for subresponse in subresponses
+        }
+
+    def _process_json(self, body):
+        """Replace namespace and user ID tokens and randomize username domains."""
+        body = TOKEN_RE.sub(lambda match: self._token_value(match.group(0)), body)
 
         if self.options.get("randomize_username", False):
             random_tld = "".join(random.choices(string.ascii_lowercase, k=4))
@@ -103,13 +218,33 @@ Example Task Definition
 
         return body
 
-    def _process_response(self, result):
+    def _token_value(self, token: str) -> str:
+        """The replacement for a token, which is worked out once per task."""
+        if token not in self._token_values:
+            if token == "%%%USERID%%%":
+                value = self.org_config.user_id
+            else:
+                _, value = inject_namespace(
+                    "composite",
+                    token,
+                    namespace=self.project_config.project__package__namespace,
+                    managed=determine_managed_mode(
+                        self.options, self.project_config, self.org_config
+                    ),
+                    namespaced_org=self.options.get(
+                        "namespaced", self.org_config.namespaced
+                    ),
+                )
+            self._token_values[token] = value
+        return self._token_values[token]
+
+    def _process_response(self, result, is_all_or_none):
         """Handle the compositeResponse and raise an exception if failed."""
         subrequests = result["compositeResponse"]
         status_codes = {subrequest["httpStatusCode"] for subrequest in subrequests}
 
         all_success = all([self._http_ok(code) for code in status_codes])
-        if self.is_all_or_none and not all_success:
+        if is_all_or_none and not all_success:
             self._log_exception_message(subrequests)
             raise SalesforceException(json.dumps(subrequests, indent=2))
         else:
@@ -140,3 +275,61 @@ Example Task Definition
         )
         table = CliTable(table_data, title="Subrequest Results")
         table.echo()
+
+
+def _split_subrequests(subrequests: List[dict]) -> List[List[dict]]:
+    """Split subrequests into chunks which fit in a composite request"""
+    chunks = []
+    chunk = []
+    queries = 0
+    for subrequest in subrequests:
+        is_query = bool(QUERY_URL_RE.search(subrequest.get("url", "")))
+        if chunk and (
+            len(chunk) == COMPOSITE_SUBREQUEST_LIMIT
+            or queries + is_query > COMPOSITE_QUERY_LIMIT
+        ):
+            chunks.append(chunk)
+            chunk = []
+            queries = 0
+        chunk.append(subrequest)
+        queries += is_query
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def _resolve_references(value, results: Dict[str, dict]):
+    """Fill in @{referenceId...} references to subrequests which have
+    already been sent from their results. A reference which can't be
+    resolved is left for the API to report."""
+    if isinstance(value, dict):
+        return {key: _resolve_references(item, results) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_resolve_references(item, results) for item in value]
+    if not isinstance(value, str) or "@{" not in value:
+        return value
+
+    match = REFERENCE_RE.fullmatch(value)
+    if match:
+        # Keep the type of the referenced value
+        resolved = _lookup_reference(match, results)
+        return value if resolved is None else resolved
+
+    def replace(match):
+        resolved = _lookup_reference(match, results)
+        return match.group(0) if resolved is None else str(resolved)
+
+    return REFERENCE_RE.sub(replace, value)
+
+
+def _lookup_reference(match, results: Dict[str, dict]):
+    reference_id, path = match.groups()
+    if reference_id not in results:
+        return None
+    value = results[reference_id]
+    for field, index in REFERENCE_PATH_RE.findall(path):
+        try:
+            value = value[field] if field else value[int(index)]
+        except (KeyError, IndexError, TypeError):
+            return None
+    return value
@@ -74,9 +74,9 @@ def capitalize(s):
 def build_settings_package(
     settings: Optional[dict], object_settings: Optional[dict], api_version: str
 ):
-    with temporary_dir() as path:
+    with temporary_dir(chdir=False) as path:
         if settings:
-            pathlib.Path("settings").mkdir()
+            (pathlib.Path(path) / "settings").mkdir()
             for section, section_settings in settings.items():
                 settings_name = capitalize(section)
                 if section == "orgPreferenceSettings":
@@ -91,7 +91,7 @@ def build_settings_package(
                     values = textwrap.indent(_dict_to_xml(section_settings), "    ")
                 # e.g. AccountSettings -> settings/Account.settings
                 settings_file = (
-                    pathlib.Path("settings")
+                    pathlib.Path(path, "settings")
                     / f"{settings_name[: -len('Settings')]}.settings"
                 )
                 with open(settings_file, "w", encoding="utf-8") as f:
@@ -100,19 +100,19 @@ def build_settings_package(
                     )
 
         if object_settings:
-            pathlib.Path("objects").mkdir()
+            (pathlib.Path(path) / "objects").mkdir()
             for obj_lower_name, this_obj_settings in object_settings.items():
                 object_name = capitalize(obj_lower_name)
                 file_content = _get_object_file(object_name, this_obj_settings)
                 with open(
-                    pathlib.Path("objects") / f"{object_name}.object",
+                    pathlib.Path(path, "objects", f"{object_name}.object"),
                     "w",
                     encoding="utf-8",
                 ) as f:
                     f.write(file_content)
 
         package_generator = PackageXmlGenerator(path, api_version)
-        with open("package.xml", "w") as f:
+        with open(pathlib.Path(path, "package.xml"), "w") as f:
             f.write(package_generator())
 
         yield path
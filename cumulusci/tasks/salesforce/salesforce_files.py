@@ -1,9 +1,30 @@
+import contextlib
+import hashlib
 import json
 import os
+import time
+import typing as T
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
+from requests.adapters import HTTPAdapter
 
+from cumulusci.core.exceptions import CumulusCIException, TaskOptionsError
+from cumulusci.core.utils import process_bool_arg
 from cumulusci.tasks.salesforce import BaseSalesforceApiTask
+from cumulusci.utils.http.multi_request import (
+    MAX_THROTTLING_RETRIES,
+    THROTTLING_STATUS_CODES,
+    backoff_delay,
+)
+from cumulusci.utils.http.streaming_body import FilePart, StreamingBody
+from cumulusci.utils.iterators import iterate_in_chunks
+
+DEFAULT_MAX_PARALLEL = 8
+# Keeps the WHERE clause of each ContentVersion query well under the SOQL length limit.
+TITLES_PER_QUERY = 200
+CHUNK_SIZE = 1024 * 1024
 
 
 class ListFiles(BaseSalesforceApiTask):
@@ -35,25 +56,31 @@ class ListFiles(BaseSalesforceApiTask):
         return self.return_values
 
 
-class RetrieveFiles(BaseSalesforceApiTask):
-    task_docs = """
-    This task downloads all the documents (files) that have been uploaded to a library in Salesforce CRM Content or Salesforce Files.
-    Use the task list_files in order to view the files that are available to download.
-    """
+class BaseFilesTask(BaseSalesforceApiTask):
+    """Transfers files to or from an org, several at a time, over one
+    keep-alive session."""
 
     task_options = {
         "path": {
-            "description": "The directory where the files will be saved. By default, files will be saved in Files",
+            "description": "The directory of the files. By default, Files",
             "required": False,
         },
-        "file_list": {
-            "description": "Specify a comma-separated list of the names of the files along with file extension to download, enclosed in double quotation marks. All the availables files are downloaded by default. Use list_files task to view files in the specified org.",
+        "max_parallel": {
+            "description": f"The maximum number of files to transfer at the same time. Defaults to {DEFAULT_MAX_PARALLEL}",
+            "required": False,
+        },
+        "skip_existing": {
+            "description": "If True (the default), files which already exist with the same checksum are skipped",
+            "required": False,
+        },
+        "manifest": {
+            "description": "The path of a JSON file in which to write the result of each file's transfer",
             "required": False,
         },
     }
 
     def _init_options(self, kwargs):
-        super(RetrieveFiles, self)._init_options(kwargs)
+        super()._init_options(kwargs)
 
         if "path" not in self.options:
             self.options["path"] = "Files"
@@ -61,40 +88,151 @@ class RetrieveFiles(BaseSalesforceApiTask):
         if "file_list" not in self.options:
             self.options["file_list"] = ""
 
+        try:
+            self.max_parallel = int(
+                self.options.get("max_parallel") or DEFAULT_MAX_PARALLEL
+            )
+        except (TypeError, ValueError):
+            raise TaskOptionsError("max_parallel must be an integer")
+        if self.max_parallel < 1:
+            raise TaskOptionsError("max_parallel must be at least 1")
+        self.skip_existing = process_bool_arg(self.options.get("skip_existing", True))
+
         self.return_values = []
 
+    @contextlib.contextmanager
+    def _session(self):
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.max_parallel, pool_maxsize=self.max_parallel
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers["Authorization"] = f"Bearer {self.org_config.access_token}"
+        try:
+            yield session
+        finally:
+            session.close()
+
+    def _request(
+        self, session: requests.Session, method: str, url: str, **kwargs
+    ) -> requests.Response:
+        """Send a request, retrying it if Salesforce throttles it.
+
+        A callable `data` is called for the body of each attempt."""
+        data = kwargs.pop("data", None)
+        attempt = 0
+        while True:
+            body = data() if callable(data) else data
+            try:
+                response = session.request(method, url, data=body, **kwargs)
+            finally:
+                if hasattr(body, "close"):
+                    body.close()
+            if (
+                response.status_code not in THROTTLING_STATUS_CODES
+                or attempt >= MAX_THROTTLING_RETRIES
+            ):
+                return response
+            response.close()
+            time.sleep(backoff_delay(attempt, response.headers.get("Retry-After")))
+            attempt += 1
+
+    def _map(self, function: T.Callable, items: T.Sequence) -> T.List:
+        """Call function on each item, max_parallel at a time, and return
+        the results in order."""
+        if len(items) < 2 or self.max_parallel == 1:
+            return [function(item) for item in items]
+        with ThreadPoolExecutor(max_workers=self.max_parallel) as executor:
+            return list(executor.map(function, items))
+
+    def _query_latest_versions(
+        self, fields: str, titles: T.Optional[T.Iterable[str]]
+    ) -> T.List:
+        """The latest ContentVersions with any of the titles, or all of
+        them if titles is None"""
+        query = f"SELECT {fields} FROM ContentVersion WHERE IsLatest = true"
+        if titles is None:
+            return self.sf.query_all(query)["records"]
+        records = []
+        for chunk in iterate_in_chunks(TITLES_PER_QUERY, sorted(set(titles))):
+            quoted = ", ".join(_soql_string(title) for title in chunk)
+            records.extend(
+                self.sf.query_all(f"{query} AND Title IN ({quoted})")["records"]
+            )
+        return records
+
+    def _write_manifest(self, results: T.List[dict]):
+        manifest = self.options.get("manifest")
+        if not manifest:
+            return
+        directory = os.path.dirname(manifest)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(manifest, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        self.logger.info(f"Wrote the results of each file to {manifest}")
+
+    def _log_summary(self, results: T.List[dict], action: str):
+        counts = {}
+        for result in results:
+            counts[result["status"]] = counts.get(result["status"], 0) + 1
+        summary = ", ".join(f"{count} {status}" for status, count in counts.items())
+        self.logger.info(f"{action} {len(results)} files: {summary or 'none'}")
+
+
+class RetrieveFiles(BaseFilesTask):
+    task_docs = """
+    This task downloads all the documents (files) that have been uploaded to a library in Salesforce CRM Content or Salesforce Files.
+    Use the task list_files in order to view the files that are available to download.
+    Files are downloaded several at a time. A file which has already been downloaded, with the same checksum, is skipped.
+    """
+
+    task_options = {
+        **BaseFilesTask.task_options,
+        "path": {
+            "description": "The directory where the files will be saved. By default, files will be saved in Files",
+            "required": False,
+        },
+        "file_list": {
+            "description": "Specify a comma-separated list of the names of the files along with file extension to download, enclosed in double quotation marks. All the availables files are downloaded by default. Use list_files task to view files in the specified org.",
+            "required": False,
+        },
+    }
+
     def _run_task(self):
         self.logger.info("Retrieving files from the specified org..")
         path = self.options["path"]
         self.logger.info(f"Output directory: {path}")
 
-        query_condition = ""
-
         file_list = self.options["file_list"]
-
-        if (
-            file_list
-        ):  # If the list of names of files to be downloaded is specified, fetch only those files.
-            items_list = [item.strip() for item in file_list.split(",")]
-            conditions = []
-            for item in items_list:
+        wanted = None
+        if file_list:
+            # If the list of names of files to be downloaded is specified, fetch only those files.
+            wanted = set()
+            for item in (item.strip() for item in file_list.split(",")):
                 file_name, file_extension = os.path.splitext(item)
-                conditions.append(
-                    f"(Title = '{file_name}' AND FileType = '{file_extension[1:]}')"
-                )
-            query_condition = f"AND ({' OR '.join(conditions)})"
+                wanted.add((file_name, file_extension[1:].lower()))
 
+        records = self._query_latest_versions(
+            "Title, Id, FileType, VersionData, ContentDocumentId, Checksum",
+            None if wanted is None else [title for title, _ in wanted],
+        )
+        if wanted is not None:
+            records = [
+                record
+                for record in records
+                if (record["Title"], (record["FileType"] or "").lower()) in wanted
+            ]
         available_files = [
             {
-                "Id": result["Id"],
-                "FileName": result["Title"],
-                "FileType": result["FileType"],
-                "VersionData": result["VersionData"],
-                "ContentDocumentId": result["ContentDocumentId"],
+                "Id": record["Id"],
+                "FileName": record["Title"],
+                "FileType": record["FileType"],
+                "VersionData": record["VersionData"],
+                "ContentDocumentId": record["ContentDocumentId"],
             }
-            for result in self.sf.query(
-                f"SELECT Title, Id, FileType, VersionData, ContentDocumentId FROM ContentVersion WHERE isLatest=true {query_condition}"
-            )["records"]
+            for record in records
         ]
 
         self.logger.info(f"Found {len(available_files)} files in the org.\n")
@@ -102,58 +240,102 @@ class RetrieveFiles(BaseSalesforceApiTask):
             f'Files will be downloaded in the directory: {self.options["path"]} \n'
         )
 
-        for current_file in available_files:
-            versionData = current_file["VersionData"]
-            url = f"{self.org_config.instance_url}/{versionData}"
-            headers = {"Authorization": f"Bearer {self.org_config.access_token}"}
-
-            response = requests.get(url, headers=headers, stream=True)
-            response.raise_for_status()
-
-            file_extension = current_file["FileType"].lower()
-            local_filename = f"{current_file['FileName']}.{file_extension}"
-            local_filename = os.path.join(path, local_filename)
-
-            self.logger.info(f"Downloading:   {current_file['FileName']}")
-
-            file_exists = os.path.exists(local_filename)
-
-            if file_exists:
-                file_name = current_file["FileName"]
-                self.logger.info(
-                    f"A file with the name {file_name} already exists in the directory. This file will be renamed."
-                )
-            if file_exists:
-                count = 1
-                while True:
-                    local_filename = os.path.join(
-                        path,
-                        f"{current_file['FileName']} ({count}).{file_extension}",
-                    )
-                    if not os.path.exists(local_filename):
-                        break
-                    count += 1
-
-            os.makedirs(
-                os.path.dirname(local_filename), exist_ok=True
-            )  # Create the folder if it doesn't exist
-
-            with open(local_filename, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-
-            self.logger.info("\n")
+        # Choose local names up front, so that files with the same name
+        # don't race for the same path.
+        downloads = []
+        reserved = set()
+        for current_file, record in zip(available_files, records):
+            local_filename = self._local_filename(
+                path, current_file, record.get("Checksum"), reserved
+            )
+            reserved.add(local_filename)
+            downloads.append((current_file, local_filename))
+
+        os.makedirs(path, exist_ok=True)
+        with self._session() as session:
+            results = self._map(
+                lambda download: self._download(session, *download), downloads
+            )
+
+        self._log_summary(results, "Retrieved")
+        self._write_manifest(results)
+        failed = [result["file"] for result in results if result["status"] == "failed"]
+        if failed:
+            raise CumulusCIException(
+                f"Unable to download {len(failed)} files: {', '.join(failed)}"
+            )
 
         self.return_values = available_files
         return self.return_values
 
-
-class UploadFiles(BaseSalesforceApiTask):
+    def _local_filename(
+        self, path: str, current_file: dict, checksum: T.Optional[str], reserved
+    ) -> str:
+        file_extension = current_file["FileType"].lower()
+        local_filename = os.path.join(
+            path, f"{current_file['FileName']}.{file_extension}"
+        )
+        if local_filename not in reserved and not os.path.exists(local_filename):
+            return local_filename
+        if (
+            self.skip_existing
+            and checksum
+            and local_filename not in reserved
+            and _md5(local_filename) == checksum
+        ):
+            return local_filename
+
+        file_name = current_file["FileName"]
+        self.logger.info(
+            f"A file with the name {file_name} already exists in the directory. This file will be renamed."
+        )
+        count = 1
+        while True:
+            local_filename = os.path.join(
+                path, f"{current_file['FileName']} ({count}).{file_extension}"
+            )
+            if local_filename not in reserved and not os.path.exists(local_filename):
+                return local_filename
+            count += 1
+
+    def _download(
+        self, session: requests.Session, current_file: dict, local_filename: str
+    ) -> dict:
+        result = {
+            "file": local_filename,
+            "title": current_file["FileName"],
+            "content_version_id": current_file["Id"],
+        }
+        if os.path.exists(local_filename):
+            self.logger.info(f"Skipping:      {current_file['FileName']} (unchanged)")
+            return {**result, "status": "skipped"}
+
+        self.logger.info(f"Downloading:   {current_file['FileName']}")
+        url = f"{self.org_config.instance_url}/{current_file['VersionData']}"
+        tmp_filename = f"{local_filename}.{uuid.uuid4().hex}.part"
+        try:
+            with self._request(session, "GET", url, stream=True) as response:
+                response.raise_for_status()
+                with open(tmp_filename, "wb") as f:
+                    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                        if chunk:
+                            f.write(chunk)
+            os.replace(tmp_filename, local_filename)
+        except Exception as e:
+            self.logger.error(f"Error downloading file '{local_filename}': {e}")
+            if os.path.exists(tmp_filename):
+                os.remove(tmp_filename)
+            return {**result, "status": "failed", "error": str(e)}
+        return {**result, "status": "downloaded"}
+
+
+class UploadFiles(BaseFilesTask):
     task_docs = """
     This task uploads files to a Salesforce org.
+    Files are uploaded several at a time. A file whose latest version in the org has the same title and checksum is skipped.
     """
     task_options = {
+        **BaseFilesTask.task_options,
         "path": {
             "description": "The directory to upload files from. By default, files under 'Files' folder are uploaded.",
             "required": False,
@@ -164,17 +346,6 @@ class UploadFiles(BaseSalesforceApiTask):
         },
     }
 
-    def _init_options(self, kwargs):
-        super(UploadFiles, self)._init_options(kwargs)
-
-        if "path" not in self.options:
-            self.options["path"] = "Files"
-
-        if "file_list" not in self.options:
-            self.options["file_list"] = ""
-
-        self.return_values = []
-
     def _run_task(self):
         path = self.options["path"]
         file_list = self.options["file_list"]
@@ -183,62 +354,117 @@ class UploadFiles(BaseSalesforceApiTask):
         api_version = self.project_config.project__package__api_version
         url = f"{self.org_config.instance_url}/services/data/v{api_version}/sobjects/ContentVersion/"
 
-        # Prepare the request headers
-        headers = {
-            "Authorization": f"Bearer {self.org_config.access_token}",
-        }
-
         if file_list:
             files_to_upload = file_list.split(",")
         else:
             files_to_upload = os.listdir(path)
 
+        uploads = []
         for filename in files_to_upload:
-            file_path = os.path.join(path, filename.strip())
-
+            filename = filename.strip()
+            file_path = os.path.join(path, filename)
             if os.path.isfile(file_path):
-                with open(file_path, "rb") as file:
-                    # Construct the payload for the entity content
-                    title = os.path.splitext(os.path.basename(file_path))[
-                        0
-                    ]  # File name
-
-                    entity_content = {
-                        "Title": title,
-                        "PathOnClient": file_path,
-                    }
-
-                    self.return_values.append(entity_content)
-
-                    files = {
-                        "entity_content": (
-                            "",
-                            json.dumps(entity_content),
-                            "application/json",
-                        ),
-                        "VersionData": (filename, file, "application/octet-stream"),
-                    }
-
-                    try:
-                        response = requests.post(url, headers=headers, files=files)
-                        response.raise_for_status()  # Raise an exception for HTTP errors
-
-                        # Parse the response JSON
-                        response_json = response.json()
-
-                        if response.status_code == 201:  # Upload successful
-                            content_version_id = response_json["id"]
-                            self.logger.info(
-                                f"File '{filename}' uploaded successfully. ContentVersion Id: {content_version_id}"
-                            )
-                        else:
-                            self.logger.error(
-                                f"Failed to upload file '{filename}': {response_json}"
-                            )
-                    except requests.RequestException as e:
-                        self.logger.error(f"Error uploading file '{filename}': {e}")
-                        self.logger.error(
-                            e.response.content
-                        )  # Print response content in case of error
-
-        return self.return_values  # Returns a list containing all the files uplaoded.
+                entity_content = {
+                    "Title": os.path.splitext(os.path.basename(file_path))[0],
+                    "PathOnClient": file_path,
+                }
+                uploads.append((filename, file_path, entity_content))
+                self.return_values.append(entity_content)
+
+        existing = set()
+        if self.skip_existing and uploads:
+            existing = {
+                (record["Title"], record["Checksum"])
+                for record in self._query_latest_versions(
+                    "Title, Checksum",
+                    [entity_content["Title"] for _, _, entity_content in uploads],
+                )
+            }
+
+        with self._session() as session:
+            results = self._map(
+                lambda upload: self._upload(session, url, existing, *upload), uploads
+            )
+
+        self._log_summary(results, "Uploaded")
+        self._write_manifest(results)
+        return self.return_values  # Returns a list containing all the files uploaded.
+
+    def _upload(
+        self,
+        session: requests.Session,
+        url: str,
+        existing: T.Set[T.Tuple[str, str]],
+        filename: str,
+        file_path: str,
+        entity_content: dict,
+    ) -> dict:
+        result = {"file": file_path, "title": entity_content["Title"]}
+        if existing and (entity_content["Title"], _md5(file_path)) in existing:
+            self.logger.info(f"File '{filename}' is already in the org. Skipping.")
+            return {**result, "status": "skipped"}
+
+        boundary = uuid.uuid4().hex
+        try:
+            with open(file_path, "rb") as file:
+                response = self._request(
+                    session,
+                    "POST",
+                    url,
+                    data=lambda: _multipart_body(
+                        entity_content, filename, file, boundary
+                    ),
+                    headers={
+                        "Content-Type": f"multipart/form-data; boundary={boundary}"
+                    },
+                )
+            response.raise_for_status()  # Raise an exception for HTTP errors
+        except requests.RequestException as e:
+            self.logger.error(f"Error uploading file '{filename}': {e}")
+            if e.response is not None:
+                # Print response content in case of error
+                self.logger.error(e.response.content)
+            return {**result, "status": "failed", "error": str(e)}
+
+        content_version_id = response.json()["id"]
+        self.logger.info(
+            f"File '{filename}' uploaded successfully. ContentVersion Id: {content_version_id}"
+        )
+        return {
+            **result,
+            "status": "uploaded",
+            "content_version_id": content_version_id,
+        }
+
+
+def _multipart_body(
+    entity_content: dict, filename: str, file: T.IO[bytes], boundary: str
+) -> StreamingBody:
+    """The multipart/form-data body of a ContentVersion upload, which reads
+    the file while it is sent instead of holding it in memory."""
+    quoted_filename = filename.replace('"', "%22")
+    head = (
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="entity_content"\r\n'
+        "Content-Type: application/json\r\n\r\n"
+        f"{json.dumps(entity_content)}\r\n"
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="VersionData"; filename="{quoted_filename}"\r\n'
+        "Content-Type: application/octet-stream\r\n\r\n"
+    ).encode("utf-8")
+    tail = f"\r\n--{boundary}--\r\n".encode("utf-8")
+    return StreamingBody(head, FilePart(file), tail)
+
+
+def _md5(file_path: str) -> str:
+    """The checksum Salesforce computes for a ContentVersion's file"""
+    digest = hashlib.md5()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _soql_string(value: str) -> str:
+    escaped = value.replace("\\", "\\\\").replace("'", "\\'")
+    return f"'{escaped}'"
@@ -7,7 +7,7 @@ import time
 from collections import defaultdict
 
 from cumulusci.core.config import BaseProjectConfig, ScratchOrgConfig, TaskConfig
-from cumulusci.core.exceptions import ProjectConfigNotFound
+from cumulusci.core.exceptions import ProjectConfigNotFound, TaskOptionsError
 from cumulusci.core.sfdx import sfdx
 from cumulusci.core.utils import process_bool_arg, process_list_arg
 from cumulusci.tasks.metadata.package import PackageXmlGenerator
@@ -29,6 +29,16 @@ KNOWN_BAD_MD_TYPES = [
     "LightningComponentResource",
 ]
 
+SOURCE_MEMBER_FIELDS = "MemberName, MemberType, RevisionCounter"
+
+
+@functools.lru_cache(maxsize=64)
+def compile_patterns(patterns: tuple):
+    """Combine regex patterns into one alternation, or None if there are none."""
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{pattern})" for pattern in patterns))
+
 
 class ListChanges(BaseSalesforceApiTask):
     api_version = "48.0"
@@ -67,6 +77,12 @@ class ListChanges(BaseSalesforceApiTask):
         with self.project_config.open_cache("snapshot") as parent_dir:
             yield parent_dir / f"{self.org_config.name}.json"
 
+    @property
+    @contextlib.contextmanager
+    def _source_members_file(self):
+        with self.project_config.open_cache("snapshot") as parent_dir:
+            yield parent_dir / f"{self.org_config.name}.sourcemembers.json"
+
     def _load_snapshot(self):
         """Load the snapshot of which component revisions have been retrieved."""
         self._snapshot = {}
@@ -101,12 +117,8 @@ class ListChanges(BaseSalesforceApiTask):
 
     def _get_changes(self):
         """Get the SourceMember records that have changed since the last snapshot."""
-        sourcemembers = self.tooling.query_all(
-            "SELECT MemberName, MemberType, RevisionCounter FROM SourceMember "
-            "WHERE IsNameObsolete=false"
-        )
         changes = []
-        for sourcemember in sourcemembers["records"]:
+        for sourcemember in self._get_source_members():
             mdtype = sourcemember["MemberType"]
             name = sourcemember["MemberName"]
             current_revnum = self._snapshot.get(mdtype, {}).get(name)
@@ -116,18 +128,84 @@ class ListChanges(BaseSalesforceApiTask):
             changes.append(sourcemember)
         return changes
 
+    def _get_source_members(self):
+        """Get the org's current SourceMember records.
+
+        A copy of the org's SourceMember records is cached along with the
+        highest RevisionCounter seen so far (the watermark), so after the
+        first call only members which changed since then are queried.
+        """
+        members, watermark = self._load_source_members()
+        if members is None:
+            members = {}
+            records = self.tooling.query_all(
+                f"SELECT {SOURCE_MEMBER_FIELDS} FROM SourceMember "
+                "WHERE IsNameObsolete=false"
+            )["records"]
+        else:
+            records = self.tooling.query_all(
+                f"SELECT {SOURCE_MEMBER_FIELDS}, IsNameObsolete FROM SourceMember "
+                f"WHERE RevisionCounter > {watermark}"
+            )["records"]
+
+        for record in records:
+            mdtype = record["MemberType"]
+            name = record["MemberName"]
+            revnum = record["RevisionCounter"]
+            if record.get("IsNameObsolete"):
+                members.get(mdtype, {}).pop(name, None)
+            else:
+                members.setdefault(mdtype, {})[name] = revnum
+            watermark = max(watermark, revnum or 0)
+
+        self._store_source_members(members, watermark)
+        return [
+            {"MemberType": mdtype, "MemberName": name, "RevisionCounter": revnum}
+            for mdtype, names in members.items()
+            for name, revnum in names.items()
+        ]
+
+    def _load_source_members(self):
+        """Load the cached SourceMember records and watermark for this org.
+
+        Returns (None, 0) if there is no usable cache. The cache is only used
+        for orgs with a known org id, so that a recreated scratch org with the
+        same name doesn't inherit the previous org's watermark."""
+        org_id = self.org_config.org_id
+        if not org_id:
+            return None, 0
+        with self._source_members_file as sf:
+            if not sf.exists():
+                return None, 0
+            with sf.open("r", encoding="utf-8") as f:
+                cache = json.load(f)
+        if cache.get("org_id") != org_id:
+            return None, 0
+        return cache["members"], cache["watermark"]
+
+    def _store_source_members(self, members, watermark):
+        org_id = self.org_config.org_id
+        if not org_id:
+            return
+        with self._source_members_file as sf:
+            with sf.open("w", encoding="utf-8") as f:
+                json.dump(
+                    {"org_id": org_id, "watermark": watermark, "members": members}, f
+                )
+
     def _filter_changes(self, changes):
         """Filter changes using the include/exclude options"""
+        include = compile_patterns(tuple(self._include))
+        exclude = compile_patterns(tuple(self._exclude))
         filtered = []
         ignored = []
         for change in changes:
             mdtype = change["MemberType"]
             name = change["MemberName"]
             full_name = f"{mdtype}: {name}"
-            if (
-                self._include
-                and not any(re.search(s, full_name) for s in self._include)
-            ) or any(re.search(s, full_name) for s in self._exclude):
+            if (include and not include.search(full_name)) or (
+                exclude and exclude.search(full_name)
+            ):
                 ignored.append(change)
             else:
                 filtered.append(change)
@@ -163,6 +241,17 @@ retrieve_changes_task_options["path"] = {
     "description": "The path to write the retrieved metadata",
     "required": False,
 }
+retrieve_changes_task_options["watch"] = {
+    "description": (
+        "If True, keep polling the org for changes and retrieve them"
+        + " as they are made, until interrupted. Defaults to False"
+    ),
+    "required": False,
+}
+retrieve_changes_task_options["poll_interval"] = {
+    "description": "Seconds to wait between polls in watch mode. Defaults to 10",
+    "required": False,
+}
 retrieve_changes_task_options["api_version"] = {
     "description": (
         "Override the default api version for the retrieve."
@@ -259,8 +348,10 @@ def retrieve_components(
             "Kindly provide project_config as part of retrieve_components"
         )
 
+    dx_dir = None
     with contextlib.ExitStack() as stack:
         if md_format:
+            target = os.path.realpath(target)
             # Create target if it doesn't exist
             if not os.path.exists(target):
                 os.mkdir(target)
@@ -275,12 +366,16 @@ def retrieve_components(
                     ),
                 )
 
-            # Temporarily convert metadata format to DX format
-            stack.enter_context(temporary_dir())
-            os.mkdir("target")
+            # Temporarily convert metadata format to DX format, in a
+            # directory of its own. Commands run there instead of changing
+            # the working directory, which flows running in parallel share.
+            dx_dir = stack.enter_context(temporary_dir(chdir=False))
+            os.mkdir(os.path.join(dx_dir, "target"))
             # We need to create sfdx-project.json
             # so that sfdx will recognize force-app as a package directory.
-            with open("sfdx-project.json", "w", encoding="utf-8") as f:
+            with open(
+                os.path.join(dx_dir, "sfdx-project.json"), "w", encoding="utf-8"
+            ) as f:
                 json.dump(
                     {"packageDirectories": [{"path": "force-app", "default": True}]}, f
                 )
@@ -289,6 +384,7 @@ def retrieve_components(
                 log_note="Converting to DX format",
                 args=["-r", target, "-d", "force-app"],
                 check_return=True,
+                cwd=dx_dir,
             )
 
         # If retrieve_complete_profile is True, separate the profiles from
@@ -326,13 +422,17 @@ def retrieve_components(
                 capture_output=capture_output,
                 check_return=True,
                 env={"SF_ORG_INSTANCE_URL": org_config.instance_url},
+                cwd=dx_dir,
             )
 
         # Extract Profiles
         if profiles:
             task_config = TaskConfig(
                 config={
-                    "options": {"profiles": ",".join(profiles), "path": "force-app"}
+                    "options": {
+                        "profiles": ",".join(profiles),
+                        "path": os.path.join(dx_dir or "", "force-app"),
+                    }
                 }
             )
             cls_retrieve_profile = RetrieveProfile(
@@ -349,6 +449,7 @@ def retrieve_components(
                 args=["-r", "force-app", "-d", target],
                 capture_output=capture_output,
                 check_return=True,
+                cwd=dx_dir,
             )
 
             # Reinject namespace tokens
@@ -422,13 +523,37 @@ class RetrieveChanges(ListChanges, BaseSalesforceApiTask):
                 "api_version"
             ] = self.project_config.project__package__api_version
 
+        self.options["watch"] = process_bool_arg(self.options.get("watch", False))
+        self.options["poll_interval"] = int(self.options.get("poll_interval", 10))
+        if self.options["watch"] and not self.options["snapshot"]:
+            raise TaskOptionsError(
+                "The watch option requires snapshot, so that changes are only retrieved once."
+            )
+
     def _run_task(self):
         self._load_snapshot()
-        self.logger.info("Querying Salesforce for changed source members")
+        if not self.options["watch"]:
+            self.logger.info("Querying Salesforce for changed source members")
+            self._retrieve_changes()
+            return
+
+        self.logger.info(
+            f"Watching for changes every {self.options['poll_interval']} seconds. "
+            "Press Ctrl+C to stop."
+        )
+        try:
+            while True:
+                self._retrieve_changes()
+                time.sleep(self.options["poll_interval"])
+        except KeyboardInterrupt:
+            self.logger.info("Stopped watching for changes.")
+
+    def _retrieve_changes(self):
         changes = self._get_changes()
         filtered, ignored = self._filter_changes(changes)
         if not filtered:
-            self.logger.info("No changes to retrieve")
+            if not self.options["watch"]:
+                self.logger.info("No changes to retrieve")
             return
         for change in filtered:
             self.logger.info("{MemberType}: {MemberName}".format(**change))
@@ -1,5 +1,3 @@
-import base64
-import io
 import zipfile
 
 from cumulusci.core.config import BaseProjectConfig, UniversalConfig
@@ -16,7 +14,7 @@ class TestCreatePackage:
         )
         task = create_task(CreatePackage, project_config=project_config)
         package_zip = task._get_package_zip()
-        zf = zipfile.ZipFile(io.BytesIO(base64.b64decode(package_zip)), "r")
+        zf = zipfile.ZipFile(package_zip, "r")
         package_xml = zf.read("package.xml")
         assert b"<fullName>TestPackage</fullName>" in package_xml
         zf.close()
@@ -1,5 +1,3 @@
-import base64
-import io
 import os
 import zipfile
 from unittest import mock
@@ -9,7 +7,9 @@ import pytest
 from cumulusci.core.config import BaseProjectConfig, UniversalConfig
 from cumulusci.core.exceptions import TaskOptionsError
 from cumulusci.core.flowrunner import StepSpec
+from cumulusci.core.shared_work import SharedWork
 from cumulusci.core.source_transforms.transforms import CleanMetaXMLTransform
+from cumulusci.salesforce_api.status_waiters import StreamingWaiter
 from cumulusci.tasks.salesforce import Deploy, DeployUnpackagedMetadata
 from cumulusci.utils import temporary_dir, touch
 
@@ -37,10 +37,32 @@ class TestDeploy:
             )
 
             api = task._get_api()
-            zf = zipfile.ZipFile(io.BytesIO(base64.b64decode(api.package_zip)), "r")
+            zf = zipfile.ZipFile(api.package_zip, "r")
             assert "package.xml" in zf.namelist()
             zf.close()
 
+    @mock.patch(
+        "cumulusci.core.config.org_config.OrgConfig.installed_packages", return_value=[]
+    )
+    def test_get_api__status_channel(self, mock_org_config):
+        with temporary_dir() as path:
+            touch("package.xml")
+            task = create_task(
+                Deploy, {"path": path, "status_channel": "/event/Status__e"}
+            )
+
+            api = task._get_api()
+            assert isinstance(api.waiter, StreamingWaiter)
+            assert api.waiter.channel == "/event/Status__e"
+            assert task._get_api().waiter is api.waiter
+
+            with mock.patch.object(api.waiter, "stop") as stop, mock.patch.object(
+                Deploy, "_get_api", return_value=None
+            ):
+                task()
+            stop.assert_called_once()
+            assert task.status_waiter is None
+
     @mock.patch(
         "cumulusci.core.config.org_config.OrgConfig.installed_packages", return_value=[]
     )
@@ -229,7 +251,7 @@ class TestDeploy:
             )
 
             api = task._get_api()
-            zf = zipfile.ZipFile(io.BytesIO(base64.b64decode(api.package_zip)), "r")
+            zf = zipfile.ZipFile(api.package_zip, "r")
             assert "package.xml" in zf.namelist()
             zf.close()
 
@@ -273,7 +295,7 @@ class TestDeploy:
             )
 
             api = task._get_api()
-            zf = zipfile.ZipFile(io.BytesIO(base64.b64decode(api.package_zip)), "r")
+            zf = zipfile.ZipFile(api.package_zip, "r")
             assert "package.xml" in zf.namelist()
             zf.close()
 
@@ -313,7 +335,7 @@ class TestDeploy:
                 )
 
                 api = task._get_api()
-                zf = zipfile.ZipFile(io.BytesIO(base64.b64decode(api.package_zip)), "r")
+                zf = zipfile.ZipFile(api.package_zip, "r")
                 namelist = zf.namelist()
                 assert "staticresources/TestBundle.resource" in namelist
                 assert "staticresources/TestBundle.resource-meta.xml" in namelist
@@ -357,6 +379,30 @@ class TestDeploy:
             api = task._get_api()
             assert api is None
 
+    @mock.patch(
+        "cumulusci.core.config.org_config.OrgConfig.installed_packages", return_value=[]
+    )
+    def test_get_package_zip__shared_work(self, mock_org_config, tmp_path):
+        with temporary_dir() as path:
+            touch("package.xml")
+            task = create_task(Deploy, {"path": path, "unmanaged": True})
+            task.project_config.shared_work = SharedWork(tmp_path)
+            with mock.patch.object(
+                task, "_build_package_zip", wraps=task._build_package_zip
+            ) as build:
+                first = task._get_package_zip(path)
+                second = task._get_package_zip(path)
+
+                # Changing the files builds a new zip
+                touch("other.txt")
+                third = task._get_package_zip(path)
+
+            assert build.call_count == 2
+            for package_zip in (first, second, third):
+                with zipfile.ZipFile(package_zip) as zf:
+                    assert "package.xml" in zf.namelist()
+                package_zip.close()
+
     @mock.patch(
         "cumulusci.core.config.org_config.OrgConfig.installed_packages", return_value=[]
     )
@@ -1,6 +1,10 @@
 import os
+import threading
 from unittest import mock
 
+import pytest
+
+from cumulusci.core.exceptions import TaskOptionsError
 from cumulusci.core.flowrunner import StepSpec
 from cumulusci.tasks.salesforce import DeployBundles
 from cumulusci.utils import temporary_dir
@@ -27,6 +31,111 @@ class TestDeployBundles:
         task()
         task._get_api.assert_not_called()
 
+    def test_init_options__bad_max_parallel(self):
+        with pytest.raises(TaskOptionsError):
+            create_task(DeployBundles, {"path": "unpackaged", "max_parallel": "x"})
+        with pytest.raises(TaskOptionsError):
+            create_task(DeployBundles, {"path": "unpackaged", "max_parallel": 0})
+
+    def test_init_options__bundle_in_two_groups(self):
+        with pytest.raises(TaskOptionsError, match="more than one"):
+            create_task(
+                DeployBundles,
+                {"path": "unpackaged", "parallel_groups": [["a", "b"], ["b", "c"]]},
+            )
+
+    def test_get_stages(self):
+        task = create_task(
+            DeployBundles,
+            {
+                "path": "unpackaged",
+                "max_parallel": 4,
+                "parallel_groups": [["d", "b"], "e,f"],
+            },
+        )
+        assert task._get_stages(["a", "b", "c", "d", "e", "f", "g"]) == [
+            ["a"],
+            ["b", "d"],
+            ["c"],
+            ["e", "f"],
+            ["g"],
+        ]
+
+    def test_get_stages__unknown_bundle(self):
+        task = create_task(
+            DeployBundles,
+            {"path": "unpackaged", "max_parallel": 2, "parallel_groups": [["a", "z"]]},
+        )
+        with pytest.raises(TaskOptionsError, match="z"):
+            task._get_stages(["a", "b"])
+
+    def test_run_task__parallel(self):
+        with temporary_dir() as path:
+            for name in ("a", "b", "c", "d"):
+                os.mkdir(name)
+            task = create_task(
+                DeployBundles,
+                {"path": path, "max_parallel": 2, "parallel_groups": [["b", "c"]]},
+            )
+            events = []
+            lock = threading.Lock()
+            both_started = threading.Barrier(2, timeout=5)
+
+            def get_api(bundle_path):
+                name = os.path.basename(bundle_path)
+                if name == "d":
+                    return None  # empty bundle
+
+                def deploy():
+                    with lock:
+                        events.append(f"start {name}")
+                    if name in ("b", "c"):
+                        # fails unless b and c are deployed concurrently
+                        both_started.wait()
+                    with lock:
+                        events.append(f"end {name}")
+
+                return deploy
+
+            task._get_api = mock.Mock(side_effect=get_api)
+            task()
+
+        assert [os.path.basename(c[0][0]) for c in task._get_api.call_args_list] == [
+            "a",
+            "b",
+            "c",
+            "d",
+        ]
+        assert events[:2] == ["start a", "end a"]
+        assert sorted(events[2:4]) == ["start b", "start c"]
+        assert sorted(events[4:]) == ["end b", "end c"]
+
+    def test_run_task__parallel_failure_stops_later_stages(self):
+        with temporary_dir() as path:
+            for name in ("a", "b", "c"):
+                os.mkdir(name)
+            task = create_task(
+                DeployBundles,
+                {"path": path, "max_parallel": 2, "parallel_groups": [["a", "b"]]},
+            )
+            deployed = []
+
+            def get_api(bundle_path):
+                name = os.path.basename(bundle_path)
+
+                def deploy():
+                    deployed.append(name)
+                    if name == "a":
+                        raise Exception("Deploy failed")
+
+                return deploy
+
+            task._get_api = mock.Mock(side_effect=get_api)
+            with pytest.raises(Exception, match="Deploy failed"):
+                task()
+
+        assert sorted(deployed) == ["a", "b"]
+
     def test_freeze(self):
         self.maxDiff = None
         with temporary_dir() as path:
@@ -173,8 +173,8 @@ class TestEnsureRecordTypes:
         )
         task._infer_requirements()
 
-        with temporary_dir():
-            task._build_package()
+        with temporary_dir() as path:
+            task._build_package(path)
             with open(os.path.join("objects", "Opportunity.object"), "r") as f:
                 opp_contents = f.read()
                 assert OPPORTUNITY_METADATA == opp_contents
@@ -199,8 +199,8 @@ class TestEnsureRecordTypes:
         task.sf.Case.describe = mock.Mock(return_value=CASE_DESCRIBE_NO_RTS)
         task._infer_requirements()
 
-        with temporary_dir():
-            task._build_package()
+        with temporary_dir() as path:
+            task._build_package(path)
             with open(os.path.join("objects", "Case.object"), "r") as f:
                 case_contents = f.read()
                 assert CASE_METADATA == case_contents
@@ -225,8 +225,8 @@ class TestEnsureRecordTypes:
         task.sf.Account.describe = mock.Mock(return_value=OPPORTUNITY_DESCRIBE_NO_RTS)
         task._infer_requirements()
 
-        with temporary_dir():
-            task._build_package()
+        with temporary_dir() as path:
+            task._build_package(path)
             with open(os.path.join("objects", "Account.object"), "r") as f:
                 opp_contents = f.read()
                 assert ACCOUNT_METADATA == opp_contents
@@ -273,8 +273,8 @@ class TestEnsureRecordTypes:
         task.sf.Account.describe = mock.Mock(return_value=OPPORTUNITY_DESCRIBE_WITH_RTS)
         task._infer_requirements()
 
-        with temporary_dir():
-            task._build_package()
+        with temporary_dir() as path:
+            task._build_package(path)
             with open(os.path.join("objects", "Account.object"), "r") as f:
                 obj_contents = f.read()
                 assert ACCOUNT_METADATA == obj_contents
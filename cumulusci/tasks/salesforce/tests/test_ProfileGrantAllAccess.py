@@ -8,6 +8,8 @@ import pytest
 from cumulusci.core.config import OrgConfig
 from cumulusci.core.exceptions import CumulusCIException, TaskOptionsError
 from cumulusci.tasks.metadata_etl import MetadataOperation
+from cumulusci.tasks.metadata_etl.base import MetadataETLFusion
+from cumulusci.tasks.metadata_etl.help_text import SetFieldHelpText
 from cumulusci.tasks.salesforce.update_profile import ProfileGrantAllAccess
 from cumulusci.tests.util import create_project_config
 from cumulusci.utils import CUMULUSCI_PATH
@@ -697,3 +699,63 @@ class TestProfileGrantAllAccess:
             task._expand_package_xml = mock.Mock()
             task._generate_package_xml(MetadataOperation.RETRIEVE)
             task._expand_package_xml.assert_not_called()
+
+    @mock.patch("cumulusci.tasks.metadata_etl.base.ApiRetrieveUnpackaged")
+    def test_fused_with_other_step(self, api_mock):
+        def extractall(path):
+            (pathlib.Path(path, "profiles")).mkdir()
+            (pathlib.Path(path, "profiles", "Admin.profile")).write_bytes(
+                ADMIN_PROFILE_BEFORE
+            )
+            (pathlib.Path(path, "objects")).mkdir()
+            (pathlib.Path(path, "objects", "Account.object")).write_text(
+                """<?xml version="1.0" encoding="UTF-8"?>
+<CustomObject xmlns="http://soap.sforce.com/2006/04/metadata">
+    <fields>
+        <fullName>TestField__c</fullName>
+    </fields>
+</CustomObject>"""
+            )
+
+        api_mock.return_value.return_value.extractall.side_effect = extractall
+        deployed = {}
+
+        def deploy_directory(path):
+            deployed.update(
+                (f.relative_to(path).as_posix(), f.read_text())
+                for f in pathlib.Path(path).rglob("*")
+                if f.is_file()
+            )
+
+        tasks = [
+            create_task(ProfileGrantAllAccess, {"include_packaged_objects": False}),
+            create_task(
+                SetFieldHelpText,
+                {
+                    "fields": [
+                        {"api_name": "Account.TestField__c", "help_text": "Help"}
+                    ],
+                },
+            ),
+        ]
+        fusion = MetadataETLFusion(tasks)
+        for task in tasks:
+            task.fusion = fusion
+            task._deploy_directory = mock.Mock(side_effect=deploy_directory)
+            task()
+
+        # The profile's own package.xml is retrieved, not only the Profile
+        package_xml = metadata_tree.fromstring(api_mock.call_args[0][1].encode("utf-8"))
+        objects = package_xml.find("types", name="CustomObject")
+        assert {"*", "Account", "Contact", "Opportunity"} <= {
+            members.text for members in objects.findall("members")
+        }
+        assert package_xml.find("types", name="CustomTab") is not None
+        assert package_xml.find("types", name="Profile").find("members").text == (
+            "Admin"
+        )
+        assert (
+            "<inlineHelpText>Help</inlineHelpText>"
+            in deployed["objects/Account.object"]
+        )
+        assert "<enabled>true</enabled>" in deployed["profiles/Admin.profile"]
@@ -1,4 +1,6 @@
-from unittest.mock import ANY, MagicMock, Mock, mock_open, patch
+import os
+from contextlib import nullcontext
+from unittest.mock import Mock, patch
 
 import pytest
 
@@ -9,327 +11,135 @@ from cumulusci.tests.util import create_project_config
 
 from .util import create_task
 
-
-class TestCheckComponents:
-    @patch("os.path.exists", return_value=True)
-    @patch("os.remove")
-    @patch("os.path.isdir", return_value=True)
-    @patch("os.listdir", return_value=["package.xml"])
-    @patch("os.path.join", side_effect=lambda *args: "/".join(args))
-    @patch("cumulusci.core.sfdx.convert_sfdx_source")
-    @patch(
-        "cumulusci.tasks.salesforce.check_components.CheckComponents._is_plan",
-        return_value=False,
-    )
-    @patch(
-        "cumulusci.tasks.salesforce.check_components.CheckComponents._freeze_steps",
-        return_value=[],
-    )
-    @patch(
-        "cumulusci.tasks.salesforce.check_components.CheckComponents._collect_components_from_paths",
-        return_value=[{"Type1": ["Comp1"]}, []],
-    )
-    @patch(
-        "cumulusci.tasks.salesforce.check_components.CheckComponents._get_api_object_responce",
-        return_value=[],
-    )
-    @patch(
-        "builtins.open",
-        new_callable=mock_open,
-        read_data="""
-        <Package xmlns="http://soap.sforce.com/2006/04/metadata">
-            <types>
-                <members>Delivery</members>
-                <name>ApexClass</name>
-            </types>
-            <types>
-                <members>Delivery__c</members>
-                <name>CustomObject</name>
-            </types>
-            <version>58.0</version>
-        </Package>
-    """,
+RETRIEVE_RESPONSE = b"""<?xml version="1.0" encoding="UTF-8"?>
+<soapenv:Envelope xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/" xmlns="http://soap.sforce.com/2006/04/metadata">
+<soapenv:Body><checkRetrieveStatusResponse><result>
+<done>true</done>
+<messages><fileName>unpackaged/classes/Missing.cls</fileName><problem>Entity of type 'ApexClass' named 'Missing' cannot be found</problem></messages>
+<status>Succeeded</status>
+<zipFile>UEsFBgAAAAAAAAAAAAAAAAAAAAAAAA==</zipFile>
+</result></checkRetrieveStatusResponse></soapenv:Body></soapenv:Envelope>"""
+
+PACKAGE_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<Package xmlns="http://soap.sforce.com/2006/04/metadata">
+    <types>
+        <members>{members}</members>
+        <name>ApexClass</name>
+    </types>
+    <version>{version}</version>
+</Package>"""
+
+
+@pytest.fixture
+def project_config(tmp_path):
+    project_config = create_project_config()
+    project_config.repo_info["root"] = str(tmp_path)
+    project_config.config["project"]["package"]["api_version"] = "60.0"
+    (tmp_path / "unpackaged/pre").mkdir(parents=True)
+    (tmp_path / "unpackaged/pre/package.xml").write_text(
+        PACKAGE_XML.format(members="Missing", version="58.0")
     )
-    @patch("cumulusci.utils.xml.metadata_tree.parse")
-    @patch(
-        "cumulusci.utils.xml.metadata_tree.parse_package_xml_types",
-        return_value={"Type2": ["Comp2"]},
-    )
-    def test_get_repo_existing_components(
-        self,
-        mock_metadata_parse,
-        mock_open_file,
-        mock_convert_sfdx_source,
-        mock_path_join,
-        mock_listdir,
-        mock_isdir,
-        mock_remove,
-        mock_path_exists,
-        mock_is_plan,
-        mock_freeze_steps,
-        mock_get_api_object,
-        mock_parse,
-        mock_collect_components,
-    ):
-        org_config = Mock(scratch=True, config={})
-        org_config.username = "test_user"
-        org_config.org_id = "test_org_id"
-        self.org_config = Mock(return_value=("test", org_config))
-        project_config = create_project_config()
-        flow_config = {
-            "test": {
-                "steps": {
-                    1: {
-                        "flow": "test2",
-                    }
-                }
-            },
-            "test2": {
-                "steps": {
-                    1: {
-                        "task": "deploy",
-                        "options": {"path": "force-app/main/default"},
-                    }
-                }
-            },
-        }
-        plan_config = {
-            "title": "Test Install",
-            "slug": "install",
-            "tier": "primary",
-            "steps": {1: {"flow": "test"}},
-        }
-        project_config.config["plans"] = {
-            "Test Install": plan_config,
-        }
-        project_config.config["flows"] = flow_config
-
-        task = create_task(CheckComponents, {"name": "test2"})
-        task.deploy_paths = ["test"]
+    (tmp_path / "force-app/main/default/classes").mkdir(parents=True)
+    return project_config
 
-        (components, response_messages) = task.get_repo_existing_components("test2")
-        assert "Type1" in components
-        assert "Type2" in components
-        assert "Comp1" in components["Type1"]
-        assert "Comp2" in components["Type2"]
 
-    @patch("os.path.exists", return_value=True)
-    @patch("os.remove")
-    @patch("os.path.isdir", return_value=True)
-    @patch("os.listdir", return_value=["package.xml"])
-    @patch("os.path.join", side_effect=lambda *args: "/".join(args))
-    @patch("cumulusci.core.sfdx.convert_sfdx_source")
-    @patch(
-        "cumulusci.tasks.salesforce.check_components.CheckComponents._is_plan",
-        return_value=False,
-    )
-    @patch(
-        "cumulusci.tasks.salesforce.check_components.CheckComponents._freeze_steps",
-        return_value=[],
-    )
-    @patch(
-        "cumulusci.tasks.salesforce.check_components.CheckComponents._collect_components_from_paths",
-        return_value=[{"Type1": ["Comp1"]}, []],
+def retrieve_task(project_config, paths):
+    task = create_task(CheckComponents, {"paths": paths}, project_config)
+    api_retrieve_unpackaged = Mock()
+    api_retrieve_unpackaged.return_value._get_response.return_value = Mock(
+        iter_content=Mock(return_value=[RETRIEVE_RESPONSE])
     )
-    @patch(
-        "cumulusci.tasks.salesforce.check_components.CheckComponents._get_api_object_responce",
-        return_value=[],
-    )
-    @patch(
-        "builtins.open",
-        new_callable=mock_open,
-        read_data="""
-        <Package xmlns="http://soap.sforce.com/2006/04/metadata">
-            <types>
-                <members>Delivery</members>
-                <name>ApexClass</name>
-            </types>
-            <types>
-                <members>Delivery__c</members>
-                <name>CustomObject</name>
-            </types>
-            <version>58.0</version>
-        </Package>
-    """,
-    )
-    @patch("cumulusci.utils.xml.metadata_tree.parse")
-    @patch(
-        "cumulusci.utils.xml.metadata_tree.parse_package_xml_types",
-        return_value={"Type2": ["Comp2"]},
-    )
-    def test_get_repo_existing_components_paths_paramter(
-        self,
-        mock_metadata_parse,
-        mock_open_file,
-        mock_convert_sfdx_source,
-        mock_path_join,
-        mock_listdir,
-        mock_isdir,
-        mock_remove,
-        mock_path_exists,
-        mock_is_plan,
-        mock_freeze_steps,
-        mock_get_api_object,
-        mock_parse,
-        mock_collect_components,
-    ):
-        org_config = Mock(scratch=True, config={})
-        org_config.username = "test_user"
-        org_config.org_id = "test_org_id"
-        self.org_config = Mock(return_value=("test", org_config))
-        project_config = create_project_config()
-        flow_config = {
-            "test": {
-                "steps": {
-                    1: {
-                        "flow": "test2",
-                    }
-                }
-            },
-            "test2": {
-                "steps": {
-                    1: {
-                        "task": "deploy",
-                        "options": {"path": "force-app/main/default"},
-                    }
-                }
-            },
-        }
-        plan_config = {
-            "title": "Test Install",
-            "slug": "install",
-            "tier": "primary",
-            "steps": {1: {"flow": "test"}},
-        }
-        project_config.config["plans"] = {
-            "Test Install": plan_config,
-        }
-        project_config.config["flows"] = flow_config
-
-        task = create_task(CheckComponents, {"name": "test2"})
-        task.deploy_paths = ["test"]
+    task.api_retrieve_unpackaged = api_retrieve_unpackaged
+    return task
 
-        (components, response_messages) = task.get_repo_existing_components("", "src")
-        assert "Type1" in components
-        assert "Type2" in components
-        assert "Comp1" in components["Type1"]
-        assert "Comp2" in components["Type2"]
 
-    @patch("os.path.exists", return_value=True)
-    @patch("os.remove")
-    @patch("os.path.isdir", return_value=True)
-    @patch("os.listdir", return_value=["some_file_or_directory"])
-    @patch("os.path.join", side_effect=lambda *args: "/".join(args))
-    @patch("cumulusci.core.sfdx.convert_sfdx_source")
-    @patch(
-        "builtins.open",
-        new_callable=mock_open,
-        read_data="""
-        <Package xmlns="http://soap.sforce.com/2006/04/metadata">
-            <types>
-                <members>Delivery</members>
-                <name>ApexClass</name>
-            </types>
-            <types>
-                <members>Delivery__c</members>
-                <name>CustomObject</name>
-            </types>
-            <version>58.0</version>
-        </Package>
-    """,
+def convert_sfdx_source(path, name, logger):
+    """Pretend to convert the source into a package.xml of its classes"""
+    members = sorted(
+        os.path.splitext(name)[0]
+        for name in os.listdir(os.path.join(path, "classes"))
+        if name.endswith(".cls")
     )
-    @patch("cumulusci.utils.xml.metadata_tree.parse")
-    def test_collect_components_from_paths(
-        self,
-        mock_metadata_parse,
-        mock_open_file,
-        mock_convert_sfdx_source,
-        mock_path_join,
-        mock_listdir,
-        mock_isdir,
-        mock_remove,
-        mock_path_exists,
-    ):
-        mock_path_exists.return_value = True
-        mock_isdir.return_value = True
-        mock_listdir.return_value = ["some_file_or_directory"]
-        mock_path_join.side_effect = lambda *args: "/".join(args)
-        mock_convert_sfdx_source.return_value.__enter__.return_value = "/converted/path"
+    converted = f"{path}_converted"
+    os.makedirs(converted, exist_ok=True)
+    with open(os.path.join(converted, "package.xml"), "w") as f:
+        f.write(
+            PACKAGE_XML.format(
+                members="</members><members>".join(members), version="59.0"
+            )
+        )
+    return nullcontext(converted)
 
-        mock_tree = MagicMock()
-        mock_tree.findall.return_value = [
-            MagicMock(
-                findall=lambda tag: [MagicMock(text="Delivery")]
-                if tag == "members"
-                else [],
-                find=lambda tag: MagicMock(text="ApexClass") if tag == "name" else None,
-            ),
-            MagicMock(
-                findall=lambda tag: [MagicMock(text="Delivery__c")]
-                if tag == "members"
-                else [],
-                find=lambda tag: MagicMock(text="CustomObject")
-                if tag == "name"
-                else None,
-            ),
-        ]
-        mock_tree.find.return_value = MagicMock(text="58.0")
-        mock_metadata_parse.return_value = mock_tree
 
-        response_messages = [
-            MagicMock(
-                getElementsByTagName=MagicMock(
-                    return_value=[
-                        MagicMock(
-                            firstChild=MagicMock(
-                                nodeValue="Entity of type 'ApexClass' named 'CustomHealth' is cannot be found"
-                            )
-                        )
-                    ]
-                )
+class TestCheckComponents:
+    def test_get_repo_existing_components(self, project_config, tmp_path):
+        (tmp_path / "force-app/main/default/classes/Delivery.cls").write_text("")
+        task = retrieve_task(
+            project_config, "unpackaged/pre,force-app/main/default,missing"
+        )
+
+        with patch(
+            "cumulusci.tasks.salesforce.check_components.convert_sfdx_source",
+            side_effect=convert_sfdx_source,
+        ):
+            components, problems = task.get_repo_existing_components(
+                "", task.options["paths"]
             )
+
+        assert components == {"ApexClass": ["Delivery", "Missing"]}
+        assert problems == [
+            "Entity of type 'ApexClass' named 'Missing' cannot be found"
         ]
+        # All the paths are checked with one retrieve
+        task.api_retrieve_unpackaged.assert_called_once()
+        _, package_xml, api_version = task.api_retrieve_unpackaged.call_args[0]
+        assert api_version == "59.0"
+        assert "<members>Delivery</members>" in package_xml
+        assert "<members>Missing</members>" in package_xml
+
+    def test_get_repo_existing_components__cached(self, project_config, tmp_path):
+        classes = tmp_path / "force-app/main/default/classes"
+        (classes / "Delivery.cls").write_text("")
+        task = retrieve_task(project_config, "force-app/main/default")
+
+        with patch(
+            "cumulusci.tasks.salesforce.check_components.convert_sfdx_source",
+            side_effect=convert_sfdx_source,
+        ) as convert:
+            task.get_repo_existing_components("", task.options["paths"])
+            components, _ = task.get_repo_existing_components("", task.options["paths"])
+            assert convert.call_count == 1
+            assert components == {"ApexClass": ["Delivery"]}
+
+            # Changed source is converted again
+            (classes / "Shipment.cls").write_text("")
+            components, _ = task.get_repo_existing_components("", task.options["paths"])
+            assert convert.call_count == 2
+            assert components == {"ApexClass": ["Delivery", "Shipment"]}
+
+    def test_get_repo_existing_components__no_components(self, project_config):
+        task = retrieve_task(project_config, "force-app/main/default")
+        with patch(
+            "cumulusci.tasks.salesforce.check_components.convert_sfdx_source",
+            side_effect=Exception("Nothing to convert"),
+        ):
+            components, problems = task.get_repo_existing_components(
+                "", task.options["paths"]
+            )
 
-        with patch("cumulusci.core.sfdx.sfdx") as sfdx:
-            with patch.object(
-                CheckComponents, "_get_api_object_responce"
-            ) as mock_get_api_response:
-                mock_get_api_response.return_value = response_messages
-                task = create_task(CheckComponents, {"paths": "force-app/main/default"})
-                components, api_response = task._collect_components_from_paths(
-                    "force-app/main/default"
-                )
+        assert components == {} and problems == []
+        task.api_retrieve_unpackaged.assert_not_called()
 
-                assert components is not None
-                assert "ApexClass" not in components
-        sfdx.assert_called_once_with(
-            "project convert source",
-            args=["-d", ANY, "-r", "force-app/main/default"],
-            capture_output=True,
-            check_return=True,
+    def test_run_task(self, project_config, tmp_path):
+        (tmp_path / "unpackaged/pre/package.xml").write_text(
+            PACKAGE_XML.format(
+                members="Missing</members><members>Delivery", version="58.0"
+            )
         )
+        task = retrieve_task(project_config, "unpackaged/pre")
+        task()
 
-    @patch("os.path.exists", return_value=False)
-    def test_collect_components_from_nonexistent_paths(self, mock_path_exists):
-        task = create_task(CheckComponents, {"paths": "invalid/path"})
-        components, api_response = task._collect_components_from_paths("invalid/path")
-        assert components is None
-        assert api_response is None
-
-    @patch("os.path.exists", return_value=False)
-    def test_copy_to_tempdir_nonexistent_src(self, mock_exists):
-        task = create_task(CheckComponents, {"paths": "force-app/main/default"})
-        with pytest.raises(FileNotFoundError):
-            task._copy_to_tempdir("nonexistent_src", "temp_dir")
-
-    @patch("shutil.copy2")
-    @patch("os.listdir", return_value=["file1", "file2"])
-    @patch("os.path.isdir", return_value=False)
-    @patch("os.path.exists", return_value=False)
-    def test_copy_to_tempdir(self, mock_exists, mock_isdir, mock_listdir, mock_copy2):
-        task = create_task(CheckComponents, {"paths": "force-app/main/default"})
-        task._copy_to_tempdir("force-app/main/default", "temp_dir")
-        mock_copy2.assert_called()
+        assert task.return_values["existing_components"] == {"ApexClass": ["Delivery"]}
 
     def test_get_deployable_paths(self):
         task = create_task(CheckComponents, {"paths": "force-app/main/default"})
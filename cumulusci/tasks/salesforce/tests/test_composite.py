@@ -1,11 +1,17 @@
 import json
+import threading
 from unittest.mock import patch
 
 import pytest
 import responses
 
-from cumulusci.core.exceptions import SalesforceException
-from cumulusci.tasks.salesforce.composite import API_ROLLBACK_MESSAGE, CompositeApi
+from cumulusci.core.exceptions import SalesforceException, TaskOptionsError
+from cumulusci.tasks.salesforce.composite import (
+    API_ROLLBACK_MESSAGE,
+    CompositeApi,
+    _resolve_references,
+    _split_subrequests,
+)
 from cumulusci.tests.util import CURRENT_SF_API_VERSION
 
 from .util import create_task
@@ -93,6 +99,54 @@ COMPOSITE_RESPONSE = {
 }
 
 
+def composite_callback(request):
+    """Respond to each subrequest as if it succeeded"""
+    subresponses = []
+    for subrequest in json.loads(request.body)["compositeRequest"]:
+        reference_id = subrequest["referenceId"]
+        if subrequest["method"] == "GET":
+            body = {"done": True, "records": [{"Id": f"ID_{reference_id}"}]}
+        else:
+            body = {"id": f"ID_{reference_id}", "success": True, "errors": []}
+        subresponses.append(
+            {
+                "body": body,
+                "httpHeaders": {},
+                "httpStatusCode": 200 if subrequest["method"] == "GET" else 201,
+                "referenceId": reference_id,
+            }
+        )
+    return (200, {}, json.dumps({"compositeResponse": subresponses}))
+
+
+def account_subrequest(reference_id, **fields):
+    return {
+        "method": "POST",
+        "url": f"/services/data/v{CURRENT_SF_API_VERSION}/sobjects/Account",
+        "referenceId": reference_id,
+        "body": {"Name": reference_id, **fields},
+    }
+
+
+def query_subrequest(reference_id):
+    return {
+        "method": "GET",
+        "url": f"/services/data/v{CURRENT_SF_API_VERSION}/query/?q=SELECT+Id+FROM+RecordType",
+        "referenceId": reference_id,
+    }
+
+
+def write_request(path, subrequests, all_or_none=True):
+    path.write_text(
+        json.dumps({"allOrNone": all_or_none, "compositeRequest": subrequests})
+    )
+    return str(path)
+
+
+def sent_requests():
+    return [json.loads(call.request.body) for call in responses.calls]
+
+
 class TestCompositeApi:
     @responses.activate
     @patch("cumulusci.tasks.salesforce.composite.CliTable")
@@ -248,3 +302,203 @@ class TestCompositeApi:
 
         assert '"Username": "sofia@connected.' in processed_body
         assert '"Username": "sofia@connected.edu"' not in processed_body
+
+    @responses.activate
+    @patch("cumulusci.tasks.salesforce.composite.CliTable")
+    def test_composite_request__split(self, table, tmp_path):
+        subrequests = [query_subrequest("rt")] + [
+            account_subrequest(
+                f"acct{i}", RecordTypeId="@{rt.records[0].Id}", ParentId="@{acct0.id}"
+            )
+            for i in range(30)
+        ]
+        task = create_task(
+            CompositeApi,
+            {"data_files": [write_request(tmp_path / "big.json", subrequests)]},
+        )
+        responses.add_callback(
+            method="POST",
+            url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/composite",
+            callback=composite_callback,
+        )
+        task.org_config._installed_packages = {}
+
+        task()
+
+        first, second = sent_requests()
+        assert first["allOrNone"] is True
+        assert first["compositeRequest"] == subrequests[:25]
+        # References to the first request are filled in from its results
+        assert second["compositeRequest"][0] == account_subrequest(
+            "acct24", RecordTypeId="ID_rt", ParentId="ID_acct0"
+        )
+        assert len(second["compositeRequest"]) == 6
+        table.assert_called_once()
+        assert len(table.call_args[0][0]) == 32
+
+    @responses.activate
+    @patch("cumulusci.tasks.salesforce.composite.CliTable")
+    def test_composite_request__split_all_or_none_failure(self, table, tmp_path):
+        subrequests = [account_subrequest(f"acct{i}") for i in range(60)]
+        task = create_task(
+            CompositeApi,
+            {"data_files": [write_request(tmp_path / "big.json", subrequests)]},
+        )
+        responses.add(
+            method="POST",
+            url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/composite",
+            status=200,
+            json={
+                "compositeResponse": [
+                    {
+                        "body": [{"errorCode": "ERROR", "message": "Nope"}],
+                        "httpHeaders": {},
+                        "httpStatusCode": 400,
+                        "referenceId": "acct0",
+                    }
+                ]
+            },
+        )
+        task.org_config._installed_packages = {}
+
+        with pytest.raises(SalesforceException):
+            task()
+
+        # The rest of the chain isn't sent
+        assert len(responses.calls) == 1
+
+    @responses.activate
+    @patch("cumulusci.tasks.salesforce.composite.CliTable")
+    def test_composite_request__references_between_files(self, table, tmp_path):
+        contacts = write_request(
+            tmp_path / "contacts.json",
+            [
+                {
+                    "method": "POST",
+                    "url": f"/services/data/v{CURRENT_SF_API_VERSION}/sobjects/Contact",
+                    "referenceId": "contact",
+                    "body": {"LastName": "Student", "AccountId": "@{uni.id}"},
+                }
+            ],
+        )
+        accounts = write_request(
+            tmp_path / "accounts.json", [account_subrequest("uni")]
+        )
+        other = write_request(tmp_path / "other.json", [account_subrequest("other")])
+        task = create_task(
+            CompositeApi,
+            {"data_files": [contacts, accounts, other], "max_parallel": 1},
+        )
+        responses.add_callback(
+            method="POST",
+            url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/composite",
+            callback=composite_callback,
+        )
+        task.org_config._installed_packages = {}
+
+        task()
+
+        # The contacts wait for the account they reference
+        accounts_request, contacts_request, other_request = sent_requests()
+        assert accounts_request["compositeRequest"][0]["referenceId"] == "uni"
+        assert contacts_request["compositeRequest"][0]["body"]["AccountId"] == "ID_uni"
+        assert other_request["compositeRequest"][0]["referenceId"] == "other"
+
+    @responses.activate
+    @patch("cumulusci.tasks.salesforce.composite.CliTable")
+    def test_composite_request__parallel(self, table, tmp_path):
+        barrier = threading.Barrier(2, timeout=5)
+
+        def callback(request):
+            # Both files are in flight at once
+            barrier.wait()
+            return composite_callback(request)
+
+        data_files = [
+            write_request(tmp_path / f"{name}.json", [account_subrequest(name)])
+            for name in ("one", "two")
+        ]
+        task = create_task(CompositeApi, {"data_files": data_files, "max_parallel": 2})
+        responses.add_callback(
+            method="POST",
+            url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/composite",
+            callback=callback,
+        )
+        task.org_config._installed_packages = {}
+
+        task()
+
+        assert len(responses.calls) == 2
+        assert task.file_results == {
+            0: {"one": {"id": "ID_one", "success": True, "errors": []}},
+            1: {"two": {"id": "ID_two", "success": True, "errors": []}},
+        }
+
+    def test_composite_request__reference_cycle(self, tmp_path):
+        data_files = [
+            write_request(
+                tmp_path / "one.json", [account_subrequest("one", ParentId="@{two.id}")]
+            ),
+            write_request(
+                tmp_path / "two.json", [account_subrequest("two", ParentId="@{one.id}")]
+            ),
+        ]
+        task = create_task(CompositeApi, {"data_files": data_files})
+        task.org_config._installed_packages = {}
+
+        with pytest.raises(TaskOptionsError, match="reference each other"):
+            task()
+
+    @pytest.mark.parametrize("max_parallel", ["0", "many"])
+    def test_init_options__bad_max_parallel(self, max_parallel):
+        with pytest.raises(TaskOptionsError, match="max_parallel"):
+            create_task(
+                CompositeApi,
+                {"data_files": ["dummy_path"], "max_parallel": max_parallel},
+            )
+
+    def test_split_subrequests__query_limit(self):
+        subrequests = [query_subrequest(f"q{i}") for i in range(7)]
+        assert [len(chunk) for chunk in _split_subrequests(subrequests)] == [5, 2]
+
+    def test_resolve_references(self):
+        results = {"rt": {"records": [{"Id": "012000000000001"}]}, "count": {"n": 3}}
+        assert _resolve_references(
+            {
+                "url": "/sobjects/RecordType/@{rt.records[0].Id}",
+                "body": {
+                    "RecordTypeId": "@{rt.records[0].Id}",
+                    "Count__c": "@{count.n}",
+                    "Missing": "@{rt.records[1].Id}",
+                    "Pending": "@{later.id}",
+                },
+            },
+            results,
+        ) == {
+            "url": "/sobjects/RecordType/012000000000001",
+            "body": {
+                "RecordTypeId": "012000000000001",
+                "Count__c": 3,
+                "Missing": "@{rt.records[1].Id}",
+                "Pending": "@{later.id}",
+            },
+        }
+
+    def test_json_processing__tokens_worked_out_once(self):
+        task = create_task(
+            CompositeApi,
+            {"data_files": ["dummy_path"], "managed": True},
+        )
+        task.project_config.project__package__namespace = "NS"
+
+        with patch(
+            "cumulusci.tasks.salesforce.composite.inject_namespace",
+            side_effect=lambda name, token, **kwargs: (name, "NS__"),
+        ) as inject_namespace:
+            assert (
+                task._process_json('"%%%NAMESPACE%%%A__c", "%%%NAMESPACE%%%B__c"')
+                == '"NS__A__c", "NS__B__c"'
+            )
+            task._process_json('"%%%NAMESPACE%%%C__c"')
+
+        inject_namespace.assert_called_once()
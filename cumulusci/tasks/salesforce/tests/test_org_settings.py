@@ -1,4 +1,3 @@
-import base64
 import io
 import json
 import os
@@ -52,7 +51,7 @@ class TestDeployOrgSettings:
             task()
 
         package_zip = task.api_class.call_args[0][1]
-        zf = zipfile.ZipFile(io.BytesIO(base64.b64decode(package_zip)), "r")
+        zf = zipfile.ZipFile(package_zip, "r")
         assert (
             readtext(zf, "package.xml")
             == """<?xml version="1.0" encoding="UTF-8"?>
@@ -120,7 +119,7 @@ class TestDeployOrgSettings:
             task()
 
         package_zip = task.api_class.call_args[0][1]
-        zf = zipfile.ZipFile(io.BytesIO(base64.b64decode(package_zip)), "r")
+        zf = zipfile.ZipFile(package_zip, "r")
         # The context manager's output is tested separately, below.
         assert (
             readtext(zf, "package.xml")
@@ -156,7 +155,7 @@ class TestDeployOrgSettings:
         task()
 
         package_zip = task.api_class.call_args[0][1]
-        zf = zipfile.ZipFile(io.BytesIO(base64.b64decode(package_zip)), "r")
+        zf = zipfile.ZipFile(package_zip, "r")
         assert (
             readtext(zf, "package.xml")
             == """<?xml version="1.0" encoding="UTF-8"?>
@@ -221,7 +220,7 @@ class TestDeployOrgSettings:
             task()
 
         package_zip = task.api_class.call_args[0][1]
-        zf = zipfile.ZipFile(io.BytesIO(base64.b64decode(package_zip)), "r")
+        zf = zipfile.ZipFile(package_zip, "r")
         assert (
             readtext(zf, "package.xml")
             == """<?xml version="1.0" encoding="UTF-8"?>
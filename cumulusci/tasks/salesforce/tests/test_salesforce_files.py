@@ -1,8 +1,13 @@
+import hashlib
 import json
 import os
-import unittest
-from unittest.mock import Mock, call, mock_open, patch
+from unittest import mock
+from unittest.mock import Mock
 
+import pytest
+import responses
+
+from cumulusci.core.exceptions import CumulusCIException, TaskOptionsError
 from cumulusci.tasks.salesforce.salesforce_files import (
     ListFiles,
     RetrieveFiles,
@@ -33,196 +38,270 @@ class TestDisplayFiles:
         ]
 
 
-class TestRetrieveFiles(unittest.TestCase):
-    @patch("requests.get")
-    @patch("os.path.exists")
-    @patch("os.makedirs")
-    @patch("builtins.open")
-    def test_run_task(self, mock_open, mock_makedirs, mock_exists, mock_get):
-        # Mock Salesforce query response
-        mock_sf = Mock()
-        mock_sf.query.return_value = {
-            "totalSize": 2,
-            "records": [
-                {
-                    "Title": "TEST1",
-                    "Id": "0PS000000000000",
-                    "FileType": "TXT",
-                    "VersionData": "version1",
-                    "ContentDocumentId": "doc1",
-                },
-                {
-                    "Title": "TEST2",
-                    "Id": "0PS000000000001",
-                    "FileType": "TXT",
-                    "VersionData": "version2",
-                    "ContentDocumentId": "doc2",
-                },
-            ],
-        }
+INSTANCE_URL = "https://test.salesforce.com"
+UPLOAD_URL = f"{INSTANCE_URL}/services/data/v50.0/sobjects/ContentVersion/"
 
-        # Mock org config
-        mock_org_config = Mock()
-        mock_org_config.instance_url = "https://test.salesforce.com"
-        mock_org_config.access_token = "test token"
 
-        # Create task with mocked Salesforce and org config
-        task = create_task(RetrieveFiles, {"path": "test_dir", "file_list": ""})
-        task.sf = mock_sf
-        task.org_config = mock_org_config
+def md5(data: bytes) -> str:
+    return hashlib.md5(data).hexdigest()
 
-        # Mock file existence and request response
-        mock_exists.return_value = False
-        mock_response = Mock()
-        mock_response.iter_content.return_value = [b"chunk1", b"chunk2"]
-        mock_response.raise_for_status = Mock()
-        mock_get.return_value = mock_response
 
-        # Run the task
-        task._run_task()
+def multipart_parts(body: bytes, content_type: str):
+    """The (headers, content) of each part of a multipart body"""
+    boundary = content_type.split("boundary=")[1].encode()
+    parts = []
+    for part in body.split(b"--" + boundary)[1:-1]:
+        headers, content = part[2:-2].split(b"\r\n\r\n", 1)
+        parts.append((headers.decode(), content))
+    return parts
+
+
+def version(title, data, file_type="TXT", id="068000000000001"):
+    return {
+        "Title": title,
+        "Id": id,
+        "FileType": file_type,
+        "VersionData": f"version/{id}",
+        "ContentDocumentId": f"doc/{id}",
+        "Checksum": md5(data),
+    }
+
 
-        # Check if query was called with correct SOQL
-        mock_sf.query.assert_called_once_with(
-            "SELECT Title, Id, FileType, VersionData, ContentDocumentId FROM ContentVersion WHERE isLatest=true "
+def create_files_task(task_class, options, records=()):
+    task = create_task(task_class, options)
+    task.project_config.config["project"]["package"]["api_version"] = "50.0"
+    task.sf = Mock()
+    task.sf.query_all.return_value = {"records": list(records)}
+    return task
+
+
+class TestRetrieveFiles:
+    @responses.activate
+    def test_run_task(self, tmp_path):
+        records = [
+            version("TEST1", b"one", id="068000000000001"),
+            version("TEST2", b"two", id="068000000000002"),
+        ]
+        for record, data in zip(records, (b"one", b"two")):
+            responses.add("GET", f"{INSTANCE_URL}/{record['VersionData']}", body=data)
+        manifest = tmp_path / "manifest.json"
+        task = create_files_task(
+            RetrieveFiles,
+            {"path": str(tmp_path / "files"), "manifest": str(manifest)},
+            records,
         )
 
-        # Check if files are downloaded
-        expected_calls = [
-            call(
-                "https://test.salesforce.com/version1",
-                headers={"Authorization": "Bearer test token"},
-                stream=True,
-            ),
-            call(
-                "https://test.salesforce.com/version2",
-                headers={"Authorization": "Bearer test token"},
-                stream=True,
-            ),
+        task._run_task()
+
+        task.sf.query_all.assert_called_once_with(
+            "SELECT Title, Id, FileType, VersionData, ContentDocumentId, Checksum FROM ContentVersion WHERE IsLatest = true"
+        )
+        assert (tmp_path / "files" / "TEST1.txt").read_bytes() == b"one"
+        assert (tmp_path / "files" / "TEST2.txt").read_bytes() == b"two"
+        assert all(
+            call.request.headers["Authorization"] == "Bearer TOKEN"
+            for call in responses.calls
+        )
+        assert task.return_values == [
+            {
+                "Id": "068000000000001",
+                "FileName": "TEST1",
+                "FileType": "TXT",
+                "VersionData": "version/068000000000001",
+                "ContentDocumentId": "doc/068000000000001",
+            },
+            {
+                "Id": "068000000000002",
+                "FileName": "TEST2",
+                "FileType": "TXT",
+                "VersionData": "version/068000000000002",
+                "ContentDocumentId": "doc/068000000000002",
+            },
+        ]
+        assert [result["status"] for result in json.loads(manifest.read_text())] == [
+            "downloaded",
+            "downloaded",
         ]
-        mock_get.assert_has_calls(expected_calls, any_order=True)
 
-        # Check if files are written correctly
-        mock_open.assert_any_call(os.path.join("test_dir", "TEST1.txt"), "wb")
-        mock_open.assert_any_call(os.path.join("test_dir", "TEST2.txt"), "wb")
+    def test_run_task__file_list(self, tmp_path):
+        records = [
+            version("TEST1", b"one", file_type="PDF"),
+            version("TEST1", b"one"),
+            version("TEST2", b"two"),
+        ]
+        task = create_files_task(
+            RetrieveFiles,
+            {"path": str(tmp_path), "file_list": "TEST1.txt, O'Brien.txt"},
+            records,
+        )
+        with mock.patch.object(task, "_download") as download:
+            download.return_value = {"file": "TEST1.txt", "status": "downloaded"}
+            task._run_task()
 
-        # Check if return values are set correctly
-        self.assertEqual(
-            task.return_values,
-            [
-                {
-                    "Id": "0PS000000000000",
-                    "FileName": "TEST1",
-                    "FileType": "TXT",
-                    "VersionData": "version1",
-                    "ContentDocumentId": "doc1",
-                },
-                {
-                    "Id": "0PS000000000001",
-                    "FileName": "TEST2",
-                    "FileType": "TXT",
-                    "VersionData": "version2",
-                    "ContentDocumentId": "doc2",
-                },
-            ],
+        task.sf.query_all.assert_called_once_with(
+            "SELECT Title, Id, FileType, VersionData, ContentDocumentId, Checksum FROM ContentVersion "
+            "WHERE IsLatest = true AND Title IN ('O\\'Brien', 'TEST1')"
         )
+        assert [
+            (result["FileName"], result["FileType"]) for result in task.return_values
+        ] == [("TEST1", "TXT")]
+
+    @responses.activate
+    def test_run_task__existing_files(self, tmp_path):
+        (tmp_path / "SAME.txt").write_bytes(b"same")
+        (tmp_path / "CHANGED.txt").write_bytes(b"old")
+        records = [
+            version("SAME", b"same", id="068000000000001"),
+            version("CHANGED", b"new", id="068000000000002"),
+            version("CHANGED", b"newer", id="068000000000003"),
+        ]
+        responses.add("GET", f"{INSTANCE_URL}/version/068000000000002", body=b"new")
+        responses.add("GET", f"{INSTANCE_URL}/version/068000000000003", body=b"newer")
+        task = create_files_task(RetrieveFiles, {"path": str(tmp_path)}, records)
 
+        task._run_task()
 
-class TestUploadFiles(unittest.TestCase):
-    @patch("requests.post")
-    @patch("os.listdir")
-    @patch("os.path.isfile")
-    @patch("builtins.open", new_callable=mock_open, read_data=b"test data")
-    def test_run_task(self, mock_open, mock_isfile, mock_listdir, mock_post):
-        # Mock org config and project config
-        mock_org_config = Mock()
-        mock_org_config.instance_url = "https://test.salesforce.com"
-        mock_org_config.access_token = "test token"
-
-        mock_project_config = Mock()
-        mock_project_config.project__package__api_version = "50.0"
-
-        # Create task with mocked configs
-        task = create_task(UploadFiles, {"path": "test_dir", "file_list": ""})
-        task.org_config = mock_org_config
-        task.project_config = mock_project_config
-
-        # Mock file discovery
-        mock_listdir.return_value = ["file1.txt", "file2.txt"]
-        mock_isfile.side_effect = lambda filepath: filepath in [
-            os.path.join("test_dir", "file1.txt"),
-            os.path.join("test_dir", "file2.txt"),
+        assert len(responses.calls) == 2
+        assert (tmp_path / "SAME.txt").read_bytes() == b"same"
+        assert (tmp_path / "CHANGED.txt").read_bytes() == b"old"
+        assert (tmp_path / "CHANGED (1).txt").read_bytes() == b"new"
+        assert (tmp_path / "CHANGED (2).txt").read_bytes() == b"newer"
+
+    @responses.activate
+    def test_run_task__download_error(self, tmp_path):
+        records = [
+            version("TEST1", b"one", id="068000000000001"),
+            version("TEST2", b"two", id="068000000000002"),
         ]
+        responses.add("GET", f"{INSTANCE_URL}/version/068000000000001", body=b"one")
+        responses.add("GET", f"{INSTANCE_URL}/version/068000000000002", status=404)
+        task = create_files_task(RetrieveFiles, {"path": str(tmp_path)}, records)
+
+        with pytest.raises(CumulusCIException, match="Unable to download 1 files"):
+            task._run_task()
+
+        assert sorted(os.listdir(tmp_path)) == ["TEST1.txt"]
 
-        # Mock requests response
-        mock_response = Mock()
-        mock_response.status_code = 201
-        mock_response.json.return_value = {"id": "contentversionid"}
-        mock_post.return_value = mock_response
+    @responses.activate
+    def test_run_task__throttled(self, tmp_path):
+        records = [version("TEST1", b"one")]
+        url = f"{INSTANCE_URL}/version/068000000000001"
+        responses.add("GET", url, status=429, headers={"Retry-After": "0"})
+        responses.add("GET", url, body=b"one")
+        task = create_files_task(RetrieveFiles, {"path": str(tmp_path)}, records)
 
-        # Run the task
         task._run_task()
 
-        mock_open.assert_any_call(os.path.join("test_dir", "file1.txt"), "rb")
-        mock_open.assert_any_call(os.path.join("test_dir", "file2.txt"), "rb")
-
-        # Check if requests.post was called correctly
-        expected_calls = [
-            call(
-                "https://test.salesforce.com/services/data/v50.0/sobjects/ContentVersion/",
-                headers={"Authorization": "Bearer test token"},
-                files={
-                    "entity_content": (
-                        "",
-                        json.dumps(
-                            {
-                                "Title": "file1",
-                                "PathOnClient": os.path.join("test_dir", "file1.txt"),
-                            }
-                        ),
-                        "application/json",
-                    ),
-                    "VersionData": (
-                        "file1.txt",
-                        mock_open(),
-                        "application/octet-stream",
-                    ),
-                },
-            ),
-            call(
-                "https://test.salesforce.com/services/data/v50.0/sobjects/ContentVersion/",
-                headers={"Authorization": "Bearer test token"},
-                files={
-                    "entity_content": (
-                        "",
-                        json.dumps(
-                            {
-                                "Title": "file2",
-                                "PathOnClient": os.path.join("test_dir", "file2.txt"),
-                            }
-                        ),
-                        "application/json",
-                    ),
-                    "VersionData": (
-                        "file2.txt",
-                        mock_open(),
-                        "application/octet-stream",
-                    ),
-                },
-            ),
-        ]
+        assert (tmp_path / "TEST1.txt").read_bytes() == b"one"
+
+    @pytest.mark.parametrize("max_parallel", ["0", "many"])
+    def test_init_options__bad_max_parallel(self, max_parallel):
+        with pytest.raises(TaskOptionsError, match="max_parallel"):
+            create_task(RetrieveFiles, {"max_parallel": max_parallel})
 
-        self.assertEqual(
-            task.return_values,
-            [
+
+class TestUploadFiles:
+    @responses.activate
+    def test_run_task(self, tmp_path):
+        (tmp_path / "file1.txt").write_bytes(b"one")
+        (tmp_path / "file2.txt").write_bytes(b"two")
+        responses.add("POST", UPLOAD_URL, status=201, json={"id": "068000000000001"})
+        manifest = tmp_path / "out" / "manifest.json"
+        task = create_files_task(
+            UploadFiles,
+            {
+                "path": str(tmp_path),
+                "file_list": "file1.txt, file2.txt",
+                "manifest": str(manifest),
+            },
+        )
+
+        task._run_task()
+
+        task.sf.query_all.assert_called_once_with(
+            "SELECT Title, Checksum FROM ContentVersion WHERE IsLatest = true AND Title IN ('file1', 'file2')"
+        )
+        uploads = {}
+        for call in responses.calls:
+            assert call.request.headers["Authorization"] == "Bearer TOKEN"
+            assert int(call.request.headers["Content-Length"]) == len(call.request.body)
+            body = call.request.body
+            if hasattr(body, "read"):
+                body = body.read()
+            (_, entity_content), (headers, content) = multipart_parts(
+                body, call.request.headers["Content-Type"]
+            )
+            assert 'filename="' in headers
+            entity_content = json.loads(entity_content)
+            uploads[entity_content["Title"]] = (entity_content, content)
+        assert uploads == {
+            "file1": (
                 {
                     "Title": "file1",
-                    "PathOnClient": os.path.join("test_dir", "file1.txt"),
+                    "PathOnClient": os.path.join(str(tmp_path), "file1.txt"),
                 },
+                b"one",
+            ),
+            "file2": (
                 {
                     "Title": "file2",
-                    "PathOnClient": os.path.join("test_dir", "file2.txt"),
+                    "PathOnClient": os.path.join(str(tmp_path), "file2.txt"),
                 },
-            ],
+                b"two",
+            ),
+        }
+        # The files are uploaded concurrently, but returned in order
+        assert task.return_values == [uploads["file1"][0], uploads["file2"][0]]
+        assert json.loads(manifest.read_text()) == [
+            {
+                "file": os.path.join(str(tmp_path), name),
+                "title": os.path.splitext(name)[0],
+                "status": "uploaded",
+                "content_version_id": "068000000000001",
+            }
+            for name in ("file1.txt", "file2.txt")
+        ]
+
+    @responses.activate
+    def test_run_task__skip_existing(self, tmp_path):
+        (tmp_path / "same.txt").write_bytes(b"same")
+        (tmp_path / "changed.txt").write_bytes(b"changed")
+        responses.add("POST", UPLOAD_URL, status=201, json={"id": "068000000000001"})
+        records = [
+            {"Title": "same", "Checksum": md5(b"same")},
+            {"Title": "changed", "Checksum": md5(b"old")},
+        ]
+        task = create_files_task(UploadFiles, {"path": str(tmp_path)}, records)
+
+        task._run_task()
+
+        assert len(responses.calls) == 1
+        assert len(task.return_values) == 2
+
+    @responses.activate
+    def test_run_task__skip_existing_false(self, tmp_path):
+        (tmp_path / "same.txt").write_bytes(b"same")
+        responses.add("POST", UPLOAD_URL, status=201, json={"id": "068000000000001"})
+        task = create_files_task(
+            UploadFiles, {"path": str(tmp_path), "skip_existing": "False"}
+        )
+
+        task._run_task()
+
+        task.sf.query_all.assert_not_called()
+        assert len(responses.calls) == 1
+
+    @responses.activate
+    def test_run_task__upload_error(self, tmp_path):
+        (tmp_path / "file1.txt").write_bytes(b"one")
+        responses.add("POST", UPLOAD_URL, status=400, json=[{"message": "Bad"}])
+        manifest = tmp_path.parent / f"{tmp_path.name}_manifest.json"
+        task = create_files_task(
+            UploadFiles, {"path": str(tmp_path), "manifest": str(manifest)}
         )
 
-        mock_post.assert_has_calls(expected_calls, any_order=True)
+        task._run_task()
+
+        (result,) = json.loads(manifest.read_text())
+        assert result["status"] == "failed"
+        assert "400" in result["error"]
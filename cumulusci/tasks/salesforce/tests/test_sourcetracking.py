@@ -6,7 +6,7 @@ from unittest import mock
 import pytest
 
 from cumulusci.core.config import OrgConfig
-from cumulusci.core.exceptions import ProjectConfigNotFound
+from cumulusci.core.exceptions import ProjectConfigNotFound, TaskOptionsError
 from cumulusci.tasks.salesforce.retrieve_profile import RetrieveProfile
 from cumulusci.tasks.salesforce.sourcetracking import (
     KNOWN_BAD_MD_TYPES,
@@ -14,6 +14,7 @@ from cumulusci.tasks.salesforce.sourcetracking import (
     RetrieveChanges,
     SnapshotChanges,
     _write_manifest,
+    compile_patterns,
     retrieve_components,
 )
 from cumulusci.tests.util import create_project_config
@@ -138,6 +139,74 @@ class TestListChanges:
         filtered, ignored = task._filter_changes([foo, bar])
         assert filtered == [foo, bar]
 
+    def test_compile_patterns(self):
+        assert compile_patterns(()) is None
+        pattern = compile_patterns(("foo", "^Profile: "))
+        assert pattern.search("CustomObject: foo__c")
+        assert pattern.search("Profile: Admin")
+        assert not pattern.search("CustomObject: Profile__c")
+
+    def test_get_changes__queries_since_watermark(self, create_task_fixture):
+        with temporary_dir():
+            task = create_task_fixture(ListChanges)
+            task.org_config.config["org_id"] = "00D000000000001"
+            task._snapshot = {"CustomObject": {"Unchanged__c": 3}}
+            task.tooling = mock.Mock()
+            task.tooling.query_all.return_value = {
+                "records": [
+                    {
+                        "MemberType": "CustomObject",
+                        "MemberName": "Unchanged__c",
+                        "RevisionCounter": 3,
+                    },
+                    {
+                        "MemberType": "CustomObject",
+                        "MemberName": "Deleted__c",
+                        "RevisionCounter": 5,
+                    },
+                ]
+            }
+            assert [c["MemberName"] for c in task._get_changes()] == ["Deleted__c"]
+            assert "IsNameObsolete=false" in task.tooling.query_all.call_args[0][0]
+
+            task.tooling.query_all.return_value = {
+                "records": [
+                    {
+                        "MemberType": "CustomObject",
+                        "MemberName": "Deleted__c",
+                        "RevisionCounter": 6,
+                        "IsNameObsolete": True,
+                    },
+                    {
+                        "MemberType": "ApexClass",
+                        "MemberName": "New",
+                        "RevisionCounter": 7,
+                        "IsNameObsolete": False,
+                    },
+                ]
+            }
+            changes = task._get_changes()
+            assert "WHERE RevisionCounter > 5" in task.tooling.query_all.call_args[0][0]
+            assert changes == [
+                {"MemberType": "ApexClass", "MemberName": "New", "RevisionCounter": 7}
+            ]
+
+            task.tooling.query_all.return_value = {"records": []}
+            task._get_changes()
+            assert "WHERE RevisionCounter > 7" in task.tooling.query_all.call_args[0][0]
+
+    def test_get_changes__different_org_queries_all(self, create_task_fixture):
+        with temporary_dir():
+            task = create_task_fixture(ListChanges)
+            task._snapshot = {}
+            task.tooling = mock.Mock()
+            task.tooling.query_all.return_value = {"records": []}
+            task.org_config.config["org_id"] = "00D000000000001"
+            task._get_changes()
+            task.org_config.config["org_id"] = "00D000000000002"
+            task._get_changes()
+            assert "IsNameObsolete=false" in task.tooling.query_all.call_args[0][0]
+
 
 @mock.patch("cumulusci.tasks.salesforce.sourcetracking.sfdx")
 class TestRetrieveChanges:
@@ -213,6 +282,43 @@ class TestRetrieveChanges:
             task._run_task()
             assert "No changes to retrieve" in messages
 
+    def test_run_task__watch(self, sfdx, create_task_fixture):
+        with temporary_dir() as path:
+            task = create_task_fixture(
+                RetrieveChanges, {"path": path, "watch": True, "poll_interval": 5}
+            )
+            task._init_task()
+            task.tooling = mock.Mock()
+            task.tooling.query_all.side_effect = [
+                {"records": []},
+                {
+                    "records": [
+                        {
+                            "MemberType": "ApexClass",
+                            "MemberName": "Foo",
+                            "RevisionCounter": 1,
+                        }
+                    ]
+                },
+            ]
+            task.logger = mock.Mock()
+            with mock.patch(
+                "cumulusci.tasks.salesforce.sourcetracking.retrieve_components"
+            ) as retrieve, mock.patch(
+                "time.sleep", side_effect=[None, KeyboardInterrupt]
+            ) as sleep:
+                task._run_task()
+            retrieve.assert_called_once()
+            assert retrieve.call_args[0][0][0]["MemberName"] == "Foo"
+            sleep.assert_called_with(5)
+            assert task._snapshot == {"ApexClass": {"Foo": 1}}
+            assert "Stopped watching" in task.logger.info.call_args[0][0]
+
+    def test_init_options__watch_requires_snapshot(self, sfdx, create_task_fixture):
+        task = create_task_fixture(RetrieveChanges, {"watch": True})
+        with pytest.raises(TaskOptionsError):
+            task._init_options({"snapshot": False})
+
     def test_run_task_with_output_dir(self, sfdx, create_task_fixture):
         sfdx_calls = []
         sfdx.side_effect = lambda cmd, *args, **kw: sfdx_calls.append(cmd)
@@ -59,7 +59,7 @@ class UninstallPackagedIncremental(UninstallPackaged):
             f"Retrieving metadata in package {self.options['package']} from target org"
         )
         packaged = self._retrieve_packaged()
-        with temporary_dir() as tempdir:
+        with temporary_dir(chdir=False) as tempdir:
             packaged.extractall(tempdir)
             destructive_changes = self._package_xml_diff(
                 package_path, Path(tempdir) / "package.xml"
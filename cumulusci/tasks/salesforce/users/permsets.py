@@ -1,5 +1,3 @@
-import json
-
 from cumulusci.cli.ui import CliTable
 from cumulusci.core.exceptions import CumulusCIException
 from cumulusci.core.utils import (
@@ -7,6 +5,12 @@ from cumulusci.core.utils import (
     process_bool_arg,
     process_list_arg,
 )
+from cumulusci.salesforce_api.permission_assignments import (
+    PERMISSION_SET_ASSIGNMENT,
+    PERMISSION_SET_GROUP_ASSIGNMENT,
+    PERMISSION_SET_LICENSE_ASSIGNMENT,
+    PermissionAssignments,
+)
 from cumulusci.tasks.salesforce import BaseSalesforceApiTask
 from cumulusci.tasks.salesforce.assign_ps_psg import build_name_conditions
 from cumulusci.utils import inject_namespace
@@ -44,8 +48,7 @@ The managed mode and namespaced org detection is automatic based on the org cont
     permission_name = "PermissionSet"
     permission_name_field = "Name"
     permission_label = "Permission Set"
-    assignment_name = "PermissionSetAssignment"
-    assignment_lookup = "PermissionSetId"
+    relationship = PERMISSION_SET_ASSIGNMENT
     assignment_child_relationship = "PermissionSetAssignments"
 
     def _init_options(self, kwargs):
@@ -89,51 +92,40 @@ The managed mode and namespaced org detection is automatic based on the org cont
         return name_processed
 
     def _run_task(self):
-        users = self._query_existing_assignments()
-        users_assigned_perms = {
-            user["Id"]: self._get_assigned_perms(user) for user in users
-        }
+        user_ids = self._query_users()
         perms_by_id = self._get_perm_ids()
 
-        records_to_insert = []
-        for user_id, assigned_perms in users_assigned_perms.items():
-            records_to_insert.extend(
-                self._get_assignments(user_id, assigned_perms, perms_by_id)
+        result = PermissionAssignments(self.sf, self.logger).assign(
+            self.relationship,
+            [(user_id, perm) for user_id in user_ids for perm in perms_by_id],
+        )
+        for user_id, perm in result.existing:
+            self.logger.warning(
+                f'{self.permission_label} "{perms_by_id[perm]}" is already assigned to {user_id}.'
             )
+        if result.is_noop:
+            return
+        for (user_id, perm), _ in result.results:
+            self.logger.info(
+                f'Assigning {self.permission_label} "{perms_by_id[perm]}" to {user_id}.'
+            )
+        self._process_composite_results(
+            [api_result for _, api_result in result.results]
+        )
 
-        self._insert_assignments(records_to_insert)
-
-    def _query_existing_assignments(self):
+    def _query_users(self):
         if not self.options["user_alias"]:
-            query = (
-                f"SELECT Id,(SELECT {self.assignment_lookup} FROM {self.assignment_child_relationship}) "
-                "FROM User "
-                f"WHERE Username = '{self.org_config.username}'"
-            )
+            query = f"SELECT Id FROM User WHERE Username = '{self.org_config.username}'"
         else:
             aliases = "','".join(self.options["user_alias"])
-            query = (
-                f"SELECT Id,(SELECT {self.assignment_lookup} FROM {self.assignment_child_relationship}) "
-                "FROM User "
-                f"""WHERE Alias IN ('{aliases}')"""
-            )
+            query = f"SELECT Id FROM User WHERE Alias IN ('{aliases}')"
 
         result = self.sf.query(query)
         if result["totalSize"] == 0:
             raise CumulusCIException(
                 "No Users were found matching the specified aliases."
             )
-        return result["records"]
-
-    def _get_assigned_perms(self, user):
-        assigned_perms = {}
-        # PermissionSetLicenseAssignments actually returns None if there are no assignments instead of an empty list of records.  Wow.
-        if user[self.assignment_child_relationship]:
-            assigned_perms = {
-                r[self.assignment_lookup]
-                for r in user[self.assignment_child_relationship]["records"]
-            }
-        return assigned_perms
+        return [user["Id"] for user in result["records"]]
 
     def _get_perm_ids(self):
         name_conditions, _ = build_name_conditions(
@@ -160,37 +152,6 @@ The managed mode and namespaced org detection is automatic based on the org cont
             )
         return perms_by_ids
 
-    def _get_assignments(self, user_id, assigned_perms, perms_by_id):
-        assignments = []
-        for perm, perm_name in perms_by_id.items():
-            if perm not in assigned_perms:
-                self.logger.info(
-                    f'Assigning {self.permission_label} "{perm_name}" to {user_id}.'
-                )
-                assignment = {
-                    "attributes": {"type": self.assignment_name},
-                    "AssigneeId": user_id,
-                    self.assignment_lookup: perm,
-                }
-                assignments.append(assignment)
-            else:
-                self.logger.warning(
-                    f'{self.permission_label} "{perm_name}" is already assigned to {user_id}.'
-                )
-        return assignments
-
-    def _insert_assignments(self, records_to_insert):
-        result_list = []
-        for i in range(0, len(records_to_insert), 200):
-            request_body = json.dumps(
-                {"allOrNone": False, "records": records_to_insert[i : i + 200]}
-            )
-            result = self.sf.restful(
-                "composite/sobjects", method="POST", data=request_body
-            )
-            result_list.extend(result)
-        self._process_composite_results(result_list)
-
     def _process_composite_results(self, api_results):
         results_table_data = [["Success", "ID", "Message"]]
         for result in api_results:
@@ -233,8 +194,7 @@ Permission Set Licenses are usually associated with a Permission Set, and assign
     permission_name = "PermissionSetLicense"
     permission_name_field = ["DeveloperName", "PermissionSetLicenseKey"]
     permission_label = "Permission Set License"
-    assignment_name = "PermissionSetLicenseAssign"
-    assignment_lookup = "PermissionSetLicenseId"
+    relationship = PERMISSION_SET_LICENSE_ASSIGNMENT
     assignment_child_relationship = "PermissionSetLicenseAssignments"
 
     def _get_perm_ids(self):
@@ -279,6 +239,5 @@ Assigns Permission Set Groups whose Developer Names are in ``api_names`` to eith
     permission_name = "PermissionSetGroup"
     permission_name_field = "DeveloperName"
     permission_label = "Permission Set Group"
-    assignment_name = "PermissionSetAssignment"
-    assignment_lookup = "PermissionSetGroupId"
+    relationship = PERMISSION_SET_GROUP_ASSIGNMENT
     assignment_child_relationship = "PermissionSetAssignments"
@@ -3,10 +3,15 @@ from unittest import mock
 
 import pytest
 import responses
-from responses.matchers import json_params_matcher
+from responses.matchers import json_params_matcher, query_param_matcher
 
 from cumulusci.core.config.org_config import OrgConfig
 from cumulusci.core.exceptions import CumulusCIException
+from cumulusci.salesforce_api.permission_assignments import (
+    PERMISSION_SET_ASSIGNMENT,
+    PERMISSION_SET_GROUP_ASSIGNMENT,
+    PERMISSION_SET_LICENSE_ASSIGNMENT,
+)
 from cumulusci.tasks.salesforce.tests.util import create_task
 from cumulusci.tasks.salesforce.users.permsets import (
     AssignPermissionSetGroups,
@@ -20,6 +25,29 @@ from cumulusci.tests.util import (
 )
 
 
+def add_existing_assignments_response(task, relationship, user_ids, perm_ids, assigned):
+    """Mock the query for the assignments which already exist"""
+    query = (
+        f"SELECT AssigneeId, {relationship.child_field} FROM {relationship.sobject} "
+        f"WHERE AssigneeId IN ({', '.join(repr(id) for id in user_ids)}) "
+        f"AND {relationship.child_field} IN ({', '.join(repr(id) for id in perm_ids)})"
+    )
+    responses.add(
+        method="GET",
+        url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/query/",
+        match=[query_param_matcher({"q": query})],
+        status=200,
+        json={
+            "done": True,
+            "totalSize": len(assigned),
+            "records": [
+                {"AssigneeId": user_id, relationship.child_field: perm_id}
+                for user_id, perm_id in assigned
+            ],
+        },
+    )
+
+
 class TestCreatePermissionSet:
     @responses.activate
     def test_create_permset(self):
@@ -32,7 +60,7 @@ class TestCreatePermissionSet:
 
         responses.add(
             method="GET",
-            url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/query/?q=SELECT+Id%2C%28SELECT+PermissionSetId+FROM+PermissionSetAssignments%29+FROM+User+WHERE+Username+%3D+%27test-cci%40example.com%27",
+            url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/query/?q=SELECT+Id+FROM+User+WHERE+Username+%3D+%27test-cci%40example.com%27",
             status=200,
             json={
                 "done": True,
@@ -40,11 +68,6 @@ class TestCreatePermissionSet:
                 "records": [
                     {
                         "Id": "005000000000000",
-                        "PermissionSetAssignments": {
-                            "done": True,
-                            "totalSize": 1,
-                            "records": [{"PermissionSetId": "0PS000000000000"}],
-                        },
                     }
                 ],
             },
@@ -70,6 +93,13 @@ class TestCreatePermissionSet:
                 ],
             },
         )
+        add_existing_assignments_response(
+            task,
+            PERMISSION_SET_ASSIGNMENT,
+            ["005000000000000"],
+            ["0PS000000000000", "0PS000000000001"],
+            [("005000000000000", "0PS000000000000")],
+        )
         responses.add(
             method="POST",
             url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/composite/sobjects",
@@ -93,7 +123,56 @@ class TestCreatePermissionSet:
 
         task()
 
+        assert len(responses.calls) == 4
+
+    @responses.activate
+    def test_create_permset__already_assigned(self):
+        task = create_task(
+            AssignPermissionSets,
+            {
+                "api_names": "PermSet1",
+            },
+        )
+
+        responses.add(
+            method="GET",
+            url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/query/?q=SELECT+Id+FROM+User+WHERE+Username+%3D+%27test-cci%40example.com%27",
+            status=200,
+            json={
+                "done": True,
+                "totalSize": 1,
+                "records": [{"Id": "005000000000000"}],
+            },
+        )
+        responses.add(
+            method="GET",
+            url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/query/?q=SELECT+Id%2C+NamespacePrefix%2C+Name+FROM+PermissionSet+WHERE+%28Name+%3D+%27PermSet1%27%29",
+            status=200,
+            json={
+                "done": True,
+                "totalSize": 1,
+                "records": [
+                    {
+                        "Id": "0PS000000000000",
+                        "Name": "PermSet1",
+                        "NamespacePrefix": None,
+                    },
+                ],
+            },
+        )
+        add_existing_assignments_response(
+            task,
+            PERMISSION_SET_ASSIGNMENT,
+            ["005000000000000"],
+            ["0PS000000000000"],
+            [("005000000000000", "0PS000000000000")],
+        )
+
+        task()
+
+        # Nothing is written
         assert len(responses.calls) == 3
+        assert all(call.request.method == "GET" for call in responses.calls)
 
     @responses.activate
     def test_create_permset__alias(self):
@@ -107,7 +186,7 @@ class TestCreatePermissionSet:
 
         responses.add(
             method="GET",
-            url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/query/?q=SELECT+Id%2C%28SELECT+PermissionSetId+FROM+PermissionSetAssignments%29+FROM+User+WHERE+Alias+IN+%28%27test0%27%2C%27test1%27%29",
+            url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/query/?q=SELECT+Id+FROM+User+WHERE+Alias+IN+%28%27test0%27%2C%27test1%27%29",
             status=200,
             json={
                 "done": True,
@@ -115,19 +194,9 @@ class TestCreatePermissionSet:
                 "records": [
                     {
                         "Id": "005000000000000",
-                        "PermissionSetAssignments": {
-                            "done": True,
-                            "totalSize": 1,
-                            "records": [{"PermissionSetId": "0PS000000000000"}],
-                        },
                     },
                     {
                         "Id": "005000000000001",
-                        "PermissionSetAssignments": {
-                            "done": True,
-                            "totalSize": 1,
-                            "records": [{"PermissionSetId": "0PS000000000000"}],
-                        },
                     },
                 ],
             },
@@ -153,6 +222,16 @@ class TestCreatePermissionSet:
                 ],
             },
         )
+        add_existing_assignments_response(
+            task,
+            PERMISSION_SET_ASSIGNMENT,
+            ["005000000000000", "005000000000001"],
+            ["0PS000000000000", "0PS000000000001"],
+            [
+                ("005000000000000", "0PS000000000000"),
+                ("005000000000001", "0PS000000000000"),
+            ],
+        )
         responses.add(
             method="POST",
             url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/composite/sobjects",
@@ -184,7 +263,7 @@ class TestCreatePermissionSet:
 
         task()
 
-        assert len(responses.calls) == 3
+        assert len(responses.calls) == 4
 
     @responses.activate
     def test_create_permset__alias_raises(self):
@@ -198,7 +277,7 @@ class TestCreatePermissionSet:
 
         responses.add(
             method="GET",
-            url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/query/?q=SELECT+Id%2C%28SELECT+PermissionSetId+FROM+PermissionSetAssignments%29+FROM+User+WHERE+Alias+IN+%28%27test%27%29",
+            url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/query/?q=SELECT+Id+FROM+User+WHERE+Alias+IN+%28%27test%27%29",
             status=200,
             json={
                 "done": True,
@@ -221,7 +300,7 @@ class TestCreatePermissionSet:
 
         responses.add(
             method="GET",
-            url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/query/?q=SELECT+Id%2C%28SELECT+PermissionSetId+FROM+PermissionSetAssignments%29+FROM+User+WHERE+Alias+IN+%28%27test0%27%2C%27test1%27%2C%27test2%27%2C%27test3%27%2C%27test4%27%2C%27test5%27%2C%27test6%27%2C%27test7%27%2C%27test8%27%2C%27test9%27%2C%27test10%27%2C%27test11%27%2C%27test12%27%2C%27test13%27%2C%27test14%27%2C%27test15%27%2C%27test16%27%2C%27test17%27%2C%27test18%27%2C%27test19%27%29",
+            url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/query/?q=SELECT+Id+FROM+User+WHERE+Alias+IN+%28%27test0%27%2C%27test1%27%2C%27test2%27%2C%27test3%27%2C%27test4%27%2C%27test5%27%2C%27test6%27%2C%27test7%27%2C%27test8%27%2C%27test9%27%2C%27test10%27%2C%27test11%27%2C%27test12%27%2C%27test13%27%2C%27test14%27%2C%27test15%27%2C%27test16%27%2C%27test17%27%2C%27test18%27%2C%27test19%27%29",
             status=200,
             json={
                 "done": True,
@@ -229,7 +308,6 @@ class TestCreatePermissionSet:
                 "records": [
                     {
                         "Id": f"00500000000000{str(i)}",
-                        "PermissionSetAssignments": None,
                     }
                     for i in range(20)
                 ],
@@ -252,6 +330,13 @@ class TestCreatePermissionSet:
                 ],
             },
         )
+        add_existing_assignments_response(
+            task,
+            PERMISSION_SET_ASSIGNMENT,
+            sorted(f"00500000000000{str(i)}" for i in range(20)),
+            sorted(f"0PS000000000000{str(i)}" for i in range(20)),
+            [],
+        )
         responses.add(
             method="POST",
             url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/composite/sobjects",
@@ -264,9 +349,9 @@ class TestCreatePermissionSet:
 
         task()
 
-        assert len(responses.calls) == 4
-        assert len(json.loads(responses.calls[2].request.body)["records"]) == 200
+        assert len(responses.calls) == 5
         assert len(json.loads(responses.calls[3].request.body)["records"]) == 200
+        assert len(json.loads(responses.calls[4].request.body)["records"]) == 200
 
     @responses.activate
     def test_create_permset_raises(self):
@@ -279,7 +364,7 @@ class TestCreatePermissionSet:
 
         responses.add(
             method="GET",
-            url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/query/?q=SELECT+Id%2C%28SELECT+PermissionSetId+FROM+PermissionSetAssignments%29+FROM+User+WHERE+Username+%3D+%27test-cci%40example.com%27",
+            url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/query/?q=SELECT+Id+FROM+User+WHERE+Username+%3D+%27test-cci%40example.com%27",
             status=200,
             json={
                 "done": True,
@@ -287,11 +372,6 @@ class TestCreatePermissionSet:
                 "records": [
                     {
                         "Id": "005000000000000",
-                        "PermissionSetAssignments": {
-                            "done": True,
-                            "totalSize": 1,
-                            "records": [{"PermissionSetId": "0PS000000000000"}],
-                        },
                     }
                 ],
             },
@@ -334,7 +414,7 @@ class TestCreatePermissionSet:
 
         responses.add(
             method="GET",
-            url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/query/?q=SELECT+Id%2C%28SELECT+PermissionSetId+FROM+PermissionSetAssignments%29+FROM+User+WHERE+Alias+IN+%28%27test0%27%2C%27test1%27%29",
+            url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/query/?q=SELECT+Id+FROM+User+WHERE+Alias+IN+%28%27test0%27%2C%27test1%27%29",
             status=200,
             json={
                 "done": True,
@@ -342,19 +422,9 @@ class TestCreatePermissionSet:
                 "records": [
                     {
                         "Id": "005000000000000",
-                        "PermissionSetAssignments": {
-                            "done": True,
-                            "totalSize": 1,
-                            "records": [{"PermissionSetId": "0PS000000000000"}],
-                        },
                     },
                     {
                         "Id": "005000000000001",
-                        "PermissionSetAssignments": {
-                            "done": True,
-                            "totalSize": 1,
-                            "records": [{"PermissionSetId": "0PS000000000000"}],
-                        },
                     },
                 ],
             },
@@ -380,6 +450,16 @@ class TestCreatePermissionSet:
                 ],
             },
         )
+        add_existing_assignments_response(
+            task,
+            PERMISSION_SET_ASSIGNMENT,
+            ["005000000000000", "005000000000001"],
+            ["0PS000000000000", "0PS000000000001"],
+            [
+                ("005000000000000", "0PS000000000000"),
+                ("005000000000001", "0PS000000000000"),
+            ],
+        )
         responses.add(
             method="POST",
             url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/composite/sobjects",
@@ -449,7 +529,7 @@ class TestCreatePermissionSet:
 
         responses.add(
             method="GET",
-            url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/query/?q=SELECT+Id%2C%28SELECT+PermissionSetId+FROM+PermissionSetAssignments%29+FROM+User+WHERE+Username+%3D+%27test-cci%40example.com%27",
+            url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/query/?q=SELECT+Id+FROM+User+WHERE+Username+%3D+%27test-cci%40example.com%27",
             status=200,
             json={
                 "done": True,
@@ -457,7 +537,6 @@ class TestCreatePermissionSet:
                 "records": [
                     {
                         "Id": "005000000000000",
-                        "PermissionSetAssignments": None,
                     }
                 ],
             },
@@ -483,6 +562,13 @@ class TestCreatePermissionSet:
                 ],
             },
         )
+        add_existing_assignments_response(
+            task,
+            PERMISSION_SET_ASSIGNMENT,
+            ["005000000000000"],
+            ["0PS000000000000", "0PS000000000001"],
+            [],
+        )
         responses.add(
             method="POST",
             url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/composite/sobjects",
@@ -495,7 +581,7 @@ class TestCreatePermissionSet:
 
         task()
 
-        assert len(responses.calls) == 3
+        assert len(responses.calls) == 4
         # Verify that the SOQL query contains the namespaced permission set name with namespace prefix condition
         assert (
             "NamespacePrefix+%3D+%27testns%27+AND+Name+%3D+%27PermSet1%27"
@@ -518,7 +604,7 @@ class TestCreatePermissionSet:
 
         responses.add(
             method="GET",
-            url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/query/?q=SELECT+Id%2C%28SELECT+PermissionSetId+FROM+PermissionSetAssignments%29+FROM+User+WHERE+Username+%3D+%27test-cci%40example.com%27",
+            url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/query/?q=SELECT+Id+FROM+User+WHERE+Username+%3D+%27test-cci%40example.com%27",
             status=200,
             json={
                 "done": True,
@@ -526,7 +612,6 @@ class TestCreatePermissionSet:
                 "records": [
                     {
                         "Id": "005000000000000",
-                        "PermissionSetAssignments": None,
                     }
                 ],
             },
@@ -547,6 +632,13 @@ class TestCreatePermissionSet:
                 ],
             },
         )
+        add_existing_assignments_response(
+            task,
+            PERMISSION_SET_ASSIGNMENT,
+            ["005000000000000"],
+            ["0PS000000000000"],
+            [],
+        )
         responses.add(
             method="POST",
             url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/composite/sobjects",
@@ -558,7 +650,7 @@ class TestCreatePermissionSet:
 
         task()
 
-        assert len(responses.calls) == 3
+        assert len(responses.calls) == 4
         # Verify that the SOQL query does NOT contain the namespace prefix
         assert "testns__" not in responses.calls[1].request.url
         assert "PermSet1" in responses.calls[1].request.url
@@ -592,7 +684,7 @@ class TestCreatePermissionSet:
 
         responses.add(
             method="GET",
-            url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/query/?q=SELECT+Id%2C%28SELECT+PermissionSetId+FROM+PermissionSetAssignments%29+FROM+User+WHERE+Username+%3D+%27test-cci%40example.com%27",
+            url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/query/?q=SELECT+Id+FROM+User+WHERE+Username+%3D+%27test-cci%40example.com%27",
             status=200,
             json={
                 "done": True,
@@ -600,7 +692,6 @@ class TestCreatePermissionSet:
                 "records": [
                     {
                         "Id": "005000000000000",
-                        "PermissionSetAssignments": None,
                     }
                 ],
             },
@@ -621,6 +712,13 @@ class TestCreatePermissionSet:
                 ],
             },
         )
+        add_existing_assignments_response(
+            task,
+            PERMISSION_SET_ASSIGNMENT,
+            ["005000000000000"],
+            ["0PS000000000000"],
+            [],
+        )
         responses.add(
             method="POST",
             url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/composite/sobjects",
@@ -632,7 +730,7 @@ class TestCreatePermissionSet:
 
         task()
 
-        assert len(responses.calls) == 3
+        assert len(responses.calls) == 4
         # Verify that the SOQL query contains the namespaced permission set name
         assert "PermSet1" in responses.calls[1].request.url
 
@@ -649,7 +747,7 @@ class TestCreatePermissionSetLicense:
 
         responses.add(
             method="GET",
-            url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/query/?q=SELECT+Id%2C%28SELECT+PermissionSetLicenseId+FROM+PermissionSetLicenseAssignments%29+FROM+User+WHERE+Username+%3D+%27test-cci%40example.com%27",
+            url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/query/?q=SELECT+Id+FROM+User+WHERE+Username+%3D+%27test-cci%40example.com%27",
             status=200,
             json={
                 "done": True,
@@ -657,11 +755,6 @@ class TestCreatePermissionSetLicense:
                 "records": [
                     {
                         "Id": "005000000000000",
-                        "PermissionSetLicenseAssignments": {
-                            "done": True,
-                            "totalSize": 1,
-                            "records": [{"PermissionSetLicenseId": "0PL000000000000"}],
-                        },
                     }
                 ],
             },
@@ -687,6 +780,13 @@ class TestCreatePermissionSetLicense:
                 ],
             },
         )
+        add_existing_assignments_response(
+            task,
+            PERMISSION_SET_LICENSE_ASSIGNMENT,
+            ["005000000000000"],
+            ["0PL000000000000", "0PL000000000001"],
+            [("005000000000000", "0PL000000000000")],
+        )
         responses.add(
             method="POST",
             url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/composite/sobjects",
@@ -710,7 +810,7 @@ class TestCreatePermissionSetLicense:
 
         task()
 
-        assert len(responses.calls) == 3
+        assert len(responses.calls) == 4
 
     @responses.activate
     def test_create_permsetlicense__no_assignments(self):
@@ -723,7 +823,7 @@ class TestCreatePermissionSetLicense:
 
         responses.add(
             method="GET",
-            url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/query/?q=SELECT+Id%2C%28SELECT+PermissionSetLicenseId+FROM+PermissionSetLicenseAssignments%29+FROM+User+WHERE+Username+%3D+%27test-cci%40example.com%27",
+            url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/query/?q=SELECT+Id+FROM+User+WHERE+Username+%3D+%27test-cci%40example.com%27",
             status=200,
             json={
                 "done": True,
@@ -731,8 +831,6 @@ class TestCreatePermissionSetLicense:
                 "records": [
                     {
                         "Id": "005000000000000",
-                        # This seems like a bug: the PermissionSetLicenseAssignments sub-query returns None if no PSLs are already assigned instead of returning an "empty list".
-                        "PermissionSetLicenseAssignments": None,
                     }
                 ],
             },
@@ -759,6 +857,13 @@ class TestCreatePermissionSetLicense:
             },
         )
 
+        add_existing_assignments_response(
+            task,
+            PERMISSION_SET_LICENSE_ASSIGNMENT,
+            ["005000000000000"],
+            ["0PL000000000000", "0PL000000000001"],
+            [],
+        )
         responses.add(
             method="POST",
             url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/composite/sobjects",
@@ -789,7 +894,7 @@ class TestCreatePermissionSetLicense:
         )
         task()
 
-        assert len(responses.calls) == 3
+        assert len(responses.calls) == 4
 
     @responses.activate
     def test_create_permsetlicense__alias(self):
@@ -803,7 +908,7 @@ class TestCreatePermissionSetLicense:
 
         responses.add(
             method="GET",
-            url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/query/?q=SELECT+Id%2C%28SELECT+PermissionSetLicenseId+FROM+PermissionSetLicenseAssignments%29+FROM+User+WHERE+Alias+IN+%28%27test%27%29",
+            url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/query/?q=SELECT+Id+FROM+User+WHERE+Alias+IN+%28%27test%27%29",
             status=200,
             json={
                 "done": True,
@@ -811,11 +916,6 @@ class TestCreatePermissionSetLicense:
                 "records": [
                     {
                         "Id": "005000000000000",
-                        "PermissionSetLicenseAssignments": {
-                            "done": True,
-                            "totalSize": 1,
-                            "records": [{"PermissionSetLicenseId": "0PL000000000000"}],
-                        },
                     }
                 ],
             },
@@ -842,6 +942,13 @@ class TestCreatePermissionSetLicense:
             },
         )
 
+        add_existing_assignments_response(
+            task,
+            PERMISSION_SET_LICENSE_ASSIGNMENT,
+            ["005000000000000"],
+            ["0PL000000000000", "0PL000000000001"],
+            [("005000000000000", "0PL000000000000")],
+        )
         responses.add(
             method="POST",
             url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/sobjects/PermissionSetLicenseAssign/",
@@ -871,7 +978,7 @@ class TestCreatePermissionSetLicense:
         )
         task()
 
-        assert len(responses.calls) == 3
+        assert len(responses.calls) == 4
 
     @responses.activate
     def test_create_permsetlicense__alias_raises(self):
@@ -885,7 +992,7 @@ class TestCreatePermissionSetLicense:
 
         responses.add(
             method="GET",
-            url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/query/?q=SELECT+Id%2C%28SELECT+PermissionSetLicenseId+FROM+PermissionSetLicenseAssignments%29+FROM+User+WHERE+Alias+IN+%28%27test%27%29",
+            url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/query/?q=SELECT+Id+FROM+User+WHERE+Alias+IN+%28%27test%27%29",
             status=200,
             json={
                 "done": True,
@@ -907,7 +1014,7 @@ class TestCreatePermissionSetLicense:
 
         responses.add(
             method="GET",
-            url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/query/?q=SELECT+Id%2C%28SELECT+PermissionSetLicenseId+FROM+PermissionSetLicenseAssignments%29+FROM+User+WHERE+Username+%3D+%27test-cci%40example.com%27",
+            url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/query/?q=SELECT+Id+FROM+User+WHERE+Username+%3D+%27test-cci%40example.com%27",
             status=200,
             json={
                 "done": True,
@@ -915,11 +1022,6 @@ class TestCreatePermissionSetLicense:
                 "records": [
                     {
                         "Id": "005000000000000",
-                        "PermissionSetLicenseAssignments": {
-                            "done": True,
-                            "totalSize": 1,
-                            "records": [{"PermissionSetLicenseId": "0PL000000000000"}],
-                        },
                     }
                 ],
             },
@@ -961,7 +1063,7 @@ class TestCreatePermissionSetGroup:
 
         responses.add(
             method="GET",
-            url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/query/?q=SELECT+Id%2C%28SELECT+PermissionSetGroupId+FROM+PermissionSetAssignments%29+FROM+User+WHERE+Username+%3D+%27test-cci%40example.com%27",
+            url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/query/?q=SELECT+Id+FROM+User+WHERE+Username+%3D+%27test-cci%40example.com%27",
             status=200,
             json={
                 "done": True,
@@ -969,11 +1071,6 @@ class TestCreatePermissionSetGroup:
                 "records": [
                     {
                         "Id": "005000000000000",
-                        "PermissionSetAssignments": {
-                            "done": True,
-                            "totalSize": 1,
-                            "records": [{"PermissionSetGroupId": "0PG000000000000"}],
-                        },
                     }
                 ],
             },
@@ -999,6 +1096,13 @@ class TestCreatePermissionSetGroup:
                 ],
             },
         )
+        add_existing_assignments_response(
+            task,
+            PERMISSION_SET_GROUP_ASSIGNMENT,
+            ["005000000000000"],
+            ["0PG000000000000", "0PG000000000001"],
+            [("005000000000000", "0PG000000000000")],
+        )
         responses.add(
             method="POST",
             url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/composite/sobjects",
@@ -1022,7 +1126,7 @@ class TestCreatePermissionSetGroup:
 
         task()
 
-        assert len(responses.calls) == 3
+        assert len(responses.calls) == 4
 
     @responses.activate
     def test_create_permsetgroup__alias(self):
@@ -1036,7 +1140,7 @@ class TestCreatePermissionSetGroup:
 
         responses.add(
             method="GET",
-            url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/query/?q=SELECT+Id%2C%28SELECT+PermissionSetGroupId+FROM+PermissionSetAssignments%29+FROM+User+WHERE+Alias+IN+%28%27test%27%29",
+            url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/query/?q=SELECT+Id+FROM+User+WHERE+Alias+IN+%28%27test%27%29",
             status=200,
             json={
                 "done": True,
@@ -1044,11 +1148,6 @@ class TestCreatePermissionSetGroup:
                 "records": [
                     {
                         "Id": "005000000000000",
-                        "PermissionSetAssignments": {
-                            "done": True,
-                            "totalSize": 1,
-                            "records": [{"PermissionSetGroupId": "0PG000000000000"}],
-                        },
                     }
                 ],
             },
@@ -1074,6 +1173,13 @@ class TestCreatePermissionSetGroup:
                 ],
             },
         )
+        add_existing_assignments_response(
+            task,
+            PERMISSION_SET_GROUP_ASSIGNMENT,
+            ["005000000000000"],
+            ["0PG000000000000", "0PG000000000001"],
+            [("005000000000000", "0PG000000000000")],
+        )
         responses.add(
             method="POST",
             url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/composite/sobjects",
@@ -1097,7 +1203,7 @@ class TestCreatePermissionSetGroup:
 
         task()
 
-        assert len(responses.calls) == 3
+        assert len(responses.calls) == 4
 
     @responses.activate
     def test_create_permsetgroup__alias_raises(self):
@@ -1111,7 +1217,7 @@ class TestCreatePermissionSetGroup:
 
         responses.add(
             method="GET",
-            url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/query/?q=SELECT+Id%2C%28SELECT+PermissionSetGroupId+FROM+PermissionSetAssignments%29+FROM+User+WHERE+Alias+IN+%28%27test%27%29",
+            url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/query/?q=SELECT+Id+FROM+User+WHERE+Alias+IN+%28%27test%27%29",
             status=200,
             json={
                 "done": True,
@@ -1133,7 +1239,7 @@ class TestCreatePermissionSetGroup:
 
         responses.add(
             method="GET",
-            url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/query/?q=SELECT+Id%2C%28SELECT+PermissionSetGroupId+FROM+PermissionSetAssignments%29+FROM+User+WHERE+Username+%3D+%27test-cci%40example.com%27",
+            url=f"{task.org_config.instance_url}/services/data/v{CURRENT_SF_API_VERSION}/query/?q=SELECT+Id+FROM+User+WHERE+Username+%3D+%27test-cci%40example.com%27",
             status=200,
             json={
                 "done": True,
@@ -1141,11 +1247,6 @@ class TestCreatePermissionSetGroup:
                 "records": [
                     {
                         "Id": "005000000000000",
-                        "PermissionSetAssignments": {
-                            "done": True,
-                            "totalSize": 1,
-                            "records": [{"PermissionSetGroupId": "0PG000000000000"}],
-                        },
                     }
                 ],
             },
@@ -642,7 +642,7 @@ class TestCreatePackageVersion:
             json={"size": 1, "records": [{"Message": "message"}]},
         )
 
-        task.request_id = "08c000000000002AAA"
+        task._pending_requests = ["08c000000000002AAA"]
         with pytest.raises(PackageUploadFailure) as err:
             task._poll_action()
         assert "message" in str(err)
@@ -658,8 +658,126 @@ class TestCreatePackageVersion:
             },
         )
 
-        task.request_id = "08c000000000002AAA"
+        task._pending_requests = ["08c000000000002AAA"]
         task._poll_action()
+        assert not task.poll_complete
+
+    @responses.activate
+    def test_poll_action__several_requests(self, task):
+        responses.add(
+            "GET",
+            f"{self.devhub_base_url}/tooling/query/",
+            json={
+                "size": 2,
+                "records": [
+                    {
+                        "Id": "08c000000000001AAA",
+                        "Status": "Success",
+                        "Package2VersionId": "051000000000001AAA",
+                    },
+                    {"Id": "08c000000000002AAA", "Status": "InProgress"},
+                ],
+            },
+        )
+
+        task._pending_requests = ["08c000000000001AAA", "08c000000000002AAA"]
+        task._poll_action()
+
+        assert "Id IN ('08c000000000001AAA', '08c000000000002AAA')" in (
+            responses.calls[0].request.params["q"]
+        )
+        assert not task.poll_complete
+        assert task._pending_requests == ["08c000000000002AAA"]
+        assert task._package_version_ids == {"08c000000000001AAA": "051000000000001AAA"}
+
+    def test_convert_project_dependencies__parallel(self, task):
+        task.max_parallel = 4
+        first, second, project = [
+            UnmanagedGitHubRefDependency(
+                github="https://github.com/test/test", ref="abcdef", subfolder=subfolder
+            )
+            for subfolder in ("unpackaged/pre/first", "unpackaged/pre/second", None)
+        ]
+        request_ids = {first: "08c1", second: "08c2", project: "08c3"}
+        requested = {}
+
+        def create_request(dependency, dependencies):
+            requested[dependency] = dependencies
+            return request_ids[dependency]
+
+        def wait(ids):
+            waited.append(ids)
+            return {request_id: f"05i{request_id[3:]}" for request_id in ids}
+
+        waited = []
+        task.tooling = mock.Mock()
+        task.tooling.query.side_effect = lambda query: {
+            "records": [
+                {"SubscriberPackageVersionId": f"04t{query.split('05i')[1][0]}"}
+            ]
+        }
+        with mock.patch.object(
+            task, "_create_unlocked_package_from_unmanaged_dep", create_request
+        ), mock.patch.object(task, "_wait_for_version_requests", wait):
+            result = task._convert_project_dependencies(
+                [
+                    PackageVersionIdDependency(version_id="04t0"),
+                    first,
+                    second,
+                    project,
+                ]
+            )
+
+        assert result == [
+            {"subscriberPackageVersionId": "04t0"},
+            {"subscriberPackageVersionId": "04t1"},
+            {"subscriberPackageVersionId": "04t2"},
+            {"subscriberPackageVersionId": "04t3"},
+        ]
+        # The sibling subfolders are built together, after the packages before them
+        assert waited == [["08c1", "08c2"], ["08c3"]]
+        assert requested[first] == [{"subscriberPackageVersionId": "04t0"}]
+        assert requested[second] == [{"subscriberPackageVersionId": "04t0"}]
+        assert requested[project] == result[:3]
+
+    def test_unpackaged_pre_dependencies__parallel(self, task):
+        task.max_parallel = 4
+        pathlib.Path(
+            task.project_config.repo_root, "unpackaged", "pre", "second"
+        ).mkdir()
+        requested = {}
+
+        def create_request(path, dependencies):
+            requested[path.name] = dependencies
+            return f"08c_{path.name}"
+
+        with mock.patch.object(
+            task, "_create_unlocked_package_from_local", create_request
+        ), mock.patch.object(
+            task,
+            "_build_unlocked_packages",
+            wraps=lambda creates: [f"04t_{create()[4:]}" for create in creates],
+        ) as build:
+            result = task._get_unpackaged_pre_dependencies(
+                [{"subscriberPackageVersionId": "04t0"}]
+            )
+
+        build.assert_called_once()
+        assert requested == {
+            "first": [{"subscriberPackageVersionId": "04t0"}],
+            "second": [{"subscriberPackageVersionId": "04t0"}],
+        }
+        assert result == [
+            {"subscriberPackageVersionId": "04t0"},
+            {"subscriberPackageVersionId": "04t_first"},
+            {"subscriberPackageVersionId": "04t_second"},
+        ]
+
+    def test_max_parallel__invalid(self, get_task):
+        with pytest.raises(TaskOptionsError):
+            get_task(
+                {"package_type": "Managed", "package_name": "Foo", "max_parallel": 0}
+            )
 
     @responses.activate
     def test_get_base_version_number__fallback(self, task):
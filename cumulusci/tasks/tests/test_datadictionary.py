@@ -750,6 +750,32 @@ class TestGenerateDataDictionary:
             ]
         }
 
+    def test_parse_object__keeps_only_needed_elements(self):
+        xml_source = b"""<?xml version="1.0" encoding="UTF-8"?>
+<CustomObject xmlns="http://soap.sforce.com/2006/04/metadata">
+    <description>Description</description>
+    <fields>
+        <fullName>Type__c</fullName>
+        <label>Type</label>
+        <type>Text</type>
+        <length>128</length>
+    </fields>
+    <label>Test Object</label>
+    <listViews>
+        <fullName>All</fullName>
+        <filterScope>Everything</filterScope>
+    </listViews>
+    <visibility>Public</visibility>
+</CustomObject>"""
+        task = create_task(GenerateDataDictionary, {})
+
+        element = task._parse_object(xml_source)
+
+        assert element.find("listViews") is None
+        assert element.label.text == "Test Object"
+        assert element.fields.length.text == "128"
+        assert element.visibility.text == "Public"
+
     def test_process_object_element__missing_description(self):
         xml_source = """<?xml version="1.0" encoding="UTF-8"?>
 <CustomObject xmlns="http://soap.sforce.com/2006/04/metadata">
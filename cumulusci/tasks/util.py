@@ -117,26 +117,23 @@ class Delete(BaseTask):
         )
 
     def _run_task(self):
+        # Paths are resolved relative to chdir rather than by changing to it,
+        # since the working directory is shared with any other threads
         chdir = self.parsed_options.chdir
-        cwd = os.getcwd()
         if chdir:
-            self.logger.info("Changing directory to {}".format(chdir))
-            os.chdir(chdir)
+            self.logger.info("Deleting paths relative to {}".format(chdir))
 
         path = self.parsed_options.path
         if not isinstance(path, list):
             path = [path]
         for path_item in path:
-            matches = glob.glob(path_item)
+            matches = glob.glob(path_item, root_dir=chdir)
             if matches:
                 for match in matches:
-                    self._delete(match)
+                    self._delete(os.path.join(chdir or "", match))
             else:
                 self.logger.info("{} does not exist, skipping delete".format(path))
 
-        if chdir:
-            os.chdir(cwd)
-
     def _delete(self, path):
         if os.path.isdir(path):
             self.logger.info("Recursively deleting directory {}".format(path))
@@ -1079,6 +1079,28 @@ Options\n------------------------------------------\n\n
         with utils.cd(None):
             assert cwd == os.getcwd()
 
+    def test_cd__same_directory(self):
+        cwd = os.getcwd()
+        with mock.patch("os.chdir") as chdir, utils.cd(cwd):
+            chdir.assert_not_called()
+
+    def test_pinned_cwd(self):
+        cwd = os.getcwd()
+        with utils.temporary_dir(chdir=False) as path:
+            with utils.pinned_cwd(path):
+                assert os.path.realpath(os.getcwd()) == os.path.realpath(path)
+                with utils.cd(path):
+                    pass
+                with pytest.raises(CumulusCIException, match="in parallel"):
+                    with utils.cd(cwd):
+                        pass
+                with pytest.raises(CumulusCIException, match="in parallel"):
+                    with utils.temporary_dir():
+                        pass
+            assert os.getcwd() == cwd
+            with utils.cd(path):
+                pass
+
     def test_in_directory(self):
         cwd = os.getcwd()
         assert utils.in_directory(".", cwd)
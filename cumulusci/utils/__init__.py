@@ -1,5 +1,6 @@
 import contextlib
 import fnmatch
+import functools
 import io
 import math
 import os
@@ -8,17 +9,18 @@ import shutil
 import sys
 import tempfile
 import textwrap
+import threading
 import zipfile
-import functools
 from datetime import datetime
 from pathlib import Path
-from typing import Union, Optional
+from typing import Optional, Union
 
 import requests
 import sarge
 
-from cumulusci.vcs.models import AbstractRepo
 from cumulusci.core.exceptions import CumulusCIException
+from cumulusci.vcs.models import AbstractRepo
+
 from .xml import (  # noqa
     elementtree_parse_file,
     remove_xml_element,
@@ -719,6 +721,11 @@ def package_xml_from_dict(items, api_version, package_name=None):
     return "\n".join(lines)
 
 
+# How many pinned_cwd() blocks are running jobs in threads
+_pinned_cwd_count = 0
+_pinned_cwd_lock = threading.Lock()
+
+
 @contextlib.contextmanager
 def cd(path):
     """Context manager that changes to another directory"""
@@ -726,6 +733,14 @@ def cd(path):
         yield
         return
     cwd = os.getcwd()
+    if os.path.realpath(path) == os.path.realpath(cwd):
+        yield
+        return
+    if _pinned_cwd_count:
+        raise CumulusCIException(
+            f"Cannot change directory to {path} while jobs run in parallel, "
+            "because they share the working directory."
+        )
     os.chdir(path)
     try:
         yield
@@ -733,6 +748,22 @@ def cd(path):
         os.chdir(cwd)
 
 
+@contextlib.contextmanager
+def pinned_cwd(path=None):
+    """Context manager for running jobs in threads from `path` (by default,
+    the current directory). The working directory is shared by all
+    threads, so until it exits cd() refuses to change it."""
+    global _pinned_cwd_count
+    with cd(path):
+        with _pinned_cwd_lock:
+            _pinned_cwd_count += 1
+        try:
+            yield
+        finally:
+            with _pinned_cwd_lock:
+                _pinned_cwd_count -= 1
+
+
 @contextlib.contextmanager
 def temporary_dir(chdir=True):
     """Context manager that creates a temporary directory and chdirs to it.
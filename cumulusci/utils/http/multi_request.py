@@ -1,64 +1,206 @@
+import logging
+import random
+import re
+import threading
+import time
 import typing as T
-from concurrent.futures import as_completed
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
 from itertools import chain
 
+import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import ReadTimeout
-from requests_futures.sessions import FuturesSession
 
 from cumulusci.utils.iterators import iterate_in_chunks, partition
 
+logger = logging.getLogger(__name__)
+
 RECOVERABLE_ERRORS = (ReadTimeout, ConnectionError)
 
+# Salesforce answers these when a client sends too much at once.
+THROTTLING_STATUS_CODES = (429, 503)
+MAX_THROTTLING_RETRIES = 4
+BACKOFF_BASE_SECONDS = 1
+BACKOFF_MAX_SECONDS = 30
+# Above this fraction of the org's daily API allowance we warn and stop
+# ramping up. Backing off would not help: the allowance is daily.
+API_USAGE_THRESHOLD = 0.9
+
+LIMIT_INFO_RE = re.compile(r"api-usage=(\d+)/(\d+)")
+
 
 class HTTPRequestError(T.NamedTuple):
     exception: Exception
     request: dict
 
 
+class AdaptiveConcurrencyLimiter:
+    """Bounds the number of requests in flight, adapting to server feedback.
+
+    The limit is halved whenever Salesforce throttles us (HTTP 429/503) and
+    grows back by one request per successful response. Once the
+    ``Sforce-Limit-Info`` header reports that the org is close to its daily
+    API allowance, a warning is logged and the limit stops growing.
+    """
+
+    def __init__(self, max_concurrency: int, min_concurrency: int = 1):
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min(min_concurrency, max_concurrency)
+        self.limit = max_concurrency
+        self.in_flight = 0
+        self._condition = threading.Condition()
+        self._warned_api_usage = False
+
+    @contextmanager
+    def slot(self):
+        with self._condition:
+            self._condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self.in_flight -= 1
+                self._condition.notify_all()
+
+    def record_response(self, response: requests.Response):
+        if response.status_code in THROTTLING_STATUS_CODES:
+            self._decrease()
+            return
+
+        usage = parse_api_usage(response.headers.get("Sforce-Limit-Info", ""))
+        if usage is not None and usage > API_USAGE_THRESHOLD:
+            self._warn_api_usage(usage)
+        else:
+            self._increase()
+
+    def _warn_api_usage(self, usage: float):
+        with self._condition:
+            if self._warned_api_usage:
+                return
+            self._warned_api_usage = True
+        logger.warning(
+            f"The org has used {usage:.0%} of its daily API request allowance."
+        )
+
+    def _decrease(self):
+        with self._condition:
+            self.limit = max(self.min_concurrency, self.limit // 2)
+
+    def _increase(self):
+        with self._condition:
+            if self.limit < self.max_concurrency:
+                self.limit += 1
+                self._condition.notify_all()
+
+
+def parse_api_usage(limit_info: str) -> T.Optional[float]:
+    """Fraction of the API allowance used, from a Sforce-Limit-Info header"""
+    match = LIMIT_INFO_RE.search(limit_info or "")
+    if not match:
+        return None
+    used, allowed = (int(value) for value in match.groups())
+    return used / allowed if allowed else None
+
+
+def backoff_delay(attempt: int, retry_after: T.Optional[str] = None) -> float:
+    """Seconds to wait before retry number `attempt` (starting at 0).
+
+    Honors a numeric Retry-After header, otherwise uses capped exponential
+    backoff with jitter so that parallel retries don't arrive together."""
+    if retry_after and retry_after.isdigit():
+        return min(float(retry_after), BACKOFF_MAX_SECONDS)
+    delay = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2**attempt)
+    return delay * random.uniform(0.5, 1.5)
+
+
 class ParallelHTTP:
-    """A parallelized HTTP client as a context manager"""
+    """A parallelized HTTP client as a context manager
+
+    Requests share one keep-alive connection pool sized to `max_workers`.
+    Concurrency adapts to throttling responses, and throttled requests are
+    retried with jittered backoff in their worker thread, so retries of
+    different requests proceed in parallel."""
 
     def __init__(self, base_url, max_workers=32):
         self.base_url = base_url
         self.max_workers = max_workers
 
     def __enter__(self, *args):
-        self.session = FuturesSession(max_workers=self.max_workers)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.max_workers, pool_maxsize=self.max_workers
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        self.limiter = AdaptiveConcurrencyLimiter(self.max_workers)
         return self
 
     def __exit__(self, *args):
+        self.executor.shutdown(wait=True)
         self.session.close()
 
     def _async_request(
         self, url: str, method: str, json: object = None, httpHeaders: dict = None
-    ):
+    ) -> Future:
         "Make an async HTTP request and return a future"
         headers = {**(httpHeaders or {}), "Accept-Encoding": "gzip"}
-        return self.session.request(
+        return self.executor.submit(
+            self._send,
             method=method,
             url=self.base_url + url.lstrip("/"),
             headers=headers,
             json=json,
-            timeout=30,
         )
 
+    def _send(self, **request_kwargs) -> requests.Response:
+        "Runs in a worker thread"
+        attempt = 0
+        while True:
+            with self.limiter.slot():
+                response = self.session.request(timeout=30, **request_kwargs)
+            self.limiter.record_response(response)
+            if (
+                response.status_code not in THROTTLING_STATUS_CODES
+                or attempt >= MAX_THROTTLING_RETRIES
+            ):
+                return response
+            time.sleep(backoff_delay(attempt, response.headers.get("Retry-After")))
+            attempt += 1
+
+    def iter_requests(
+        self, requests: T.Iterable[T.Dict]
+    ) -> T.Iterator[T.Union[requests.Response, HTTPRequestError]]:
+        """Initiate requests and yield each response (or HTTPRequestError)
+        as soon as it completes."""
+        futures_to_requests = {
+            self._async_request(**request): request for request in requests
+        }
+        for future, request in iter_completed(futures_to_requests):
+            yield future_with_exception_handling(future, {future: request})
+
     def do_requests(self, requests: T.Iterable[T.Dict]):
         """Initiate requests and wait for them to complete.
 
         Returns a tuple with a sequence of successes and a sequence of failures.
         """
+        successes, errors = collate_results(self.iter_requests(requests))
 
-        futures_to_requests = {
-            self._async_request(**request): request for request in requests
-        }
+        return successes, errors
 
-        results = (
-            future_with_exception_handling(future, futures_to_requests)
-            for future in as_completed(futures_to_requests.keys())
-        )
-        successes, errors = collate_results(results)
 
-        return successes, errors
+def iter_completed(
+    futures_to_requests: T.Dict[Future, T.Any]
+) -> T.Iterator[T.Tuple[Future, T.Any]]:
+    """Yield (future, request) pairs as they complete.
+
+    The mapping may be extended while iterating, e.g. to add retries."""
+    while futures_to_requests:
+        done, _ = wait(futures_to_requests.keys(), return_when=FIRST_COMPLETED)
+        for future in done:
+            yield future, futures_to_requests.pop(future)
 
 
 def future_with_exception_handling(future, futures_to_requests):
@@ -111,6 +253,14 @@ def parse_composite_results(composite_results):
     return individual_results
 
 
+def response_to_dict(response):
+    return {
+        "httpStatusCode": response.status_code,
+        "body": response.json(),
+        "httpHeaders": response.headers,
+    }
+
+
 IDEMPOTENT_METHODS = ("GET", "PUT")
 
 
@@ -145,53 +295,82 @@ class CompositeParallelSalesforce:
     def do_composite_requests(
         self, requests
     ) -> T.Tuple[T.Sequence, T.Sequence]:  # results, errors
+        errors, individual_results = partition(
+            lambda r: not isinstance(r, HTTPRequestError),
+            self.iter_composite_requests(requests),
+        )
+        individual_results = list(individual_results)
+        return individual_results, list(errors)
+
+    def iter_composite_requests(
+        self, requests
+    ) -> T.Iterator[T.Union[dict, HTTPRequestError]]:
+        """Yield individual subrequest results as their composite request
+        completes, rather than waiting for all of them.
+
+        When a composite request fails with a recoverable error, its
+        idempotent subrequests are immediately resent one by one alongside
+        the remaining composite requests. Anything that cannot be
+        recovered is yielded as an HTTPRequestError."""
         if not self.psf:
             raise AssertionError(
                 "Session was not opened. Please call open() or use as a context manager"
             )
 
         composite_requests = create_composite_requests(requests, self.chunk_size)
-        composite_results, errors = self.psf.do_requests(composite_requests)
-        individual_results = parse_composite_results(composite_results)
+        pending = {
+            self.psf._async_request(**request): (request, False)
+            for request in composite_requests
+        }
 
-        errors = list(errors)
-        if errors:
-            singleton_results, unrecoverable_errors = self.retry_errors(errors)
-        else:
-            singleton_results = []
-            unrecoverable_errors = []
+        for future, (request, is_retry) in iter_completed(pending):
+            try:
+                response = future.result()
+                if not is_retry:
+                    response.raise_for_status()
+            except Exception as e:
+                error = HTTPRequestError(e, request)
+                if is_retry:
+                    yield error
+                    continue
+                retries, unrecoverable_errors = self.plan_retries(error)
+                yield from unrecoverable_errors
+                for retry in retries:
+                    pending[self.psf._async_request(**retry)] = (retry, True)
+                continue
+
+            if is_retry:
+                yield response_to_dict(response)
+            else:
+                yield from response.json()["compositeResponse"]
 
-        individual_results = list(individual_results)
+    def plan_retries(
+        self, error: HTTPRequestError
+    ) -> T.Tuple[T.List[dict], T.List[HTTPRequestError]]:
+        "Split a failed composite request into retryable singletons and errors"
+        if not isinstance(error.exception, RECOVERABLE_ERRORS):
+            return [], [error]
 
-        individual_results += list(singleton_results)
-        return individual_results, unrecoverable_errors
+        singleton_requests = []
+        unrecoverable_errors = []
+        for request in split_requests(error.request):
+            if request["method"] in IDEMPOTENT_METHODS:
+                singleton_requests.append(request)
+            else:
+                unrecoverable_errors.append(HTTPRequestError(error.exception, request))
+        return singleton_requests, unrecoverable_errors
 
     def retry_errors(self, errors: T.List[HTTPRequestError]):
         "Retry all composite requests that had errors."
         unrecoverable_errors = []
         singleton_requests = []
         for error in errors:
-            if isinstance(error.exception, RECOVERABLE_ERRORS):
-                single_requests = split_requests(error.request)
-                for request in single_requests:
-                    if request["method"] in IDEMPOTENT_METHODS:
-                        singleton_requests.append(request)
-                    else:
-                        unrecoverable_errors.append(
-                            HTTPRequestError(error.exception, request)
-                        )
-            else:
-                unrecoverable_errors.append(error)
+            retries, unrecoverable = self.plan_retries(error)
+            singleton_requests.extend(retries)
+            unrecoverable_errors.extend(unrecoverable)
 
         singleton_results, errors = self.psf.do_requests(singleton_requests)
 
-        def response_to_dict(response):
-            return {
-                "httpStatusCode": response.status_code,
-                "body": response.json(),
-                "httpHeaders": response.headers,
-            }
-
         singleton_results = [
             response_to_dict(response) for response in singleton_results
         ]
@@ -0,0 +1,82 @@
+import math
+import os
+import typing as T
+from base64 import b64encode
+
+
+class FilePart(T.NamedTuple):
+    """A binary file to include in a StreamingBody, optionally base64 encoded"""
+
+    file: T.IO[bytes]
+    base64: bool = False
+
+    def __len__(self) -> int:
+        size = self.file.seek(0, os.SEEK_END)
+        return 4 * math.ceil(size / 3) if self.base64 else size
+
+
+class StreamingBody:
+    """A request body assembled from byte strings and binary files.
+
+    The files are read (and base64 encoded, if requested) a chunk at a time
+    while the request is being sent, so they never need to be held in memory
+    in full. The length is known up front, so `requests` sends a
+    Content-Length header rather than a chunked body, and the body can be
+    rewound with seek(0) if it needs to be sent again.
+    """
+
+    # A multiple of 3, so that base64 encoded chunks can be concatenated
+    chunk_size = 3 * 256 * 1024
+
+    def __init__(self, *parts: T.Union[bytes, FilePart]):
+        self.parts = parts
+        self.seek(0)
+
+    def __len__(self) -> int:
+        return sum(len(part) for part in self.parts)
+
+    def __iter__(self) -> T.Iterator[bytes]:
+        while chunk := self.read(self.chunk_size):
+            yield chunk
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if (offset, whence) != (0, os.SEEK_SET):
+            raise ValueError("A StreamingBody can only be rewound to the start")
+        self._chunks = self._iter_chunks()
+        self._chunk = b""
+        self._offset = 0  # how much of self._chunk has been read
+        self._position = 0
+        return 0
+
+    def read(self, size: int = -1) -> bytes:
+        pieces = []
+        remaining = size
+        while size < 0 or remaining > 0:
+            if self._offset >= len(self._chunk):
+                self._chunk = next(self._chunks, None)
+                self._offset = 0
+                if self._chunk is None:
+                    self._chunk = b""
+                    break
+            end = len(self._chunk)
+            if size >= 0:
+                end = min(end, self._offset + remaining)
+                remaining -= end - self._offset
+            pieces.append(self._chunk[self._offset : end])
+            self._offset = end
+
+        data = b"".join(pieces)
+        self._position += len(data)
+        return data
+
+    def _iter_chunks(self) -> T.Iterator[bytes]:
+        for part in self.parts:
+            if isinstance(part, bytes):
+                yield part
+                continue
+            part.file.seek(0)
+            while chunk := part.file.read(self.chunk_size):
+                yield b64encode(chunk) if part.base64 else chunk
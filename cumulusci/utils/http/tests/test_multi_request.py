@@ -1,8 +1,15 @@
+from unittest import mock
+
 import pytest
 import responses
 
 from cumulusci.tests.util import FakeUnreliableRequestHandler
-from cumulusci.utils.http.multi_request import CompositeParallelSalesforce
+from cumulusci.utils.http.multi_request import (
+    AdaptiveConcurrencyLimiter,
+    CompositeParallelSalesforce,
+    backoff_delay,
+    parse_api_usage,
+)
 
 COMPOSITE_RESPONSE = {
     "compositeResponse": [
@@ -253,3 +260,127 @@ class TestCompositeParallelSalesforce:
         # The POST should not.
         assert len(errors) == 1, str(errors)
         assert single_request_handler.counter == 1
+
+    @responses.activate
+    def test_throttled_composite_is_retried(self, sf):
+        requests = [
+            {
+                "method": "GET",
+                "url": "/services/data/v50.0/limits",
+                "referenceId": "one",
+            }
+        ]
+        responses.add(
+            responses.POST,
+            f"{sf.base_url}composite",
+            status=429,
+            headers={"Retry-After": "2"},
+        )
+        responses.add(
+            responses.POST, f"{sf.base_url}composite", json=COMPOSITE_RESPONSE
+        )
+
+        with mock.patch("time.sleep") as sleep:
+            with CompositeParallelSalesforce(sf, 2, max_workers=1) as cpsf:
+                results, errors = cpsf.do_composite_requests(requests)
+
+        sleep.assert_called_once_with(2.0)
+        assert errors == []
+        assert len(results) == 2
+
+    @responses.activate
+    def test_non_200_composite_is_an_error(self, sf):
+        requests = [
+            {
+                "method": "GET",
+                "url": "/services/data/v50.0/limits",
+                "referenceId": "one",
+            }
+        ]
+        responses.add(responses.POST, f"{sf.base_url}composite", status=400, json=[])
+
+        with CompositeParallelSalesforce(sf, 2, max_workers=1) as cpsf:
+            results, errors = cpsf.do_composite_requests(requests)
+
+        assert results == []
+        assert len(errors) == 1
+
+    @responses.activate
+    def test_iter_composite_requests(self, sf):
+        requests = [
+            {
+                "method": "GET",
+                "url": "/services/data/v50.0/limits",
+                "referenceId": "one",
+            }
+        ] * 4
+        responses.add(
+            responses.POST, f"{sf.base_url}composite", json=COMPOSITE_RESPONSE
+        )
+
+        with CompositeParallelSalesforce(sf, 2, max_workers=2) as cpsf:
+            results = cpsf.iter_composite_requests(requests)
+            first = next(results)
+            assert first["httpStatusCode"] == 200
+            assert len(list(results)) == 3
+
+
+class TestAdaptiveConcurrencyLimiter:
+    def response(self, status_code=200, limit_info=None):
+        response = mock.Mock(status_code=status_code, headers={})
+        if limit_info:
+            response.headers["Sforce-Limit-Info"] = limit_info
+        return response
+
+    def test_throttling_halves_limit(self):
+        limiter = AdaptiveConcurrencyLimiter(8)
+        limiter.record_response(self.response(429))
+        assert limiter.limit == 4
+        limiter.record_response(self.response(503))
+        assert limiter.limit == 2
+
+    def test_limit_has_a_floor(self):
+        limiter = AdaptiveConcurrencyLimiter(2)
+        for _ in range(3):
+            limiter.record_response(self.response(429))
+        assert limiter.limit == 1
+
+    def test_success_increases_limit_to_max(self):
+        limiter = AdaptiveConcurrencyLimiter(4)
+        limiter.limit = 2
+        limiter.record_response(self.response())
+        assert limiter.limit == 3
+        limiter.record_response(self.response())
+        limiter.record_response(self.response())
+        assert limiter.limit == 4
+
+    def test_api_usage_near_limit_warns_once(self, caplog):
+        limiter = AdaptiveConcurrencyLimiter(4)
+        limiter.limit = 2
+        limiter.record_response(self.response(limit_info="api-usage=95/100"))
+        limiter.record_response(self.response(limit_info="api-usage=96/100"))
+        assert limiter.limit == 2
+        assert [record.getMessage() for record in caplog.records] == [
+            "The org has used 95% of its daily API request allowance."
+        ]
+        limiter.record_response(self.response(limit_info="api-usage=10/100"))
+        assert limiter.limit == 3
+
+    def test_slot_tracks_in_flight(self):
+        limiter = AdaptiveConcurrencyLimiter(2)
+        with limiter.slot():
+            assert limiter.in_flight == 1
+        assert limiter.in_flight == 0
+
+
+def test_parse_api_usage():
+    assert parse_api_usage("api-usage=25/100") == 0.25
+    assert parse_api_usage("api-usage=1/0") is None
+    assert parse_api_usage("") is None
+
+
+def test_backoff_delay():
+    assert backoff_delay(0, "3") == 3
+    assert backoff_delay(0, "3600") == 30
+    assert 0.5 <= backoff_delay(0) <= 1.5
+    assert backoff_delay(20) <= 45
@@ -0,0 +1,49 @@
+import io
+from base64 import b64encode
+
+import pytest
+import requests
+import responses
+
+from cumulusci.utils.http.streaming_body import FilePart, StreamingBody
+
+CONTENT = bytes(range(256)) * 100
+
+
+class TestStreamingBody:
+    def body(self):
+        body = StreamingBody(
+            b"<zip>", FilePart(io.BytesIO(CONTENT), base64=True), b"</zip>"
+        )
+        body.chunk_size = 300  # force several chunks
+        return body
+
+    def test_read(self):
+        body = self.body()
+        expected = b"<zip>" + b64encode(CONTENT) + b"</zip>"
+        assert len(body) == len(expected)
+        assert b"".join(iter(lambda: body.read(1000), b"")) == expected
+        assert body.tell() == len(expected)
+
+    def test_read__all(self):
+        body = StreamingBody(b"a", FilePart(io.BytesIO(b"bc")), b"", b"d")
+        assert body.read() == b"abcd"
+        assert body.read() == b""
+
+    def test_seek__rewinds(self):
+        body = self.body()
+        first = body.read()
+        assert body.seek(0) == 0
+        assert body.read() == first
+
+    def test_seek__only_to_start(self):
+        with pytest.raises(ValueError):
+            self.body().seek(5)
+
+    @responses.activate
+    def test_sent_with_content_length(self):
+        responses.add(responses.POST, "https://example.com/")
+        requests.post("https://example.com/", data=self.body())
+        request = responses.calls[0].request
+        assert request.headers["Content-Length"] == str(len(self.body()))
+        assert "Transfer-Encoding" not in request.headers
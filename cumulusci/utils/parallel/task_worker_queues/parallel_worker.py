@@ -5,6 +5,7 @@ import typing as T
 from contextlib import contextmanager
 from multiprocessing import Queue
 from pathlib import Path
+from threading import Thread
 from traceback import format_exc
 
 from pydantic.v1 import BaseModel
@@ -200,11 +201,13 @@ class ParallelWorker:
         worker_config: WorkerConfig,
         results_reporter: Queue,
         filesystem_lock,
+        on_exit: T.Optional[T.Callable[["ParallelWorker"], None]] = None,
     ):
         self.spawn_class = spawn_class
         self.worker_config = worker_config
         self.results_reporter = results_reporter
         self.filesystem_lock = filesystem_lock
+        self.on_exit = on_exit
         assert filesystem_lock
 
     def _validate_worker_config_is_simple(self, worker_config):
@@ -224,6 +227,15 @@ class ParallelWorker:
         )
         self.process.start()
 
+        if self.on_exit:
+            # The watcher runs in the controller process, so on_exit may
+            # safely use thread-only primitives like queue.Queue.
+            Thread(target=self._notify_on_exit, daemon=True).start()
+
+    def _notify_on_exit(self):
+        self.process.join()
+        self.on_exit(self)
+
     def is_alive(self) -> bool:
         return self.process.is_alive()
 
@@ -51,7 +51,9 @@ class WorkerQueue:
     dropped into it, they are automatically processed."
 
     The use of file system folders makes the queue's work
-    externally observable.
+    externally observable. The controller also keeps an in-memory
+    record of which jobs are queued, in progress, finished or failed,
+    so that status reports do not need to list the folders.
     """
 
     next_queue = None  # is there another queue in the pipeline?
@@ -70,14 +72,25 @@ class WorkerQueue:
         # race conditions. See PR #3076 for more info.
         filesystem_lock,
         results_reporter: Queue = None,
+        # if supplied, a {"status": "exited", ...} message is put here
+        # by the controller process whenever one of this queue's workers
+        # exits, so the controller can wake up instead of polling.
+        exit_reporter: Queue = None,
     ):
         self.config = queue_config
         # convenience access to names
         self._create_dirs()
         self.workers = []
         self.results_reporter = results_reporter
+        self.exit_reporter = exit_reporter
         self.filesystem_lock = filesystem_lock
 
+        # in-memory view of the job folders, maintained by the controller
+        self._queued_jobs: T.List[str] = []
+        self._inprogress_jobs: T.Dict[ParallelWorker, str] = {}
+        self._outbox_jobs: T.List[str] = []
+        self._failed_jobs: T.List[str] = []
+
     def __getattr__(self, name):
         """Convenience proxy for config values
         note that local values will shadow them."""
@@ -132,35 +145,36 @@ class WorkerQueue:
 
     @property
     def queued_job_dirs(self):
-        return list(self.inbox_dir.iterdir())
+        return [self.inbox_dir / name for name in self._queued_jobs]
 
     @property
     def queued_jobs(self):
-        return [job.name for job in self.queued_job_dirs]
+        return list(self._queued_jobs)
 
     @property
     def inprogress_job_dirs(self):
-        return list(self.inprogress_dir.iterdir())
+        return [self.inprogress_dir / name for name in self.inprogress_jobs]
 
     @property
     def inprogress_jobs(self):
-        return [job.name for job in self.inprogress_job_dirs]
+        return list(self._inprogress_jobs.values())
 
     @property
     def outbox_job_dirs(self):
-        return list(self.outbox_dir.iterdir())
+        return [self.outbox_dir / name for name in self._outbox_jobs]
 
     @property
     def outbox_jobs(self):
-        return [job.name for job in self.outbox_job_dirs]
+        return list(self._outbox_jobs)
 
     @property
     def failed_job_dirs(self):
+        # the failures folder may be shared between queues in a pipeline
         return list(self.failures_dir.iterdir()) if self.failures_dir.exists() else []
 
     @property
     def failed_jobs(self):
-        return [job.name for job in self.failed_job_dirs]
+        return list(self._failed_jobs)
 
     def push(
         self,
@@ -190,6 +204,7 @@ class WorkerQueue:
     def _queue_job(self, job_dir: Path):
         """Enqueue a job"""
         shutil.move(str(job_dir), str(self.inbox_dir))
+        self._queued_jobs.append(job_dir.name)
 
     def _start_job(self, job_dir: Path):
         """Start a job"""
@@ -226,18 +241,53 @@ class WorkerQueue:
             worker_config,
             self.results_reporter,
             self.filesystem_lock,
+            on_exit=self._report_exit if self.exit_reporter else None,
         )
         worker.start()
         self.workers.append(worker)
+        self._inprogress_jobs[worker] = working_dir.name
+
+    def _report_exit(self, worker: ParallelWorker):
+        """Called from a watcher thread when a worker exits"""
+        self.exit_reporter.put(
+            {
+                "status": "exited",
+                "queue": self.name,
+                "directory": str(worker.worker_config.working_dir),
+            }
+        )
+
+    def _job_finished(self, worker: ParallelWorker):
+        """Record where a finished worker's job went.
+
+        Workers move their job to the outbox on success and to the
+        failures folder otherwise."""
+        name = self._inprogress_jobs.pop(worker, None)
+        if name is None:
+            return
+        if (self.outbox_dir / name).exists():
+            if self.next_queue:
+                self.next_queue._queued_jobs.append(name)
+            else:
+                self._outbox_jobs.append(name)
+        else:
+            self._failed_jobs.append(name)
 
     def tick(self):
         """Things are moved from place to place in the 'tick'.
         The tick runs in the parent/controller/original process
         so there are no threading/locking issues."""
-        self.workers = [w for w in self.workers if w.is_alive()]
+        still_running = []
+        for worker in self.workers:
+            if worker.is_alive():
+                still_running.append(worker)
+            else:
+                self._job_finished(worker)
+        self.workers = still_running
 
         for idx, job_dir in zip(range(self.num_free_workers), self.queued_job_dirs):
             logger.info(f"Starting job {job_dir}")
+            self._queued_jobs.remove(job_dir.name)
             self._start_job(job_dir)
         if self.next_queue:
             self.next_queue.tick()
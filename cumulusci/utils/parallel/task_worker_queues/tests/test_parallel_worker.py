@@ -2,6 +2,7 @@ from contextlib import contextmanager
 from logging import getLogger
 from multiprocessing import Lock
 from pathlib import Path
+from queue import Queue
 from tempfile import TemporaryDirectory
 from unittest import mock
 
@@ -293,6 +294,52 @@ class TestWorkerQueue:
             q2.tick()
             assert q2.outbox_jobs == ["foo"]
 
+    def test_worker_queue__tracks_failed_jobs(self, tmpdir):
+        with self.configure_worker_queue(
+            parent_dir=tmpdir,
+            name="start",
+            task_class=Sleep,
+            make_task_options=lambda *args, **kwargs: {"seconds": "not a number"},
+            queue_size=3,
+            num_workers=2,
+        ) as q:
+            q.push(name="a")
+            process = q.workers[0].process
+            with pytest.raises(exc.TaskOptionsError):
+                process._finish()
+            process._is_alive = False
+            q.tick()
+            assert q.failed_jobs == ["a"]
+            assert q.inprogress_jobs == []
+            assert q.outbox_jobs == []
+            assert [d.name for d in q.failed_job_dirs] == ["a"]
+
+    def test_worker_queue__reports_exits(self, tmpdir):
+        exits = Queue()
+        config = WorkerQueueConfig(
+            project_config=dummy_project_config,
+            org_config=dummy_org_config,
+            connected_app=None,
+            redirect_logging=True,
+            spawn_class=WorkerQueue.Thread,
+            parent_dir=Path(tmpdir),
+            name="start",
+            task_class=Sleep,
+            make_task_options=lambda *args, **kwargs: {"seconds": 0},
+            queue_size=3,
+            num_workers=2,
+        )
+        q = WorkerQueue(config, filesystem_lock=Lock(), exit_reporter=exits)
+        q.push(name="a")
+        message = exits.get(timeout=10)
+        assert message["status"] == "exited"
+        assert message["queue"] == "start"
+        assert Path(message["directory"]).name == "a"
+
+        q.tick()
+        assert q.outbox_jobs == ["a"]
+        assert q.empty
+
 
 class TestParallelWorker:
     def test_terminate_parallel_worker(self):
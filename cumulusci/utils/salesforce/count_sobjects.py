@@ -3,7 +3,14 @@ import typing as T
 from simple_salesforce.api import Salesforce
 
 from cumulusci.utils.http.multi_request import CompositeParallelSalesforce
-from cumulusci.utils.iterators import partition
+from cumulusci.utils.iterators import iterate_in_chunks, partition
+
+# COUNT() queries can be slow on big objects, so keep composite calls small.
+COUNT_CHUNK_SIZE = 5
+# LIMIT 1 queries are cheap, so use the largest composite batch.
+EXISTS_CHUNK_SIZE = 25
+# Keep the limits/recordCount query string to a reasonable length.
+RECORD_COUNT_CHUNK_SIZE = 100
 
 
 class ObjectCount(T.NamedTuple):
@@ -12,14 +19,31 @@ class ObjectCount(T.NamedTuple):
     salesforce_errors: T.Sequence[dict]  # e.g. 404, 401
 
 
-def count_sobjects(sf: Salesforce, objs: T.Sequence[str]) -> ObjectCount:
-    """Quickly count SObjects using SOQL and Parallelization"""
-    with CompositeParallelSalesforce(sf, max_workers=8, chunk_size=5) as cpsf:
+def count_sobjects(
+    sf: Salesforce,
+    objs: T.Sequence[str],
+    *,
+    exists_only: bool = False,
+    chunk_size: T.Optional[int] = None,
+) -> ObjectCount:
+    """Quickly count SObjects using SOQL and Parallelization
+
+    With `exists_only`, each object is queried with `LIMIT 1` instead of
+    `COUNT()`, so the "count" is 1 for objects with any records and 0
+    otherwise. That is much cheaper on large objects."""
+    if exists_only:
+        query = "select Id from {} limit 1"
+        chunk_size = chunk_size or EXISTS_CHUNK_SIZE
+    else:
+        query = "select count() from {}"
+        chunk_size = chunk_size or COUNT_CHUNK_SIZE
+
+    with CompositeParallelSalesforce(sf, max_workers=8, chunk_size=chunk_size) as cpsf:
         responses, transport_errors = cpsf.do_composite_requests(
             (
                 {
                     "method": "GET",
-                    "url": f"/services/data/v{sf.sf_version}/query/?q=select count() from {obj}",
+                    "url": f"/services/data/v{sf.sf_version}/query/?q={query.format(obj)}",
                     "referenceId": f"ref{obj}",
                 }
                 for obj in objs
@@ -44,3 +68,36 @@ def count_sobjects(sf: Salesforce, objs: T.Sequence[str]) -> ObjectCount:
         for response in successes
     }
     return ObjectCount(ret, transport_errors, tuple(salesforce_errors))
+
+
+def count_sobjects_from_record_count(
+    sf: Salesforce, objs: T.Sequence[str]
+) -> ObjectCount:
+    """Count SObjects with the REST `limits/recordCount` resource
+
+    One call counts many objects, but the numbers are the approximate
+    figures Salesforce maintains for storage reporting. Objects that
+    Salesforce has no figure for are counted with SOQL instead."""
+    counts = {}
+    transport_errors = []
+    for chunk in iterate_in_chunks(RECORD_COUNT_CHUNK_SIZE, objs):
+        try:
+            response = sf.restful(
+                "limits/recordCount", params={"sObjects": ",".join(chunk)}
+            )
+        except Exception as e:
+            transport_errors.append({"exception": e, "request": chunk})
+            continue
+        for record_count in response.get("sObjects", ()):
+            counts[record_count["name"]] = record_count["count"]
+
+    missing = [obj for obj in objs if obj not in counts]
+    soql_counts, soql_transport_errors, salesforce_errors = (
+        count_sobjects(sf, missing) if missing else ObjectCount({}, (), ())
+    )
+    counts.update(soql_counts)
+    return ObjectCount(
+        counts,
+        tuple(transport_errors) + tuple(soql_transport_errors),
+        salesforce_errors,
+    )
@@ -1,7 +1,15 @@
+import json
+from unittest import mock
+
 import pytest
+import responses
 import vcr
 
-from cumulusci.utils.salesforce.count_sobjects import count_sobjects
+from cumulusci.utils.salesforce.count_sobjects import (
+    ObjectCount,
+    count_sobjects,
+    count_sobjects_from_record_count,
+)
 
 
 class TestCountSObjects:
@@ -27,3 +35,61 @@ class TestCountSObjects:
             _, net_errors, sf_errors = count_sobjects(sf, ["Account", "XYZZY"])
             assert net_errors
             assert not sf_errors
+
+    @responses.activate
+    def test_count_sobjects__exists_only(self, sf):
+        responses.add(
+            responses.POST,
+            f"{sf.base_url}composite",
+            json={
+                "compositeResponse": [
+                    {
+                        "body": {"totalSize": 1, "done": True, "records": []},
+                        "httpHeaders": {},
+                        "httpStatusCode": 200,
+                        "referenceId": "refAccount",
+                    }
+                ]
+            },
+        )
+        results, net_errors, sf_errors = count_sobjects(
+            sf, ["Account"], exists_only=True
+        )
+        assert results == {"Account": 1}
+        subrequest = json.loads(responses.calls[0].request.body)["compositeRequest"][0]
+        assert subrequest["url"].endswith("select Id from Account limit 1")
+
+
+class TestCountSObjectsFromRecordCount:
+    @responses.activate
+    def test_record_count(self, sf):
+        responses.add(
+            responses.GET,
+            f"{sf.base_url}limits/recordCount",
+            json={"sObjects": [{"count": 3, "name": "Account"}]},
+        )
+        with mock.patch(
+            "cumulusci.utils.salesforce.count_sobjects.count_sobjects",
+            return_value=ObjectCount({"Opportunity": 0}, (), ()),
+        ) as soql_count:
+            results, net_errors, sf_errors = count_sobjects_from_record_count(
+                sf, ["Account", "Opportunity"]
+            )
+        assert results == {"Account": 3, "Opportunity": 0}
+        assert "sObjects=Account%2COpportunity" in responses.calls[0].request.url
+        soql_count.assert_called_once_with(sf, ["Opportunity"])
+
+    @responses.activate
+    def test_record_count__errors(self, sf):
+        responses.add(
+            responses.GET, f"{sf.base_url}limits/recordCount", body=ConnectionError()
+        )
+        with mock.patch(
+            "cumulusci.utils.salesforce.count_sobjects.count_sobjects",
+            return_value=ObjectCount({"Account": 3}, (), ()),
+        ):
+            results, net_errors, sf_errors = count_sobjects_from_record_count(
+                sf, ["Account"]
+            )
+        assert results == {"Account": 3}
+        assert len(net_errors) == 1
@@ -12,6 +12,7 @@ from sqlalchemy import create_engine
 
 from cumulusci.salesforce_api.org_schema import (
     BufferedSession,
+    CountMethod,
     Filters,
     get_org_schema,
     zip_database,
@@ -388,14 +389,82 @@ class TestOrgSchema:
                 assert "Account" in schema
                 assert "PermissionSet" in schema
 
-    def test_error_populate_without_include_counts(self, sf, org_config):
+    def test_populate_without_include_counts_checks_existence(self, sf, org_config):
         with mock_return_uncached_responses(self.cassette_data):
-            with pytest.raises(AssertionError, match="include_counts"):
+            with patch(
+                "cumulusci.salesforce_api.org_schema.count_sobjects",
+                return_value=({"Account": 1, "Contact": 1, "PermissionSet": 0}, [], []),
+            ) as count_sobjects, get_org_schema(
+                FakeSF(), org_config, filters=[Filters.populated]
+            ) as schema:
+                assert "Account" in schema
+                assert "PermissionSet" not in schema
+                assert schema["Account"].count_method == "exists"
+                assert not schema.includes_counts
+        assert count_sobjects.call_args.kwargs == {"exists_only": True}
+
+    def test_cached_counts_reused(self, sf, org_config):
+        counts = ({"Account": 10, "Contact": 5, "PermissionSet": 0}, [], [])
+        with mock_return_uncached_responses(self.cassette_data):
+            with patch(
+                "cumulusci.salesforce_api.org_schema.count_sobjects",
+                return_value=counts,
+            ) as count_sobjects:
+                with get_org_schema(FakeSF(), org_config, include_counts=True):
+                    pass
                 with get_org_schema(
-                    FakeSF(), org_config, filters=[Filters.populated]
+                    FakeSF(),
+                    org_config,
+                    include_counts=True,
+                    counts_max_age=3600,
+                    filters=[Filters.populated],
                 ) as schema:
                     assert "Account" in schema
                     assert "PermissionSet" not in schema
+                    assert schema["Account"].count == 10
+                    assert schema.includes_counts
+        # Only objects that weren't cached are counted the second time
+        assert count_sobjects.call_count == 2
+        recounted = count_sobjects.call_args.args[1]
+        assert "Account" not in recounted and "Case" in recounted
+
+    def test_stale_or_imprecise_counts_not_reused(self, sf, org_config):
+        counts = ({"Account": 10, "Contact": 5}, [], [])
+        with mock_return_uncached_responses(self.cassette_data):
+            with patch(
+                "cumulusci.salesforce_api.org_schema.count_sobjects",
+                return_value=counts,
+            ) as count_sobjects:
+                with get_org_schema(FakeSF(), org_config, filters=[Filters.populated]):
+                    pass  # existence checks only
+                with get_org_schema(
+                    FakeSF(), org_config, include_counts=True, counts_max_age=3600
+                ):
+                    pass
+                with get_org_schema(
+                    FakeSF(), org_config, include_counts=True, counts_max_age=0
+                ):
+                    pass
+        assert [
+            "Account" in call.args[1] for call in count_sobjects.call_args_list
+        ] == [True, True, True]
+
+    def test_count_method_record_count(self, sf, org_config):
+        with mock_return_uncached_responses(self.cassette_data):
+            with patch(
+                "cumulusci.salesforce_api.org_schema.count_sobjects_from_record_count",
+                return_value=({"Account": 10, "Contact": 0}, [], []),
+            ), get_org_schema(
+                FakeSF(),
+                org_config,
+                include_counts=True,
+                count_method=CountMethod.record_count,
+                filters=[Filters.populated],
+            ) as schema:
+                assert "Account" in schema
+                assert "Contact" not in schema
+                assert schema["Account"].count_method == "record_count"
+                assert schema.includes_counts
 
     def test_filter_by_populated(self, sf, org_config):
         with mock_return_uncached_responses(self.cassette_data):
@@ -15,7 +15,8 @@ Or to give a more Salesforce-y example:
 Account
 """
 
-from typing import Generator, Union
+from io import BytesIO
+from typing import Dict, Generator, Iterable, Iterator, List, Tuple, Union
 
 from lxml import etree
 
@@ -49,6 +50,94 @@ def fromstring(source):
     return MetadataElement(lxml_parse_string(source).getroot())
 
 
+def iter_child_elements(source, tags: Iterable[str]) -> Iterator[etree._Element]:
+    """Stream the direct children of the root element whose tag is in `tags`
+
+    Accepts the same sources as parse(), as well as bytes. Each matching
+    child is yielded as an lxml element as soon as its closing tag has been
+    read, and is discarded, along with everything before it, when the next
+    one is requested. Memory use is therefore bounded by the largest child
+    rather than the whole document, which matters for read-only consumers
+    of very large Profiles or CustomObjects that need only a few fields.
+
+    Don't keep references to the yielded elements (or anything inside them)
+    past the iteration that produced them: copy out the values you need.
+    """
+    tags = set(tags)
+    for element in _iter_root_children(_iterparse(source)):
+        parent = element.getparent()
+        while element.getprevious() is not None:
+            del parent[0]
+        if etree.QName(element).localname in tags:
+            yield element
+        element.clear(keep_tail=True)
+
+
+def iterparse(source, tags: Iterable[str]) -> Iterator["MetadataElement"]:
+    """Stream the direct children of the root element whose tag is in `tags`
+    as MetadataElements.
+
+    See iter_child_elements() for the lifetime of the yielded elements.
+
+    >>> for types in iterparse("package.xml", ["types"]):
+    ...     print(types["name"].text, [m.text for m in types.findall("members")])
+    """
+    for element in iter_child_elements(source, tags):
+        yield MetadataElement(element, element.getparent())
+
+
+def parse_subset(source, tags: Iterable[str]) -> "MetadataElement":
+    """Parse a Metadata Tree that keeps only the root's children named in `tags`
+
+    Other children are dropped as soon as they have been read, so the tree
+    never holds more than the requested parts of the document. Use this
+    instead of parse() when only a few fields of a large file are needed.
+    """
+    tags = set(tags)
+    context = _iterparse(source)
+    for element in _iter_root_children(context):
+        parent = element.getparent()
+        # Elements before the current one are complete and safe to remove.
+        previous = element.getprevious()
+        while previous is not None:
+            sibling, previous = previous, previous.getprevious()
+            if not _is_wanted(sibling, tags):
+                parent.remove(sibling)
+        if not _is_wanted(element, tags):
+            element.clear(keep_tail=True)
+
+    root = context.root
+    for child in list(root):
+        if not _is_wanted(child, tags):
+            root.remove(child)
+    return MetadataElement(root)
+
+
+def _iterparse(source) -> etree.iterparse:
+    if isinstance(source, bytes):
+        source = BytesIO(source)
+    elif hasattr(source, "open"):  # for pathlib.Path objects
+        source = str(source)
+    return etree.iterparse(
+        source,
+        events=("end",),
+        resolve_entities=False,
+        load_dtd=False,
+        no_network=True,
+    )
+
+
+def _iter_root_children(context: etree.iterparse) -> Iterator[etree._Element]:
+    for _, element in context:
+        parent = element.getparent()
+        if parent is not None and parent.getparent() is None:
+            yield element
+
+
+def _is_wanted(element: etree._Element, tags: set) -> bool:
+    return isinstance(element.tag, str) and etree.QName(element).localname in tags
+
+
 def parse_package_xml_types(feildName, source_xml_tree):
     """ "Parse metadata types based on the  feildName and map based on the type"""
     xml_map = {}
@@ -63,6 +152,45 @@ def parse_package_xml_types(feildName, source_xml_tree):
     return xml_map
 
 
+class ChildIndex:
+    """The children of the elements of one tree, grouped by tag.
+
+    Looking up a child by name is a linear scan in lxml, which adds up when
+    code walks a large Profile or CustomObject by name over and over. The
+    index is built the first time an element's children are looked up and
+    reused until that element is changed through a MetadataElement method.
+    As a safety net, an element whose number of children changed behind the
+    index's back is re-indexed as well; call MetadataElement.invalidate()
+    after any other direct edits of the underlying lxml tree.
+    """
+
+    __slots__ = ["_entries"]
+
+    def __init__(self):
+        # Keyed by the lxml proxy, which keeps the proxy (and so its
+        # identity) alive for as long as the entry exists.
+        self._entries: Dict[
+            etree._Element, Tuple[int, Dict[str, List[etree._Element]]]
+        ] = {}
+
+    def children(self, element: etree._Element, tag: str) -> List[etree._Element]:
+        """The children of `element` with the (namespaced) `tag`, in order"""
+        entry = self._entries.get(element)
+        if entry is None or entry[0] != len(element):
+            by_tag = {}
+            for child in element:
+                by_tag.setdefault(child.tag, []).append(child)
+            entry = self._entries[element] = (len(element), by_tag)
+        return entry[1].get(tag, [])
+
+    def invalidate(self, element: etree._Element = None):
+        """Forget the children of `element`, or of every element if None"""
+        if element is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(element, None)
+
+
 class MetadataElement:
     '''A class for representing Metadata in a Pythonic tree.
 
@@ -99,12 +227,18 @@ class MetadataElement:
     There are also methods for finding, appending, inserting and removing nodes, which have their own documentation.
     '''
 
-    __slots__ = ["_element", "_parent", "_ns", "tag"]
+    __slots__ = ["_element", "_parent", "_ns", "_index", "tag"]
 
-    def __init__(self, element: etree._Element, parent: etree._Element = None):
+    def __init__(
+        self,
+        element: etree._Element,
+        parent: etree._Element = None,
+        index: ChildIndex = None,
+    ):
         assert isinstance(element, etree._Element)
         self._element = element
         self._parent = parent
+        self._index = index if index is not None else ChildIndex()
         self._ns = next(iter(element.nsmap.values()))
         self.tag = element.tag.split("}")[1]
 
@@ -119,16 +253,26 @@ class MetadataElement:
         self._element.text = text
 
     def _wrap_element(self, child: etree._Element):
-        return MetadataElement(child, self._element)
+        return MetadataElement(child, self._element, self._index)
 
     def _add_namespace(self, tag):
         return "{%s}%s" % (self._ns, tag)
 
+    def _children(self, element: etree._Element, tag: str) -> List[etree._Element]:
+        return self._index.children(element, self._add_namespace(tag))
+
     def _get_child(self, childname):
-        child_element = self._element.find(self._add_namespace(childname))
-        if child_element is None:
+        children = self._children(self._element, childname)
+        if not children:
             raise AttributeError(f"{childname} not found in {self.tag}")
-        return self._wrap_element(child_element)
+        return self._wrap_element(children[0])
+
+    def invalidate(self):
+        """Discard cached child lookups for the whole tree.
+
+        Only needed after modifying the underlying lxml elements directly;
+        the methods of MetadataElement keep the cache up to date."""
+        self._index.invalidate()
 
     def _create_child(self, tag, text=None):
         element = etree.Element(self._add_namespace(tag))
@@ -153,8 +297,8 @@ class MetadataElement:
         of that first ingredient.
         """
         if isinstance(item, int):
-            siblings = self._parent.findall(self._element.tag)
-            return MetadataElement(siblings[item], self._parent)
+            siblings = self._index.children(self._parent, self._element.tag)
+            return MetadataElement(siblings[item], self._parent, self._index)
         elif isinstance(item, str):
             return self._get_child(item)
         else:
@@ -192,13 +336,14 @@ class MetadataElement:
         </types>
         '''
         newchild = self._create_child(tag, text)
-        same_elements = self._element.findall(self._add_namespace(tag))
+        same_elements = self._children(self._element, tag)
         if same_elements:
             last = same_elements[-1]
             index = self._element.index(last)
             self._element.insert(index + 1, newchild._element)
         else:
             self._element.append(newchild._element)
+        self._index.invalidate(self._element)
         return newchild
 
     def insert(self, index: int, tag: str, text: str = None):
@@ -218,6 +363,7 @@ class MetadataElement:
         """
         newchild = self._create_child(tag, text)
         self._element.insert(index, newchild._element)
+        self._index.invalidate(self._element)
         return newchild
 
     def insert_before(self, oldElement: "MetadataElement", tag: str, text: str = None):
@@ -238,6 +384,7 @@ class MetadataElement:
     def remove(self, metadata_element: "MetadataElement") -> None:
         """Remove an element from its parent (self)"""
         self._element.remove(metadata_element._element)
+        self._index.invalidate(self._element)
 
     def find(self, tag, **kwargs):
         """Find a single direct child-elements with name `tag`"""
@@ -248,7 +395,8 @@ class MetadataElement:
         return list(self._findall(tag, kwargs))
 
     def _sub_element_matches_spec(self, e: etree._Element, name: str, value):
-        matching_subelement = e.find(self._add_namespace(name))
+        children = self._children(e, name)
+        matching_subelement = children[0] if children else None
         if matching_subelement is None and name != "text":
             return value is None
         elif matching_subelement is not None:
@@ -265,7 +413,7 @@ class MetadataElement:
 
         return (
             self._wrap_element(e)
-            for e in self._element.findall(self._add_namespace(type))
+            for e in self._children(self._element, type)
             if matches(e)
         )
 
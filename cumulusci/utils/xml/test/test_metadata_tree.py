@@ -2,12 +2,16 @@ from io import BytesIO
 from pathlib import Path
 
 import pytest
+from lxml import etree
 
 from cumulusci.utils.xml.metadata_tree import (
     METADATA_NAMESPACE,
     fromstring,
+    iter_child_elements,
+    iterparse,
     parse,
     parse_package_xml_types,
+    parse_subset,
 )
 
 standard_xml = f"""<Data xmlns='{METADATA_NAMESPACE}'>
@@ -249,3 +253,99 @@ class TestMetadataTree:
         expected = {"Report": ["namespace__TestFolder/TestReport"]}
 
         assert result == expected
+
+    def test_child_index__reuses_lookups(self):
+        Data = fromstring(standard_xml)
+        index = Data._index
+        assert Data.bar[1].name.text == "Bar2"
+        assert index._entries[Data._element][1] is not None
+
+        children = index.children(Data._element, f"{{{METADATA_NAMESPACE}}}foo")
+        assert Data._children(Data._element, "foo") is children
+        assert [foo.text for foo in Data.findall("foo")] == ["Foo", "Foo2"]
+
+    def test_child_index__updated_by_mutations(self):
+        Data = fromstring(standard_xml)
+        assert len(Data.findall("foo")) == 2
+
+        foo3 = Data.append("foo", "Foo3")
+        assert [foo.text for foo in Data.findall("foo")] == ["Foo", "Foo2", "Foo3"]
+        Data.remove(Data.foo)
+        assert Data.foo.text == "Foo2"
+        Data.insert_before(foo3, "foo", "Foo2.5")
+        assert Data.foo[1].text == "Foo2.5"
+        assert Data.find("bar", name="Bar2").label.text == "Label2"
+
+    def test_child_index__direct_lxml_changes(self):
+        Data = fromstring(standard_xml)
+        assert Data.foo.text == "Foo"
+
+        # A change in the number of children is noticed...
+        Data._element.remove(Data.foo._element)
+        assert Data.foo.text == "Foo2"
+
+        # ...while other direct changes need an explicit invalidation.
+        Data.foo._element.tag = f"{{{METADATA_NAMESPACE}}}renamed"
+        Data.invalidate()
+        assert Data.renamed.text == "Foo2"
+        assert Data.find("foo") is None
+
+    def test_iter_child_elements(self):
+        source = standard_xml.encode("utf-8")
+        names = [
+            element.findtext(f"{{{METADATA_NAMESPACE}}}name")
+            for element in iter_child_elements(source, ["bar"])
+        ]
+        assert names == ["Bar1", "Bar2"]
+
+    def test_iter_child_elements__discards_processed_elements(self):
+        seen = []
+        for element in iter_child_elements(standard_xml.encode("utf-8"), ["foo"]):
+            root = element.getparent()
+            seen.append(element.text)
+            # Everything before the current element has been dropped
+            assert element.getprevious() is None
+        assert seen == ["Foo", "Foo2"]
+        assert len(root) <= 1
+
+    def test_iterparse(self, tmp_path):
+        path = tmp_path / "Data.xml"
+        path.write_text(standard_xml)
+
+        labels = [bar.label.text for bar in iterparse(path, ["bar"])]
+        assert labels == ["Label1", "Label2"]
+        with path.open("rb") as f:
+            assert [e.text for e in iterparse(f, ["text", "foo"])] == [
+                "Foo",
+                "Foo2",
+                "Baz",
+            ]
+
+    def test_parse_subset(self):
+        Data = parse_subset(
+            f"""<Data xmlns='{METADATA_NAMESPACE}'>
+                <!-- comment -->
+                <foo>Foo</foo>
+                <bar><name>Bar1</name></bar>
+                <foo>Foo2</foo>
+                <baz>Baz</baz>
+                <bar><name>Bar2</name></bar>
+            </Data>""".encode(
+                "utf-8"
+            ),
+            ["bar", "baz"],
+        )
+        assert Data.find("foo") is None
+        assert [bar.name.text for bar in Data.findall("bar")] == ["Bar1", "Bar2"]
+        assert Data.baz.text == "Baz"
+        assert len(Data._element) == 3
+
+    def test_parse_subset__does_not_resolve_entities(self):
+        Data = parse_subset(
+            b"""<?xml version="1.0"?>
+<!DOCTYPE Data [<!ENTITY ext SYSTEM "file:///etc/passwd">]>
+<Data xmlns="http://soap.sforce.com/2006/04/metadata"><foo>&ext;</foo></Data>""",
+            ["foo"],
+        )
+        assert Data.foo._element.text is None
+        assert b"&ext;" in etree.tostring(Data._element)
@@ -48,6 +48,7 @@ class Step(CCIDictModel):
     ui_options: Dict[str, Any] = VSCodeFriendlyDict
     checks: List[PreflightCheck] = []
     description: str = None
+    parallel: str = None
 
     @root_validator()
     def _check(cls, values):
@@ -75,6 +76,8 @@ class Flow(CCIDictModel):
     description: str = None
     steps: Dict[str, Step] = None
     group: str = None
+    fuse_metadata_etl: bool = None
+    max_parallel: int = None
 
 
 class Package(CCIDictModel):
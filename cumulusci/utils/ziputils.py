@@ -21,6 +21,29 @@ def zip_subfolder(zip_src: zipfile.ZipFile, path):
     return zip_dest
 
 
+def zip_subfolder_in_place(zip_src: zipfile.ZipFile, path) -> zipfile.ZipFile:
+    """Like zip_subfolder, but renames the entries of a zip opened for reading
+    instead of copying them into a new, recompressed archive.
+
+    Entries outside of `path` are dropped from the listing."""
+    assert zip_src.mode == "r", "Only zip files opened for reading can be renamed"
+    if path and not path.endswith("/"):
+        path = path + "/"
+
+    infos = []
+    for info in zip_src.infolist():
+        if not info.filename.startswith(path):
+            continue
+        # ZipFile checks headers against orig_filename, so renaming is safe
+        info.filename = info.filename.replace(path, "", 1)
+        if info.filename:
+            infos.append(info)
+
+    zip_src.filelist = infos
+    zip_src.NameToInfo = {info.filename: info for info in infos}
+    return zip_src
+
+
 def process_text_in_zipfile(zf, process_file):
     """Process each file in a zip file using the `process_file` function.
 